@@ -67,6 +67,10 @@ class AccessPoint:
         """ Get a connection request by address """
         return self.conn_reqs.get(address, None)
 
+    def connection_count(self) -> int:
+        """ Number of open connections """
+        return len(self.conn_reqs)
+
     @abc.abstractmethod
     def start(self):
         """ Start the access point """
@@ -7,9 +7,6 @@
 
 from access_point import AccessPoint
 from data_producer import DataProducer
-from mock.mock_access_point import MockAccessPoint
-from silabs.common.util import get_connector
-from silabs.silabs_access_point import SilabsAccessPoint
 
 
 _ble_ap: AccessPoint = None  # type: ignore
@@ -18,10 +15,16 @@ _ble_ap: AccessPoint = None  # type: ignore
 def create_ble_ap(data_producer: DataProducer) -> AccessPoint:
     """ function to create BLE AP """
     global _ble_ap  # pylint: disable=global-statement
+    # Backends are imported here, so that processes without a radio (HTTP
+    # workers, CLI commands) do not load bgapi and pyserial
+    # pylint: disable=import-outside-toplevel
+    from silabs.common.util import get_connector
     connector = get_connector()
     if connector is None:
+        from mock.mock_access_point import MockAccessPoint
         _ble_ap = MockAccessPoint(data_producer)
     else:
+        from silabs.silabs_access_point import SilabsAccessPoint
         _ble_ap = SilabsAccessPoint(connector, data_producer)
     return _ble_ap
 
@@ -8,35 +8,47 @@
 This script configures components, like MQTT and PostgreSQL, initializes them,
 and serves a secure Flask web application with MQTT and BLE integration.
 
+Run directly, it serves everything from one process. For several HTTP
+worker processes, run radio_daemon.py and serve wsgi.py instead.
+
 """
 
 import datetime
+import logging
 import uuid
 import ssl
+from concurrent.futures import ThreadPoolExecutor
 
 import click
 import paho.mqtt.client as mqtt
 from sqlalchemy import select
 
-from config import (BOOT_TIMEOUT, MQTT_HOST, MQTT_PORT, POSTGRES_DB,
-                    POSTGRES_HOST, POSTGRES_PASSWORD, POSTGRES_PORT,
-                    POSTGRES_USER)
-from control import PeerCertWSGIRequestHandler
+from config import (BOOT_TIMEOUT, DATABASE_URL, FDO_SUPPORT, ISE_SUPPORT, MQTT_HOST, MQTT_PORT,
+                    POSTGRES_DB, POSTGRES_HOST, POSTGRES_PASSWORD, POSTGRES_PORT,
+                    POSTGRES_REPLICA_HOST, POSTGRES_REPLICA_PORT, POSTGRES_USER)
 import ap_factory
+from access_point import AccessPoint
+from boot import BootTimer
 from data_producer import DataProducer
-from database import db, session
+from fdo_upload import fdo_uploader
+from change_bus import change_bus
+from database import db, session, upgrade_database
 from models import EndpointApp, OnboardingAppKey
-from util import make_hash
+from util import check_hash, hash_password, needs_rehash
 from app_factory import create_app
 # pylint: disable-next=unused-import
 from scim_ethermab import EtherMABExtension
 # pylint: disable-next=unused-import
 from scim_fdo import FDOExtension
 
-app = create_app((
+app = create_app(DATABASE_URL or (
     'postgresql+psycopg2://'
     f'{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}'
-))
+), replica_url=(
+    'postgresql+psycopg2://'
+    f'{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_REPLICA_HOST}:{POSTGRES_REPLICA_PORT}/'
+    f'{POSTGRES_DB}'
+) if POSTGRES_REPLICA_HOST else None)
 
 @app.cli.command("register-onboarding-app")
 @click.argument("name")
@@ -49,55 +61,108 @@ def onboarding_apiauth(name):
     print(name, " API-KEY:", key)
 
 
-def mqtt_connect() -> mqtt.Client:
-    """ Function MQTT connect """
+def create_mqtt_client() -> mqtt.Client:
+    """ MQTT client for the broker, not connected yet """
     client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
     client.tls_set(ca_certs="ca_certificates/ca.pem")
     client.tls_insecure_set(True)
     client.username_pw_set("admin", "admin")
-    client.connect(MQTT_HOST, MQTT_PORT, 60)
 
     return client
 
 
-if __name__ == "__main__":
+def prepare_database():
+    """ Apply migrations and make sure that the admin endpoint app exists """
     with app.app_context():
-        db.create_all()
+        upgrade_database()
         # if endpointApp doesn't exist, create it
-        if not session.scalar(select(EndpointApp).filter_by(applicationName="admin")):
+        admin_app = session.scalar(select(EndpointApp).filter_by(applicationName="admin"))
+        if not admin_app:
             endpoint_app = EndpointApp()
             endpoint_app.applicationType = "telemetry"
             endpoint_app.applicationName = "admin"
-            endpoint_app.password = make_hash("admin")
+            endpoint_app.password = hash_password("admin")
             endpoint_app.is_admin = True
             endpoint_app.createdTime = datetime.datetime.now()
             endpoint_app.modifiedTime = datetime.datetime.now()
 
             session.merge(endpoint_app)
             session.commit()
+        elif admin_app.password and needs_rehash(admin_app.password) \
+                and check_hash("admin", admin_app.password):
+            # Cost parameters changed; the default admin password is known,
+            # so its hash can be upgraded in place
+            admin_app.password = hash_password("admin")
+            admin_app.modifiedTime = datetime.datetime.now()
+            session.commit()
 
-    mqtt_client = mqtt_connect()
-    mqtt_client.loop_start()
 
+def start_radio() -> tuple[AccessPoint, mqtt.Client]:
+    """
+    Prepare the database, connect to MQTT and boot the BLE access point,
+    concurrently, then start the work that must run in a single process:
+    ISE sync, FDO uploads and scanning. Logs how long each step took.
+    """
+    timer = BootTimer()
+    mqtt_client = create_mqtt_client()
     data_producer = DataProducer(mqtt_client, app)
 
-    ble_ap = ap_factory.create_ble_ap(data_producer)
-    ble_ap.start()
+    ble_ap = None
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="boot") as pool:
+        database = pool.submit(timer.timed("database", prepare_database))
+        broker = pool.submit(timer.timed("mqtt", mqtt_client.connect, MQTT_HOST, MQTT_PORT, 60))
+        try:
+            with timer.step("access point"):
+                ble_ap = ap_factory.create_ble_ap(data_producer)
+                ble_ap.start()
+                booted = ble_ap.ready.wait(timeout=BOOT_TIMEOUT)
+            database.result()
+            broker.result()
+            if not booted:
+                raise RuntimeError("Failed to boot")
+        except BaseException:
+            if ble_ap is not None:
+                ble_ap.stop()
+            raise
+
+    mqtt_client.loop_start()
 
-    if not ble_ap.ready.wait(timeout=BOOT_TIMEOUT):
-        ble_ap.stop()
-        mqtt_client.loop_stop()
-        raise RuntimeError("Failed to boot")
+    with timer.step("background jobs"):
+        change_bus().start(app)
+        if ISE_SUPPORT:
+            # ise_sync loads the ISE SDK, which is slow to import
+            # pylint: disable-next=import-outside-toplevel
+            from ise_sync import ise_sync
+            ise_sync().start(app)
+        if FDO_SUPPORT:
+            fdo_uploader().start(app)
 
     ble_ap.start_scan()
+    logging.info(timer.report())
+    return ble_ap, mqtt_client
+
+
+def stop_radio(ble_ap: AccessPoint, mqtt_client: mqtt.Client):
+    """ Undo start_radio """
+    ble_ap.stop()
+    if ISE_SUPPORT:
+        # pylint: disable-next=import-outside-toplevel
+        from ise_sync import ise_sync
+        ise_sync().stop()
+    fdo_uploader().stop()
+    change_bus().stop()
+    mqtt_client.loop_stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    radio = start_radio()
 
     context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
     context.verify_mode = ssl.CERT_OPTIONAL
     context.load_verify_locations('ca_certificates/ca.pem')
     context.load_cert_chain('certs/server.crt', 'certs/server.key')
 
-    app.run(host="0.0.0.0", port=8081, ssl_context=context,
-            request_handler=PeerCertWSGIRequestHandler)
+    app.run(host="0.0.0.0", port=8081, ssl_context=context)
 
-    ble_ap.stop()
-    mqtt_client.loop_stop()
+    stop_radio(*radio)
@@ -7,28 +7,46 @@
 Flask application factory
 """
 
+import os
 from typing import Optional
 
 from flask import Flask
 from flask_migrate import Migrate
 from scim import scim_app
 from control import control_app
-from database import db
+from database import REPLICA_BIND, db, engine_options
+from peer_cert import PeerCertMiddleware
+# Registers the session hooks that publish registry changes
+# pylint: disable-next=unused-import
+import change_bus
+from device_import import import_devices_command
 from config import WANT_ETHER_MAB, WANT_FDO
 from scim_extensions import reset_scim_extensions
 from scim_ble import register_ble_extension
 from scim_ethermab import register_ethermab_extension
 from scim_fdo import register_fdo_extension
 
-migrate = Migrate()
+migrate = Migrate(directory=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                         "migrations"))
 
 def create_app(url: str,
                want_ether_mab: Optional[bool] = None,
-               want_fdo: Optional[bool] = None):
-    """ Create Flask Application """
+               want_fdo: Optional[bool] = None,
+               replica_url: Optional[str] = None):
+    """
+    Create Flask Application. The storage backend follows url: a
+    postgresql:// URL, or sqlite:///path/to/file.db for the embedded
+    SQLite mode.
+    """
     app = Flask(__name__)
+    app.wsgi_app = PeerCertMiddleware(app.wsgi_app)  # type: ignore
 
     app.config["SQLALCHEMY_DATABASE_URI"] = url
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(url)
+    if replica_url:
+        app.config["SQLALCHEMY_BINDS"] = {
+            REPLICA_BIND: {"url": replica_url, **engine_options(replica_url, replica=True)}
+        }
     app.config['JSON_SORT_KEYS'] = False
 
     if want_ether_mab is None:
@@ -48,4 +66,6 @@ def create_app(url: str,
     app.register_blueprint(control_app)
     app.register_blueprint(scim_app)
 
+    app.cli.add_command(import_devices_command)
+
     return app
@@ -0,0 +1,123 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+
+Compare inline and process-pool credential hashing under a threaded
+Flask server load.
+
+Worker threads issue a mix of hashing requests (as made by telemetry
+EndpointApp creation) and light requests. The benchmark reports
+hashing throughput and the latency of the light requests, which is
+what other API clients see while apps are being created in bulk.
+
+Run from the gateway directory:
+
+    python -m benchmarks.hash_offload --requests 200 --threads 16
+
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask, jsonify
+
+import util
+
+
+def build_app(offload: bool) -> Flask:
+    """ Minimal app with a hashing route and a light route """
+    app = Flask(__name__)
+
+    @app.route("/hash", methods=["POST"])
+    def create_app_credentials():
+        if offload:
+            password = util.hash_password("client-token")
+        else:
+            password = util.make_hash("client-token")
+        return jsonify({"password": password}), 201
+
+    @app.route("/ping")
+    def ping():
+        return jsonify({"devices": list(range(50))})
+
+    return app
+
+
+def run(offload: bool, requests: int, threads: int) -> dict:
+    """ Drive the app and collect timings """
+    app = build_app(offload)
+    clients = threading.local()
+    light_latencies: list[float] = []
+    lock = threading.Lock()
+
+    def client():
+        if not hasattr(clients, "client"):
+            clients.client = app.test_client()
+        return clients.client
+
+    def hash_request(_):
+        assert client().post("/hash").status_code == 201
+
+    def light_request(_):
+        started = time.perf_counter()
+        assert client().get("/ping").status_code == 200
+        with lock:
+            light_latencies.append(time.perf_counter() - started)
+
+    if offload:
+        # Start the pool outside the measurement
+        util.hash_password("warm-up")
+
+    done = threading.Event()
+
+    def light_load():
+        while not done.is_set():
+            light_request(None)
+            time.sleep(0.005)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        light = [threading.Thread(target=light_load) for _ in range(2)]
+        for thread in light:
+            thread.start()
+        list(executor.map(hash_request, range(requests)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        for thread in light:
+            thread.join()
+
+    light_latencies.sort()
+    return {
+        "mode": "offload" if offload else "inline",
+        "hashes_per_s": requests / elapsed,
+        "light_p50_ms": statistics.median(light_latencies) * 1000,
+        "light_p99_ms": light_latencies[int(len(light_latencies) * 0.99) - 1] * 1000,
+        "light_requests": len(light_latencies),
+    }
+
+
+def main():
+    """ Print a comparison table """
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+
+    print(f"PBKDF2-{util.HASH_FUNCTION}, {util.COST_FACTOR} iterations, "
+          f"{util.HASH_WORKERS} hash workers")
+    print(f"{'mode':8} {'hashes/s':>9} {'light p50 ms':>13} {'light p99 ms':>13} {'light n':>8}")
+    for offload in (False, True):
+        result = run(offload, args.requests, args.threads)
+        print(f"{result['mode']:8} {result['hashes_per_s']:9.1f} {result['light_p50_ms']:13.2f} "
+              f"{result['light_p99_ms']:13.2f} {result['light_requests']:8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+
+Startup timing. The gateway runs independent boot steps concurrently;
+BootTimer records how long each one took, so that the time to first
+request, and with it the outage window of a restart, can be read from
+the logs.
+
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Optional
+
+
+def process_uptime() -> Optional[float]:
+    """ Seconds since this process started, where /proc tells """
+    try:
+        with open("/proc/self/stat", encoding="ascii") as stat:
+            # Fields after the command name, which may contain spaces;
+            # starttime is field 22, in clock ticks after system boot
+            fields = stat.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime", encoding="ascii") as uptime:
+            system_uptime = float(uptime.read().split()[0])
+        return system_uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class BootTimer:
+    """ Durations of named boot steps, which may overlap """
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.startup = process_uptime()
+        self.steps: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def step(self, name: str):
+        """ Time the enclosed block as step name """
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.steps[name] = time.monotonic() - started
+
+    def timed(self, name: str, func: Callable, *args, **kwargs) -> Callable[[], Any]:
+        """ func(*args, **kwargs) timed as step name, e.g. to submit to an executor """
+
+        def run():
+            with self.step(name):
+                return func(*args, **kwargs)
+
+        return run
+
+    def report(self) -> str:
+        """ A one-line summary of the boot so far """
+        with self._lock:
+            steps = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.steps.items())
+        line = f"Boot took {time.monotonic() - self.started:.2f}s ({steps})"
+        if self.startup is not None:
+            line += f" after {self.startup:.2f}s of imports and setup"
+        return line
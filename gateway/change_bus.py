@@ -0,0 +1,297 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+
+This module tells every gateway process sharing a database which
+registry rows changed, so that in-process state derived from them can
+be kept and refreshed only when needed.
+
+Flushes that touch a tracked table emit one compact NOTIFY per changed
+row on the tiedie_changes channel, as a JSON array of table, key,
+version and operation. PostgreSQL delivers them when the transaction
+commits, and not at all if it rolls back. A listener thread in each
+process hands them to the subscribers registered with the change bus.
+
+A change with no key means that any row of the table may have changed,
+e.g. after a bulk statement. The "*" table means that notifications
+may have been lost while the listener reconnected; subscribers should
+drop everything they derived.
+
+SQLite has no NOTIFY. An SQLite database serves a single gateway
+process, so session changes are delivered to the subscribers of that
+process after the commit instead.
+
+"""
+
+import dataclasses
+import json
+import logging
+import select
+import threading
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import event, func, inspect
+from sqlalchemy import select as sql_select
+from sqlalchemy.orm import Session
+
+from config import CHANGE_BUS_MAX_KEYS, CHANGE_BUS_RECONNECT
+from database import db
+
+CHANNEL = "tiedie_changes"
+ALL_TABLES = "*"
+
+INSERT = "i"
+UPDATE = "u"
+DELETE = "d"
+
+# Tracked table -> (reported table, key column)
+TRACKED_TABLES = {
+    "bledevices": ("bledevices", "device_id"),
+    "data_app": ("data_app", "data_app_id"),
+    # Subscriptions are part of their data app
+    "data_app_event": ("data_app", "data_app_id"),
+    "endpoint_app": ("endpoint_app", "id"),
+    "event": ("event", "instance_id"),
+    "sdf_model": ("sdf_model", "id"),
+}
+
+_PENDING = "tiedie.changes"
+
+
+@dataclasses.dataclass(frozen=True)
+class Change:
+    """ A changed row, or a whole table if key is None """
+    table: str
+    key: Optional[str] = None
+    version: Optional[int] = None
+    op: str = UPDATE
+
+    def encode(self) -> str:
+        """ Compact NOTIFY payload """
+        return json.dumps([self.table, self.key, self.version, self.op],
+                          separators=(",", ":"))
+
+    @classmethod
+    def decode(cls, payload: str) -> "Change":
+        """ Parse a NOTIFY payload """
+        table, key, version, op = json.loads(payload)
+        return cls(table, key, version, op)
+
+
+Subscriber = Callable[[Change], None]
+
+
+class ChangeBus:
+    """ Delivers row changes, from any process, to in-process subscribers """
+
+    def __init__(self, reconnect_delay: float = CHANGE_BUS_RECONNECT):
+        self.reconnect_delay = reconnect_delay
+        self._subscribers: dict[Optional[str], list[Subscriber]] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._listening = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._app = None
+
+    def subscribe(self, callback: Subscriber, table: Optional[str] = None):
+        """
+        Call callback with the changes to table, or to every table if
+        table is None. Callbacks run on the listener thread and should
+        be quick. Resync changes ("*") reach every subscriber.
+        """
+        with self._lock:
+            self._subscribers.setdefault(table, []).append(callback)
+
+    def unsubscribe(self, callback: Subscriber, table: Optional[str] = None):
+        """ Remove a subscription; safe to call more than once """
+        with self._lock:
+            callbacks = self._subscribers.get(table, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def publish(self, changes: Iterable[Change]):
+        """ Hand changes to the subscribers of this process """
+        for change in changes:
+            with self._lock:
+                if change.table == ALL_TABLES:
+                    callbacks = [callback for callbacks in self._subscribers.values()
+                                 for callback in callbacks]
+                else:
+                    callbacks = (self._subscribers.get(change.table, []) +
+                                 self._subscribers.get(None, []))
+            for callback in callbacks:
+                try:
+                    callback(change)
+                except Exception: # pylint: disable=broad-except
+                    logging.exception("Change subscriber failed on %s", change)
+
+    def start(self, app):
+        """ Start listening for notifications, on PostgreSQL """
+        with app.app_context():
+            if db.engine.dialect.name != "postgresql":
+                return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._app = app
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="change-bus", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """ Stop the listener thread """
+        self._stopping.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+        self._listening.clear()
+
+    def wait_listening(self, timeout: Optional[float] = None) -> bool:
+        """ Wait until the listener has subscribed to the channel """
+        return self._listening.wait(timeout)
+
+    def _run(self):
+        listened = False
+        while not self._stopping.is_set():
+            try:
+                with self._app.app_context():
+                    connection = db.engine.raw_connection()
+                dbapi_connection = connection.driver_connection
+                # The listener holds its connection for good
+                connection.detach()
+                try:
+                    # Changes made while reconnecting were missed
+                    self._listen(dbapi_connection, resync=listened)
+                finally:
+                    listened = listened or self._listening.is_set()
+                    self._listening.clear()
+                    connection.close()
+            except Exception: # pylint: disable=broad-except
+                logging.exception("Change bus listener failed")
+            self._stopping.wait(self.reconnect_delay)
+
+    def _listen(self, dbapi_connection, resync: bool):
+        dbapi_connection.autocommit = True
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+        self._listening.set()
+        if resync:
+            self.publish([Change(ALL_TABLES)])
+
+        while not self._stopping.is_set():
+            select.select([dbapi_connection], [], [], 1.0)
+            # Polling on every pass also notices a dropped connection
+            dbapi_connection.poll()
+            changes = []
+            while dbapi_connection.notifies:
+                notification = dbapi_connection.notifies.pop(0)
+                try:
+                    changes.append(Change.decode(notification.payload))
+                except ValueError:
+                    logging.warning("Ignoring change notification %r", notification.payload)
+            self.publish(changes)
+
+
+def _row_change(instance, op: str) -> Optional[Change]:
+    state = inspect(instance)
+    table, key_column = TRACKED_TABLES.get(state.mapper.local_table.name, (None, None))
+    if table is None:
+        return None
+    key = state.dict.get(key_column)
+    if key is None and state.identity is not None:
+        # Expired, e.g. deleted after a commit
+        columns = [column.key for column in state.mapper.primary_key]
+        key = state.identity[columns.index(key_column)]
+    version = state.dict.get("version") if table == state.mapper.local_table.name else None
+    return Change(table, None if key is None else str(key), version, op)
+
+
+def _coalesce(changes: Iterable[Change]) -> list[Change]:
+    """ One change per row, and one per table when too many rows changed """
+    rows: dict[tuple[str, Optional[str]], Change] = {}
+    for change in changes:
+        seen = rows.get((change.table, change.key))
+        if seen is None or (seen.version is None and change.version is not None):
+            rows[(change.table, change.key)] = change
+    per_table: dict[str, list[Change]] = {}
+    for change in rows.values():
+        per_table.setdefault(change.table, []).append(change)
+    coalesced = []
+    for table, table_changes in per_table.items():
+        if len(table_changes) > CHANGE_BUS_MAX_KEYS or \
+                any(change.key is None for change in table_changes):
+            coalesced.append(Change(table))
+        else:
+            coalesced.extend(table_changes)
+    return coalesced
+
+
+def notify_changes(connection, changes: Iterable[Change]):
+    """
+    NOTIFY changes in the transaction of a Core connection, for writes
+    that bypass the ORM session. A no-op on SQLite.
+    """
+    changes = _coalesce(changes)
+    if changes and connection.dialect.name == "postgresql":
+        connection.execute(sql_select(*[func.pg_notify(CHANNEL, change.encode())
+                                        for change in changes]))
+
+
+def _emit(db_session: Session, changes: list[Change]):
+    if not changes:
+        return
+    connection = db_session.connection()
+    if connection.dialect.name == "postgresql":
+        notify_changes(connection, changes)
+    else:
+        db_session.info.setdefault(_PENDING, []).extend(changes)
+
+
+@event.listens_for(Session, "after_flush")
+def _changes_after_flush(db_session: Session, _flush_context):
+    changes = []
+    for instances, op in ((db_session.new, INSERT), (db_session.dirty, UPDATE),
+                          (db_session.deleted, DELETE)):
+        for instance in instances:
+            if op == UPDATE and not db_session.is_modified(instance):
+                continue
+            change = _row_change(instance, op)
+            if change is not None:
+                changes.append(change)
+    _emit(db_session, changes)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _changes_of_bulk_statement(orm_execute_state):
+    if orm_execute_state.is_select or orm_execute_state.bind_mapper is None:
+        return
+    table, _ = TRACKED_TABLES.get(orm_execute_state.bind_mapper.local_table.name, (None, None))
+    if table is None:
+        return
+    op = INSERT if orm_execute_state.is_insert else \
+        DELETE if orm_execute_state.is_delete else UPDATE
+    _emit(orm_execute_state.session, [Change(table, op=op)])
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(committed: Session):
+    pending = committed.info.pop(_PENDING, None)
+    if pending:
+        change_bus().publish(_coalesce(pending))
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(rolled_back: Session):
+    rolled_back.info.pop(_PENDING, None)
+
+
+_change_bus = ChangeBus()
+
+
+def change_bus() -> ChangeBus:
+    """ Global change bus getter """
+    return _change_bus
@@ -17,6 +17,21 @@ SL_BT_CONFIG_MAX_CONNECTIONS = 32
 
 BOOT_TIMEOUT = int(os.getenv("BOOT_TIMEOUT", "5"))
 CONNECTION_TIMEOUT = int(os.getenv("CONNECTION_TIMEOUT", "5"))
+GROUP_MAX_CONCURRENCY = int(os.getenv("GROUP_MAX_CONCURRENCY", "8"))
+JOB_TABLE_SIZE = int(os.getenv("JOB_TABLE_SIZE", "1024"))
+JOB_TTL = int(os.getenv("JOB_TTL", "300"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "8"))
+JOB_MAX_WAIT = int(os.getenv("JOB_MAX_WAIT", "30"))
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", "256"))
+SSE_KEEPALIVE = int(os.getenv("SSE_KEEPALIVE", "15"))
+VALUE_CACHE_SIZE = int(os.getenv("VALUE_CACHE_SIZE", "4096"))
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "1000"))
+SCIM_STREAM_BATCH_SIZE = int(os.getenv("SCIM_STREAM_BATCH_SIZE", "500"))
+SCIM_STREAM_CHUNK_SIZE = int(os.getenv("SCIM_STREAM_CHUNK_SIZE", "65536"))
+SCIM_PAGE_SIZE = int(os.getenv("SCIM_PAGE_SIZE", "100"))
+PBKDF2_HASH = os.getenv("PBKDF2_HASH", "sha512")
+PBKDF2_ITERATIONS = int(os.getenv("PBKDF2_ITERATIONS", "100000"))
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", "2"))
 MQTT_HOST = os.getenv("MQTT_HOST", "localhost")
 MQTT_PORT = int(os.getenv("MQTT_PORT", "8883"))
 POSTGRES_USER = os.getenv("POSTGRES_USER", "root")
@@ -24,17 +39,62 @@ POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "password")
 POSTGRES_HOST = os.getenv("POSTGRES_HOST", "localhost")
 POSTGRES_PORT = os.getenv("POSTGRES_PORT", "5432")
 POSTGRES_DB = os.getenv("POSTGRES_DB", "tiedie")
+# Optional streaming replica for read-only endpoints and telemetry routing
+POSTGRES_REPLICA_HOST = os.getenv("POSTGRES_REPLICA_HOST", None)
+POSTGRES_REPLICA_PORT = os.getenv("POSTGRES_REPLICA_PORT", POSTGRES_PORT)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+# Milliseconds; 0 disables the timeout
+DB_STATEMENT_TIMEOUT = int(os.getenv("DB_STATEMENT_TIMEOUT", "0"))
+DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "500"))
+# Seconds between change bus listener reconnection attempts
+CHANGE_BUS_RECONNECT = float(os.getenv("CHANGE_BUS_RECONNECT", "5"))
+# Rows of one table per transaction above which a single table-wide
+# change is sent instead
+CHANGE_BUS_MAX_KEYS = int(os.getenv("CHANGE_BUS_MAX_KEYS", "100"))
+# Overrides the POSTGRES_* settings, e.g. sqlite:////var/lib/tiedie/tiedie.db
+DATABASE_URL = os.getenv("DATABASE_URL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+# Milliseconds a writer waits for the database lock
+SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))
+# Unix socket of the radio daemon, for HTTP workers started from wsgi.py
+RADIO_SOCKET = os.getenv("RADIO_SOCKET", "/tmp/tiedie-radio.sock")
+# Seconds; BLE connects with retries can take a while
+RADIO_RPC_TIMEOUT = float(os.getenv("RADIO_RPC_TIMEOUT", "60"))
+RADIO_RECONNECT = float(os.getenv("RADIO_RECONNECT", "1"))
+# Request header carrying the URL-encoded PEM client certificate, set by a
+# TLS-terminating proxy (e.g. X-SSL-Client-Cert for nginx
+# $ssl_client_escaped_cert). Only set it when the proxy strips the header
+# from client requests.
+PEER_CERT_HEADER = os.getenv("PEER_CERT_HEADER", None)
 EXTERNAL_HOST = os.getenv("EXTERNAL_HOST", "localhost")
 EXTERNAL_PORT = os.getenv("EXTERNAL_PORT", "8080")
 CDKM_ENDPOINT = os.getenv("CDKM_ENDPOINT", None )
 ISE_USERNAME = os.getenv('ISE_USERNAME',None)
 ISE_PASSWORD = os.getenv('ISE_PASSWORD',None)
 ISE_HOST = os.getenv('ISE_HOST', None)
+ISE_ERS_URL = os.getenv('ISE_ERS_URL', None)
+ISE_REQUEST_TIMEOUT = int(os.getenv('ISE_REQUEST_TIMEOUT', '30'))
+ISE_SYNC_BATCH_SIZE = int(os.getenv('ISE_SYNC_BATCH_SIZE', '500'))
+ISE_SYNC_DELAY = float(os.getenv('ISE_SYNC_DELAY', '0.5'))
+ISE_BULK_TIMEOUT = int(os.getenv('ISE_BULK_TIMEOUT', '120'))
+ISE_RECONCILE_INTERVAL = int(os.getenv('ISE_RECONCILE_INTERVAL', '900'))
 WANT_ETHER_MAB = os.getenv('WANT_ETHERNET_MAB', None)
 WANT_FDO = os.getenv('WANT_FDO',None)
 FDO_OWNER_URI = os.getenv('FDO_OWNER_URI',None)
 FDO_CLIENT_CERT = os.getenv('FDO_CLIENT_CERT',None)
 FDO_CA_CERT = os.getenv('FDO_SERVER_CERT',None)
+FDO_UPLOAD_TIMEOUT = int(os.getenv('FDO_UPLOAD_TIMEOUT', '5'))
+FDO_ASYNC_UPLOAD = os.getenv('FDO_ASYNC_UPLOAD', 'false').lower() in ('1', 'true', 'yes')
+FDO_ASYNC_STATUS = int(os.getenv('FDO_ASYNC_STATUS', '201'))
+FDO_UPLOAD_WORKERS = int(os.getenv('FDO_UPLOAD_WORKERS', '4'))
+FDO_UPLOAD_MAX_ATTEMPTS = int(os.getenv('FDO_UPLOAD_MAX_ATTEMPTS', '8'))
+FDO_RETRY_BASE = float(os.getenv('FDO_RETRY_BASE', '2'))
+FDO_RETRY_MAX = float(os.getenv('FDO_RETRY_MAX', '300'))
+FDO_POLL_INTERVAL = float(os.getenv('FDO_POLL_INTERVAL', '5'))
 FDO_SUPPORT = FDO_OWNER_URI is not None and FDO_CLIENT_CERT is not None
 
 ISE_SUPPORT = ISE_USERNAME is not None and ISE_PASSWORD is not None and \
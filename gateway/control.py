@@ -12,19 +12,28 @@ registrations with authentication.
 """
 
 import base64
+import json
 import logging
+import math
+import queue
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from http import HTTPStatus
 from functools import wraps
 from enum import Enum
+from typing import TYPE_CHECKING
 import uuid
-import werkzeug.serving
-import OpenSSL
-from flask import Blueprint, Response, jsonify, make_response, request
+from flask import (Blueprint, Response, g, jsonify, make_response, request,
+                   stream_with_context, url_for)
 from sqlalchemy import select
 from ap_factory import ble_ap
-from database import session
+from config import (GROUP_MAX_CONCURRENCY, JOB_MAX_WAIT, SL_BT_CONFIG_MAX_CONNECTIONS,
+                    SSE_KEEPALIVE)
+from database import read_only, session
+from etags import conditional_response, make_etag
+from event_stream import event_broker
 from access_point_responses import (
+    AccessPointError,
     BleConnectionError,
     BleDisconnectError,
     BleDiscoveryError,
@@ -32,9 +41,14 @@ from access_point_responses import (
     BleWriteError
 )
 from access_point import BleConnectOptions
+from jobs import Job, JobTableFull, job_manager
 from models import Device, EndpointApp
-from nipc_models import BleExtension, DataApp, SdfModel, Event
+from nipc_models import BleExtension, DataApp, DeviceGroup, SdfModel, Event
 from tiedie_exceptions import SchemaError
+from value_cache import value_cache
+
+if TYPE_CHECKING:
+    import OpenSSL
 
 # NIPC Problem Details Error Types Constants
 class NipcProblemTypes(str, Enum):
@@ -110,13 +124,26 @@ def create_nipc_problem_response(
     Returns:
         tuple of (response_dict, status_code)
     """
-    response = {
+    return _problem_response(nipc_problem_details(error_type, status, title, detail))
+
+
+def nipc_problem_details(
+    error_type: NipcProblemTypes,
+    status: HTTPStatus,
+    title: str,
+    detail: str
+) -> dict:
+    """Build a NIPC Problem Details body without requiring a request context."""
+    return {
         "type": error_type.value,
         "status": status.value,
         "title": title,
         "detail": detail
     }
-    problem_response = make_response(jsonify(response), status)
+
+
+def _problem_response(problem: dict) -> Response:
+    problem_response = make_response(jsonify(problem), problem["status"])
     problem_response.headers["Content-Type"] = "application/problem+json"
     return problem_response
 
@@ -174,27 +201,12 @@ def _build_connection_response(device_id: str, services) -> dict:
     }
 
 
-class PeerCertWSGIRequestHandler(werkzeug.serving.WSGIRequestHandler):
-    """Custom WSGI request handler to extract and provide peer certificates."""
-
-    def make_environ(self):
-        environ = super().make_environ()
-        x509_binary = self.connection.getpeercert(True)
-        if x509_binary is None:
-            environ['peercert'] = None
-            return environ
-        x509 = OpenSSL.crypto.load_certificate(  # type: ignore
-            OpenSSL.crypto.FILETYPE_ASN1, x509_binary)  # type: ignore
-        environ['peercert'] = x509
-        return environ
-
-
 def authenticate_user(func):
     """Verify x-api-key or client certificate."""
 
     @wraps(func)
     def check_apikey(*args, **kwargs):
-        client_cert: OpenSSL.crypto.X509 | None = request.environ.get(
+        client_cert: "OpenSSL.crypto.X509 | None" = request.environ.get(
             'peercert')
         if client_cert:
             endpoint_app = session.scalar(
@@ -202,6 +214,7 @@ def authenticate_user(func):
                 .filter_by(subjectName=client_cert.get_subject().CN)
             )
             if endpoint_app is not None:
+                g.endpoint_app = endpoint_app
                 return func(*args, **kwargs)
 
             return make_response(jsonify({"error": "Unauthorized"}), 403)
@@ -216,6 +229,7 @@ def authenticate_user(func):
         if endpoint_app is None:
             return make_response(jsonify({"error": "Unauthorized"}), 403)
 
+        g.endpoint_app = endpoint_app
         return func(*args, **kwargs)
     return check_apikey
 
@@ -223,7 +237,11 @@ def authenticate_user(func):
 @control_app.route('/devices/<device_id>/connections', methods=['POST'])
 @authenticate_user
 def connect(device_id: str):
-    """Connect to a device (NIPC Section 4.4.1)."""
+    """Connect to a device (NIPC Section 4.4.1).
+
+    Clients sending "Prefer: respond-async" (or ?async=true) get 202 with a
+    job resource under /nipc/jobs instead of waiting for the radio.
+    """
     device = session.get(BleExtension, device_id)
     if device is None:
         return create_nipc_problem_response(
@@ -235,37 +253,105 @@ def connect(device_id: str):
 
     request_json = request.get_json() if request.is_json else None
     retries, services, cached, cache_expiry_duration = _parse_connection_options(request_json)
+    connect_options = BleConnectOptions(services, cached, cache_expiry_duration)
+    address = device.device_mac_address
+
+    if _wants_async():
+        return _submit_job(
+            ("connect", device_id),
+            "connect",
+            device_id,
+            lambda job: _run_connect(device_id, address, connect_options, retries, job)
+        )
+
+    body, status = _run_connect(device_id, address, connect_options, retries)
+    if status != HTTPStatus.OK:
+        return _problem_response(body)
+    return jsonify(body), status
 
+
+def _run_connect(device_id: str,
+                 address: str,
+                 connect_options: BleConnectOptions,
+                 retries: int,
+                 job: Job | None = None) -> tuple[dict, HTTPStatus]:
+    """Connect to and discover a device, returning (body, status)."""
     try:
-        connect_options = BleConnectOptions(services, cached, cache_expiry_duration)
-        ble_ap().connect(
-            device.device_mac_address,
-            connect_options,
-            retries
-        )
+        if job:
+            job.set_progress("connecting")
+        ble_ap().connect(address, connect_options, retries)
 
-        discover_result = ble_ap().discover(
-            device.device_mac_address,
-            connect_options,
-            retries
-        )
+        if job:
+            job.set_progress("discovering")
+        discover_result = ble_ap().discover(address, connect_options, retries)
 
-        response_data = _build_connection_response(device_id, discover_result.services)
-        return jsonify(response_data), HTTPStatus.OK
+        return _build_connection_response(device_id, discover_result.services), HTTPStatus.OK
     except (BleConnectionError, BleDiscoveryError) as e:
-        return create_nipc_problem_response(
+        return nipc_problem_details(
             NipcProblemTypes.PROTOCOLMAP_BLE_NO_CONNECTION,
             HTTPStatus.BAD_REQUEST,
             "Connection Failed",
             str(e)
-        )
+        ), HTTPStatus.BAD_REQUEST
     except Exception as e: # pylint: disable=broad-except
-        return create_nipc_problem_response(
+        return nipc_problem_details(
             NipcProblemTypes.ABOUT_BLANK,
             HTTPStatus.INTERNAL_SERVER_ERROR,
             "Internal Server Error",
             f"Internal server error: {str(e)}"
+        ), HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+def _wants_async() -> bool:
+    """Check whether the client opted in to asynchronous processing (RFC 7240)."""
+    prefer = [token.strip().lower()
+              for token in request.headers.get("Prefer", "").split(",")]
+    return "respond-async" in prefer or \
+        request.args.get("async", "").lower() in ("1", "true")
+
+
+def _submit_job(key: tuple, operation: str, device_id: str, func) -> Response:
+    """Queue an asynchronous job and answer 202 with the job resource."""
+    try:
+        job = job_manager().submit(key, operation, device_id, func)
+    except JobTableFull as e:
+        problem_response = create_nipc_problem_response(
+            NipcProblemTypes.ABOUT_BLANK,
+            HTTPStatus.SERVICE_UNAVAILABLE,
+            "Service Unavailable",
+            str(e)
         )
+        problem_response.headers["Retry-After"] = "1"
+        return problem_response
+
+    response = make_response(jsonify(job.serialize()), HTTPStatus.ACCEPTED)
+    response.headers["Location"] = url_for("control.get_job", job_id=job.job_id,
+                                           _external=True)
+    response.headers["Preference-Applied"] = "respond-async"
+    return response
+
+
+@control_app.route('/jobs/<job_id>', methods=['GET'])
+@authenticate_user
+def get_job(job_id: str):
+    """Poll an asynchronous job. Use ?wait=<seconds> to long-poll until it finishes."""
+    job = job_manager().get(job_id)
+    if job is None:
+        return create_nipc_problem_response(
+            NipcProblemTypes.INVALID_ID,
+            HTTPStatus.NOT_FOUND,
+            "Not Found",
+            f"Job ID {job_id} does not exist or has expired"
+        )
+
+    try:
+        wait = min(max(float(request.args.get("wait", 0)), 0), JOB_MAX_WAIT)
+    except ValueError:
+        wait = 0
+    if wait and not job.finished:
+        job.done.wait(timeout=wait)
+
+    return jsonify(job.serialize()), HTTPStatus.OK
 
 
 @control_app.route('/devices/<device_id>/connections', methods=['PUT'])
@@ -335,6 +421,7 @@ def disconnect_from_device(device_id: str):
 
     try:
         ble_ap().disconnect(device.device_mac_address)
+        value_cache().invalidate(device.device_mac_address)
         return jsonify({"id": device_id}), HTTPStatus.OK
     except BleDisconnectError as e:
         return create_nipc_problem_response(
@@ -495,135 +582,160 @@ def extract_protocol_map(property_def: dict, protocol: str = 'ble') -> dict:
     return protocol_map[protocol]
 
 
-@control_app.route('/devices/<device_id>/properties', methods=['GET'])
-@authenticate_user
-def read_properties(device_id: str):
-    """Read property values from a device (NIPC Section 4.1.2)."""
-    try:
-        # Get property names from query parameter
-        property_names = request.args.getlist('propertyName')
-        if not property_names:
-            return create_nipc_problem_response(
-                NipcProblemTypes.INVALID_SDF_URL,
-                HTTPStatus.BAD_REQUEST,
-                "Missing Property Name",
-                "Query parameter 'propertyName' is required"
-            )
+def _resolve_read_properties(property_names: list[str]) -> tuple[list, list]:
+    """Resolve SDF property names to BLE (service, characteristic) pairs.
 
-        # Look up device
-        device = session.get(BleExtension, device_id)
-        if device is None:
-            return create_nipc_problem_response(
-                NipcProblemTypes.INVALID_ID,
-                HTTPStatus.NOT_FOUND,
-                "Device Not Found",
-                f"Device ID {device_id} does not exist or is not a device"
-            )
+    Returns:
+        tuple of (resolved services, problem details for invalid names)
+    """
+    services = []
+    errors = []
 
-        results = []
-        services = []
+    for property_name in property_names:
+        try:
+            # URL decode the property name
+            property_name = urllib.parse.unquote(property_name)
 
-        for property_name in property_names:
-            try:
-                # URL decode the property name
-                property_name = urllib.parse.unquote(property_name)
+            # Parse SDF reference
+            namespace, path_components = parse_sdf_reference(property_name)
 
-                # Parse SDF reference
-                namespace, path_components = parse_sdf_reference(property_name)
+            # Look up SDF model
+            model = lookup_sdf_model(namespace)
 
-                # Look up SDF model
-                model = lookup_sdf_model(namespace)
+            # Navigate to property
+            property_def = navigate_sdf_model(model, path_components)
 
-                # Navigate to property
-                property_def = navigate_sdf_model(model, path_components)
+            # Extract BLE protocol mapping
+            ble_mapping = extract_protocol_map(property_def, 'ble')
 
-                # Extract BLE protocol mapping
-                ble_mapping = extract_protocol_map(property_def, 'ble')
+            # Perform BLE read
+            service_id = ble_mapping['serviceID'].lower()
+            characteristic_id = ble_mapping['characteristicID'].lower()
 
-                # Perform BLE read
-                service_id = ble_mapping['serviceID'].lower()
-                characteristic_id = ble_mapping['characteristicID'].lower()
+            services.append((property_name, service_id, characteristic_id))
+        except Exception as e: # pylint: disable=broad-except
+            errors.append({
+                "type": NipcProblemTypes.INVALID_SDF_URL,
+                "status": HTTPStatus.BAD_REQUEST.value,
+                "title": "Invalid SDF Reference",
+                "detail": str(e)
+            })
 
-                services.append((property_name, service_id, characteristic_id))
-            except Exception as e: # pylint: disable=broad-except
-                results.append({
-                    "type": NipcProblemTypes.INVALID_SDF_URL,
-                    "status": HTTPStatus.BAD_REQUEST.value,
-                    "title": "Invalid SDF Reference",
-                    "detail": str(e)
-                })
+    return services, errors
+
+
+def _requested_max_age() -> float | None:
+    """Return how stale a cached value the client accepts, in seconds.
 
-        # if device is not connected, connect first
-        implicit_connect = False
-        if device.device_mac_address not in ble_ap().conn_reqs:
-            implicit_connect = True
-            ble_ap().connect(device.device_mac_address, BleConnectOptions())
-            ble_ap().discover(device.device_mac_address, BleConnectOptions(
-                services=[service_id for _, service_id, _ in services]
+    Taken from the 'maxAge' query parameter, falling back to the
+    Cache-Control max-age request directive. None means the device must
+    be read.
+
+    Raises:
+        ValueError: if maxAge is not a non-negative number
+    """
+    max_age = request.args.get('maxAge')
+    if max_age is None:
+        max_age = request.cache_control.max_age
+    if max_age is None:
+        return None
+
+    max_age = float(max_age)
+    if math.isnan(max_age) or max_age < 0:
+        raise ValueError(f"Invalid maxAge: {max_age}")
+    return max_age
+
+
+def _invalid_max_age(e: ValueError) -> Response:
+    return create_nipc_problem_response(
+        NipcProblemTypes.ABOUT_BLANK,
+        HTTPStatus.BAD_REQUEST,
+        "Bad Request",
+        f"maxAge must be a non-negative number of seconds: {str(e)}"
+    )
+
+
+def _read_from_device(address: str, services: list,
+                      max_age: float | None = None) -> list[dict]:
+    """Read resolved properties from a device, connecting implicitly if needed.
+
+    When max_age is set, values cached from earlier reads or notifications
+    that are at most max_age seconds old are returned without touching the
+    radio, and every result carries the age of its value in seconds.
+    """
+    results: list[dict | None] = [None] * len(services)
+    pending = []
+
+    for index, (property_name, service_id, characteristic_id) in enumerate(services):
+        cached = None
+        if max_age is not None:
+            cached = value_cache().get(address, service_id, characteristic_id, max_age)
+        if cached is None:
+            pending.append(index)
+            continue
+
+        value, age = cached
+        results[index] = {
+            "property": property_name,
+            "value": base64.b64encode(value).decode('utf-8'),
+            "age": round(age, 3)
+        }
+
+    if not pending:
+        return results
+
+    # if device is not connected, connect first
+    implicit_connect = False
+    if ble_ap().get_connection(address) is None:
+        implicit_connect = True
+        ble_ap().connect(address, BleConnectOptions())
+
+    try:
+        if implicit_connect:
+            ble_ap().discover(address, BleConnectOptions(
+                services=list({services[index][1] for index in pending})
             ))
 
-        for property_name, service_id, characteristic_id in services:
+        for index in pending:
+            property_name, service_id, characteristic_id = services[index]
             try:
-                resp = ble_ap().read(
-                    device.device_mac_address, service_id, characteristic_id)
+                resp = ble_ap().read(address, service_id, characteristic_id)
+                value_cache().put(address, service_id, characteristic_id, resp.value)
 
-                results.append({
+                results[index] = {
                     "property": property_name,
                     "value": base64.b64encode(resp.value).decode('utf-8')
-                })
+                }
+                if max_age is not None:
+                    results[index]["age"] = 0
             except BleReadError as e:
-                results.append({
+                results[index] = {
                     "type": NipcProblemTypes.PROPERTY_READ_FAILED,
                     "status": HTTPStatus.INTERNAL_SERVER_ERROR.value,
                     "title": "Property Read Error",
                     "detail": f"Failed to read property {property_name}: {str(e)}"
-                })
-
+                }
+    finally:
+        # Concurrent fan-outs size themselves from the free connection slots
         if implicit_connect:
-            ble_ap().disconnect(device.device_mac_address)
+            ble_ap().disconnect(address)
 
-        return jsonify(results), HTTPStatus.OK
-    except Exception as e: # pylint: disable=broad-except
-        return create_nipc_problem_response(
-            NipcProblemTypes.PROPERTY_READ_FAILED,
-            HTTPStatus.INTERNAL_SERVER_ERROR,
-            "Internal Server Error",
-            f"Unexpected error: {str(e)}"
-        )
+    return results
 
 
-@control_app.route('/devices/<device_id>/properties', methods=['PUT'])
+@control_app.route('/devices/<device_id>/properties', methods=['GET'])
 @authenticate_user
-def write_properties(device_id: str):
-    """Write property values to a device (NIPC Section 4.1.1)."""
+def read_properties(device_id: str):
+    """Read property values from a device (NIPC Section 4.1.2)."""
     try:
-        # Validate request body
-        try:
-            request_json = request.json
-        except Exception: # pylint: disable=broad-except
-            # Handle case where request.json raises an exception (e.g., no Content-Type)
-            return create_nipc_problem_response(
-                NipcProblemTypes.INVALID_SDF_URL,
-                HTTPStatus.BAD_REQUEST,
-                "Missing Request Body",
-                "Request body with property array is required"
-            )
-
-        if not request_json:
-            return create_nipc_problem_response(
-                NipcProblemTypes.INVALID_SDF_URL,
-                HTTPStatus.BAD_REQUEST,
-                "Missing Request Body",
-                "Request body with property array is required"
-            )
-
-        properties_to_write = request_json
-        if not isinstance(properties_to_write, list):
+        # Get property names from query parameter
+        property_names = request.args.getlist('propertyName')
+        if not property_names:
             return create_nipc_problem_response(
                 NipcProblemTypes.INVALID_SDF_URL,
                 HTTPStatus.BAD_REQUEST,
-                "Invalid Request Format",
-                "Request body must be an array of property objects"
+                "Missing Property Name",
+                "Query parameter 'propertyName' is required"
             )
 
         # Look up device
@@ -636,61 +748,108 @@ def write_properties(device_id: str):
                 f"Device ID {device_id} does not exist or is not a device"
             )
 
-        results = []
-        services = []
+        try:
+            max_age = _requested_max_age()
+        except ValueError as e:
+            return _invalid_max_age(e)
 
-        for prop_obj in properties_to_write:
-            try:
-                property_name = prop_obj['property']
-                value = prop_obj['value']
+        services, results = _resolve_read_properties(property_names)
+        results.extend(_read_from_device(device.device_mac_address, services, max_age))
 
-                # Parse SDF reference
-                namespace, path_components = parse_sdf_reference(property_name)
+        return jsonify(results), HTTPStatus.OK
+    except Exception as e: # pylint: disable=broad-except
+        return create_nipc_problem_response(
+            NipcProblemTypes.PROPERTY_READ_FAILED,
+            HTTPStatus.INTERNAL_SERVER_ERROR,
+            "Internal Server Error",
+            f"Unexpected error: {str(e)}"
+        )
 
-                # Look up SDF model
-                model = lookup_sdf_model(namespace)
 
-                # Navigate to property
-                property_def = navigate_sdf_model(model, path_components)
+def _validate_write_request(request_json) -> Response | None:
+    """Check that a property write body is a non-empty array."""
+    if not request_json:
+        return create_nipc_problem_response(
+            NipcProblemTypes.INVALID_SDF_URL,
+            HTTPStatus.BAD_REQUEST,
+            "Missing Request Body",
+            "Request body with property array is required"
+        )
 
-                # Extract BLE protocol mapping
-                ble_mapping = extract_protocol_map(property_def, 'ble')
+    if not isinstance(request_json, list):
+        return create_nipc_problem_response(
+            NipcProblemTypes.INVALID_SDF_URL,
+            HTTPStatus.BAD_REQUEST,
+            "Invalid Request Format",
+            "Request body must be an array of property objects"
+        )
 
-                # Add service to list
-                services.append((property_name,
-                                ble_mapping['serviceID'].lower(),
-                                ble_mapping['characteristicID'].lower(),
-                                value))
-            except Exception as e: # pylint: disable=broad-except
-                results.append({
-                    "type": NipcProblemTypes.INVALID_SDF_URL,
-                    "status": HTTPStatus.BAD_REQUEST.value,
-                    "title": "Invalid SDF Reference",
-                    "detail": str(e)
-                })
+    return None
 
-        # if device is not connected, connect first
-        implicit_connect = False
-        if device.device_mac_address not in ble_ap().conn_reqs:
-            implicit_connect = True
-            ble_ap().connect(device.device_mac_address, BleConnectOptions())
-            ble_ap().discover(device.device_mac_address, BleConnectOptions(
-                services=[service_id for _, service_id, _, _ in services]
-            ))
 
-        for property_name, service_id, characteristic_id, value in services:
-            try:
-                # Parse SDF reference
-                namespace, path_components = parse_sdf_reference(property_name)
+def _resolve_write_properties(properties_to_write: list) -> tuple[list, list]:
+    """Resolve SDF property writes to BLE (service, characteristic) pairs.
 
-                # Look up SDF model
-                model = lookup_sdf_model(namespace)
+    Returns:
+        tuple of (resolved writes, problem details for invalid entries)
+    """
+    services = []
+    errors = []
 
-                # Navigate to property
-                property_def = navigate_sdf_model(model, path_components)
+    for prop_obj in properties_to_write:
+        try:
+            property_name = prop_obj['property']
+            value = prop_obj['value']
 
+            # Parse SDF reference
+            namespace, path_components = parse_sdf_reference(property_name)
+
+            # Look up SDF model
+            model = lookup_sdf_model(namespace)
+
+            # Navigate to property
+            property_def = navigate_sdf_model(model, path_components)
+
+            # Extract BLE protocol mapping
+            ble_mapping = extract_protocol_map(property_def, 'ble')
+
+            # Add service to list
+            services.append((property_name,
+                            ble_mapping['serviceID'].lower(),
+                            ble_mapping['characteristicID'].lower(),
+                            value,
+                            property_def.get('writable', True) is not False))
+        except Exception as e: # pylint: disable=broad-except
+            errors.append({
+                "type": NipcProblemTypes.INVALID_SDF_URL,
+                "status": HTTPStatus.BAD_REQUEST.value,
+                "title": "Invalid SDF Reference",
+                "detail": str(e)
+            })
+
+    return services, errors
+
+
+def _write_to_device(address: str, services: list) -> list[dict]:
+    """Write resolved properties to a device, connecting implicitly if needed."""
+    results = []
+
+    # if device is not connected, connect first
+    implicit_connect = False
+    if ble_ap().get_connection(address) is None:
+        implicit_connect = True
+        ble_ap().connect(address, BleConnectOptions())
+
+    try:
+        if implicit_connect:
+            ble_ap().discover(address, BleConnectOptions(
+                services=[service_id for _, service_id, _, _, _ in services]
+            ))
+
+        for property_name, service_id, characteristic_id, value, writable in services:
+            try:
                 # Check if property is writable
-                if property_def.get('writable', True) is False:
+                if not writable:
                     results.append({
                         "type": NipcProblemTypes.PROPERTY_NOT_WRITABLE,
                         "status": HTTPStatus.BAD_REQUEST.value,
@@ -699,18 +858,12 @@ def write_properties(device_id: str):
                     })
                     continue
 
-                # Extract BLE protocol mapping
-                ble_mapping = extract_protocol_map(property_def, 'ble')
-
                 # Assume it's base64 encoded
                 binary_data = base64.b64decode(value)
 
                 # Perform BLE write
-                service_id = ble_mapping['serviceID'].lower()
-                characteristic_id = ble_mapping['characteristicID'].lower()
-
-                ble_ap().write(
-                    device.device_mac_address, service_id, characteristic_id, binary_data)
+                ble_ap().write(address, service_id, characteristic_id, binary_data)
+                value_cache().put(address, service_id, characteristic_id, binary_data)
 
                 results.append({
                     "status": HTTPStatus.OK.value
@@ -722,9 +875,41 @@ def write_properties(device_id: str):
                     "title": "Property Write Error",
                     "detail": f"Failed to write property {property_name}: {str(e)}"
                 })
-
+    finally:
         if implicit_connect:
-            ble_ap().disconnect(device.device_mac_address)
+            ble_ap().disconnect(address)
+
+    return results
+
+
+@control_app.route('/devices/<device_id>/properties', methods=['PUT'])
+@authenticate_user
+def write_properties(device_id: str):
+    """Write property values to a device (NIPC Section 4.1.1)."""
+    try:
+        # Validate request body
+        try:
+            request_json = request.json
+        except Exception: # pylint: disable=broad-except
+            # Handle case where request.json raises an exception (e.g., no Content-Type)
+            request_json = None
+
+        error_response = _validate_write_request(request_json)
+        if error_response is not None:
+            return error_response
+
+        # Look up device
+        device = session.get(BleExtension, device_id)
+        if device is None:
+            return create_nipc_problem_response(
+                NipcProblemTypes.INVALID_ID,
+                HTTPStatus.NOT_FOUND,
+                "Device Not Found",
+                f"Device ID {device_id} does not exist or is not a device"
+            )
+
+        services, results = _resolve_write_properties(request_json)
+        results.extend(_write_to_device(device.device_mac_address, services))
 
         return jsonify(results), HTTPStatus.OK
     except Exception as e: # pylint: disable=broad-except
@@ -735,6 +920,248 @@ def write_properties(device_id: str):
             f"Unexpected error: {str(e)}"
         )
 
+def _parse_uuid(value) -> uuid.UUID | None:
+    """Parse an ID as a UUID, returning None if it is malformed."""
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _get_group(group_id: str) -> DeviceGroup | None:
+    """Look up a device group, treating malformed IDs as unknown."""
+    parsed_id = _parse_uuid(group_id)
+    if parsed_id is None:
+        return None
+    return session.get(DeviceGroup, parsed_id)
+
+
+def _group_not_found(group_id: str) -> Response:
+    return create_nipc_problem_response(
+        NipcProblemTypes.INVALID_ID,
+        HTTPStatus.NOT_FOUND,
+        "Not Found",
+        f"Group ID {group_id} does not exist"
+    )
+
+
+def _group_concurrency(count: int) -> int:
+    """Bound fan-out parallelism by configuration and free connection slots."""
+    free_slots = SL_BT_CONFIG_MAX_CONNECTIONS - ble_ap().connection_count()
+    return max(1, min(GROUP_MAX_CONCURRENCY, free_slots, count))
+
+
+def _lookup_group_targets(device_ids: list) -> list[tuple[str, str | None]]:
+    """Map device IDs to BLE addresses with one query; unknown devices map to None."""
+    parsed_ids = [_parse_uuid(device_id) for device_id in device_ids]
+    addresses = {
+        str(row.device_id): row.device_mac_address
+        for row in session.execute(
+            select(BleExtension.device_id, BleExtension.device_mac_address)
+            .filter(BleExtension.device_id.in_(
+                [parsed_id for parsed_id in parsed_ids if parsed_id is not None]))
+        )
+    }
+    # Targets are keyed and reported by canonical ID; malformed IDs as given
+    target_ids = [str(parsed_id if parsed_id is not None else device_id)
+                  for device_id, parsed_id in zip(device_ids, parsed_ids)]
+    return [(target_id, addresses.get(target_id)) for target_id in target_ids]
+
+
+def _stream_group_operation(targets: list[tuple[str, str | None]], operation) -> Response:
+    """Fan an operation out across devices and stream NDJSON results as they finish.
+
+    Each line is either {"id": ..., "properties": [...]} or a Problem Details
+    object carrying the device "id" when the whole device operation failed.
+    """
+    def line(obj: dict) -> str:
+        return json.dumps(obj) + "\n"
+
+    def problem(device_id, error_type, status, title, detail) -> str:
+        return line({"id": device_id, "type": error_type.value, "status": status.value,
+                     "title": title, "detail": detail})
+
+    def generate():
+        pending = []
+        for device_id, address in targets:
+            if address is None:
+                yield problem(device_id, NipcProblemTypes.INVALID_ID, HTTPStatus.NOT_FOUND,
+                              "Device Not Found",
+                              f"Device ID {device_id} does not exist or is not a device")
+            else:
+                pending.append((device_id, address))
+
+        if not pending:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=_group_concurrency(len(pending)))
+        try:
+            futures = {executor.submit(operation, address): device_id
+                       for device_id, address in pending}
+            for future in as_completed(futures):
+                device_id = futures[future]
+                try:
+                    yield line({"id": device_id, "properties": future.result()})
+                except AccessPointError as e:
+                    yield problem(device_id, NipcProblemTypes.PROTOCOLMAP_BLE_CONNECTION_FAILED,
+                                  HTTPStatus.BAD_REQUEST, "Connection Failed", str(e))
+                except Exception as e: # pylint: disable=broad-except
+                    yield problem(device_id, NipcProblemTypes.ABOUT_BLANK,
+                                  HTTPStatus.INTERNAL_SERVER_ERROR, "Internal Server Error",
+                                  f"Internal server error: {str(e)}")
+        finally:
+            # Stop queued work if the client goes away mid-stream
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    return Response(stream_with_context(generate()), HTTPStatus.OK,
+                    mimetype="application/x-ndjson")
+
+
+def _fan_out_read(device_ids: list) -> Response:
+    """Read the requested properties from every device in device_ids."""
+    property_names = request.args.getlist('propertyName')
+    if not property_names:
+        return create_nipc_problem_response(
+            NipcProblemTypes.INVALID_SDF_URL,
+            HTTPStatus.BAD_REQUEST,
+            "Missing Property Name",
+            "Query parameter 'propertyName' is required"
+        )
+
+    try:
+        max_age = _requested_max_age()
+    except ValueError as e:
+        return _invalid_max_age(e)
+
+    services, errors = _resolve_read_properties(property_names)
+    return _stream_group_operation(
+        _lookup_group_targets(device_ids),
+        lambda address: errors + _read_from_device(address, services, max_age)
+    )
+
+
+def _fan_out_write(device_ids: list) -> Response:
+    """Write the requested properties to every device in device_ids."""
+    request_json = request.get_json(silent=True)
+    error_response = _validate_write_request(request_json)
+    if error_response is not None:
+        return error_response
+
+    services, errors = _resolve_write_properties(request_json)
+    return _stream_group_operation(
+        _lookup_group_targets(device_ids),
+        lambda address: errors + _write_to_device(address, services)
+    )
+
+
+def _device_ids_from_args() -> list | Response:
+    device_ids = request.args.getlist('deviceId')
+    if not device_ids:
+        return create_nipc_problem_response(
+            NipcProblemTypes.INVALID_ID,
+            HTTPStatus.BAD_REQUEST,
+            "Bad Request",
+            "Query parameter 'deviceId' is required"
+        )
+    return device_ids
+
+
+@control_app.route('/groups', methods=['POST'])
+@authenticate_user
+def create_group():
+    """Save a group of devices for fan-out operations."""
+    request_json = request.get_json(silent=True)
+    device_ids = request_json.get("devices") if isinstance(request_json, dict) else None
+    if not isinstance(device_ids, list) or not device_ids:
+        return create_nipc_problem_response(
+            NipcProblemTypes.INVALID_ID,
+            HTTPStatus.BAD_REQUEST,
+            "Bad Request",
+            "Request body must contain a list of devices"
+        )
+
+    parsed_ids = [_parse_uuid(device_id) for device_id in device_ids]
+    devices = session.scalars(
+        select(Device).filter(Device.device_id.in_(
+            [parsed_id for parsed_id in parsed_ids if parsed_id is not None]))
+    ).all()
+    if None in parsed_ids or len(devices) != len(set(parsed_ids)):
+        return create_nipc_problem_response(
+            NipcProblemTypes.INVALID_ID,
+            HTTPStatus.NOT_FOUND,
+            "Not Found",
+            "One or more device IDs do not exist"
+        )
+
+    group = DeviceGroup(list(devices))
+    session.add(group)
+    session.commit()
+    return jsonify(group.serialize()), HTTPStatus.CREATED, \
+        {"Location": f"{request.base_url}/{group.group_id}"}
+
+
+@control_app.route('/groups/<group_id>', methods=['GET'])
+@read_only
+@authenticate_user
+def get_group(group_id: str):
+    """Get a saved device group."""
+    group = _get_group(group_id)
+    if group is None:
+        return _group_not_found(group_id)
+    return jsonify(group.serialize()), HTTPStatus.OK
+
+
+@control_app.route('/groups/<group_id>', methods=['DELETE'])
+@authenticate_user
+def delete_group(group_id: str):
+    """Delete a saved device group. Member devices are not affected."""
+    group = _get_group(group_id)
+    if group is None:
+        return _group_not_found(group_id)
+    session.delete(group)
+    session.commit()
+    return jsonify({"id": group_id}), HTTPStatus.OK
+
+
+@control_app.route('/groups/<group_id>/properties', methods=['GET'])
+@authenticate_user
+def read_group_properties(group_id: str):
+    """Read property values from every device in a saved group."""
+    group = _get_group(group_id)
+    if group is None:
+        return _group_not_found(group_id)
+    return _fan_out_read([device.device_id for device in group.devices])
+
+
+@control_app.route('/groups/<group_id>/properties', methods=['PUT'])
+@authenticate_user
+def write_group_properties(group_id: str):
+    """Write property values to every device in a saved group."""
+    group = _get_group(group_id)
+    if group is None:
+        return _group_not_found(group_id)
+    return _fan_out_write([device.device_id for device in group.devices])
+
+
+@control_app.route('/devices/properties', methods=['GET'])
+@authenticate_user
+def read_devices_properties():
+    """Read property values from the devices listed in deviceId query parameters."""
+    device_ids = _device_ids_from_args()
+    if isinstance(device_ids, Response):
+        return device_ids
+    return _fan_out_read(device_ids)
+
+
+@control_app.route('/devices/properties', methods=['PUT'])
+@authenticate_user
+def write_devices_properties():
+    """Write property values to the devices listed in deviceId query parameters."""
+    device_ids = _device_ids_from_args()
+    if isinstance(device_ids, Response):
+        return device_ids
+    return _fan_out_write(device_ids)
+
 @control_app.route('/registrations/models', methods=['POST'])
 @authenticate_user
 def register_sdf_model():
@@ -792,6 +1219,7 @@ def register_sdf_model():
 
 
 @control_app.route('/registrations/models', methods=['GET'])
+@read_only
 @authenticate_user
 def get_sdf_model():
     """Fetch a registered SDF model by sdfName (query parameter) or list all models."""
@@ -799,19 +1227,26 @@ def get_sdf_model():
     if sdf_name:
         # Get specific model
         sdf_name = urllib.parse.unquote(sdf_name)
-        model = session.scalar(select(SdfModel).filter_by(sdf_name=sdf_name))
-        if not model:
+        version = session.execute(
+            select(SdfModel.id, SdfModel.version).filter_by(sdf_name=sdf_name)).first()
+        if not version:
             return create_nipc_problem_response(
                 NipcProblemTypes.INVALID_SDF_URL,
                 HTTPStatus.NOT_FOUND,
                 "Not Found",
                 "SDF model not found"
             )
-        return jsonify(model.model), HTTPStatus.OK
+        return conditional_response(
+            make_etag("SdfModel", *version),
+            lambda: (jsonify(session.scalar(
+                select(SdfModel.model).filter_by(id=version.id))), HTTPStatus.OK))
 
-    # List all models
-    models = session.execute(select(SdfModel)).scalars().all()
-    return jsonify([m.serialize() for m in models]), HTTPStatus.OK
+    # List all models; only names and versions are needed for the ETag
+    models = session.execute(
+        select(SdfModel.id, SdfModel.version, SdfModel.sdf_name).order_by(SdfModel.id)).all()
+    return conditional_response(
+        make_etag("SdfModels", [(model.id, model.version) for model in models]),
+        lambda: (jsonify([{"sdfName": model.sdf_name} for model in models]), HTTPStatus.OK))
 
 
 @control_app.route('/registrations/models', methods=['PUT'])
@@ -961,6 +1396,7 @@ def register_data_app():
 
 
 @control_app.route('/registrations/data-apps', methods=['GET'])
+@read_only
 @authenticate_user
 def get_data_app():
     """Get a data application (NIPC) by ID."""
@@ -983,11 +1419,12 @@ def get_data_app():
                 f"Data app with ID {data_app_id} not found"
             )
 
-        response_body = {
-            "events": [{"event": event} for event in data_app.events],
-            "mqttClient": True
-        }
-        return jsonify(response_body), HTTPStatus.OK
+        return conditional_response(
+            make_etag("DataApp", data_app.data_app_id, data_app.version),
+            lambda: (jsonify({
+                "events": [{"event": event} for event in data_app.events],
+                "mqttClient": True
+            }), HTTPStatus.OK))
     except Exception as e: # pylint: disable=broad-except
         logging.exception("Unexpected error during data app retrieval %s", e)
         return create_nipc_problem_response(
@@ -1109,6 +1546,70 @@ def delete_data_app():
             "Internal server error"
         )
 
+@control_app.route('/events/stream', methods=['GET'])
+@authenticate_user
+def stream_events():
+    """Stream a data app's enabled events as Server-Sent Events.
+
+    Each event carries the event name and the base64 encoded CBOR payload
+    that is published to MQTT. A "dropped" event reports how many events
+    were discarded because the client fell behind.
+    """
+    data_app_id = request.args.get('dataAppId')
+    if not data_app_id:
+        return create_nipc_problem_response(
+            NipcProblemTypes.INVALID_SDF_URL,
+            HTTPStatus.BAD_REQUEST,
+            "Bad Request",
+            "Missing dataAppId query parameter"
+        )
+
+    # Events are published under the canonical form of the ID
+    parsed_id = _parse_uuid(data_app_id)
+    if parsed_id is None:
+        return create_nipc_problem_response(
+            NipcProblemTypes.ABOUT_BLANK,
+            HTTPStatus.BAD_REQUEST,
+            "Bad Request",
+            f"dataAppId must be a UUID: {data_app_id}"
+        )
+
+    if g.endpoint_app.id != parsed_id and not g.endpoint_app.is_admin:
+        return make_response(jsonify({"error": "Unauthorized"}), 403)
+
+    if session.get(DataApp, parsed_id) is None:
+        return create_nipc_problem_response(
+            NipcProblemTypes.ABOUT_BLANK,
+            HTTPStatus.NOT_FOUND,
+            "Not Found",
+            f"Data app with ID {data_app_id} not found"
+        )
+
+    broker = event_broker()
+    subscriber = broker.subscribe(str(parsed_id))
+
+    def generate():
+        yield f"retry: {SSE_KEEPALIVE * 1000}\n\n"
+        while True:
+            try:
+                event = subscriber.events.get(timeout=SSE_KEEPALIVE)
+            except queue.Empty:
+                yield ": keepalive\n\n"
+                continue
+
+            dropped = subscriber.take_dropped()
+            if dropped:
+                yield f"event: dropped\ndata: {json.dumps({'dropped': dropped})}\n\n"
+
+            payload = base64.b64encode(event.payload).decode("ascii")
+            yield f"id: {event.event_id}\nevent: {event.event_name}\ndata: {payload}\n\n"
+
+    response = Response(generate(), HTTPStatus.OK, mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    response.call_on_close(lambda: broker.unsubscribe(subscriber))
+    return response
+
 @control_app.route('/devices/<device_id>/events', methods=["POST"])
 @authenticate_user
 def enable_event(device_id: str):
@@ -1228,33 +1729,38 @@ def disable_event(device_id: str):
         )
 
 @control_app.route('/devices/<device_id>/events', methods=["GET"])
+@read_only
 @authenticate_user
 def get_events(device_id: str):
     """Get events for a device."""
     try:
         instance_ids = request.args.getlist('instanceId')
-        if not instance_ids:
-            # return all events for the device
-            events = session.query(Event).filter_by(device_id=device_id).all()
-            return jsonify([
-                {"event": event.event_name, "instanceId": event.instance_id}
-                for event in events
-            ]), HTTPStatus.OK
-        events = []
-        for instance_id in instance_ids:
-            event = session.query(Event).filter_by(
-                device_id=device_id,
-                instance_id=instance_id
-            ).first()
-            if not event:
+        query = select(Event.instance_id, Event.event_name, Event.version) \
+            .filter_by(device_id=device_id)
+        if instance_ids:
+            query = query.filter(Event.instance_id.in_(instance_ids))
+        events = {event.instance_id: event for event in session.execute(query).all()}
+
+        if instance_ids:
+            requested = [uuid.UUID(instance_id) for instance_id in instance_ids]
+            if any(instance_id not in events for instance_id in requested):
                 return create_nipc_problem_response(
                     NipcProblemTypes.INVALID_ID,
                     HTTPStatus.BAD_REQUEST,
                     "Bad Request",
                     f"Event for device ID {device_id} not found"
                 )
-            events.append({"event": event.event_name, "instanceId": event.instance_id})
-        return jsonify(events), HTTPStatus.OK
+        else:
+            # return all events for the device
+            requested = sorted(events)
+
+        return conditional_response(
+            make_etag("Events", device_id,
+                      [(instance_id, events[instance_id].version) for instance_id in requested]),
+            lambda: (jsonify([
+                {"event": events[instance_id].event_name, "instanceId": instance_id}
+                for instance_id in requested
+            ]), HTTPStatus.OK))
     except Exception as e: # pylint: disable=broad-except
         logging.exception("Unexpected error during event lookup %s", e)
         return create_nipc_problem_response(
@@ -16,8 +16,10 @@ import cbor2
 from flask import Flask
 import paho.mqtt.client as mqtt
 from sqlalchemy import func, select
-from database import session
-from nipc_models import BleExtension, DataApp, Event
+from database import session, use_replica
+from event_stream import event_broker
+from nipc_models import BleExtension, DataAppEvent, Event
+from value_cache import value_cache
 
 def create_topic_from_event(data_app_id: str, event_name: str) -> str:
     """
@@ -33,6 +35,19 @@ def create_topic_from_event(data_app_id: str, event_name: str) -> str:
     namespace, json_pointer = event_name.split('#', 1)
     return f"data-app/{data_app_id}/{namespace}/{json_pointer}"
 
+
+def subscribed_events(**event_filter) -> list[tuple[Any, str]]:
+    """
+    Find the (data app ID, event name) pairs subscribed to the events
+    that match a filter on Event columns, in one indexed join.
+    """
+    return list(session.execute(
+        select(DataAppEvent.data_app_id, Event.event_name)
+        .select_from(Event)
+        .filter_by(**event_filter)
+        .join(DataAppEvent, DataAppEvent.event_name == Event.event_name)
+    ).all())
+
 class DataProducer:
     """
     Handles data production and publishing over MQTT.
@@ -51,21 +66,23 @@ class DataProducer:
                              char_uuid: str,
                              value: bytes):
         """ Publish GATT notifications/indications to registered MQTT topics """
-        with self.app.app_context():
+        value_cache().put(mac_address, service_uuid, char_uuid, value)
+
+        with self.app.app_context(), use_replica():
             device = session.scalar(select(BleExtension).filter(
                 func.lower(BleExtension.device_mac_address) == func.lower(mac_address)))
 
             if device is None:
                 return
 
-            gatt_events = list(session.scalars(
-                select(Event).filter_by(
-                    device_id=device.device_id,
-                    event_type="gatt",
-                    gatt_service_id=service_uuid,
-                    gatt_characteristic_id=char_uuid
-                )
-            ).all())
+            subscriptions = subscribed_events(
+                device_id=device.device_id,
+                event_type="gatt",
+                gatt_service_id=service_uuid,
+                gatt_characteristic_id=char_uuid
+            )
+            if not subscriptions:
+                return
 
             ble_sub: dict[str, Any] = {
                 "data": value,
@@ -77,30 +94,25 @@ class DataProducer:
                 }
             }
 
-            for event in gatt_events:
-                data_apps = session.scalars(
-                    select(DataApp).filter_by(DataApp.events.contains(event.event_name))
-                ).all()
-                for data_app in data_apps:
-                    topic = create_topic_from_event(data_app.data_app_id, event.event_name)
+            data = cbor2.dumps(obj=ble_sub)
 
-                    data = cbor2.dumps(obj=ble_sub)
-
-                    self.mqtt_client.publish(topic, data)
+            for data_app_id, event_name in subscriptions:
+                topic = create_topic_from_event(data_app_id, event_name)
+                self.mqtt_client.publish(topic, data)
+                event_broker().publish(str(data_app_id), event_name, data)
 
     def publish_advertisement(self, evt):
         """ Publishes filtered BLE advertisements to MQTT topics based on conditions. """
-        with self.app.app_context():
+        with self.app.app_context(), use_replica():
             device = session.scalar(select(BleExtension).filter(
                 func.lower(BleExtension.device_mac_address) == func.lower(evt.address)))
 
             if device is None:
                 return
 
-            adv_events = list(session.scalars(
-                select(Event).filter_by(
-                    device_id=device.device_id,
-                    event_type="advertisements")).all())
+            subscriptions = subscribed_events(
+                device_id=device.device_id,
+                event_type="advertisements")
 
             ble_adv = {
                 "data": evt.data,
@@ -114,17 +126,14 @@ class DataProducer:
 
             data = cbor2.dumps(obj=ble_adv)
 
-            for event in adv_events:
-                data_apps = session.scalars(
-                    select(DataApp).filter_by(DataApp.events.contains(event.event_name))
-                ).all()
-                for data_app in data_apps:
-                    topic = create_topic_from_event(data_app.data_app_id, event.event_name)
-                    self.mqtt_client.publish(topic, data)
+            for data_app_id, event_name in subscriptions:
+                topic = create_topic_from_event(data_app_id, event_name)
+                self.mqtt_client.publish(topic, data)
+                event_broker().publish(str(data_app_id), event_name, data)
 
     def publish_connection_status(self, evt, address, connected: bool):
         """ Publishes BLE connection status updates to MQTT topics based on conditions. """
-        with self.app.app_context():
+        with self.app.app_context(), use_replica():
             device = session.scalar(select(BleExtension).filter(
                 func.lower(BleExtension.device_mac_address) == func.lower(address)))
 
@@ -143,17 +152,12 @@ class DataProducer:
 
             data = cbor2.dumps(obj=ble_connection)
 
-            connection_events = list(session.scalars(
-                select(Event).filter_by(
-                    device_id=device.device_id,
-                    event_type="connection_events"
-                )
-            ).all())
-
-            for event in connection_events:
-                data_apps = session.scalars(
-                    select(DataApp).filter_by(DataApp.events.contains(event.event_name))
-                ).all()
-                for data_app in data_apps:
-                    topic = create_topic_from_event(data_app.data_app_id, event.event_name)
-                    self.mqtt_client.publish(topic, data)
+            subscriptions = subscribed_events(
+                device_id=device.device_id,
+                event_type="connection_events"
+            )
+
+            for data_app_id, event_name in subscriptions:
+                topic = create_topic_from_event(data_app_id, event_name)
+                self.mqtt_client.publish(topic, data)
+                event_broker().publish(str(data_app_id), event_name, data)
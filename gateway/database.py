@@ -8,10 +8,152 @@
 Configures Flask with SQLAlchemy for database
 operations and initializes a session.
 
+Reads can be routed to an optional read replica, configured as the
+"replica" bind. Views decorated with read_only, and code running inside
+use_replica(), send their plain SELECTs there; everything else uses the
+primary.
+
+PostgreSQL and SQLite are supported; the backend is picked by the
+database URL. SQLite databases run in WAL mode, so that readers are not
+blocked by the (single) writer.
+
 """
 
+import sqlite3
+from contextlib import contextmanager
+from functools import wraps
+
+import flask_migrate
+from flask import has_request_context, request
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import Engine, Select, event, make_url
 from sqlalchemy.orm import Session
 
-db = SQLAlchemy()
+from config import (DB_MAX_OVERFLOW, DB_POOL_PRE_PING, DB_POOL_RECYCLE, DB_POOL_SIZE,
+                    DB_POOL_TIMEOUT, DB_QUERY_CACHE_SIZE, DB_STATEMENT_TIMEOUT,
+                    SQLITE_BUSY_TIMEOUT, SQLITE_SYNCHRONOUS)
+
+REPLICA_BIND = "replica"
+
+_READ_ONLY = "tiedie.read_only"
+_FLUSHED = "tiedie.flushed"
+
+
+class RoutingSession(FlaskSession):
+    """
+    Session that sends reads to the replica bind while they are routed
+    there. Writes, flushes and SELECT ... FOR UPDATE always use the
+    primary, and so does every read once the current transaction has
+    flushed, so that a session reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._read_from_replica(clause):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _read_from_replica(self, clause) -> bool:
+        if not isinstance(clause, Select) or self._flushing or self.info.get(_FLUSHED):
+            return False
+        # pylint: disable-next=protected-access
+        if clause._for_update_arg is not None:
+            return False
+        return bool(self.info.get(_READ_ONLY) or
+                    (has_request_context() and request.environ.get(_READ_ONLY)))
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _pin_to_primary(db_session, _flush_context):
+    db_session.info[_FLUSHED] = True
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _unpin(db_session, transaction):
+    if transaction.parent is None:
+        db_session.info.pop(_FLUSHED, None)
+
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 session: Session = db.session
+
+
+@event.listens_for(Engine, "connect")
+def _configure_sqlite(dbapi_connection, _connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def engine_options(url: str, replica: bool = False) -> dict:
+    """ Pool and connection settings for an engine on url """
+    if make_url(url).get_backend_name() == "sqlite":
+        # The default pool suits SQLite: connections are cheap and
+        # writes are serialized by the database anyway
+        return {
+            "pool_pre_ping": DB_POOL_PRE_PING,
+            "query_cache_size": DB_QUERY_CACHE_SIZE,
+        }
+
+    server_options = []
+    if DB_STATEMENT_TIMEOUT > 0:
+        server_options.append(f"-c statement_timeout={DB_STATEMENT_TIMEOUT}")
+    if replica:
+        # A write that reaches the replica fails at once, even if the
+        # replica bind points at a writable server
+        server_options.append("-c default_transaction_read_only=on")
+
+    options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "query_cache_size": DB_QUERY_CACHE_SIZE,
+    }
+    if server_options:
+        options["connect_args"] = {"options": " ".join(server_options)}
+    return options
+
+
+def read_only(view):
+    """
+    Route the reads of a view to the read replica, if one is configured.
+    Apply it outside the authentication decorator so that credential
+    lookups are routed too.
+    """
+
+    @wraps(view)
+    def route_to_replica(*args, **kwargs):
+        request.environ[_READ_ONLY] = True
+        return view(*args, **kwargs)
+
+    return route_to_replica
+
+
+@contextmanager
+def use_replica():
+    """ Route the reads of the current session to the read replica """
+    previous = session.info.get(_READ_ONLY, False)
+    session.info[_READ_ONLY] = True
+    try:
+        yield
+    finally:
+        session.info[_READ_ONLY] = previous
+
+
+def upgrade_database():
+    """
+    Apply pending migrations. The baseline revision skips tables that
+    already exist, so a database created by db.create_all() before
+    migrations existed is adopted the same way. Must be called in an
+    application context.
+    """
+    flask_migrate.upgrade()
@@ -0,0 +1,82 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+
+Column types and SQL expressions that work on both PostgreSQL and
+SQLite, the two supported storage backends.
+
+UUIDs are native on PostgreSQL and CHAR(32) on SQLite. Lists of strings
+are arrays on PostgreSQL and JSON arrays on SQLite; list_contains and
+list_length compile to the matching SQL on each.
+
+"""
+
+import uuid
+
+from sqlalchemy import JSON, Boolean, Integer, String, TypeDecorator
+from sqlalchemy import Uuid as _Uuid
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+# pylint: disable-next=abstract-method,too-many-ancestors
+class Uuid(TypeDecorator):
+    """
+    UUID column that also accepts UUID strings as parameters, as
+    PostgreSQL does, so that ids taken from URLs can be used directly.
+    """
+    impl = _Uuid
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, str):
+            return uuid.UUID(value)
+        return value
+
+
+def string_list():
+    """ Column type for a list of strings """
+    # none_as_null stores None as SQL NULL rather than JSON null, as the
+    # array type does
+    return ARRAY(String).with_variant(JSON(none_as_null=True), "sqlite")
+
+
+class list_contains(FunctionElement):
+    """ list_contains(value, column): true if a string list holds value """
+    type = Boolean()
+    name = "list_contains"
+    inherit_cache = True
+
+
+class list_length(FunctionElement):
+    """ list_length(column): number of items in a string list """
+    type = Integer()
+    name = "list_length"
+    inherit_cache = True
+
+
+@compiles(list_contains)
+def _array_contains(element, compiler, **kw):
+    value, column = element.clauses
+    return f"{compiler.process(value, **kw)} = ANY ({compiler.process(column, **kw)})"
+
+
+@compiles(list_contains, "sqlite")
+def _json_contains(element, compiler, **kw):
+    value, column = element.clauses
+    return (f"EXISTS (SELECT 1 FROM json_each({compiler.process(column, **kw)}) "
+            f"WHERE json_each.value = {compiler.process(value, **kw)})")
+
+
+@compiles(list_length)
+def _array_length(element, compiler, **kw):
+    return f"cardinality({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(list_length, "sqlite")
+def _json_length(element, compiler, **kw):
+    return f"json_array_length({compiler.process(element.clauses, **kw)})"
@@ -0,0 +1,410 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+
+This module implements `flask import-devices`, a bulk loader for
+migrating existing device registries.
+
+Input is streamed as NDJSON (one SCIM Device resource per line) or CSV.
+Rows are validated against the core, BLE, Ethernet MAB and FDO rules and
+copied in batches into a temporary staging table with PostgreSQL COPY
+(plain batched INSERTs on SQLite).
+Uniqueness against the registry and within the input is then checked
+in SQL, and the surviving rows are merged into the device tables in the
+same transaction. Rejected rows are written to a side file as NDJSON, so
+memory use does not depend on the size of the input.
+
+Imports do not contact ISE or the FDO owner service; imported MAB
+devices are added to ISE by the ISE reconciliation job, and, when an
+owner service is configured, the vouchers of imported FDO devices are
+queued as upload jobs in the same transaction.
+
+"""
+
+import csv
+import datetime
+import io
+import json
+import sys
+import uuid
+from functools import partial
+from typing import Any, Iterator, TextIO
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import (BigInteger, Boolean, Column, Integer, MetaData, String, Table,
+                        Text, and_, exists, func, insert, literal, or_, select)
+from sqlalchemy.orm import aliased
+
+import scim_ethermab
+import scim_fdo
+from change_bus import INSERT, Change, notify_changes
+from database import db
+from db_types import Uuid, string_list
+from fdo_upload import FdoUploadJob, UploadState
+from models import Device
+from nipc_models import BleExtension
+from scim_ble import BLE_SCHEMA, ble_extension_values
+from scim_ethermab import EtherMABExtension
+from scim_fdo import FDOExtension
+from tiedie_exceptions import FDONotSupported, MABNotSupported, SchemaError
+
+CORE_SCHEMA = "urn:ietf:params:scim:schemas:core:2.0:Device"
+MAB_SCHEMA = "urn:ietf:params:scim:schemas:extension:ethernet-mab:2.0:Device"
+FDO_SCHEMA = "urn:ietf:params:scim:schemas:extension:fido-device-onboard:2.0:Device"
+
+# CSV columns; list values are separated by semicolons
+CSV_LIST_SEPARATOR = ";"
+
+staging_metadata = MetaData()
+
+staging_devices = Table(
+    "import_devices", staging_metadata,
+    Column("line_no", BigInteger, primary_key=True),
+    Column("record", Text, nullable=False),
+    Column("device_id", Uuid, nullable=False),
+    Column("schemas", string_list()),
+    Column("display_name", String),
+    Column("active", Boolean),
+    Column("ble", Boolean, nullable=False),
+    Column("ble_mac_address", String, index=True),
+    Column("version_support", string_list()),
+    Column("is_random", Boolean),
+    Column("separate_broadcast_address", string_list()),
+    Column("irk", String),
+    Column("pairing_methods", string_list()),
+    Column("pairing_null", String),
+    Column("pairing_just_works_key", Integer),
+    Column("pairing_pass_key", Integer),
+    Column("pairing_oob_key", String),
+    Column("pairing_oobrn", BigInteger),
+    Column("mab_mac_address", String, index=True),
+    Column("fdo_voucher", String),
+    # Upload job of the voucher, as PEM, if vouchers are uploaded
+    Column("fdo_job_id", Uuid),
+    Column("fdo_pem", Text),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+STAGING_COLUMNS = [column.name for column in staging_devices.columns]
+
+
+def _csv_bool(value: str):
+    if value == "":
+        return None
+    lowered = value.strip().lower()
+    if lowered in ("true", "1", "yes"):
+        return True
+    if lowered in ("false", "0", "no"):
+        return False
+    raise SchemaError(f"not a boolean: {value}")
+
+
+def _csv_list(value: str):
+    return [item.strip() for item in value.split(CSV_LIST_SEPARATOR) if item.strip()]
+
+
+def csv_to_resource(row: dict[str, str]) -> dict:
+    """
+    Map a flat CSV row to a SCIM Device resource. Columns: displayName,
+    active, deviceMacAddress, isRandom, versionSupport, pairingMethods,
+    irk, separateBroadcastAddress (BLE), mabMacAddress (Ethernet MAB) and
+    fdoOwnerVoucher (FDO).
+    """
+    row = {key.strip(): (value or "").strip() for key, value in row.items() if key}
+    resource: dict[str, Any] = {
+        "schemas": [CORE_SCHEMA],
+        "displayName": row.get("displayName", ""),
+        "active": _csv_bool(row.get("active", "")),
+    }
+    if row.get("deviceMacAddress"):
+        resource["schemas"].append(BLE_SCHEMA)
+        resource[BLE_SCHEMA] = {
+            "deviceMacAddress": row["deviceMacAddress"],
+            "isRandom": _csv_bool(row.get("isRandom", "")),
+            "versionSupport": _csv_list(row.get("versionSupport", "")),
+            "pairingMethods": _csv_list(row.get("pairingMethods", "")),
+            "separateBroadcastAddress": _csv_list(row.get("separateBroadcastAddress", "")),
+        }
+        if row.get("irk"):
+            resource[BLE_SCHEMA]["irk"] = row["irk"]
+    if row.get("mabMacAddress"):
+        resource["schemas"].append(MAB_SCHEMA)
+        resource[MAB_SCHEMA] = {"deviceMacAddress": row["mabMacAddress"]}
+    if row.get("fdoOwnerVoucher"):
+        resource["schemas"].append(FDO_SCHEMA)
+        resource[FDO_SCHEMA] = {"fdoOwnerVoucher": row["fdoOwnerVoucher"]}
+    return resource
+
+
+def validate_resource(resource) -> dict:
+    """
+    Check a SCIM Device resource against the rules applied by POST
+    /Devices and return its staging row. Uniqueness is checked later,
+    in the database.
+    """
+    if not isinstance(resource, dict):
+        raise SchemaError("record is not an object")
+    if not isinstance(resource.get("schemas"), list):
+        raise SchemaError("schemas is not a list")
+    schemas = resource["schemas"].copy()
+    if CORE_SCHEMA not in schemas:
+        raise SchemaError("SCIM Device Schema Required")
+    schemas.remove(CORE_SCHEMA)
+    if "id" in resource:
+        raise SchemaError("Specifying id on create not permitted")
+    if not isinstance(resource.get("displayName"), str) or not resource["displayName"]:
+        raise SchemaError("displayName required")
+    if not isinstance(resource.get("active"), bool):
+        raise SchemaError("active must be a boolean")
+
+    device_id = uuid.uuid4()
+    row: dict[str, Any] = {
+        "device_id": device_id,
+        "schemas": resource["schemas"],
+        "display_name": resource["displayName"],
+        "active": resource["active"],
+        "ble": False,
+    }
+
+    if BLE_SCHEMA in schemas:
+        schemas.remove(BLE_SCHEMA)
+        ble_json = resource.get(BLE_SCHEMA)
+        if not isinstance(ble_json, dict) or not ble_json.get("deviceMacAddress"):
+            raise SchemaError("BLE deviceMacAddress required")
+        values = ble_extension_values(device_id, ble_json)
+        values["ble_mac_address"] = values.pop("device_mac_address")
+        del values["device_id"]
+        row.update(values, ble=True)
+
+    if MAB_SCHEMA in schemas:
+        schemas.remove(MAB_SCHEMA)
+        if not scim_ethermab.ETHER_MAB_ENABLED:
+            raise MABNotSupported("MAB not supported.")
+        mab_json = resource.get(MAB_SCHEMA)
+        if not isinstance(mab_json, dict) or not mab_json.get("deviceMacAddress"):
+            raise SchemaError("MAC address required")
+        row["mab_mac_address"] = mab_json["deviceMacAddress"]
+
+    if FDO_SCHEMA in schemas:
+        schemas.remove(FDO_SCHEMA)
+        if not scim_fdo.FDO_ENABLED:
+            raise FDONotSupported("FDO not supported")
+        fdo_json = resource.get(FDO_SCHEMA)
+        if not isinstance(fdo_json, dict) or not fdo_json.get("fdoOwnerVoucher"):
+            raise SchemaError("fdoOwnerVoucher required")
+        row["fdo_voucher"] = fdo_json["fdoOwnerVoucher"]
+        if scim_fdo.FDO_SUPPORT:
+            row["fdo_job_id"] = uuid.uuid4()
+            row["fdo_pem"] = scim_fdo.to_pem(row["fdo_voucher"])
+
+    if schemas:
+        raise SchemaError("not supported: " + json.dumps(schemas))
+    return row
+
+
+def read_records(stream: TextIO, fmt: str) -> Iterator[tuple[int, str, Any]]:
+    """
+    Yield (line number, raw record, parsed resource or exception) for
+    every record of an NDJSON or CSV stream.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            raw = json.dumps(row)
+            try:
+                yield reader.line_num, raw, csv_to_resource(row)
+            except SchemaError as e:
+                yield reader.line_num, raw, e
+        return
+
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, line.rstrip("\n"), json.loads(line)
+        except ValueError as e:
+            yield line_no, line.rstrip("\n"), SchemaError(f"invalid JSON: {e}")
+
+
+def _copy_value(value) -> Any:
+    """ Render a value for COPY ... (FORMAT csv); None is an unquoted empty field """
+    if isinstance(value, list):
+        return "{" + ",".join(
+            '"' + str(item).replace("\\", "\\\\").replace('"', '\\"') + '"'
+            for item in value) + "}"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return value
+
+
+def _copy_batch(cursor, rows: list[dict]):
+    """ COPY a batch of staging rows """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if row.get(column) is None else _copy_value(row.get(column))
+                         for column in STAGING_COLUMNS])
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY {staging_devices.name} ({', '.join(STAGING_COLUMNS)}) "
+        "FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _insert_batch(connection, rows: list[dict]):
+    """ INSERT a batch of staging rows, for backends without COPY """
+    connection.execute(staging_devices.insert(),
+                       [{column: row.get(column) for column in STAGING_COLUMNS}
+                        for row in rows])
+
+
+def _duplicate_rejects():
+    """ Staged rows whose MAC is already registered or appeared on an earlier line """
+    staged = staging_devices.c
+    earlier = aliased(staging_devices)
+    ble_taken = or_(
+        exists().where(BleExtension.device_mac_address == staged.ble_mac_address),
+        exists().where(and_(earlier.c.ble_mac_address == staged.ble_mac_address,
+                            earlier.c.line_no < staged.line_no)))
+    mab_taken = or_(
+        exists().where(EtherMABExtension.device_mac_address == staged.mab_mac_address),
+        exists().where(and_(earlier.c.mab_mac_address == staged.mab_mac_address,
+                            earlier.c.line_no < staged.line_no)))
+    return select(staged.line_no, staged.record, literal("Device already exists")) \
+        .where(or_(and_(staged.ble_mac_address.isnot(None), ble_taken),
+                   and_(staged.mab_mac_address.isnot(None), mab_taken)))
+
+
+def _merge(connection):
+    """ Move the staged rows into the device tables """
+    staged = staging_devices.c
+    now = datetime.datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    connection.execute(insert(Device.__table__).from_select(
+        ["device_id", "schemas", "display_name", "active",
+         "created_time", "modified_time", "version"],
+        select(staged.device_id, staged.schemas, staged.display_name, staged.active,
+               literal(now), literal(now), literal(1))))
+
+    ble_columns = ["version_support", "is_random", "separate_broadcast_address", "irk",
+                   "pairing_methods", "pairing_null", "pairing_just_works_key",
+                   "pairing_pass_key", "pairing_oob_key", "pairing_oobrn"]
+    connection.execute(insert(BleExtension.__table__).from_select(
+        ["device_id", "device_mac_address", *ble_columns],
+        select(staged.device_id, staged.ble_mac_address,
+               *[staged[column] for column in ble_columns]).where(staged.ble)))
+
+    connection.execute(insert(EtherMABExtension.__table__).from_select(
+        ["device_id", "device_mac_address"],
+        select(staged.device_id, staged.mab_mac_address)
+        .where(staged.mab_mac_address.isnot(None))))
+
+    connection.execute(insert(FDOExtension.__table__).from_select(
+        ["device_id", "fdo_voucher"],
+        select(staged.device_id, staged.fdo_voucher).where(staged.fdo_voucher.isnot(None))))
+
+    # Due now; the upload workers poll for them
+    queued = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    connection.execute(insert(FdoUploadJob.__table__).from_select(
+        ["job_id", "device_id", "voucher", "state", "attempts",
+         "next_attempt", "created", "updated"],
+        select(staged.fdo_job_id, staged.device_id, staged.fdo_pem,
+               literal(UploadState.PENDING.value), literal(0),
+               literal(queued), literal(queued), literal(queued))
+        .where(staged.fdo_job_id.isnot(None))))
+
+
+def import_devices(stream: TextIO, fmt: str, rejects: TextIO,
+                   batch_size: int = 10000) -> tuple[int, int]:
+    """
+    Import devices from stream in a single transaction.
+
+    Returns:
+        (imported, rejected) counts
+    """
+    rejected = 0
+
+    def reject(line_no: int, record: str, error: str):
+        nonlocal rejected
+        rejected += 1
+        rejects.write(json.dumps({"line": line_no, "error": error, "record": record}) + "\n")
+
+    with db.engine.begin() as connection:
+        use_copy = connection.dialect.name == "postgresql"
+        if use_copy:
+            cursor = connection.connection.cursor()
+            load_batch = partial(_copy_batch, cursor)
+        else:
+            # Without ON COMMIT DROP, a failed import leaves its staging
+            # table on the pooled connection
+            staging_devices.drop(connection, checkfirst=True)
+            load_batch = partial(_insert_batch, connection)
+        staging_devices.create(connection)
+
+        batch = []
+        for line_no, record, resource in read_records(stream, fmt):
+            if isinstance(resource, Exception):
+                reject(line_no, record, str(resource))
+                continue
+            try:
+                row = validate_resource(resource)
+            except (SchemaError, MABNotSupported, FDONotSupported) as e:
+                reject(line_no, record, str(e))
+                continue
+            row.update(line_no=line_no, record=record)
+            batch.append(row)
+            if len(batch) >= batch_size:
+                load_batch(batch)
+                batch = []
+        if batch:
+            load_batch(batch)
+        if use_copy:
+            cursor.close()
+
+        connection.exec_driver_sql(f"ANALYZE {staging_devices.name}")
+
+        duplicates = _duplicate_rejects()
+        for line_no, record, error in connection.execute(
+                duplicates.execution_options(yield_per=batch_size)):
+            reject(line_no, record, error)
+        connection.execute(staging_devices.delete().where(
+            staging_devices.c.line_no.in_(
+                duplicates.with_only_columns(staging_devices.c.line_no))))
+
+        _merge(connection)
+        notify_changes(connection, [Change("bledevices", op=INSERT)])
+        imported = connection.scalar(select(func.count()).select_from(staging_devices))
+        if not use_copy:
+            staging_devices.drop(connection)
+
+    return imported, rejected
+
+
+@click.command("import-devices")
+@click.argument("source", type=click.File("r", encoding="utf-8"))
+@click.option("--format", "fmt", type=click.Choice(["ndjson", "csv"]),
+              help="Input format; defaults to the file extension, else ndjson.")
+@click.option("--rejects", "rejects_path", type=click.Path(dir_okay=False),
+              help="Where to write rejected records (default: SOURCE.rejects.ndjson).")
+@click.option("--batch-size", default=10000, show_default=True,
+              help="Rows per COPY (or INSERT) batch.")
+@with_appcontext
+def import_devices_command(source, fmt, rejects_path, batch_size):
+    """ Bulk-import devices from an NDJSON or CSV file ('-' for stdin). """
+    name = getattr(source, "name", "-")
+    if fmt is None:
+        fmt = "csv" if str(name).lower().endswith(".csv") else "ndjson"
+    if rejects_path is None:
+        rejects_path = "import.rejects.ndjson" if name in ("-", "<stdin>") \
+            else f"{name}.rejects.ndjson"
+
+    with open(rejects_path, "w", encoding="utf-8") as rejects:
+        imported, rejected = import_devices(source, fmt, rejects, batch_size)
+
+    print(f"imported {imported} devices, rejected {rejected}", file=sys.stderr)
+    if rejected:
+        print(f"rejected records written to {rejects_path}", file=sys.stderr)
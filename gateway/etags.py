@@ -0,0 +1,36 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+
+This module derives strong entity tags from row versions and answers
+conditional GET requests (If-None-Match) without building the response
+body when the client already holds the current representation.
+
+"""
+
+import hashlib
+from http import HTTPStatus
+from typing import Any, Callable
+
+from flask import Response, make_response, request
+
+
+def make_etag(*parts: Any) -> str:
+    """ Derive an (unquoted) entity tag from resource IDs and row versions """
+    return hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+
+
+def conditional_response(etag: str, build: Callable[[], Any]) -> Response:
+    """
+    Return 304 Not Modified if If-None-Match matches etag; otherwise call
+    build() for the full response. Either way the ETag header is set.
+    """
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=HTTPStatus.NOT_MODIFIED)
+    else:
+        response = make_response(build())
+    response.set_etag(etag)
+    return response
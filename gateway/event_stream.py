@@ -0,0 +1,117 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+
+This module fans device events out to in-process stream subscribers,
+alongside MQTT. Each subscriber has a bounded buffer; when a consumer
+falls behind, the oldest events are dropped and counted.
+
+"""
+
+import dataclasses
+import itertools
+import queue
+import threading
+from typing import Callable
+
+from config import SSE_QUEUE_SIZE
+
+
+@dataclasses.dataclass
+class StreamEvent:
+    """ An encoded event as published to MQTT """
+    event_id: int
+    event_name: str
+    payload: bytes
+
+
+class Subscriber:
+    """ A bounded event buffer for one stream consumer """
+
+    def __init__(self, data_app_id: str, max_queue: int = SSE_QUEUE_SIZE):
+        self.data_app_id = data_app_id
+        self.events: queue.Queue[StreamEvent] = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def offer(self, event: StreamEvent):
+        """ Queue an event, dropping the oldest one if the buffer is full """
+        with self._lock:
+            while True:
+                try:
+                    self.events.put_nowait(event)
+                    return
+                except queue.Full:
+                    try:
+                        self.events.get_nowait()
+                        self.dropped += 1
+                    except queue.Empty:
+                        pass
+
+    def take_dropped(self) -> int:
+        """ Return and reset the number of events dropped since the last call """
+        with self._lock:
+            dropped, self.dropped = self.dropped, 0
+            return dropped
+
+
+class EventBroker:
+    """ Routes published events to the subscribers of each data app """
+
+    def __init__(self):
+        self._subscribers: dict[str, list[Subscriber]] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._listeners: list[Callable[[str, str, bytes], None]] = []
+
+    def subscribe(self, data_app_id: str) -> Subscriber:
+        """ Register a new subscriber for a data app """
+        subscriber = Subscriber(data_app_id)
+        with self._lock:
+            self._subscribers.setdefault(data_app_id, []).append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        """ Remove a subscriber; safe to call more than once """
+        with self._lock:
+            subscribers = self._subscribers.get(subscriber.data_app_id, [])
+            if subscriber in subscribers:
+                subscribers.remove(subscriber)
+            if not subscribers:
+                self._subscribers.pop(subscriber.data_app_id, None)
+
+    def add_listener(self, listener: Callable[[str, str, bytes], None]):
+        """
+        Also hand every published event to listener, with or without
+        subscribers, e.g. to forward it to other processes
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, str, bytes], None]):
+        """ Remove a listener; safe to call more than once """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def publish(self, data_app_id: str, event_name: str, payload: bytes):
+        """ Deliver an encoded event to every subscriber of a data app """
+        for listener in list(self._listeners):
+            listener(data_app_id, event_name, payload)
+
+        subscribers = self._subscribers.get(data_app_id)
+        if not subscribers:
+            return
+
+        event = StreamEvent(next(self._ids), event_name, payload)
+        for subscriber in list(subscribers):
+            subscriber.offer(event)
+
+
+_event_broker = EventBroker()
+
+
+def event_broker() -> EventBroker:
+    """ Global event broker getter """
+    return _event_broker
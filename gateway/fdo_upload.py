@@ -0,0 +1,306 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+
+This module submits FDO ownership vouchers to the owner service.
+
+All submissions share one HTTPS session, so the client-certificate TLS
+handshake happens once per pooled connection rather than once per
+voucher.
+
+With FDO_ASYNC_UPLOAD set, SCIM requests only record an upload job in
+the database, in the same transaction as the device. Worker threads
+claim due jobs with SELECT ... FOR UPDATE SKIP LOCKED, upload them
+concurrently, and retry failures with exponential backoff. Because jobs
+are rows, uploads survive restarts, and a job whose worker died is
+picked up again once its lease expires.
+
+"""
+
+import datetime
+import logging
+import threading
+import uuid
+from enum import Enum
+from typing import TYPE_CHECKING, Callable, Optional
+
+from sqlalchemy import (DateTime, ForeignKey, Integer, String, Text, event, select,
+                        update)
+from sqlalchemy.orm import Session, backref, mapped_column, relationship
+
+from config import (FDO_CA_CERT, FDO_CLIENT_CERT, FDO_OWNER_URI, FDO_POLL_INTERVAL,
+                    FDO_RETRY_BASE, FDO_RETRY_MAX, FDO_UPLOAD_MAX_ATTEMPTS,
+                    FDO_UPLOAD_TIMEOUT, FDO_UPLOAD_WORKERS)
+from database import db, session
+from db_types import Uuid
+from models import Device
+from tiedie_exceptions import FDONotSupported
+
+if TYPE_CHECKING:
+    import requests
+
+# Client errors that will not go away by retrying
+RETRYABLE_CLIENT_ERRORS = (408, 425, 429)
+
+
+class UploadState(str, Enum):
+    """ Lifecycle states of an upload job """
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+class FdoUploadJob(db.Model):
+    """ One voucher waiting for, or done with, submission to the owner service """
+    __tablename__ = "fdo_upload_job"
+
+    job_id = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    device_id = mapped_column(Uuid, ForeignKey("devices.device_id"),
+                              nullable=False, index=True)
+    voucher = mapped_column(Text, nullable=False)
+    state = mapped_column(String, nullable=False, default=UploadState.PENDING.value)
+    attempts = mapped_column(Integer, nullable=False, default=0)
+    # Due time while pending; lease expiry while running
+    next_attempt = mapped_column(DateTime, nullable=False, default=_now, index=True)
+    last_error = mapped_column(String)
+    created = mapped_column(DateTime, nullable=False, default=_now)
+    updated = mapped_column(DateTime, nullable=False, default=_now, onupdate=_now)
+    device = relationship(Device, backref=backref("fdo_upload_jobs",
+                                                  cascade="all, delete-orphan"))
+
+
+class UploadError(Exception):
+    """ A voucher submission failed """
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+_owner_session: Optional["requests.Session"] = None
+_owner_session_lock = threading.Lock()
+
+
+def owner_session() -> "requests.Session":
+    """ Shared, connection-pooled session for the FDO owner service """
+    global _owner_session # pylint: disable=global-statement
+    # Imported on first use, as most gateways have no owner service
+    # pylint: disable-next=import-outside-toplevel,redefined-outer-name
+    import requests
+    # pylint: disable-next=import-outside-toplevel
+    from requests.adapters import HTTPAdapter
+
+    with _owner_session_lock:
+        if _owner_session is None:
+            http = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=max(FDO_UPLOAD_WORKERS, 1))
+            http.mount("https://", adapter)
+            http.mount("http://", adapter)
+            http.cert = FDO_CLIENT_CERT
+            http.verify = FDO_CA_CERT is not None
+            _owner_session = http
+        return _owner_session
+
+
+def submit_voucher(voucher: str,
+                   url: Optional[str] = None,
+                   http: Optional["requests.Session"] = None,
+                   timeout: float = FDO_UPLOAD_TIMEOUT):
+    """
+    POST a PEM voucher to the owner service.
+
+    Raises:
+        UploadError: if the owner service did not accept the voucher
+    """
+    # pylint: disable-next=import-outside-toplevel,redefined-outer-name
+    import requests
+
+    http = http or owner_session()
+    try:
+        res = http.post(url=url or FDO_OWNER_URI, data=voucher,
+                        headers={'Content-Type': 'text/plain'},
+                        timeout=timeout)
+    except requests.RequestException as e:
+        raise UploadError(str(e)) from e
+    if res.status_code not in (200, 201):
+        retryable = res.status_code >= 500 or res.status_code in RETRYABLE_CLIENT_ERRORS
+        raise UploadError(f"{res.status_code} {res.text}", retryable)
+
+
+def upload_voucher_now(voucher: str):
+    """ Synchronous submission for the SCIM request path """
+    try:
+        submit_voucher(voucher)
+    except UploadError as e:
+        raise FDONotSupported(str(e)) from e
+
+
+class FdoUploader:
+    """
+    Worker pool that drains the upload job table. The database is the
+    queue; wake() only shortens the wait after new jobs are committed.
+    """
+
+    def __init__(self,
+                 submit: Callable[[str], None] = submit_voucher,
+                 workers: int = FDO_UPLOAD_WORKERS,
+                 max_attempts: int = FDO_UPLOAD_MAX_ATTEMPTS,
+                 retry_base: float = FDO_RETRY_BASE,
+                 retry_max: float = FDO_RETRY_MAX,
+                 poll_interval: float = FDO_POLL_INTERVAL,
+                 lease: float = FDO_UPLOAD_TIMEOUT * 4):
+        self.submit = submit
+        self.workers = max(workers, 1)
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self._app = None
+        self._threads: list[threading.Thread] = []
+        self._cond = threading.Condition()
+        self._wakeups = 0
+        self._stopping = False
+
+    def backoff(self, attempts: int) -> float:
+        """ Seconds to wait after the given number of failed attempts """
+        return min(self.retry_base * 2 ** (attempts - 1), self.retry_max)
+
+    def start(self, app):
+        """ Start the workers """
+        with self._cond:
+            if self._threads:
+                return
+            self._app = app
+            self._stopping = False
+            self._threads = [threading.Thread(target=self._run, name=f"fdo-upload-{n}",
+                                              daemon=True)
+                             for n in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """ Stop the workers; unfinished jobs stay in the table """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join(timeout)
+
+    def wake(self):
+        """ Tell idle workers that new jobs may be due """
+        with self._cond:
+            self._wakeups += 1
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._stopping:
+                    return
+                seen = self._wakeups
+            try:
+                worked = self.run_once()
+            except Exception: # pylint: disable=broad-except
+                logging.exception("FDO voucher upload worker failed")
+                worked = False
+            if worked:
+                continue
+            with self._cond:
+                self._cond.wait_for(lambda: self._stopping or self._wakeups != seen,
+                                    self.poll_interval)
+
+    def _claim(self) -> Optional[tuple[uuid.UUID, str, int]]:
+        now = _now()
+        job = session.scalars(
+            select(FdoUploadJob)
+            .where(FdoUploadJob.state.in_([UploadState.PENDING.value,
+                                           UploadState.RUNNING.value]),
+                   FdoUploadJob.next_attempt <= now)
+            .order_by(FdoUploadJob.next_attempt)
+            .limit(1)
+            .with_for_update(skip_locked=True)).first()
+        if job is None:
+            session.rollback()
+            return None
+        claimed = (job.job_id, job.voucher, job.attempts + 1)
+        # SQLite has no SKIP LOCKED: the job is only ours if no other
+        # worker has claimed it, bumping attempts, since it was read
+        result = session.execute(
+            update(FdoUploadJob)
+            .where(FdoUploadJob.job_id == job.job_id, FdoUploadJob.attempts == job.attempts)
+            .values(state=UploadState.RUNNING.value, attempts=job.attempts + 1,
+                    next_attempt=now + datetime.timedelta(seconds=self.lease))
+            .execution_options(synchronize_session=False))
+        session.commit()
+        return claimed if result.rowcount == 1 else None
+
+    def run_once(self) -> bool:
+        """ Upload one due job; returns False if none was due """
+        with self._app.app_context():
+            claimed = self._claim()
+            if claimed is None:
+                return False
+            job_id, voucher, attempts = claimed
+
+            error = None
+            try:
+                self.submit(voucher)
+            except UploadError as e:
+                error = e
+
+            job = session.get(FdoUploadJob, job_id)
+            if job is None:
+                # The device was deleted while uploading
+                session.rollback()
+                return True
+            if error is None:
+                job.state = UploadState.SUCCEEDED.value
+                job.last_error = None
+            elif not error.retryable or attempts >= self.max_attempts:
+                logging.warning("FDO voucher upload for %s failed: %s", job.device_id, error)
+                job.state = UploadState.FAILED.value
+                job.last_error = str(error)
+            else:
+                job.state = UploadState.PENDING.value
+                job.last_error = str(error)
+                job.next_attempt = _now() + datetime.timedelta(seconds=self.backoff(attempts))
+            session.commit()
+            return True
+
+
+def enqueue_voucher(entry: Device, voucher: str):
+    """
+    Add an upload job to a device; it is saved with the device. Workers
+    are woken once the session commits.
+    """
+    entry.fdo_upload_jobs.append(FdoUploadJob(voucher=voucher))
+    session.info["fdo_upload_wake"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_commit(committed: Session):
+    if committed.info.pop("fdo_upload_wake", False):
+        fdo_uploader().wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(rolled_back: Session):
+    rolled_back.info.pop("fdo_upload_wake", None)
+
+
+_fdo_uploader = FdoUploader()
+
+
+def fdo_uploader() -> FdoUploader:
+    """ Global FDO upload worker pool getter """
+    return _fdo_uploader
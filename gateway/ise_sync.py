@@ -0,0 +1,386 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+
+This module keeps Cisco ISE in step with the Ethernet MAB registry.
+
+SCIM requests only record the change locally and queue the MAC address
+once their transaction commits.
+A background worker coalesces queued changes, looks up endpoint IDs and
+applies them with ERS bulk requests where the server supports them,
+falling back to one request per endpoint otherwise. A single ISE client
+is shared by all requests, so its HTTP connections are reused.
+
+Changes that fail are retried by the reconciliation job, which also
+creates ISE endpoints for any MAB device that ISE does not know about.
+Reconciliation never deletes endpoints it was not asked to delete, as
+ISE holds endpoints that the gateway does not manage.
+
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+import ciscoisesdk
+from ciscoisesdk.exceptions import ApiError, ciscoisesdkException
+from requests.exceptions import RequestException
+from sqlalchemy import select
+
+from config import (ISE_BULK_TIMEOUT, ISE_ERS_URL, ISE_HOST, ISE_PASSWORD,
+                    ISE_RECONCILE_INTERVAL, ISE_REQUEST_TIMEOUT, ISE_SUPPORT,
+                    ISE_SYNC_BATCH_SIZE, ISE_SYNC_DELAY, ISE_USERNAME)
+from database import session
+from tiedie_exceptions import ISEError
+
+ENDPOINT_MEDIA_TYPE = "vnd.com.cisco.ise.identity.endpoint.1.0+xml"
+
+ISE_ERRORS = (ApiError, ciscoisesdkException, RequestException)
+
+# Responses from ISE versions that do not implement ERS bulk requests
+BULK_UNSUPPORTED = (404, 405, 415, 501)
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def ise_client():
+    """
+    Return the shared ISE client, creating it on first use. Returns None
+    if ISE is not configured.
+    """
+    global _client # pylint: disable=global-statement
+
+    if not ISE_SUPPORT:
+        return None
+
+    with _client_lock:
+        if _client is None:
+            ui_url = 'https://' + ISE_HOST
+            try:
+                _client = ciscoisesdk.IdentityServicesEngineAPI(
+                    username=ISE_USERNAME,
+                    password=ISE_PASSWORD,
+                    uses_api_gateway=False,
+                    ers_base_url=ISE_ERS_URL or ui_url + ':9060',
+                    version="3.1.0",
+                    ui_base_url=ui_url,
+                    mnt_base_url=ui_url,
+                    uses_csrf_token=False,
+                    px_grid_base_url=ui_url + ':8910',
+                    single_request_timeout=ISE_REQUEST_TIMEOUT,
+                    verify=False)
+            except ApiError as e:
+                raise ISEError(e.description) from e
+        return _client
+
+
+def normalize_mac(mac: str) -> str:
+    """ ISE reports MAC addresses in upper case """
+    return mac.strip().upper()
+
+
+def _bulk_request(operation: str, body: str) -> str:
+    return ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<ns4:endpointBulkRequest operationType="{operation}" '
+            f'resourceMediaType="{ENDPOINT_MEDIA_TYPE}" '
+            'xmlns:ns4="identity.ers.ise.cisco.com">'
+            f'{body}</ns4:endpointBulkRequest>')
+
+
+class IseSync:
+    """
+    Queue of pending ISE endpoint changes, keyed by MAC address. Only
+    the latest change of a MAC address is kept, so adding and removing a
+    device before the worker runs costs no ISE requests at all.
+    """
+
+    def __init__(self,
+                 client_factory: Optional[Callable] = ise_client,
+                 batch_size: int = ISE_SYNC_BATCH_SIZE,
+                 delay: float = ISE_SYNC_DELAY,
+                 reconcile_interval: float = ISE_RECONCILE_INTERVAL,
+                 bulk_timeout: float = ISE_BULK_TIMEOUT):
+        self.client_factory = client_factory
+        self.batch_size = max(batch_size, 1)
+        self.delay = delay
+        self.reconcile_interval = reconcile_interval
+        self.bulk_timeout = bulk_timeout
+        self.use_bulk = True
+        # mac -> True to create the endpoint, False to delete it
+        self._pending: OrderedDict[str, bool] = OrderedDict()
+        self._failed: dict[str, bool] = {}
+        self._busy = False
+        self._stopping = False
+        self._app = None
+        self._thread: Optional[threading.Thread] = None
+        self._cond = threading.Condition()
+
+    @property
+    def enabled(self) -> bool:
+        """ True if ISE is configured """
+        return self.client_factory is not None
+
+    def add(self, mac: str):
+        """ Queue creation of an ISE endpoint """
+        self.queue([(mac, True)])
+
+    def remove(self, mac: str):
+        """ Queue deletion of an ISE endpoint """
+        self.queue([(mac, False)])
+
+    def replace(self, old_mac: str, new_mac: str):
+        """ Queue a MAC address change """
+        self.queue([(old_mac, False), (new_mac, True)])
+
+    def queue(self, changes: Iterable[tuple[str, bool]]):
+        """ Queue (MAC address, True to create or False to delete) changes """
+        if not self.enabled:
+            return
+        with self._cond:
+            for mac, present in changes:
+                mac = normalize_mac(mac)
+                self._pending.pop(mac, None)
+                self._pending[mac] = present
+                self._failed.pop(mac, None)
+            self._ensure_worker()
+            self._cond.notify_all()
+
+    def start(self, app):
+        """ Start the worker and periodic reconciliation against app's database """
+        if not self.enabled:
+            return
+        with self._cond:
+            self._app = app
+            self._ensure_worker()
+            self._cond.notify_all()
+
+    def stop(self, timeout: Optional[float] = None):
+        """ Stop the worker; pending changes are left to reconciliation """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """ Wait until all queued changes have been applied or have failed """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy,
+                                       timeout)
+
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="ise-sync", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        next_reconcile = time.monotonic()
+        while True:
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+                while not self._pending and not self._stopping:
+                    if self._app is None:
+                        self._cond.wait()
+                        continue
+                    remaining = next_reconcile - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._stopping:
+                    return
+                # Give a burst of changes the chance to form one batch
+                if 0 < len(self._pending) < self.batch_size and self.delay > 0:
+                    self._cond.wait(self.delay)
+                batch = []
+                while self._pending and len(batch) < self.batch_size:
+                    batch.append(self._pending.popitem(last=False))
+                self._busy = True
+
+            if batch:
+                self.apply(batch)
+            elif self._app is not None:
+                next_reconcile = time.monotonic() + self.reconcile_interval
+                try:
+                    self.reconcile()
+                except Exception: # pylint: disable=broad-except
+                    logging.exception("ISE reconciliation failed")
+
+    def apply(self, batch: list[tuple[str, bool]]):
+        """ Apply a batch of changes; failures are kept for reconciliation """
+        deletes = [mac for mac, present in batch if not present]
+        creates = [mac for mac, present in batch if present]
+        try:
+            api = self.client_factory()
+            failed = self._delete_endpoints(api, deletes) if deletes else []
+            failed_creates = self._create_endpoints(api, creates) if creates else []
+        except ISE_ERRORS:
+            logging.exception("ISE sync of %d endpoints failed", len(batch))
+            failed, failed_creates = deletes, creates
+
+        with self._cond:
+            for mac in failed:
+                self._failed.setdefault(mac, False)
+            for mac in failed_creates:
+                self._failed.setdefault(mac, True)
+
+    @staticmethod
+    def _endpoint_id(api, mac: str) -> Optional[str]:
+        try:
+            endpoint = api.endpoint.get_endpoint_by_name(mac)
+        except ApiError as e:
+            if e.status_code == 404:
+                return None
+            raise
+        return endpoint.response.ERSEndPoint['id']
+
+    def _delete_endpoints(self, api, macs: list[str]) -> list[str]:
+        ids = {}
+        for mac in macs:
+            endpoint_id = self._endpoint_id(api, mac)
+            if endpoint_id is not None:
+                ids[endpoint_id] = mac
+
+        if len(ids) > 1 and self.use_bulk:
+            failed = self._bulk(api, "delete",
+                                "<ns4:idList>" + "".join(
+                                    f"<id>{escape(endpoint_id)}</id>" for endpoint_id in ids)
+                                + "</ns4:idList>")
+            if failed is not None:
+                return [ids.get(key, key) for key in failed]
+
+        failed = []
+        for endpoint_id, mac in ids.items():
+            try:
+                api.endpoint.delete_endpoint_by_id(endpoint_id)
+            except ApiError as e:
+                if e.status_code != 404:
+                    logging.warning("ISE delete of %s failed: %s", mac, e.description)
+                    failed.append(mac)
+        return failed
+
+    def _create_endpoints(self, api, macs: list[str]) -> list[str]:
+        if len(macs) > 1 and self.use_bulk:
+            failed = self._bulk(api, "create",
+                                "<ns4:resourcesList>" + "".join(
+                                    f"<ns4:endpoint name={quoteattr(mac)}>"
+                                    f"<mac>{escape(mac)}</mac></ns4:endpoint>"
+                                    for mac in macs)
+                                + "</ns4:resourcesList>")
+            if failed is None:
+                failed = macs
+            # Creating an endpoint that already exists fails; check those one by one
+            macs = failed
+
+        failed = []
+        for mac in macs:
+            try:
+                if self._endpoint_id(api, mac) is None:
+                    api.endpoint.create_endpoint(mac=mac)
+            except ApiError as e:
+                logging.warning("ISE create of %s failed: %s", mac, e.description)
+                failed.append(mac)
+        return failed
+
+    def _bulk(self, api, operation: str, body: str) -> Optional[list[str]]:
+        """
+        Submit an ERS bulk request and wait for it to finish. Returns the
+        names (or IDs) of the resources that failed, or None if the whole
+        request could not be run.
+        """
+        try:
+            response = api.endpoint.bulk_request_for_endpoint(
+                headers={"Content-Type": "application/xml", "Accept": "application/json"},
+                payload=_bulk_request(operation, body))
+        except ApiError as e:
+            if e.status_code in BULK_UNSUPPORTED:
+                logging.info("ISE does not support ERS bulk requests; using single requests")
+                self.use_bulk = False
+            else:
+                logging.warning("ISE bulk %s failed: %s", operation, e.description)
+            return None
+
+        location = response.headers.get("Location") or response.headers.get("location")
+        if not location:
+            return None
+        bulk_id = location.rstrip("/").rsplit("/", 1)[-1]
+
+        deadline = time.monotonic() + self.bulk_timeout
+        interval = 0.05
+        while True:
+            status = api.endpoint.monitor_bulk_status_endpoint(bulk_id).response.get(
+                "BulkStatus", {})
+            if status.get("executionStatus") not in (None, "IN_PROGRESS", "PENDING"):
+                break
+            if time.monotonic() > deadline:
+                logging.warning("ISE bulk %s %s did not finish in time", operation, bulk_id)
+                return None
+            time.sleep(interval)
+            interval = min(interval * 2, 2.0)
+
+        return [resource.get("name") or resource.get("id")
+                for resource in status.get("resourcesStatus", [])
+                if resource.get("status") != "SUCCESS"]
+
+    def _endpoint_macs(self, api, page_size: int = 100) -> set[str]:
+        macs = set()
+        page = 1
+        while True:
+            result = api.endpoint.get_endpoints(page=page, size=page_size).response.get(
+                "SearchResult", {})
+            resources = result.get("resources") or []
+            macs.update(normalize_mac(resource["name"]) for resource in resources)
+            if not result.get("nextPage") or not resources:
+                return macs
+            page += 1
+
+    def reconcile(self, app=None):
+        """
+        Queue every MAB device that ISE does not know about, and retry
+        changes that failed earlier.
+
+        Endpoints that ISE knows but the registry does not are left alone:
+        ISE also holds endpoints that the gateway does not manage, and
+        nothing marks the ones it created. Changes only come from the
+        registry, and are queued once they commit, so a SCIM request that
+        fails or is rolled back leaves no endpoint behind.
+        """
+        # pylint: disable-next=import-outside-toplevel,cyclic-import
+        from scim_ethermab import EtherMABExtension
+
+        app = app or self._app
+        with app.app_context():
+            registered = {normalize_mac(mac) for mac in session.scalars(
+                select(EtherMABExtension.device_mac_address)) if mac}
+            session.remove()
+
+        known = self._endpoint_macs(self.client_factory())
+
+        with self._cond:
+            retries, self._failed = self._failed, {}
+            changes = dict.fromkeys(sorted(registered - known), True)
+            changes.update((mac, present) for mac, present in retries.items()
+                           if present or mac in known)
+            changes = [(mac, present) for mac, present in changes.items()
+                       if mac not in self._pending]
+        if changes:
+            logging.info("ISE reconciliation queued %d endpoints", len(changes))
+            self.queue(changes)
+        return changes
+
+
+_ise_sync = IseSync(ise_client if ISE_SUPPORT else None)
+
+
+def ise_sync() -> IseSync:
+    """ Global ISE sync queue getter """
+    return _ise_sync
@@ -0,0 +1,177 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+
+This module runs long BLE operations as asynchronous jobs so that HTTP
+workers are not held for the duration of radio operations. Jobs are
+kept in a bounded in-memory table and expire after a TTL.
+
+"""
+
+import dataclasses
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from enum import Enum
+from http import HTTPStatus
+from typing import Callable, Optional
+
+from config import JOB_TABLE_SIZE, JOB_TTL, JOB_WORKERS
+
+
+class JobState(str, Enum):
+    """ Lifecycle states of a job """
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobTableFull(Exception):
+    """ Raised when no job slot can be freed for a new job. """
+
+
+def _timestamp(value: float) -> str:
+    return datetime.fromtimestamp(value, timezone.utc).isoformat()
+
+
+@dataclasses.dataclass
+class Job:
+    """ A single asynchronous operation and its outcome. """
+    job_id: str
+    operation: str
+    device_id: str
+    state: JobState = JobState.PENDING
+    progress: Optional[str] = None
+    status: Optional[int] = None
+    body: Optional[dict] = None
+    created: float = dataclasses.field(default_factory=time.time)
+    updated: float = dataclasses.field(default_factory=time.time)
+    done: threading.Event = dataclasses.field(default_factory=threading.Event)
+
+    @property
+    def finished(self) -> bool:
+        """ True once the job has succeeded or failed """
+        return self.state in (JobState.SUCCEEDED, JobState.FAILED)
+
+    def set_progress(self, progress: str):
+        """ Record the current stage of a running job """
+        self.progress = progress
+        self.updated = time.time()
+
+    def serialize(self) -> dict:
+        """ Serialize the job resource """
+        response = {
+            "id": self.job_id,
+            "operation": self.operation,
+            "deviceId": self.device_id,
+            "state": self.state.value,
+            "progress": self.progress,
+            "created": _timestamp(self.created),
+            "lastModified": _timestamp(self.updated),
+        }
+        if self.state == JobState.SUCCEEDED:
+            response["result"] = self.body
+        elif self.state == JobState.FAILED:
+            response["error"] = self.body
+        return response
+
+
+class JobManager:
+    """
+    Runs jobs on a bounded worker pool and keeps their results in a bounded
+    table. Finished jobs are purged once older than the TTL, or earliest
+    first when the table is full. Submitting the same key while a job is
+    still active returns the active job instead of queueing duplicate work.
+    """
+
+    def __init__(self, max_jobs: int = JOB_TABLE_SIZE, ttl: float = JOB_TTL,
+                 workers: int = JOB_WORKERS):
+        self.max_jobs = max_jobs
+        self.ttl = ttl
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._active: dict[tuple, str] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers,
+                                            thread_name_prefix="job")
+
+    def submit(self,
+               key: tuple,
+               operation: str,
+               device_id: str,
+               func: Callable[[Job], tuple[dict, HTTPStatus]]) -> Job:
+        """
+        Queue func(job) for execution. func returns (body, status); a status
+        below 400 marks the job as succeeded.
+        """
+        with self._lock:
+            active_id = self._active.get(key)
+            if active_id is not None:
+                return self._jobs[active_id]
+
+            self._purge(time.time())
+            if len(self._jobs) >= self.max_jobs:
+                raise JobTableFull("job table is full")
+
+            job = Job(job_id=str(uuid.uuid4()), operation=operation, device_id=device_id)
+            self._jobs[job.job_id] = job
+            self._active[key] = job.job_id
+
+        self._executor.submit(self._run, key, job, func)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """ Look up a job by ID """
+        with self._lock:
+            self._purge(time.time())
+            return self._jobs.get(job_id)
+
+    def _run(self, key: tuple, job: Job,
+             func: Callable[[Job], tuple[dict, HTTPStatus]]):
+        job.state = JobState.RUNNING
+        job.updated = time.time()
+        try:
+            body, status = func(job)
+        except Exception as e: # pylint: disable=broad-except
+            body, status = {
+                "type": "about:blank",
+                "status": HTTPStatus.INTERNAL_SERVER_ERROR.value,
+                "title": "Internal Server Error",
+                "detail": f"Internal server error: {str(e)}"
+            }, HTTPStatus.INTERNAL_SERVER_ERROR
+
+        with self._lock:
+            job.status = int(status)
+            job.body = body
+            job.state = JobState.SUCCEEDED if job.status < 400 else JobState.FAILED
+            job.updated = time.time()
+            self._active.pop(key, None)
+        job.done.set()
+
+    def _purge(self, now: float):
+        """ Drop expired jobs, then the oldest finished ones if still full. """
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.finished and now - job.updated > self.ttl]:
+            del self._jobs[job_id]
+
+        if len(self._jobs) < self.max_jobs:
+            return
+
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished]:
+            del self._jobs[job_id]
+            if len(self._jobs) < self.max_jobs:
+                return
+
+
+_job_manager = JobManager()
+
+
+def job_manager() -> JobManager:
+    """ Global job manager getter """
+    return _job_manager
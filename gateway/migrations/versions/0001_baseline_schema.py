@@ -0,0 +1,206 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""baseline schema
+
+The schema as created by db.create_all() before migrations were
+introduced. Tables and indexes that already exist are left alone, so
+databases created by db.create_all() are adopted by upgrading them.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 09:56:06.237788
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Arrays on PostgreSQL, JSON arrays on SQLite
+STRING_LIST = sa.ARRAY(sa.String()).with_variant(sa.JSON(none_as_null=True), 'sqlite')
+
+
+def upgrade():
+    """ Apply this revision """
+    op.create_table('device_group',
+    sa.Column('group_id', sa.Uuid(), nullable=False),
+    sa.PrimaryKeyConstraint('group_id'),
+    if_not_exists=True
+    )
+    op.create_table('devices',
+    sa.Column('device_id', sa.Uuid(), nullable=False),
+    sa.Column('schemas', STRING_LIST, nullable=True),
+    sa.Column('display_name', sa.String(), nullable=True),
+    sa.Column('active', sa.Boolean(), nullable=True),
+    sa.Column('created_time', sa.String(), nullable=True),
+    sa.Column('modified_time', sa.String(), nullable=True),
+    sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+    sa.PrimaryKeyConstraint('device_id'),
+    if_not_exists=True
+    )
+    op.create_index('ix_devices_display_name', 'devices', ['display_name'],
+                    unique=False, if_not_exists=True)
+
+    op.create_table('endpoint_app',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('applicationType', sa.String(), nullable=False),
+    sa.Column('applicationName', sa.String(), nullable=False),
+    sa.Column('rootCA', sa.String(), nullable=True),
+    sa.Column('subjectName', sa.String(), nullable=True),
+    sa.Column('clientToken', sa.String(), nullable=True),
+    sa.Column('createdTime', sa.DateTime(), nullable=False),
+    sa.Column('modifiedTime', sa.DateTime(), nullable=False),
+    sa.Column('password', sa.String(), nullable=True),
+    sa.Column('is_admin', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('applicationName'),
+    if_not_exists=True
+    )
+    op.create_table('onboardingapi_key',
+    sa.Column('key_type', sa.String(), nullable=False),
+    sa.Column('key_val', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('key_type', 'key_val'),
+    sa.UniqueConstraint('key_type'),
+    sa.UniqueConstraint('key_val'),
+    if_not_exists=True
+    )
+    op.create_table('sdf_model',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('sdf_name', sa.String(), nullable=False),
+    sa.Column('model', sa.JSON(), nullable=False),
+    sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    if_not_exists=True
+    )
+    op.create_index('ix_sdf_model_sdf_name', 'sdf_model', ['sdf_name'],
+                    unique=True, if_not_exists=True)
+
+    op.create_table('bledevices',
+    sa.Column('device_id', sa.Uuid(), nullable=False),
+    sa.Column('device_mac_address', sa.String(), nullable=True),
+    sa.Column('version_support', STRING_LIST, nullable=True),
+    sa.Column('is_random', sa.Boolean(), nullable=True),
+    sa.Column('separate_broadcast_address', STRING_LIST, nullable=True),
+    sa.Column('irk', sa.String(), nullable=True),
+    sa.Column('pairing_methods', STRING_LIST, nullable=True),
+    sa.Column('pairing_null', sa.String(), nullable=True),
+    sa.Column('pairing_just_works_key', sa.Integer(), nullable=True),
+    sa.Column('pairing_pass_key', sa.Integer(), nullable=True),
+    sa.Column('pairing_oob_key', sa.String(), nullable=True),
+    sa.Column('pairing_oobrn', sa.BigInteger(), nullable=True),
+    sa.ForeignKeyConstraint(['device_id'], ['devices.device_id'], ),
+    sa.PrimaryKeyConstraint('device_id'),
+    if_not_exists=True
+    )
+    op.create_index('ix_bledevices_device_mac_address', 'bledevices', ['device_mac_address'],
+                    unique=False, if_not_exists=True)
+
+    op.create_table('data_app',
+    sa.Column('data_app_id', sa.Uuid(), nullable=False),
+    sa.Column('events', STRING_LIST, nullable=True),
+    sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+    sa.ForeignKeyConstraint(['data_app_id'], ['endpoint_app.id'], ),
+    sa.PrimaryKeyConstraint('data_app_id'),
+    if_not_exists=True
+    )
+    op.create_table('device_group_members',
+    sa.Column('group_id', sa.Uuid(), nullable=False),
+    sa.Column('device_id', sa.Uuid(), nullable=False),
+    sa.ForeignKeyConstraint(['device_id'], ['devices.device_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['group_id'], ['device_group.group_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('group_id', 'device_id'),
+    if_not_exists=True
+    )
+    op.create_table('devices_endpoint_apps',
+    sa.Column('endpoint_app_id', sa.Uuid(), nullable=False),
+    sa.Column('device_id', sa.Uuid(), nullable=False),
+    sa.ForeignKeyConstraint(['device_id'], ['devices.device_id'], ),
+    sa.ForeignKeyConstraint(['endpoint_app_id'], ['endpoint_app.id'], ),
+    sa.PrimaryKeyConstraint('endpoint_app_id', 'device_id'),
+    if_not_exists=True
+    )
+    op.create_table('ethernetmab',
+    sa.Column('device_id', sa.Uuid(), nullable=False),
+    sa.Column('device_mac_address', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['device_id'], ['devices.device_id'], ),
+    sa.PrimaryKeyConstraint('device_id'),
+    if_not_exists=True
+    )
+    op.create_index('ix_ethernetmab_device_mac_address', 'ethernetmab', ['device_mac_address'],
+                    unique=False, if_not_exists=True)
+
+    op.create_table('event',
+    sa.Column('instance_id', sa.Uuid(), nullable=False),
+    sa.Column('event_name', sa.String(), nullable=False),
+    sa.Column('device_id', sa.Uuid(), nullable=False),
+    sa.Column('event_type', sa.String(), nullable=False),
+    sa.Column('gatt_service_id', sa.String(), nullable=True),
+    sa.Column('gatt_characteristic_id', sa.String(), nullable=True),
+    sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+    sa.ForeignKeyConstraint(['device_id'], ['devices.device_id'], ),
+    sa.PrimaryKeyConstraint('instance_id'),
+    sa.UniqueConstraint('event_name'),
+    if_not_exists=True
+    )
+    op.create_table('fdo_upload_job',
+    sa.Column('job_id', sa.Uuid(), nullable=False),
+    sa.Column('device_id', sa.Uuid(), nullable=False),
+    sa.Column('voucher', sa.Text(), nullable=False),
+    sa.Column('state', sa.String(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt', sa.DateTime(), nullable=False),
+    sa.Column('last_error', sa.String(), nullable=True),
+    sa.Column('created', sa.DateTime(), nullable=False),
+    sa.Column('updated', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['device_id'], ['devices.device_id'], ),
+    sa.PrimaryKeyConstraint('job_id'),
+    if_not_exists=True
+    )
+    op.create_index('ix_fdo_upload_job_device_id', 'fdo_upload_job', ['device_id'],
+                    unique=False, if_not_exists=True)
+    op.create_index('ix_fdo_upload_job_next_attempt', 'fdo_upload_job', ['next_attempt'],
+                    unique=False, if_not_exists=True)
+
+    op.create_table('scim_fdo',
+    sa.Column('device_id', sa.Uuid(), nullable=False),
+    sa.Column('fdo_voucher', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['device_id'], ['devices.device_id'], ),
+    sa.PrimaryKeyConstraint('device_id'),
+    if_not_exists=True
+    )
+
+
+def downgrade():
+    """ Revert this revision """
+    op.drop_table('scim_fdo')
+    op.drop_index('ix_fdo_upload_job_next_attempt', table_name='fdo_upload_job')
+    op.drop_index('ix_fdo_upload_job_device_id', table_name='fdo_upload_job')
+
+    op.drop_table('fdo_upload_job')
+    op.drop_table('event')
+    op.drop_index('ix_ethernetmab_device_mac_address', table_name='ethernetmab')
+
+    op.drop_table('ethernetmab')
+    op.drop_table('devices_endpoint_apps')
+    op.drop_table('device_group_members')
+    op.drop_table('data_app')
+    op.drop_index('ix_bledevices_device_mac_address', table_name='bledevices')
+
+    op.drop_table('bledevices')
+    op.drop_index('ix_sdf_model_sdf_name', table_name='sdf_model')
+
+    op.drop_table('sdf_model')
+    op.drop_table('onboardingapi_key')
+    op.drop_table('endpoint_app')
+    op.drop_index('ix_devices_display_name', table_name='devices')
+
+    op.drop_table('devices')
+    op.drop_table('device_group')
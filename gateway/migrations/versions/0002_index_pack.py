@@ -0,0 +1,63 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""index pack for the hot query paths
+
+- lower(bledevices.device_mac_address): data producer device lookups
+- event (device_id, event_type, gatt_service_id, gatt_characteristic_id):
+  data producer event matching, NIPC event lookups by device
+- GIN on data_app.events: events @> ARRAY[...] fan-out to data apps
+- endpoint_app clientToken and subjectName: control request authentication
+- device_id on the device association tables: relationship loads and
+  device deletion
+
+Indexes are created with IF NOT EXISTS, since databases adopted from
+db.create_all() may already have some of them.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 09:56:49.267098
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """ Apply this revision """
+    op.create_index('ix_bledevices_lower_device_mac_address', 'bledevices',
+                    [sa.literal_column('lower(device_mac_address)')],
+                    unique=False, if_not_exists=True)
+    op.create_index('ix_event_device_type_gatt', 'event',
+                    ['device_id', 'event_type', 'gatt_service_id', 'gatt_characteristic_id'],
+                    unique=False, if_not_exists=True)
+    op.create_index('ix_data_app_events', 'data_app', ['events'],
+                    unique=False, postgresql_using='gin', if_not_exists=True)
+    op.create_index('ix_endpoint_app_clientToken', 'endpoint_app', ['clientToken'],
+                    unique=False, if_not_exists=True)
+    op.create_index('ix_endpoint_app_subjectName', 'endpoint_app', ['subjectName'],
+                    unique=False, if_not_exists=True)
+    op.create_index('ix_devices_endpoint_apps_device_id', 'devices_endpoint_apps',
+                    ['device_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_device_group_members_device_id', 'device_group_members',
+                    ['device_id'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    """ Revert this revision """
+    op.drop_index('ix_device_group_members_device_id', table_name='device_group_members')
+    op.drop_index('ix_devices_endpoint_apps_device_id', table_name='devices_endpoint_apps')
+    op.drop_index('ix_endpoint_app_subjectName', table_name='endpoint_app')
+    op.drop_index('ix_endpoint_app_clientToken', table_name='endpoint_app')
+    op.drop_index('ix_data_app_events', table_name='data_app')
+    op.drop_index('ix_event_device_type_gatt', table_name='event')
+    op.drop_index('ix_bledevices_lower_device_mac_address', table_name='bledevices')
@@ -0,0 +1,83 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""data app event subscriptions as a join table
+
+Moves data_app.events (an array of SDF event references) into
+data_app_event rows. The primary key serves lookups by data app, and
+the event_name index serves the fan-out from an event to its data apps.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 10:41:12.514306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """ Apply this revision """
+    op.create_table('data_app_event',
+    sa.Column('data_app_id', sa.Uuid(), nullable=False),
+    sa.Column('event_name', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['data_app_id'], ['data_app.data_app_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('data_app_id', 'event_name')
+    )
+    op.create_index('ix_data_app_event_event_name', 'data_app_event', ['event_name'],
+                    unique=False)
+
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(
+            "INSERT INTO data_app_event (data_app_id, event_name) "
+            "SELECT DISTINCT data_app.data_app_id, event.value FROM data_app, "
+            "json_each(data_app.events) AS event "
+            "WHERE event.value IS NOT NULL"
+        )
+    else:
+        op.execute(
+            "INSERT INTO data_app_event (data_app_id, event_name) "
+            "SELECT DISTINCT data_app.data_app_id, event.name FROM data_app "
+            "CROSS JOIN LATERAL unnest(data_app.events) AS event(name) "
+            "WHERE event.name IS NOT NULL"
+        )
+
+    op.drop_index('ix_data_app_events', table_name='data_app')
+    op.drop_column('data_app', 'events')
+
+
+def downgrade():
+    """ Revert this revision """
+    op.add_column('data_app', sa.Column(
+        'events',
+        sa.ARRAY(sa.String()).with_variant(sa.JSON(none_as_null=True), 'sqlite'),
+        nullable=True))
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(
+            "UPDATE data_app SET events = (SELECT json_group_array(event_name) FROM ("
+            "SELECT event_name FROM data_app_event "
+            "WHERE data_app_event.data_app_id = data_app.data_app_id "
+            "ORDER BY event_name)) "
+            "WHERE data_app_id IN (SELECT data_app_id FROM data_app_event)"
+        )
+    else:
+        op.execute(
+            "UPDATE data_app SET events = subscriptions.events FROM ("
+            "SELECT data_app_id, array_agg(event_name ORDER BY event_name) AS events "
+            "FROM data_app_event GROUP BY data_app_id) AS subscriptions "
+            "WHERE data_app.data_app_id = subscriptions.data_app_id"
+        )
+    op.create_index('ix_data_app_events', 'data_app', ['events'],
+                    unique=False, postgresql_using='gin')
+
+    op.drop_index('ix_data_app_event_event_name', table_name='data_app_event')
+    op.drop_table('data_app_event')
@@ -13,20 +13,22 @@ from typing import List, Optional
 
 import uuid
 from sqlalchemy import Boolean, Column, DateTime, \
-    ForeignKey, String, ARRAY
-from sqlalchemy.dialects.postgresql import UUID
+    ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, relationship, mapped_column
 from config import EXTERNAL_HOST, EXTERNAL_PORT, MQTT_PORT
 from scim_extensions import scim_ext_read
 from database import db
+from db_types import Uuid, string_list
+from etags import make_etag
 
 
 devices_endpoint_apps = db.Table(
     "devices_endpoint_apps",
-    Column("endpoint_app_id", UUID(as_uuid=True),
+    Column("endpoint_app_id", Uuid,
            ForeignKey("endpoint_app.id"), primary_key=True),
     Column(
-        "device_id", UUID(as_uuid=True), ForeignKey("devices.device_id"), primary_key=True
+        "device_id", Uuid, ForeignKey("devices.device_id"), primary_key=True,
+        index=True
     ),
 )
 
@@ -34,12 +36,16 @@ devices_endpoint_apps = db.Table(
 class Device(db.Model):
     """ Core elements of Tiedie devices."""
     __tablename__ = "devices"
-    device_id = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    schemas = mapped_column(ARRAY(String))
-    display_name = mapped_column(String)
+    device_id = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    schemas = mapped_column(string_list())
+    display_name = mapped_column(String, index=True)
     active = mapped_column(Boolean)
     created_time = mapped_column(String)
     modified_time = mapped_column(String)
+    # Bumped on every update; drives ETags and SCIM meta.version
+    version = mapped_column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
 
     endpoint_apps: Mapped[List["EndpointApp"]] = relationship(
         "EndpointApp", secondary=devices_endpoint_apps)
@@ -66,6 +72,11 @@ class Device(db.Model):
         self.modified_time = created_time
 
 
+    @property
+    def etag(self) -> str:
+        """Strong entity tag of the current device representation"""
+        return make_etag("Device", self.device_id, self.version)
+
     def serialize(self):
         """serialize function"""
         response = {
@@ -75,7 +86,8 @@ class Device(db.Model):
             "active": self.active,
             "meta": {"resourceType": "Device",
                      "created": self.created_time,
-                     "lastModified": self.modified_time},
+                     "lastModified": self.modified_time,
+                     "version": f'"{self.etag}"'},
             }
         for read_fn in scim_ext_read:
             read_fn(self, response)
@@ -101,13 +113,14 @@ class EndpointApp(db.Model):
     __tablename__ = "endpoint_app"
 
     id: Mapped[str] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+        Uuid, primary_key=True, default=uuid.uuid4)
     applicationType: Mapped[str] = mapped_column(String())
     applicationName: Mapped[str] = mapped_column(
         String(), unique=True, nullable=False)
     rootCA: Mapped[Optional[str]] = mapped_column(String())
-    subjectName: Mapped[Optional[str]] = mapped_column(String())
-    clientToken: Mapped[Optional[UUID]] = mapped_column(String())
+    # Looked up on every control request
+    subjectName: Mapped[Optional[str]] = mapped_column(String(), index=True)
+    clientToken: Mapped[Optional[str]] = mapped_column(String(), index=True)
     createdTime: Mapped[datetime] = mapped_column(DateTime())
     modifiedTime: Mapped[datetime] = mapped_column(DateTime())
     password: Mapped[Optional[str]] = mapped_column(String())
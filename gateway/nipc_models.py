@@ -16,29 +16,42 @@ import uuid
 from sqlalchemy import (
     JSON,
     Boolean,
+    Column,
     ForeignKey,
     Integer,
     String,
-    ARRAY,
-    BigInteger
+    BigInteger,
+    Index,
+    func,
+    inspect
 )
-from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, relationship, mapped_column
 from database import db
+from db_types import Uuid, string_list
 from models import Device
 
+
+device_group_members = db.Table(
+    "device_group_members",
+    Column("group_id", Uuid,
+           ForeignKey("device_group.group_id", ondelete="CASCADE"), primary_key=True),
+    Column("device_id", Uuid,
+           ForeignKey("devices.device_id", ondelete="CASCADE"), primary_key=True,
+           index=True),
+)
+
 class BleExtension(db.Model):
     """ Represent BLE device information and associated data fields. """
     __tablename__ = "bledevices"
 
-    device_id = mapped_column(UUID(as_uuid=True),ForeignKey("devices.device_id"),
+    device_id = mapped_column(Uuid,ForeignKey("devices.device_id"),
                               primary_key=True)
-    device_mac_address = mapped_column(String)
-    version_support = mapped_column(ARRAY(String))
+    device_mac_address = mapped_column(String, index=True)
+    version_support = mapped_column(string_list())
     is_random = mapped_column(Boolean())
-    separate_broadcast_address = mapped_column(ARRAY(String))
+    separate_broadcast_address = mapped_column(string_list())
     irk = mapped_column(String)
-    pairing_methods = mapped_column(ARRAY(String))
+    pairing_methods = mapped_column(string_list())
     pairing_null = mapped_column(String)
     pairing_just_works_key = mapped_column(Integer)
     pairing_pass_key = mapped_column(Integer)
@@ -57,7 +70,7 @@ class BleExtension(db.Model):
         irk,
         pairing_methods,
         pairing_null,
-        pairing_just_works_keys,
+        pairing_just_works_key,
         pairing_pass_key,
         pairing_oob_key,
         pairing_oobrn,
@@ -70,7 +83,7 @@ class BleExtension(db.Model):
         self.irk = irk
         self.pairing_methods = pairing_methods
         self.pairing_null = pairing_null
-        self.pairing_just_works_key = pairing_just_works_keys
+        self.pairing_just_works_key = pairing_just_works_key
         self.pairing_pass_key = pairing_pass_key
         self.pairing_oob_key = pairing_oob_key
         self.pairing_oobrn = pairing_oobrn
@@ -116,13 +129,20 @@ class BleExtension(db.Model):
         return response
 
 
+# Data producers match advertisement addresses case-insensitively
+Index("ix_bledevices_lower_device_mac_address", func.lower(BleExtension.device_mac_address))
+
+
 class SdfModel(db.Model):
     """Represents a registered SDF model for a class of devices."""
     __tablename__ = "sdf_model"
 
-    id = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     sdf_name = mapped_column(String, unique=True, nullable=False, index=True)
     model = mapped_column(JSON, nullable=False)
+    version = mapped_column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
 
     def __init__(self, sdf_name: str, model: dict):
         self.sdf_name = sdf_name
@@ -134,39 +154,86 @@ class SdfModel(db.Model):
                 "sdfName": self.sdf_name
             }
 
+class DataAppEvent(db.Model):
+    """An event that a data application is subscribed to."""
+    __tablename__ = "data_app_event"
+
+    data_app_id = mapped_column(
+            ForeignKey("data_app.data_app_id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    # SDF event reference, matched against Event.event_name on fan-out
+    event_name = mapped_column(String, primary_key=True, index=True)
+
+    def __init__(self, event_name: str):
+        self.event_name = event_name
+
 class DataApp(db.Model):
     """Represents a registered data application."""
     __tablename__ = "data_app"
 
     data_app_id = mapped_column(
-        UUID(as_uuid=True),
-        ForeignKey("endpoint_app.id"),
+            ForeignKey("endpoint_app.id"),
         primary_key=True,
         default=uuid.uuid4
     )
-    # events is an array of strings
-    events = mapped_column(ARRAY(String))
+    version = mapped_column(Integer, nullable=False, server_default="1")
+
+    subscriptions: Mapped[list[DataAppEvent]] = relationship(
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by=DataAppEvent.event_name
+    )
+
+    __mapper_args__ = {"version_id_col": version}
 
     def __init__(self, data_app_id: str, events: list[str]):
         self.data_app_id = data_app_id
         self.events = events
 
+    @property
+    def events(self) -> list[str]:
+        """Names of the subscribed events."""
+        return [subscription.event_name for subscription in self.subscriptions]
+
+    @events.setter
+    def events(self, events: list[str]):
+        """Replace the subscribed events, touching only the rows that change."""
+        wanted = dict.fromkeys(events)
+        current = {subscription.event_name: subscription
+                   for subscription in self.subscriptions}
+        if wanted.keys() == current.keys():
+            return
+        self.subscriptions = [current.get(name) or DataAppEvent(name) for name in wanted]
+        if inspect(self).persistent:
+            # Subscription changes do not touch the data_app row; bump the
+            # version by hand so that the ETag changes
+            self.version = self.version + 1
+
 class Event(db.Model):
     """Represents an event."""
     __tablename__ = "event"
 
-    instance_id = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    instance_id = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     event_name = mapped_column(String, unique=True, nullable=False)
-    device_id = mapped_column(UUID(as_uuid=True), ForeignKey("devices.device_id"), nullable=False)
+    device_id = mapped_column(Uuid, ForeignKey("devices.device_id"), nullable=False)
     # event type can be "advertisements", "connection_events", "gatt"
     event_type = mapped_column(String, nullable=False)
     gatt_service_id = mapped_column(String, nullable=True)
     gatt_characteristic_id = mapped_column(String, nullable=True)
+    version = mapped_column(Integer, nullable=False, server_default="1")
+
+    __table_args__ = (
+        # Leading columns also serve lookups by device and by device and type
+        Index("ix_event_device_type_gatt", "device_id", "event_type",
+              "gatt_service_id", "gatt_characteristic_id"),
+    )
+    __mapper_args__ = {"version_id_col": version}
 
     def __init__(
             self,
             event_name: str,
-            instance_id: UUID,
+            instance_id: uuid.UUID,
             device_id: str,
             event_type: str,
             gatt_service_id: Optional[str],
@@ -178,3 +245,22 @@ class Event(db.Model):
         self.event_type = event_type
         self.gatt_service_id = gatt_service_id
         self.gatt_characteristic_id = gatt_characteristic_id
+
+
+class DeviceGroup(db.Model):
+    """Represents a saved group of devices for fan-out operations."""
+    __tablename__ = "device_group"
+
+    group_id = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+
+    devices: Mapped[list[Device]] = relationship(secondary=device_group_members)
+
+    def __init__(self, devices: list[Device]):
+        self.devices = devices
+
+    def serialize(self) -> dict:
+        """Serialize the device group to a dictionary."""
+        return {
+            "id": str(self.group_id),
+            "devices": [str(device.device_id) for device in self.devices]
+        }
@@ -0,0 +1,67 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+
+WSGI middleware that exposes the TLS client certificate of a request as
+environ["peercert"], an OpenSSL X509 or None, for certificate-based
+authentication.
+
+When the WSGI server terminates TLS itself (the Werkzeug development
+server, gunicorn), the certificate is read from the connection socket.
+Behind a TLS-terminating proxy, set PEER_CERT_HEADER to the request
+header in which the proxy passes the URL-encoded PEM certificate; the
+socket is then ignored, and so is the header when it is not configured.
+
+"""
+
+import logging
+from typing import TYPE_CHECKING
+from urllib.parse import unquote
+
+from config import PEER_CERT_HEADER
+
+if TYPE_CHECKING:
+    import OpenSSL
+
+
+class PeerCertMiddleware:
+    """ Sets environ["peercert"] from the TLS socket or a proxy header """
+
+    def __init__(self, app, header: str | None = PEER_CERT_HEADER):
+        self.app = app
+        self.environ_key = "HTTP_" + header.upper().replace("-", "_") if header else None
+
+    def __call__(self, environ, start_response):
+        environ["peercert"] = self.peer_cert(environ)
+        return self.app(environ, start_response)
+
+    def peer_cert(self, environ) -> "OpenSSL.crypto.X509 | None":
+        """ The client certificate of a request, if any """
+        # Loaded with the first request, rather than at startup
+        # pylint: disable-next=import-outside-toplevel,redefined-outer-name
+        import OpenSSL.crypto
+
+        if self.environ_key is not None:
+            pem = environ.get(self.environ_key)
+            if not pem:
+                return None
+            try:
+                return OpenSSL.crypto.load_certificate(  # type: ignore
+                    OpenSSL.crypto.FILETYPE_PEM, unquote(pem).encode())  # type: ignore
+            except OpenSSL.crypto.Error:
+                logging.warning("Ignoring malformed client certificate in %s", self.environ_key)
+                return None
+
+        for key in ("werkzeug.socket", "gunicorn.socket"):
+            getpeercert = getattr(environ.get(key), "getpeercert", None)
+            if getpeercert is None:
+                continue
+            x509_binary = getpeercert(True)
+            if x509_binary is None:
+                return None
+            return OpenSSL.crypto.load_certificate(  # type: ignore
+                OpenSSL.crypto.FILETYPE_ASN1, x509_binary)  # type: ignore
+        return None
@@ -0,0 +1,46 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+
+Runs the BLE radio in a process of its own, so that the HTTP APIs can be
+served by several WSGI worker processes (see wsgi.py).
+
+The daemon applies migrations, boots the access point, publishes radio
+events to MQTT, runs the ISE reconciliation and FDO upload jobs, and
+serves the access point to the workers on RADIO_SOCKET. Start it before
+the workers; it runs until SIGTERM or SIGINT.
+
+"""
+
+import logging
+import signal
+import threading
+
+from app import start_radio, stop_radio
+from config import RADIO_SOCKET
+from radio_rpc import RadioRpcServer
+
+
+def main():
+    """ Serve the radio until told to stop """
+    logging.basicConfig(level=logging.INFO)
+    ble_ap, mqtt_client = start_radio()
+
+    server = RadioRpcServer(ble_ap, RADIO_SOCKET)
+    server.start()
+    logging.info("Radio listening on %s", RADIO_SOCKET)
+
+    stopping = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: stopping.set())
+    stopping.wait()
+
+    server.stop()
+    stop_radio(ble_ap, mqtt_client)
+
+
+if __name__ == "__main__":
+    main()
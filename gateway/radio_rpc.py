@@ -0,0 +1,502 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+
+This module lets the BLE radio, which only one process can own, serve
+any number of HTTP worker processes.
+
+The radio daemon wraps its access point in a RadioRpcServer, listening
+on a Unix socket. Workers install a RemoteAccessPoint, which implements
+the AccessPoint interface with calls to the daemon, so the blueprints
+use the radio as before. Stream events and notified or written values
+produced by the daemon are pushed back to every worker, which hands them
+to its own event broker and value cache. A worker that invalidates the
+values of a device has the daemon invalidate them in every worker.
+
+Messages are CBOR maps, each preceded by its length as 4 big-endian
+bytes. A request is {"id", "method", "params"}; the reply is {"id",
+"result"} or {"id", "error": {"type", "message"}}, where type names one
+of the access point errors. After its reply, the "events" method turns
+the connection into a one-way stream of {"event": [...]}, {"value":
+[...]} and {"invalidate": address} messages.
+
+"""
+
+import itertools
+import logging
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+from typing import Any, Iterable, Optional
+
+import cbor2
+
+from access_point import AccessPoint, BleConnectOptions, ConnectionRequest
+from access_point_responses import (
+    AccessPointError, BleConnectionError, BleDisconnectError, BleDiscoveryError,
+    BleReadError, BleSubscribeError, BleUnsubscribeError, BleWriteError,
+    DiscoverResponse, ReadResponse, SubscribeResponse, UnsubscribeResponse, WriteResponse
+)
+from ble_types import Characteristic, Descriptor, Service
+from config import RADIO_RECONNECT, RADIO_RPC_TIMEOUT, RADIO_SOCKET
+from event_stream import EventBroker, event_broker
+from value_cache import ValueCache, value_cache
+
+_HEADER = struct.Struct(">I")
+_MAX_MESSAGE = 16 * 1024 * 1024
+_STREAM_QUEUE_SIZE = 1024
+
+_ERRORS = {error.__name__: error for error in (
+    AccessPointError, BleConnectionError, BleDiscoveryError, BleReadError,
+    BleWriteError, BleSubscribeError, BleUnsubscribeError, BleDisconnectError)}
+
+
+def _send(sock: socket.socket, message: dict):
+    payload = cbor2.dumps(message)
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            if data:
+                raise ConnectionError("truncated radio RPC message")
+            return None
+        data += chunk
+    return bytes(data)
+
+
+def _recv(sock: socket.socket) -> Optional[dict]:
+    """ The next message, or None if the peer closed the connection """
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    (size,) = _HEADER.unpack(header)
+    if size > _MAX_MESSAGE:
+        raise ConnectionError(f"radio RPC message of {size} bytes is too large")
+    payload = _recv_exact(sock, size)
+    if payload is None:
+        raise ConnectionError("truncated radio RPC message")
+    return cbor2.loads(payload)
+
+
+def _encode_services(services: Iterable[Service]) -> list[dict]:
+    return [
+        {
+            "id": svc.service_id,
+            "handle": svc.service_handle,
+            "characteristics": [
+                {
+                    "id": char.characteristic_id,
+                    "handle": char.char_handle,
+                    "properties": char.properties,
+                    "descriptors": [[desc.descriptor_id, desc.desc_handle]
+                                    for desc in char.descriptors.values()],
+                }
+                for char in svc.characteristics.values()
+            ],
+        }
+        for svc in services
+    ]
+
+
+def _decode_services(services: list[dict]) -> list[Service]:
+    decoded = []
+    for svc in services:
+        characteristics = {}
+        for char in svc["characteristics"]:
+            characteristic = Characteristic(char["id"], char["handle"], 0)
+            characteristic.properties = list(char["properties"])
+            characteristic.descriptors = {
+                descriptor_id: Descriptor(descriptor_id, handle)
+                for descriptor_id, handle in char["descriptors"]
+            }
+            characteristics[characteristic.characteristic_id] = characteristic
+        decoded.append(Service(svc["id"], svc["handle"], characteristics))
+    return decoded
+
+
+def _encode_connection(conn: ConnectionRequest) -> dict:
+    return {
+        "address": conn.address,
+        "handle": conn.handle,
+        "services": _encode_services(conn.services.values()),
+    }
+
+
+def _decode_connection(conn: dict) -> ConnectionRequest:
+    services = _decode_services(conn["services"])
+    return ConnectionRequest(conn["address"], conn["handle"],
+                             {svc.service_id: svc for svc in services})
+
+
+def _encode_options(options: BleConnectOptions) -> dict:
+    return {
+        "services": options.services,
+        "cached": options.cached,
+        "cache_idle_purge": options.cache_idle_purge,
+    }
+
+
+def _error_type(error: Exception) -> str:
+    for cls in type(error).__mro__:
+        if cls.__name__ in _ERRORS and issubclass(cls, AccessPointError):
+            return cls.__name__
+    return AccessPointError.__name__
+
+
+class _RpcHandler(socketserver.BaseRequestHandler):
+    """ Serves the requests of one client connection """
+
+    def handle(self):
+        rpc: RadioRpcServer = self.server.rpc # type: ignore
+        try:
+            while (request := _recv(self.request)) is not None:
+                if request.get("method") == "events":
+                    rpc.stream_events(self.request, request.get("id"))
+                    return
+                _send(self.request, rpc.reply(request))
+        except (OSError, ValueError) as e:
+            logging.debug("Radio RPC client dropped: %s", e)
+
+
+class RadioRpcServer:
+    """ Serves an access point to other processes on a Unix socket """
+
+    def __init__(self,
+                 access_point: AccessPoint,
+                 path: str = RADIO_SOCKET,
+                 broker: Optional[EventBroker] = None,
+                 cache: Optional[ValueCache] = None):
+        self.access_point = access_point
+        self.path = path
+        self.broker = broker or event_broker()
+        self.cache = cache or value_cache()
+        self._server: Optional[socketserver.ThreadingUnixStreamServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._streams: list[queue.Queue] = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        """ Listen on the socket, replacing the one of a previous run """
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = socketserver.ThreadingUnixStreamServer(self.path, _RpcHandler)
+        self._server.daemon_threads = True
+        self._server.rpc = self # type: ignore
+        # Workers run as the same user, or in the daemon's group
+        os.chmod(self.path, 0o660)
+
+        self.broker.add_listener(self._forward_event)
+        self.cache.add_listener(self._forward_value)
+        self.cache.add_invalidation_listener(self._forward_invalidation)
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="radio-rpc", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """ Stop serving and end the event streams """
+        self.broker.remove_listener(self._forward_event)
+        self.cache.remove_listener(self._forward_value)
+        self.cache.remove_invalidation_listener(self._forward_invalidation)
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+        with self._lock:
+            streams, self._streams = self._streams, []
+        for events in streams:
+            events.put(None)
+
+    def reply(self, request: dict) -> dict:
+        """ Run one request against the access point """
+        request_id = request.get("id")
+        method = getattr(self, f"_rpc_{request.get('method')}", None)
+        if method is None:
+            return {"id": request_id, "error": {
+                "type": AccessPointError.__name__,
+                "message": f"unknown method {request.get('method')}"}}
+        try:
+            return {"id": request_id, "result": method(**request.get("params", {}))}
+        except Exception as e: # pylint: disable=broad-except
+            if not isinstance(e, AccessPointError):
+                logging.exception("Radio RPC %s failed", request.get("method"))
+            return {"id": request_id, "error": {"type": _error_type(e), "message": str(e)}}
+
+    def stream_events(self, sock: socket.socket, request_id: Any):
+        """ Push forwarded events to a client until it goes away """
+        events: queue.Queue = queue.Queue(maxsize=_STREAM_QUEUE_SIZE)
+        with self._lock:
+            self._streams.append(events)
+        try:
+            # Tells the client that nothing is missed from now on
+            _send(sock, {"id": request_id, "result": None})
+            while (message := events.get()) is not None:
+                _send(sock, message)
+        finally:
+            with self._lock:
+                if events in self._streams:
+                    self._streams.remove(events)
+
+    def _forward(self, message: dict):
+        with self._lock:
+            streams = list(self._streams)
+        for events in streams:
+            try:
+                events.put_nowait(message)
+            except queue.Full:
+                logging.warning("Radio event stream is full; dropping an event")
+
+    def _forward_event(self, data_app_id: str, event_name: str, payload: bytes):
+        self._forward({"event": [data_app_id, event_name, payload]})
+
+    def _forward_value(self, address: str, service_uuid: str, char_uuid: str, value: bytes):
+        self._forward({"value": [address, service_uuid, char_uuid, value]})
+
+    def _forward_invalidation(self, address: str):
+        self._forward({"invalidate": address})
+
+    def _rpc_status(self) -> dict:
+        return {
+            "ready": self.access_point.ready.is_set(),
+            "connectable": bool(self.access_point.connectable()),
+            "connection_count": self.access_point.connection_count(),
+        }
+
+    def _rpc_connections(self) -> dict:
+        return {address: _encode_connection(conn)
+                for address, conn in list(self.access_point.conn_reqs.items())}
+
+    def _rpc_connection(self, address: str) -> Optional[dict]:
+        conn = self.access_point.get_connection(address)
+        return _encode_connection(conn) if conn is not None else None
+
+    def _rpc_connect(self, address: str, options: dict, retries: int):
+        self.access_point.connect(address, BleConnectOptions(**options), retries)
+
+    def _rpc_discover(self, address: str, options: dict, retries: int) -> list[dict]:
+        response = self.access_point.discover(address, BleConnectOptions(**options), retries)
+        return _encode_services(response.services)
+
+    def _rpc_read(self, address: str, service_uuid: str, char_uuid: str) -> bytes:
+        return self.access_point.read(address, service_uuid, char_uuid).value
+
+    def _rpc_write(self, address: str, service_uuid: str, char_uuid: str, value: bytes) -> bool:
+        success = self.access_point.write(address, service_uuid, char_uuid, value).success
+        if success:
+            # Forwarded, so that no worker serves the value from before the write
+            self.cache.put(address, service_uuid, char_uuid, value)
+        return success
+
+    def _rpc_subscribe(self, address: str, service_uuid: str, char_uuid: str) -> bool:
+        return self.access_point.subscribe(address, service_uuid, char_uuid).subscribed
+
+    def _rpc_unsubscribe(self, address: str, service_uuid: str, char_uuid: str) -> bool:
+        return self.access_point.unsubscribe(address, service_uuid, char_uuid).unsubscribed
+
+    def _rpc_disconnect(self, address: str):
+        self.access_point.disconnect(address)
+
+    def _rpc_invalidate(self, address: str):
+        self.cache.invalidate(address)
+
+
+class RemoteAccessPoint(AccessPoint):
+    """
+    The access point of the radio daemon, for HTTP workers. Calls are
+    synchronous and may run concurrently, over a pool of connections.
+    ready is set while the event stream from the daemon is open.
+    """
+
+    def __init__(self,
+                 path: str = RADIO_SOCKET,
+                 timeout: float = RADIO_RPC_TIMEOUT,
+                 reconnect_delay: float = RADIO_RECONNECT,
+                 broker: Optional[EventBroker] = None,
+                 cache: Optional[ValueCache] = None):
+        super().__init__(None) # type: ignore
+        self.path = path
+        self.timeout = timeout
+        self.reconnect_delay = reconnect_delay
+        self.broker = broker or event_broker()
+        self.cache = cache or value_cache()
+        self._idle: list[socket.socket] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._stream: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property # type: ignore[override]
+    def conn_reqs(self) -> dict[str, ConnectionRequest]: # pylint: disable=invalid-overridden-method
+        """
+        Current connections of the radio, with their services. Each access
+        is a round trip that grows with the connections; prefer
+        get_connection and connection_count.
+        """
+        return {address: _decode_connection(conn)
+                for address, conn in self._call("connections").items()}
+
+    def get_connection(self, address: str) -> Optional[ConnectionRequest]:
+        conn = self._call("connection", address=address)
+        return _decode_connection(conn) if conn is not None else None
+
+    def start(self):
+        """ Open the event stream from the daemon """
+        self._stopping.clear()
+        self.cache.add_invalidation_listener(self._invalidate_everywhere)
+        self._thread = threading.Thread(target=self._run, name="radio-events", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        self.cache.remove_invalidation_listener(self._invalidate_everywhere)
+        with self._lock:
+            stream, self._stream = self._stream, None
+            idle, self._idle = self._idle, []
+        for sock in idle + ([stream] if stream is not None else []):
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def connection_count(self) -> int:
+        return self._call("status")["connection_count"]
+
+    def connectable(self):
+        return self._call("status")["connectable"]
+
+    def start_scan(self):
+        """ Scanning is up to the daemon """
+
+    def connect(self,
+                address: str,
+                ble_connect_options: BleConnectOptions,
+                retries: int = 3) -> None:
+        self._call("connect", address=address, options=_encode_options(ble_connect_options),
+                   retries=retries)
+
+    def discover(self,
+                 address: str,
+                 ble_connect_options: BleConnectOptions,
+                 retries: int = 3) -> DiscoverResponse:
+        services = self._call("discover", address=address,
+                              options=_encode_options(ble_connect_options), retries=retries)
+        return DiscoverResponse(address, _decode_services(services))
+
+    def read(self, address: str, service_uuid: str, char_uuid: str) -> ReadResponse:
+        value = self._call("read", address=address, service_uuid=service_uuid,
+                           char_uuid=char_uuid)
+        return ReadResponse(address, service_uuid, char_uuid, value)
+
+    def write(self,
+              address: str,
+              service_uuid: str,
+              char_uuid: str,
+              value: bytes) -> WriteResponse: # type: ignore[override]
+        success = self._call("write", address=address, service_uuid=service_uuid,
+                             char_uuid=char_uuid, value=value)
+        return WriteResponse(address, service_uuid, char_uuid, value, success)
+
+    def subscribe(self, address: str, service_uuid: str, char_uuid: str) -> SubscribeResponse:
+        subscribed = self._call("subscribe", address=address, service_uuid=service_uuid,
+                                char_uuid=char_uuid)
+        return SubscribeResponse(address, service_uuid, char_uuid, subscribed)
+
+    def unsubscribe(self, address: str, service_uuid: str, char_uuid: str) -> UnsubscribeResponse:
+        unsubscribed = self._call("unsubscribe", address=address, service_uuid=service_uuid,
+                                  char_uuid=char_uuid)
+        return UnsubscribeResponse(address, service_uuid, char_uuid, unsubscribed)
+
+    def disconnect(self, address: str) -> None:
+        self._call("disconnect", address=address)
+
+    def _invalidate_everywhere(self, address: str):
+        try:
+            self._call("invalidate", address=address)
+        except AccessPointError as e:
+            # The cache of every worker is cleared when the stream reopens
+            logging.warning("Could not invalidate the values of %s in other workers: %s",
+                            address, e)
+
+    def _open(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _call(self, method: str, **params) -> Any:
+        with self._lock:
+            sock = self._idle.pop() if self._idle else None
+        request_id = next(self._ids)
+        try:
+            if sock is None:
+                sock = self._open()
+            _send(sock, {"id": request_id, "method": method, "params": params})
+            reply = _recv(sock)
+            if reply is None or reply.get("id") != request_id:
+                raise ConnectionError("unexpected reply from the radio daemon")
+        except (OSError, ValueError) as e:
+            if sock is not None:
+                sock.close()
+            raise AccessPointError(f"radio daemon unavailable: {e}") from e
+
+        with self._lock:
+            self._idle.append(sock)
+        if "error" in reply:
+            error = reply["error"]
+            raise _ERRORS.get(error["type"], AccessPointError)(error["message"])
+        return reply.get("result")
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                sock = self._open()
+                sock.settimeout(None)
+                with self._lock:
+                    if self._stopping.is_set():
+                        sock.close()
+                        return
+                    self._stream = sock
+                _send(sock, {"id": 0, "method": "events", "params": {}})
+                if _recv(sock) is None:
+                    raise ConnectionError("radio daemon closed the event stream")
+                # Values may have changed or been invalidated while the stream was down
+                self.cache.clear()
+                self.ready.set()
+                while (message := _recv(sock)) is not None:
+                    if "event" in message:
+                        self.broker.publish(*message["event"])
+                    elif "value" in message:
+                        self.cache.put(*message["value"], notify=False)
+                    elif "invalidate" in message:
+                        self.cache.invalidate(message["invalidate"], notify=False)
+            except (OSError, ValueError) as e:
+                if not self._stopping.is_set():
+                    logging.warning("Radio event stream lost: %s", e)
+            finally:
+                self.ready.clear()
+                with self._lock:
+                    sock, self._stream = self._stream, None
+                if sock is not None:
+                    sock.close()
+            self._stopping.wait(self.reconnect_delay)
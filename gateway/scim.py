@@ -10,25 +10,71 @@ app management, authentication, and error handling.
 
 """
 
+import base64
 import uuid
 import datetime
 import json
 from functools import wraps
-from flask import Blueprint, jsonify, make_response, request, current_app
-from sqlalchemy import select
-from werkzeug.test import EnvironBuilder
+from flask import Blueprint, Response, current_app, g, jsonify, make_response, request, \
+    stream_with_context
+from sqlalchemy import func as sql_func, select, true
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.attributes import flag_modified
+from config import SCIM_PAGE_SIZE, SCIM_STREAM_BATCH_SIZE, SCIM_STREAM_CHUNK_SIZE
 from tiedie_exceptions import DeviceExists, MABNotSupported, SchemaError, \
-    ISEError, FDONotSupported
-from scim_extensions import scim_ext_create, scim_ext_update, scim_ext_delete
-from database import session
+    ISEError, FDONotSupported, FilterError
+from scim_extensions import scim_ext_create, scim_ext_update, scim_ext_delete, \
+    scim_ext_filter
+from database import read_only, session
+from etags import conditional_response
 from models import EndpointApp, Device, OnboardingAppKey
-from util import make_hash
-from scim_ble import ble_get_filtered_entries
-from scim_ethermab import ethermab_get_filtered_entries
+from util import hash_password
+from scim_filter import FilterAttribute, compile_filter
+from scim_bulk import run_bulk
 from scim_error import blow_an_error
 
 scim_app = Blueprint("scim", __name__, url_prefix="/scim/v2")
 
+DEVICE_SCHEMA = "urn:ietf:params:scim:schemas:core:2.0:Device"
+ENDPOINT_APP_SCHEMA = "urn:ietf:params:scim:schemas:core:2.0:EndpointApp"
+
+DEVICE_FILTER_ATTRIBUTES = {
+    "id": FilterAttribute(Device.device_id, coerce=uuid.UUID),
+    "schemas": FilterAttribute(Device.schemas, multi_valued=True),
+    "displayName": FilterAttribute(Device.display_name),
+    "active": FilterAttribute(Device.active),
+    "meta.created": FilterAttribute(Device.created_time),
+    "meta.lastModified": FilterAttribute(Device.modified_time),
+}
+
+ENDPOINT_APPS_EXT_FILTER_ATTRIBUTES = {
+    "applications.value": FilterAttribute(EndpointApp.id, Device.endpoint_apps.any,
+                                          coerce=uuid.UUID),
+}
+
+ENDPOINT_APP_FILTER_ATTRIBUTES = {
+    "id": FilterAttribute(EndpointApp.id, coerce=uuid.UUID),
+    "applicationType": FilterAttribute(EndpointApp.applicationType),
+    "applicationName": FilterAttribute(EndpointApp.applicationName),
+    "certificateInfo.subjectName": FilterAttribute(EndpointApp.subjectName),
+    "meta.created": FilterAttribute(EndpointApp.createdTime,
+                                    coerce=lambda value: datetime.datetime.fromisoformat(
+                                        value.rstrip("Z"))),
+    "meta.lastModified": FilterAttribute(EndpointApp.modifiedTime,
+                                         coerce=lambda value: datetime.datetime.fromisoformat(
+                                             value.rstrip("Z"))),
+}
+
+
+def _device_filter_schemas():
+    """ Filterable Device attributes, including registered extensions """
+    return {
+        DEVICE_SCHEMA: DEVICE_FILTER_ATTRIBUTES,
+        "urn:ietf:params:scim:schemas:extension:endpointAppsExt:2.0:Device":
+            ENDPOINT_APPS_EXT_FILTER_ATTRIBUTES,
+        **scim_ext_filter,
+    }
+
 def authenticate_user(func):
     """Verify x-api-key"""
 
@@ -122,7 +168,8 @@ def create_device():
         session.commit()
 
         core=entry.serialize()
-        return make_response(jsonify(core),201)
+        # Extensions that finish their work in the background may ask for 202
+        return make_response(jsonify(core), g.pop("scim_create_status", 201))
     except DeviceExists:
         response= blow_an_error("Device already exists", 409,"uniqueness")
     except MABNotSupported:
@@ -139,6 +186,7 @@ def create_device():
 
 
 @scim_app.route("/Devices/<string:device_id>", methods=["GET"])
+@read_only
 @authenticate_user
 def read_device(device_id):
     """
@@ -150,58 +198,137 @@ def read_device(device_id):
     if not entry:
         return blow_an_error("Device not found",404)
 
-    return jsonify(entry.serialize())
+    return conditional_response(entry.etag, lambda: jsonify(entry.serialize()))
+
+
+def _device_list_query():
+    """
+    Select devices with every relationship Device.serialize() touches
+    loaded up front: extensions are joined, endpoint apps are fetched with
+    one IN query per batch.
+    """
+    return select(Device).options(
+        joinedload(Device.ble_extension),
+        joinedload(Device.ethermab_extension),
+        joinedload(Device.fdo_extension),
+        selectinload(Device.endpoint_apps),
+    )
+
+
+def _encode_cursor(key) -> str:
+    return base64.urlsafe_b64encode(str(key).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> uuid.UUID:
+    """ Raises ValueError for tokens we did not issue """
+    return uuid.UUID(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode())
+
+
+def _stream_list_response(query, header, page_size=None, key_attribute=None):
+    """
+    Stream a SCIM ListResponse, serializing one resource at a time so
+    that memory use does not grow with the number of resources.
+
+    The query runs when streaming starts: the session of the view is
+    removed when the view returns, before the body is sent.
+
+    With page_size and key_attribute set, the query returns up to one extra
+    row; if it is present, nextCursor points past the last returned one.
+    """
+    dumps = current_app.json.dumps
+
+    def generate():
+        yield dumps({"schemas": ["urn:ietf:params:scim:api:messages:2.0:ListResponse"],
+                     **header})[:-1] + ', "Resources": ['
+        items = 0
+        last = None
+        has_more = False
+        chunk = []
+        chunk_size = 0
+        resources = session.scalars(query)
+        try:
+            for resource in resources:
+                if page_size is not None and items == page_size:
+                    has_more = True
+                    break
+                encoded = dumps(resource.serialize())
+                chunk.append("," + encoded if items else encoded)
+                chunk_size += len(encoded)
+                items += 1
+                last = resource
+                if chunk_size >= SCIM_STREAM_CHUNK_SIZE:
+                    yield "".join(chunk)
+                    chunk = []
+                    chunk_size = 0
+        finally:
+            resources.close()
+
+        chunk.append(f'], "itemsPerPage": {items}')
+        if has_more and last is not None:
+            chunk.append(', "nextCursor": ' +
+                         dumps(_encode_cursor(getattr(last, key_attribute))))
+        chunk.append("}")
+        yield "".join(chunk)
+
+    return Response(stream_with_context(generate()), 200, mimetype="application/json")
+
+
+def _list_response(query, key_column, total_results):
+    """
+    Page query and stream it as a ListResponse. Supports index paging
+    (startIndex/count, RFC 7644 section 3.4.2.4) and keyset paging over
+    key_column (cursor/count, draft-ietf-scim-cursor-pagination), where
+    every page costs the same wherever it is in the result set.
+    """
+    try:
+        count = max(int(request.args["count"]), 0) if "count" in request.args else None
+        start_index = int(request.args["startIndex"]) if "startIndex" in request.args else None
+    except ValueError:
+        return blow_an_error("startIndex and count must be integers", 400, "invalidValue")
+
+    query = query.order_by(key_column)
+
+    if "cursor" in request.args:
+        if start_index is not None:
+            return blow_an_error("cursor and startIndex are mutually exclusive",
+                                 400, "invalidValue")
+        if request.args["cursor"]:
+            try:
+                query = query.filter(key_column > _decode_cursor(request.args["cursor"]))
+            except ValueError:
+                return blow_an_error("Invalid cursor", 400, "invalidCursor")
+
+        page_size = SCIM_PAGE_SIZE if count is None else count
+        if page_size == 0:
+            # Only the total: there is no last resource to continue after
+            return _stream_list_response(query.limit(0), {"totalResults": total_results})
+        return _stream_list_response(query.limit(page_size + 1),
+                                     {"totalResults": total_results},
+                                     page_size, key_column.key)
+
+    start_index = max(start_index or 1, 1)
+    return _stream_list_response(query.offset(start_index - 1).limit(count),
+                                 {"totalResults": total_results, "startIndex": start_index})
 
 
 @scim_app.route("/Devices", methods=["GET"])
+@read_only
 @authenticate_user
 def read_devices():
     """Get SCIM Devices"""
-    start_index = 1
-    count = None
-
-    if "start_index" in request.args:
-        start_index = int(request.args["startIndex"])
-
-    if "count" in request.args:
-        count = int(request.args["count"])
-
+    condition = true()
     if "filter" in request.args:
-        single_filter = request.args["filter"].split(" ")
-        filter_value = single_filter[2].strip('"')
-
-        ble_entries = ble_get_filtered_entries(filter_value)
-        mab_entries = ethermab_get_filtered_entries(filter_value)
-
-        entries = []
-        if ble_entries:
-            for ble_entry in ble_entries:
-                entries.append(ble_entry.device)
-        if mab_entries:
-            for mab_entry in mab_entries:
-                entries.append(mab_entry.device)
-    else:
-        entries = Device.query.paginate(
-            page=start_index, per_page=count, error_out=False).items
-
-    serialized_entries=[]
-    for entry in entries:
-        serialized_entry=entry.serialize()
-        serialized_entries.append(serialized_entry)
-
-
-    return make_response(
-        jsonify(
-            {
-                "schemas": ["urn:ietf:params:scim:api:messages:2.0:ListResponse"],
-                "totalResults": len(entries),
-                "startIndex": start_index,
-                "itemsPerPage": len(entries),
-                "Resources": serialized_entries,
-            }
-        ),
-        200,
-    )
+        try:
+            condition = compile_filter(request.args["filter"], _device_filter_schemas(),
+                                       DEVICE_SCHEMA)
+        except FilterError as e:
+            return blow_an_error(str(e), 400, "invalidFilter")
+
+    total_results = session.scalar(
+        select(sql_func.count()).select_from(Device).filter(condition))
+    query = _device_list_query().filter(condition) \
+        .execution_options(yield_per=SCIM_STREAM_BATCH_SIZE)
+    return _list_response(query, Device.device_id, total_results)
 
 
 @scim_app.route("/Devices/<string:entry_id>", methods=["PUT"])
@@ -228,12 +355,16 @@ def update_device(entry_id):
         entry.modified_time = datetime.datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
         for ext in scim_ext_update:
             ext(entry,request)
+        # Extension-only changes must still bump the device version
+        flag_modified(entry, "modified_time")
 
         session.commit()
     except Exception as e:
         return blow_an_error(str(e),400)
 
-    return make_response(jsonify(entry.serialize()),200)
+    response = make_response(jsonify(entry.serialize()),200)
+    response.set_etag(entry.etag)
+    return response
 
 @scim_app.route("/Devices/<string:entry_id>", methods=["DELETE"])
 @authenticate_user
@@ -252,6 +383,7 @@ def delete_device(entry_id):
     return make_response("", 204)
 
 @scim_app.route("/EndpointApps/<string:id>", methods=["GET"])
+@read_only
 @authenticate_user
 def read_endpoint(endpoint_id):
     """Get SCIM Endpoint"""
@@ -264,48 +396,23 @@ def read_endpoint(endpoint_id):
 
 
 @scim_app.route("/EndpointApps", methods=["GET"])
+@read_only
 @authenticate_user
 def read_endpoints():
     """Get SCIM Endpoint"""
-    start_index = 1
-    count = None
-
-    if "start_index" in request.args:
-        start_index = int(request.args["startIndex"])
-
-    if "count" in request.args:
-        count = int(request.args["count"])
-
+    condition = true()
     if "filter" in request.args:
-        single_filter = request.args["filter"].split(" ")
-        filter_value = single_filter[2].strip('"')
-
-        endpoint_apps = EndpointApp.query.filter_by(
-            applicationName=filter_value).first()
+        try:
+            condition = compile_filter(request.args["filter"],
+                                       {ENDPOINT_APP_SCHEMA: ENDPOINT_APP_FILTER_ATTRIBUTES},
+                                       ENDPOINT_APP_SCHEMA)
+        except FilterError as e:
+            return blow_an_error(str(e), 400, "invalidFilter")
 
-        if not endpoint_apps:
-            endpoint_apps = []
-        else:
-            endpoint_apps = [endpoint_apps]
-
-    else:
-        endpoint_apps = EndpointApp.query.paginate(
-            page=start_index, per_page=count, error_out=False).items
-
-    serialized_endpoint_apps = [e.serialize() for e in endpoint_apps]
-
-    return make_response(
-        jsonify(
-            {
-                "schemas": ["urn:ietf:params:scim:api:messages:2.0:ListResponse"],
-                "totalResults": len(endpoint_apps),
-                "startIndex": start_index,
-                "itemsPerPage": len(endpoint_apps),
-                "Resources": serialized_endpoint_apps,
-            }
-        ),
-        200,
-    )
+    total_results = session.scalar(
+        select(sql_func.count()).select_from(EndpointApp).filter(condition))
+    return _list_response(select(EndpointApp).filter(condition), EndpointApp.id,
+                          total_results)
 
 
 @scim_app.route('/EndpointApps', methods=['POST'])
@@ -327,9 +434,9 @@ def create_endpoint():
     endpoint_app.applicationName = request.json.get("applicationName")
     certificate_info = request.json.get("certificateInfo", None)
     if certificate_info is None:
-        endpoint_app.clientToken = uuid.uuid4()  # type: ignore
+        endpoint_app.clientToken = str(uuid.uuid4())
         if endpoint_app.applicationType == "telemetry":
-            endpoint_app.password = make_hash(str(endpoint_app.clientToken))
+            endpoint_app.password = hash_password(str(endpoint_app.clientToken))
     else:
         endpoint_app.rootCA = certificate_info.get("rootCA")
         endpoint_app.subjectName = certificate_info.get("subjectName")
@@ -358,54 +465,8 @@ def delete_endpoint(device_id):
 @scim_app.route("/Bulk", methods=["POST"])
 @authenticate_user
 def bulk_command():
-    """ Processes SCIM bulk requests, handles operations, and returns summarized results. """
+    """ Processes SCIM bulk requests (RFC 7644 section 3.7). """
     if request.json is None:
         return blow_an_error("Request body is not valid JSON.",400)
 
-    print(request.json.get("schemas"))
-    if request.json.get("schemas") == ["urn:ietf:params:scim:api:messages:2.0:BulkRequest"]:
-        operations = request.json.get("Operations")
-        results = []
-        for op in operations:
-            requestpath = op["path"]
-            method = op["method"]
-            data = op.get("data")
-            bulk_id = op.get("bulkId")
-
-            environ = EnvironBuilder(
-                path=requestpath,
-                method=method,
-                json=data,
-                environ_base=request.environ
-            ).get_environ()
-
-            with current_app.request_context(environ):
-                try:
-                    # Pre process Request
-                    rv = current_app.preprocess_request()
-
-                    if rv is None:
-                        # Main Dispatch
-                        rv = current_app.dispatch_request()
-
-                except Exception as e:
-                    rv = current_app.handle_user_exception(e)
-
-                response = current_app.make_response(rv)
-
-                # Post process Request
-                response = current_app.process_response(response)
-
-            if response.json is not None:
-                jn = dict(response.json)
-                jn["operation"] = op["operation"]
-                if bulk_id is not None:
-                    results.append({bulk_id: jn})
-                results.append(jn)
-
-                if jn["status"] == "FAILURE":
-                    break
-
-        return make_response(jsonify({"status": "SUCCESS", "operations": results}), 200)
-
-    return blow_an_error("Request body is not valid JSON.",400)
+    return run_bulk(request.json)
@@ -10,21 +10,17 @@ This module implements BLE dispatch for SCIM.
 from tiedie_exceptions import DeviceExists
 from nipc_models import BleExtension
 from database import session
+from models import Device
 from scim_extensions import register_scim_extension
+from scim_filter import FilterAttribute
+from value_cache import value_cache
 
-def ble_create_device(schemas,entry,request,device_id,update=False):
+BLE_SCHEMA = "urn:ietf:params:scim:schemas:extension:ble:2.0:Device"
+
+def ble_extension_values(device_id, ble_json):
     """
-    Process BLE SCIM creation request.  Return a BleExtension()
+    Map a BLE SCIM extension object to BleExtension column values.
     """
-    ble_schema="urn:ietf:params:scim:schemas:extension:ble:2.0:Device"
-    if not update:
-        if not ble_schema in schemas:
-            return
-        schemas.remove(ble_schema)
-
-    ble_json = request.json.get(ble_schema)
-    device_mac_address = ble_json.get("deviceMacAddress")
-
     pairing_just_works = ble_json.get(
         "urn:ietf:params:scim:schemas:extension:pairingJustWorks:2.0:Device")
     pairing_just_works_key = None
@@ -44,27 +40,40 @@ def ble_create_device(schemas,entry,request,device_id,update=False):
         pairing_oob_key = pairing.get("key")
         pairing_oobrn = pairing.get("randNumber")
 
+    return {
+        "device_id": device_id,
+        "version_support": ble_json.get("versionSupport"),
+        "device_mac_address": ble_json.get("deviceMacAddress"),
+        "is_random": ble_json.get("isRandom"),
+        "separate_broadcast_address": ble_json.get("separateBroadcastAddress", []),
+        "irk": ble_json.get("irk", ""),
+        "pairing_methods": ble_json.get("pairingMethods", []),
+        "pairing_null": "{}" if ble_json.get(
+                "urn:ietf:params:scim:schemas:extension:pairingNull:2.0:Device") else None,
+        "pairing_just_works_key": pairing_just_works_key,
+        "pairing_pass_key": pairing_pass_key,
+        "pairing_oob_key": pairing_oob_key,
+        "pairing_oobrn": pairing_oobrn,
+    }
+
+def ble_create_device(schemas,entry,request,device_id,update=False):
+    """
+    Process BLE SCIM creation request.  Return a BleExtension()
+    """
+    if not update:
+        if not BLE_SCHEMA in schemas:
+            return
+        schemas.remove(BLE_SCHEMA)
+
+    values = ble_extension_values(device_id, request.json.get(BLE_SCHEMA))
+
     existing_device = BleExtension.query.filter_by(
-        device_mac_address=device_mac_address).first()
+        device_mac_address=values["device_mac_address"]).first()
 
     if existing_device:
         raise DeviceExists("Device Exists")
 
-    entry.ble_extension = BleExtension(
-        device_id=device_id,
-        version_support = ble_json.get("versionSupport"),
-        device_mac_address=device_mac_address,
-        is_random=ble_json.get("isRandom"),
-        separate_broadcast_address = ble_json.get("separateBroadcastAddress", []),
-        irk = ble_json.get("irk", ""),
-        pairing_methods = ble_json.get("pairingMethods", []),
-        pairing_null = "{}" if ble_json.get(
-                "urn:ietf:params:scim:schemas:extension:pairingNull:2.0:Device") else None,
-        pairing_just_works_keys=pairing_just_works_key,
-        pairing_pass_key=pairing_pass_key,
-        pairing_oob_key=pairing_oob_key,
-        pairing_oobrn=pairing_oobrn,
-    )
+    entry.ble_extension = BleExtension(**values)
 
 def ble_update_device(parent,request):
     """
@@ -95,11 +104,6 @@ def ble_update_device(parent,request):
 
     return entry
 
-def ble_get_filtered_entries(mac_address):
-    """ returned filtered list """
-
-    return BleExtension.query.filter_by(device_mac_address=mac_address).all()
-
 def ble_read_device(entry,response):
     """
     Serialize BLE entry.
@@ -115,14 +119,28 @@ def ble_delete_device(entry_id):
     entry=session.get(BleExtension,entry_id)
     if not entry:
         return
+    address = entry.device_mac_address
     session.delete(entry)
     session.commit()
+    value_cache().invalidate(address)
 
 def register_ble_extension():
     """Register BLE SCIM extension hooks."""
+    scope = Device.ble_extension.has
     register_scim_extension(
         ble_create_device,
         ble_read_device,
         ble_update_device,
         ble_delete_device,
+        {BLE_SCHEMA: {
+            "deviceMacAddress": FilterAttribute(BleExtension.device_mac_address, scope),
+            "isRandom": FilterAttribute(BleExtension.is_random, scope),
+            "irk": FilterAttribute(BleExtension.irk, scope),
+            "versionSupport": FilterAttribute(BleExtension.version_support, scope,
+                                              multi_valued=True),
+            "pairingMethods": FilterAttribute(BleExtension.pairing_methods, scope,
+                                              multi_valued=True),
+            "separateBroadcastAddress": FilterAttribute(
+                BleExtension.separate_broadcast_address, scope, multi_valued=True),
+        }},
     )
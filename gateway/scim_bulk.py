@@ -0,0 +1,312 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+
+This module implements SCIM /Bulk (RFC 7644 section 3.7).
+
+Runs of plain device creations (core, BLE and endpoint app schemas) are
+validated together: MAC uniqueness and endpoint app lookups take one
+query per chunk, and the rows are written with batched INSERTs and a
+single commit per chunk. Every other operation is dispatched through
+the regular SCIM endpoints, one at a time.
+
+"""
+
+import dataclasses
+import datetime
+import uuid
+from typing import Any, Optional
+
+from flask import Response, current_app, jsonify, make_response, request
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.test import EnvironBuilder
+
+from config import BULK_CHUNK_SIZE, EXTERNAL_HOST, EXTERNAL_PORT
+from database import session
+from etags import make_etag
+from models import Device, EndpointApp, devices_endpoint_apps
+from nipc_models import BleExtension
+from scim_ble import ble_extension_values
+from scim_error import blow_an_error, scim_error_body
+
+BULK_REQUEST_SCHEMA = "urn:ietf:params:scim:api:messages:2.0:BulkRequest"
+BULK_RESPONSE_SCHEMA = "urn:ietf:params:scim:api:messages:2.0:BulkResponse"
+
+CORE_SCHEMA = "urn:ietf:params:scim:schemas:core:2.0:Device"
+BLE_SCHEMA = "urn:ietf:params:scim:schemas:extension:ble:2.0:Device"
+APPS_SCHEMA = "urn:ietf:params:scim:schemas:extension:endpointAppsExt:2.0:Device"
+BATCHED_SCHEMAS = {CORE_SCHEMA, BLE_SCHEMA, APPS_SCHEMA}
+
+SCIM_PREFIX = "/scim/v2"
+
+
+@dataclasses.dataclass
+class BulkOperation:
+    """ One parsed entry of a BulkRequest """
+    method: str
+    path: str
+    bulk_id: Optional[str]
+    data: Any
+
+
+def _scim_path(path: str) -> str:
+    """ Bulk paths are relative to the SCIM base URL """
+    path = path.rstrip("/")
+    if path.startswith(SCIM_PREFIX + "/"):
+        return path
+    return SCIM_PREFIX + path
+
+
+def _location(path: str) -> str:
+    return f"https://{EXTERNAL_HOST}:{EXTERNAL_PORT}{path}"
+
+
+def _operation_result(op: BulkOperation, status: int, location: Optional[str] = None,
+                      version: Optional[str] = None, response: Any = None) -> dict:
+    result: dict[str, Any] = {"method": op.method}
+    if op.bulk_id is not None:
+        result["bulkId"] = op.bulk_id
+    if version is not None:
+        result["version"] = version
+    if location is not None:
+        result["location"] = location
+    if response is not None:
+        result["response"] = response
+    result["status"] = str(status)
+    return result
+
+
+def _is_uuid(value) -> bool:
+    try:
+        uuid.UUID(str(value))
+        return True
+    except ValueError:
+        return False
+
+
+def _is_batchable(op: BulkOperation) -> bool:
+    """
+    True for well-formed device creations that need no extension side
+    effects. Anything else goes through the regular endpoint, which also
+    produces the usual validation errors.
+    """
+    data = op.data
+    if op.method != "POST" or op.path != SCIM_PREFIX + "/Devices":
+        return False
+    if not isinstance(data, dict) or "id" in data:
+        return False
+    if "displayName" not in data or "active" not in data:
+        return False
+
+    schemas = data.get("schemas")
+    if not isinstance(schemas, list) or CORE_SCHEMA not in schemas \
+            or not set(schemas) <= BATCHED_SCHEMAS:
+        return False
+    if BLE_SCHEMA in schemas and not isinstance(data.get(BLE_SCHEMA), dict):
+        return False
+    if APPS_SCHEMA in schemas:
+        apps_ext = data.get(APPS_SCHEMA)
+        if not isinstance(apps_ext, dict) or not isinstance(apps_ext.get("applications"), list):
+            return False
+        if not all(isinstance(app, dict) and _is_uuid(app.get("value"))
+                   for app in apps_ext["applications"]):
+            return False
+    return True
+
+
+def _mac_address(op: BulkOperation) -> Optional[str]:
+    if BLE_SCHEMA not in op.data["schemas"]:
+        return None
+    return op.data[BLE_SCHEMA].get("deviceMacAddress")
+
+
+def _app_ids(op: BulkOperation) -> list[uuid.UUID]:
+    if APPS_SCHEMA not in op.data["schemas"]:
+        return []
+    return [uuid.UUID(str(app.get("value")))
+            for app in op.data[APPS_SCHEMA]["applications"]]
+
+
+def _create_devices(ops: list[BulkOperation], max_errors: Optional[int]) -> Optional[list[dict]]:
+    """
+    Create a chunk of devices with one uniqueness query and batched
+    inserts. Stops after max_errors failures. Returns None if the batch
+    could not be written, in which case nothing was committed.
+    """
+    macs = {mac for mac in map(_mac_address, ops) if mac is not None}
+    taken = set(session.scalars(select(BleExtension.device_mac_address).filter(
+        BleExtension.device_mac_address.in_(macs)))) if macs else set()
+
+    app_ids = {app_id for op in ops for app_id in _app_ids(op)}
+    known_apps = set(session.scalars(select(EndpointApp.id).filter(
+        EndpointApp.id.in_(app_ids)))) if app_ids else set()
+
+    now = datetime.datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ")
+    devices, ble_extensions, app_links, results = [], [], [], []
+    errors = 0
+
+    for op in ops:
+        mac = _mac_address(op)
+        if mac is not None and mac in taken:
+            results.append(_operation_result(
+                op, 409, response=scim_error_body("Device already exists", 409, "uniqueness")))
+            errors += 1
+            if max_errors is not None and errors >= max_errors:
+                break
+            continue
+
+        device_id = uuid.uuid4()
+        if mac is not None:
+            taken.add(mac)
+        devices.append({
+            "device_id": device_id,
+            "schemas": op.data["schemas"],
+            "display_name": op.data["displayName"],
+            "active": op.data["active"],
+            "created_time": now,
+            "modified_time": now,
+            "version": 1,
+        })
+        if BLE_SCHEMA in op.data["schemas"]:
+            ble_extensions.append(ble_extension_values(device_id, op.data[BLE_SCHEMA]))
+        app_links.extend({"endpoint_app_id": app_id, "device_id": device_id}
+                         for app_id in dict.fromkeys(_app_ids(op)) if app_id in known_apps)
+        results.append(_operation_result(
+            op, 201,
+            location=_location(f"{op.path}/{device_id}"),
+            version=f'"{make_etag("Device", device_id, 1)}"'))
+
+    try:
+        if devices:
+            session.execute(insert(Device), devices)
+        if ble_extensions:
+            session.execute(insert(BleExtension), ble_extensions)
+        if app_links:
+            session.execute(insert(devices_endpoint_apps), app_links)
+        session.commit()
+    except SQLAlchemyError:
+        current_app.logger.exception("Batched device creation failed; retrying one by one")
+        session.rollback()
+        return None
+
+    return results
+
+
+def _dispatch(op: BulkOperation) -> dict:
+    """ Run a single operation through the regular SCIM endpoints """
+    environ = EnvironBuilder(
+        path=op.path,
+        method=op.method,
+        json=op.data,
+        environ_base=request.environ
+    ).get_environ()
+
+    with current_app.request_context(environ):
+        try:
+            # Pre process Request
+            rv = current_app.preprocess_request()
+
+            if rv is None:
+                # Main Dispatch
+                rv = current_app.dispatch_request()
+
+        except Exception as e: # pylint: disable=broad-except
+            rv = current_app.handle_user_exception(e)
+
+        response = current_app.make_response(rv)
+
+        # Post process Request
+        response = current_app.process_response(response)
+
+    body = response.get_json(silent=True)
+    if response.status_code >= 400:
+        return _operation_result(op, response.status_code, response=body)
+
+    location = None
+    if op.method == "POST" and isinstance(body, dict) and "id" in body:
+        location = _location(f"{op.path}/{body['id']}")
+    elif op.method in ("PUT", "PATCH"):
+        location = _location(op.path)
+    return _operation_result(op, response.status_code, location=location,
+                             version=response.headers.get("ETag"))
+
+
+def _parse_operation(raw) -> BulkOperation | dict:
+    """ Parse one operation, or return its error result """
+    if not isinstance(raw, dict):
+        raw = {}
+    op = BulkOperation(str(raw.get("method") or "").upper(), raw.get("path"),
+                       raw.get("bulkId"), raw.get("data"))
+
+    if not op.method or not isinstance(op.path, str):
+        return _operation_result(
+            op, 400, response=scim_error_body("Operation requires method and path", 400))
+    if op.method == "POST" and op.bulk_id is None:
+        return _operation_result(
+            op, 400, response=scim_error_body("bulkId is required for POST", 400))
+
+    op.path = _scim_path(op.path)
+    return op
+
+
+def run_bulk(body) -> Response:
+    """ Execute a BulkRequest and build the BulkResponse """
+    if not isinstance(body, dict) or body.get("schemas") != [BULK_REQUEST_SCHEMA] \
+            or not isinstance(body.get("Operations"), list):
+        return blow_an_error("Request body is not a valid BulkRequest.", 400)
+
+    fail_on_errors = body.get("failOnErrors")
+    if fail_on_errors is not None and \
+            (not isinstance(fail_on_errors, int) or isinstance(fail_on_errors, bool)
+             or fail_on_errors < 1):
+        return blow_an_error("failOnErrors must be a positive integer", 400, "invalidValue")
+
+    operations = [_parse_operation(raw) for raw in body["Operations"]]
+    results: list[dict] = []
+    errors = 0
+
+    def record(result: dict) -> bool:
+        """ Add a result; return True once failOnErrors is reached """
+        nonlocal errors
+        results.append(result)
+        if int(result["status"]) >= 400:
+            errors += 1
+        return fail_on_errors is not None and errors >= fail_on_errors
+
+    index = 0
+    while index < len(operations):
+        op = operations[index]
+        if isinstance(op, dict):
+            index += 1
+            if record(op):
+                break
+            continue
+
+        if not _is_batchable(op):
+            index += 1
+            if record(_dispatch(op)):
+                break
+            continue
+
+        chunk = []
+        while index < len(operations) and len(chunk) < max(BULK_CHUNK_SIZE, 1) \
+                and isinstance(operations[index], BulkOperation) \
+                and _is_batchable(operations[index]):
+            chunk.append(operations[index])
+            index += 1
+
+        chunk_results = _create_devices(
+            chunk, None if fail_on_errors is None else fail_on_errors - errors)
+        if chunk_results is None:
+            chunk_results = (_dispatch(op) for op in chunk)
+        if any(record(result) for result in chunk_results):
+            break
+
+    return make_response(jsonify({
+        "schemas": [BULK_RESPONSE_SCHEMA],
+        "Operations": results
+    }), 200)
@@ -11,9 +11,9 @@ Simple error formating routine for scim.
 
 from flask import jsonify,make_response
 
-def blow_an_error(e,code,scim_code = "invalidSyntax"):
+def scim_error_body(e,code,scim_code = "invalidSyntax"):
     """
-    Simple formating handling routine"
+    Build a SCIM error object
     """
 
     response  = {
@@ -24,4 +24,11 @@ def blow_an_error(e,code,scim_code = "invalidSyntax"):
     if scim_code:
         response["scimType"] = scim_code
 
-    return make_response(jsonify(response), code)
+    return response
+
+def blow_an_error(e,code,scim_code = "invalidSyntax"):
+    """
+    Simple formating handling routine"
+    """
+
+    return make_response(jsonify(scim_error_body(e,code,scim_code)), code)
@@ -7,21 +7,62 @@
 This module implements Ethernet MAB dispatch for SCIM.
 """
 
-import ciscoisesdk
-from ciscoisesdk.exceptions import ApiError
-from sqlalchemy import ForeignKey, String
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, relationship, mapped_column
+from sqlalchemy import ForeignKey, String, event
+from sqlalchemy.orm import Mapped, Session, SessionTransaction, relationship, mapped_column
 from scim_extensions import register_scim_extension
+from scim_filter import FilterAttribute
 from models import Device
 from database import session,db
-from config import ISE_SUPPORT, ISE_HOST, ISE_USERNAME, ISE_PASSWORD, \
-    WANT_ETHER_MAB
-from tiedie_exceptions import SchemaError, DeviceExists, ISEError, \
-    MABNotSupported
+from db_types import Uuid
+from config import WANT_ETHER_MAB
+from tiedie_exceptions import SchemaError, DeviceExists, MABNotSupported
 
 ETHER_MAB_ENABLED = bool(WANT_ETHER_MAB)
 
+_ISE_CHANGES = "tiedie.ise_changes"
+
+
+def ise_sync():
+    """
+    The ISE sync worker. ise_sync loads the ISE SDK, which is slow to
+    import, so it is only imported once a MAB device changes.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    import ise_sync as ise_sync_module
+    return ise_sync_module.ise_sync()
+
+
+def _sync_on_commit(extension, *changes):
+    """
+    Record (MAC address, present) ISE changes of extension. They are
+    queued once a flush of extension commits, so that devices that are
+    never saved, or rolled back, do not reach ISE.
+    """
+    extension.ise_changes = getattr(extension, "ise_changes", []) + list(changes)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_after_flush(flushed: Session, _flush_context):
+    for instance in (*flushed.new, *flushed.dirty, *flushed.deleted):
+        if isinstance(instance, EtherMABExtension) and getattr(instance, "ise_changes", None):
+            flushed.info.setdefault(_ISE_CHANGES, []).extend(instance.ise_changes)
+            instance.ise_changes = []
+
+
+@event.listens_for(Session, "after_commit")
+def _queue_after_commit(committed: Session):
+    pending = committed.info.pop(_ISE_CHANGES, None)
+    if pending:
+        ise_sync().queue(pending)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_after_rollback(ended: Session, transaction: SessionTransaction):
+    # Committed changes were popped by after_commit
+    if transaction.parent is None:
+        ended.info.pop(_ISE_CHANGES, None)
+
+
 class EtherMABExtension(db.Model):
     """
     MAC Authenticated Bypass Extension.  Use this for 802.3 devices that
@@ -29,9 +70,9 @@ class EtherMABExtension(db.Model):
     """
     __tablename__ = "ethernetmab"
 
-    device_id = mapped_column(UUID(as_uuid=True),ForeignKey("devices.device_id"),
+    device_id = mapped_column(Uuid,ForeignKey("devices.device_id"),
                               primary_key=True)
-    device_mac_address = mapped_column(String)
+    device_mac_address = mapped_column(String, index=True)
     device: Mapped[Device] = relationship(back_populates="ethermab_extension")
 
     def __init__(
@@ -59,34 +100,6 @@ class EtherMABExtension(db.Model):
     def __repr__(self):
         return f"<id {self.device_id}>"
 
-def init_ise():
-    """
-    This sets up the ERS API.  Goes to the environment for inputs.
-    """
-
-    if not ISE_SUPPORT:
-        return False
-
-    ui_url = 'https://' + ISE_HOST
-    mnt_url = ui_url
-    ers_url = ui_url + ':9060'
-    px_url = ui_url + ':8910'
-
-    try:
-        api=ciscoisesdk.IdentityServicesEngineAPI(username=ISE_USERNAME,
-                                                  password=ISE_PASSWORD,
-                                                  uses_api_gateway=False,
-                                                  ers_base_url=ers_url,
-                                                  version="3.1.0",
-                                                  ui_base_url=ui_url,
-                                                  mnt_base_url=mnt_url,
-                                                  uses_csrf_token=False,
-                                                  px_grid_base_url=px_url,
-                                                  verify=False)
-        return api
-    except ApiError as e:
-        raise ISEError(e.description) from e
-
 def ethermab_create_device(schemas,entry,request,device_id,update=False):
     """
     Process SCIM Creation request for a MAB device.  Return a EtherMABExtension
@@ -107,22 +120,9 @@ def ethermab_create_device(schemas,entry,request,device_id,update=False):
     if EtherMABExtension.query.filter_by(device_mac_address=device_mac_address).first():
         raise DeviceExists
 
-    api=init_ise()
-    endpoint=None
-    if api:
-        try:
-            endpoint = api.endpoint.get_endpoint_by_name(device_mac_address)
-        except ApiError as e:
-            if e.status_code != 404:
-                raise ISEError(e.description) from e
-            # if it is a 404, device is in ISE- let it be
-        try:
-            if not endpoint:
-                api.endpoint.create_endpoint(mac=device_mac_address)
-        except ApiError as e:
-            raise ISEError(e.description) from e
     entry.ethermab_extension = EtherMABExtension(
         device_id=device_id,device_mac_address=device_mac_address)
+    _sync_on_commit(entry.ethermab_extension, (device_mac_address, True))
 
 def ethermab_read_device(entry,response):
     """
@@ -151,35 +151,15 @@ def ethermab_update_device(parent,request):
                                request.json["id"],update=True)
         return
 
-    mab_json = request[ethschema]
+    mab_json = request.json[ethschema]
 
     if not "deviceMacAddress" in mab_json:
         raise SchemaError("There's only one field to update and you didn't update it!")
     mac_addr = mab_json["deviceMacAddress"]
     old_mac = ether_entry.device_mac_address
     ether_entry.device_mac_address = mac_addr
-    if not ISE_SUPPORT:
-        return
-    api=init_ise()
-    endpoint = None
-    if api:
-        try:
-            endpoint = api.endpoint.get_endpoint_by_name(old_mac)
-        except ApiError as e:
-            if e.status_code != 404:
-                raise ISEError(e.description) from e
-        if endpoint:
-            endpoint_id = endpoint.response.ERSEndPoint['id']
-            try:
-                api.endpoint.create_endpoint(mac=mac_addr)
-                api.endpoint.delete_endpoint_by_id(endpoint_id)
-            except ApiError as e:
-                raise ISEError(e.description) from e
-
-def ethermab_get_filtered_entries(mac_address):
-    """ Return Ethernet MAB filtered entries """
-
-    return EtherMABExtension.query.filter_by(device_mac_address=mac_address).all()
+    if old_mac != mac_addr:
+        _sync_on_commit(ether_entry, (old_mac, False), (mac_addr, True))
 
 def ethermab_delete_device(entry_id):
     """
@@ -190,19 +170,7 @@ def ethermab_delete_device(entry_id):
     if not entry:
         return
 
-    api=init_ise()
-    if api:
-        try:
-            endpoint = api.endpoint.get_endpoint_by_name(entry.device_mac_address)
-        except ApiError as e:
-            if e.status_code != 404:
-                raise ISEError(e.description) from e
-        if endpoint:
-            endpoint_id = endpoint.response.ERSEndPoint['id']
-            try:
-                api.endpoint.delete_endpoint_by_id(endpoint_id)
-            except ApiError as e:
-                raise ISEError(e.description) from e
+    _sync_on_commit(entry, (entry.device_mac_address, False))
     session.delete(entry)
     session.commit()
 def register_ethermab_extension(enabled=None):
@@ -223,4 +191,8 @@ def register_ethermab_extension(enabled=None):
         ethermab_read_device,
         ethermab_update_device,
         ethermab_delete_device,
+        {"urn:ietf:params:scim:schemas:extension:ethernet-mab:2.0:Device": {
+            "deviceMacAddress": FilterAttribute(EtherMABExtension.device_mac_address,
+                                                Device.ethermab_extension.has),
+        }},
     )
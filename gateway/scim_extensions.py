@@ -13,6 +13,8 @@ scim_ext_create = []
 scim_ext_read = []
 scim_ext_update = []
 scim_ext_delete = []
+# Filterable attributes of each extension schema, keyed by schema URN
+scim_ext_filter = {}
 
 
 def reset_scim_extensions():
@@ -21,6 +23,7 @@ def reset_scim_extensions():
     scim_ext_read.clear()
     scim_ext_update.clear()
     scim_ext_delete.clear()
+    scim_ext_filter.clear()
 
 
 def _append_unique(target, fn):
@@ -28,9 +31,15 @@ def _append_unique(target, fn):
         target.append(fn)
 
 
-def register_scim_extension(create_fn, read_fn, update_fn, delete_fn):
-    """Register extension hooks without creating duplicate entries."""
+def register_scim_extension(create_fn, read_fn, update_fn, delete_fn,
+                            filter_attributes=None):
+    """
+    Register extension hooks without creating duplicate entries.
+    filter_attributes maps schema URNs to their filterable attributes.
+    """
     _append_unique(scim_ext_create, create_fn)
     _append_unique(scim_ext_read, read_fn)
     _append_unique(scim_ext_update, update_fn)
     _append_unique(scim_ext_delete, delete_fn)
+    if filter_attributes:
+        scim_ext_filter.update(filter_attributes)
@@ -7,16 +7,16 @@
 This module implements FDO dispatch for SCIM.
 """
 
-import requests
+from flask import g
 from sqlalchemy import ForeignKey, String
-from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, relationship, mapped_column
 from scim_extensions import register_scim_extension
 from models import Device
 from database import session,db
+from db_types import Uuid
 from tiedie_exceptions import SchemaError,DeviceExists,FDONotSupported
-from config import FDO_SUPPORT, FDO_OWNER_URI, FDO_CA_CERT, FDO_CLIENT_CERT, \
-    WANT_FDO
+from config import FDO_SUPPORT, FDO_ASYNC_UPLOAD, FDO_ASYNC_STATUS, WANT_FDO
+from fdo_upload import enqueue_voucher, upload_voucher_now
 
 FDO_ENABLED = bool(WANT_FDO)
 
@@ -26,7 +26,7 @@ class FDOExtension(db.Model):
     """
     __tablename__ = "scim_fdo"
 
-    device_id = mapped_column(UUID(as_uuid=True),ForeignKey("devices.device_id"),
+    device_id = mapped_column(Uuid,ForeignKey("devices.device_id"),
                               primary_key=True)
     fdo_voucher = mapped_column(String)
     device: Mapped[Device] = relationship(back_populates="fdo_extension")
@@ -88,17 +88,11 @@ def fdo_create_device(schemas, entry, request,device_id,update=False):
         raise DeviceExists
 
     if FDO_SUPPORT:
-        try:
-            res=requests.post(url=FDO_OWNER_URI,data=fdo_voucher,
-                              headers={'Content-Type':
-                                       'text/plain'},
-                              cert=FDO_CLIENT_CERT,
-                              verify=(FDO_CA_CERT is not None),
-                              timeout=5)
-        except Exception as e:
-            raise FDONotSupported(str(e)) from e
-        if res.status_code not in (200,201):
-            raise FDONotSupported(res.text)
+        if FDO_ASYNC_UPLOAD:
+            enqueue_voucher(entry, fdo_voucher)
+            g.scim_create_status = FDO_ASYNC_STATUS
+        else:
+            upload_voucher_now(fdo_voucher)
     entry.fdo_extension =  FDOExtension(device_id=device_id,
                                         fdo_voucher=fdo_voucherb64)
 
@@ -133,7 +127,7 @@ def fdo_update_device(parent,request):
                           request.json["id"],update=True)
         return
 
-    fdo_json = request[fschema]
+    fdo_json = request.json[fschema]
 
     if not "fdoOwnerVoucher" in fdo_json:
         raise SchemaError("There's only one field to update and you didn't update it!")
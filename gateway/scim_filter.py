@@ -0,0 +1,257 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+
+This module parses SCIM filter expressions (RFC 7644 section 3.4.2.2)
+and compiles them into SQLAlchemy conditions, so that only matching
+rows are fetched from the database.
+
+Attributes live in per-schema tables of FilterAttribute. Unqualified
+names resolve against the core schema first, then against every
+extension schema that defines them.
+
+"""
+
+import dataclasses
+import json
+import re
+from typing import Any, Callable, Optional
+
+from sqlalchemy import String, and_, cast, literal, not_, or_
+
+from db_types import list_contains, list_length
+from tiedie_exceptions import FilterError
+
+
+@dataclasses.dataclass
+class FilterAttribute:
+    """ Maps a SCIM attribute to a column """
+    column: Any
+    # Wraps a condition on a related table, e.g. Device.ble_extension.has
+    scope: Optional[Callable[[Any], Any]] = None
+    # String list columns only support eq, ne and pr
+    multi_valued: bool = False
+    # Converts filter values to column values, e.g. uuid.UUID
+    coerce: Optional[Callable[[Any], Any]] = None
+
+
+COMPARE_OPS = {"eq", "ne", "co", "sw", "ew", "gt", "ge", "lt", "le"}
+STRING_OPS = {"co", "sw", "ew"}
+
+_TOKEN = re.compile(r'''\s*(?:
+    (?P<punct>[()\[\]])
+  | (?P<string>"(?:[^"\\]|\\.)*")
+  | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)(?![\w:.])
+  | (?P<word>[A-Za-z][\w:.$-]*)
+)''', re.VERBOSE)
+
+
+def _tokenize(text: str) -> list[tuple[str, Any]]:
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match:
+            raise FilterError(f"Unexpected character at position {position}")
+        position = match.end()
+        kind = match.lastgroup
+        token = match.group(kind)
+        if kind in ("string", "number"):
+            tokens.append(("value", json.loads(token)))
+        else:
+            tokens.append((kind, token))
+    return tokens
+
+
+def _compare(attribute: FilterAttribute, op: str, value: Any):
+    """ Build the condition for one attribute expression """
+    column = attribute.column
+
+    if op == "pr":
+        condition = column.isnot(None)
+        if attribute.multi_valued:
+            condition = and_(condition, list_length(column) > 0)
+        return attribute.scope(condition) if attribute.scope else condition
+
+    if op in STRING_OPS:
+        if not isinstance(value, str):
+            raise FilterError(f"'{op}' requires a string value")
+        if attribute.multi_valued:
+            raise FilterError(f"'{op}' is not supported on multi-valued attributes")
+        if not isinstance(column.type, String):
+            column = cast(column, String)
+        condition = {
+            "co": column.contains,
+            "sw": column.startswith,
+            "ew": column.endswith,
+        }[op](value, autoescape=True)
+        return attribute.scope(condition) if attribute.scope else condition
+
+    if op in ("gt", "ge", "lt", "le") and (value is None or isinstance(value, bool)):
+        raise FilterError(f"'{op}' requires a string or number value")
+
+    if attribute.coerce and value is not None:
+        try:
+            value = attribute.coerce(value)
+        except (TypeError, ValueError, AttributeError) as e:
+            raise FilterError(f"Invalid value {json.dumps(value)}") from e
+
+    if attribute.multi_valued:
+        if op not in ("eq", "ne") or value is None:
+            raise FilterError(f"'{op}' is not supported on multi-valued attributes")
+        condition = list_contains(literal(value, String), column)
+        if op == "ne":
+            condition = not_(condition)
+    elif op == "eq":
+        condition = column.is_(None) if value is None else column == value
+    elif op == "ne":
+        condition = column.isnot(None) if value is None else \
+            or_(column != value, column.is_(None))
+    else:
+        condition = {
+            "gt": column.__gt__,
+            "ge": column.__ge__,
+            "lt": column.__lt__,
+            "le": column.__le__,
+        }[op](value)
+
+    return attribute.scope(condition) if attribute.scope else condition
+
+
+class _Parser:
+    """
+    Recursive descent parser; precedence is not, then and, then or.
+    """
+
+    def __init__(self, text: str, resolve: Callable[[str], list[FilterAttribute]]):
+        self.tokens = _tokenize(text)
+        self.position = 0
+        self.resolve = resolve
+
+    def _peek(self) -> tuple[str, Any]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return ("end", None)
+
+    def _next(self) -> tuple[str, Any]:
+        token = self._peek()
+        self.position += 1
+        return token
+
+    def _keyword(self, *keywords: str) -> Optional[str]:
+        kind, token = self._peek()
+        if kind == "word" and token.lower() in keywords:
+            self.position += 1
+            return token.lower()
+        return None
+
+    def _expect(self, punct: str):
+        kind, token = self._next()
+        if kind != "punct" or token != punct:
+            raise FilterError(f"Expected '{punct}'")
+
+    def parse(self):
+        """ Parse the whole expression """
+        if not self.tokens:
+            raise FilterError("Empty filter")
+        condition = self._or("")
+        if self._peek()[0] != "end":
+            raise FilterError(f"Unexpected token '{self._peek()[1]}'")
+        return condition
+
+    def _or(self, prefix: str):
+        condition = self._and(prefix)
+        while self._keyword("or"):
+            condition = or_(condition, self._and(prefix))
+        return condition
+
+    def _and(self, prefix: str):
+        condition = self._unary(prefix)
+        while self._keyword("and"):
+            condition = and_(condition, self._unary(prefix))
+        return condition
+
+    def _unary(self, prefix: str):
+        if self._keyword("not"):
+            self._expect("(")
+            condition = self._or(prefix)
+            self._expect(")")
+            return not_(condition)
+
+        if self._peek() == ("punct", "("):
+            self._next()
+            condition = self._or(prefix)
+            self._expect(")")
+            return condition
+
+        return self._attribute_expression(prefix)
+
+    def _attribute_expression(self, prefix: str):
+        kind, path = self._next()
+        if kind != "word":
+            raise FilterError("Expected an attribute name")
+        path = prefix + path
+
+        # valuePath: attr[subfilter] filters on sub-attributes of attr
+        if self._peek() == ("punct", "["):
+            self._next()
+            condition = self._or(path + ".")
+            self._expect("]")
+            return condition
+
+        op = self._keyword("pr", *COMPARE_OPS)
+        if op is None:
+            raise FilterError(f"Expected an operator after '{path}'")
+
+        value = None
+        if op != "pr":
+            kind, value = self._next()
+            if kind == "word" and value.lower() in ("true", "false", "null"):
+                value = json.loads(value.lower())
+            elif kind != "value":
+                raise FilterError(f"Expected a value after '{path} {op}'")
+
+        attributes = self.resolve(path)
+        return or_(*[_compare(attribute, op, value) for attribute in attributes]) \
+            if len(attributes) > 1 else _compare(attributes[0], op, value)
+
+
+def compile_filter(text: str,
+                   schemas: dict[str, dict[str, FilterAttribute]],
+                   core_schema: str):
+    """
+    Compile a SCIM filter into a SQLAlchemy condition.
+
+    Args:
+        text: the filter expression
+        schemas: attribute tables keyed by schema URN
+        core_schema: the schema that unqualified names resolve to first
+
+    Raises:
+        FilterError: if the filter is malformed or uses unknown attributes
+    """
+    lowered = {schema.lower(): {name.lower(): attribute for name, attribute in attributes.items()}
+               for schema, attributes in schemas.items()}
+    core = lowered.get(core_schema.lower(), {})
+
+    def resolve(path: str) -> list[FilterAttribute]:
+        path = path.lower()
+        if path.startswith("urn:"):
+            schema, _, name = path.rpartition(":")
+            attribute = lowered.get(schema, {}).get(name)
+            if attribute is None:
+                raise FilterError(f"Unknown attribute '{path}'")
+            return [attribute]
+
+        if path in core:
+            return [core[path]]
+        attributes = [attributes[path] for attributes in lowered.values() if path in attributes]
+        if not attributes:
+            raise FilterError(f"Unknown attribute '{path}'")
+        return attributes
+
+    return _Parser(text, resolve).parse()
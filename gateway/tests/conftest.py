@@ -3,6 +3,9 @@ Pytest bootstrap for gateway tests.
 
 Centralize shared fixtures and enable optional SCIM extensions via create_app
 options, without relying on environment-variable import ordering.
+
+Tests run against PostgreSQL unless TEST_DATABASE=sqlite selects the
+embedded SQLite mode; tests marked postgres are then skipped.
 """
 
 import os
@@ -17,11 +20,28 @@ from testcontainers.postgres import PostgresContainer
 
 from app_factory import create_app
 from data_producer import DataProducer
-from database import db
+from database import db, upgrade_database
 from models import OnboardingAppKey
 from nipc_models import SdfModel
 from tests.mosquitto_container import MosquittoContainer
 
+TEST_DATABASE = os.getenv("TEST_DATABASE", "postgres")
+
+
+def pytest_configure(config):
+    """Register markers."""
+    config.addinivalue_line("markers", "postgres: needs a PostgreSQL database")
+
+
+def pytest_collection_modifyitems(items):
+    """Skip PostgreSQL-only tests when testing another database."""
+    if TEST_DATABASE == "postgres":
+        return
+    skip = pytest.mark.skip(reason=f"needs PostgreSQL, testing {TEST_DATABASE}")
+    for item in items:
+        if "postgres" in item.keywords:
+            item.add_marker(skip)
+
 
 @pytest.fixture(name="postgres")
 def fixture_postgres():
@@ -30,17 +50,25 @@ def fixture_postgres():
         yield postgres_container
 
 
+@pytest.fixture(name="database_url")
+def fixture_database_url(request: pytest.FixtureRequest, tmp_path):
+    """URL of an empty database of the backend under test."""
+    if TEST_DATABASE == "sqlite":
+        return f"sqlite:///{tmp_path / 'tiedie.db'}"
+    return request.getfixturevalue("postgres").get_connection_url()
+
+
 @pytest.fixture(name="app")
-def fixture_app(postgres: PostgresContainer):
+def fixture_app(database_url: str):
     """Flask application."""
     app = create_app(
-        postgres.get_connection_url(),
+        database_url,
         want_ether_mab=True,
         want_fdo=True,
     )
 
     with app.app_context():
-        db.create_all()
+        upgrade_database()
 
     yield app
 
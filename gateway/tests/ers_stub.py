@@ -0,0 +1,168 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Minimal in-process stand-in for the ISE ERS endpoint API.
+"""
+
+import json
+import re
+import threading
+import uuid
+import xml.etree.ElementTree as ET
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class ErsStub:
+    """ Serves /ers/config/endpoint on a local port and records the requests """
+
+    def __init__(self, bulk_supported: bool = True):
+        self.endpoints: dict[str, str] = {}
+        self.bulk_supported = bulk_supported
+        self.requests: Counter = Counter()
+        self.bulk_status: dict[str, dict] = {}
+        self.lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """ Base URL of the stub """
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def macs(self) -> set[str]:
+        """ MAC addresses of all endpoints """
+        with self.lock:
+            return set(self.endpoints.values())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def create(self, mac: str) -> tuple[bool, str]:
+        """ Add an endpoint unless the MAC address is taken """
+        with self.lock:
+            if mac in self.endpoints.values():
+                return False, mac
+            endpoint_id = str(uuid.uuid4())
+            self.endpoints[endpoint_id] = mac
+            return True, endpoint_id
+
+    def bulk_submit(self, body: bytes) -> str:
+        """ Run an XML bulk request and return its bulk ID """
+        root = ET.fromstring(body)
+        operation = root.get("operationType")
+        statuses = []
+        if operation == "create":
+            for endpoint in root.iter("{identity.ers.ise.cisco.com}endpoint"):
+                mac = endpoint.findtext("mac")
+                created, _ = self.create(mac)
+                statuses.append({"name": mac, "status": "SUCCESS" if created else "FAIL"})
+        else:
+            for item in root.iter("id"):
+                with self.lock:
+                    found = self.endpoints.pop(item.text, None) is not None
+                statuses.append({"id": item.text, "status": "SUCCESS" if found else "FAIL"})
+
+        bulk_id = str(uuid.uuid4())
+        self.bulk_status[bulk_id] = {
+            "bulkId": bulk_id,
+            "executionStatus": "COMPLETED",
+            "operationType": operation,
+            "resourcesCount": len(statuses),
+            "successCount": sum(status["status"] == "SUCCESS" for status in statuses),
+            "failCount": sum(status["status"] != "SUCCESS" for status in statuses),
+            "resourcesStatus": statuses,
+        }
+        return bulk_id
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """ ERS request handler """
+
+            def log_message(self, *args): # pylint: disable=arguments-differ
+                pass
+
+            def _reply(self, status: int, body=None, headers=None):
+                payload = json.dumps(body).encode() if body is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _body(self) -> bytes:
+                return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+            def do_GET(self): # pylint: disable=invalid-name
+                """ Lookups, listing and bulk status """
+                path, _, query = self.path.partition("?")
+                if match := re.fullmatch(r"/ers/config/endpoint/name/(.+)", path):
+                    stub.requests["lookup"] += 1
+                    with stub.lock:
+                        found = [(endpoint_id, mac) for endpoint_id, mac in stub.endpoints.items()
+                                 if mac == match.group(1).upper()]
+                    if not found:
+                        self._reply(404, {"ERSResponse": {"messages": []}})
+                        return
+                    self._reply(200, {"ERSEndPoint": {"id": found[0][0], "name": found[0][1],
+                                                      "mac": found[0][1]}})
+                elif match := re.fullmatch(r"/ers/config/endpoint/bulk/(.+)", path):
+                    stub.requests["bulk_status"] += 1
+                    self._reply(200, {"BulkStatus": stub.bulk_status[match.group(1)]})
+                elif path == "/ers/config/endpoint":
+                    stub.requests["list"] += 1
+                    params = dict(pair.split("=", 1) for pair in query.split("&") if pair)
+                    page, size = int(params.get("page", 1)), int(params.get("size", 20))
+                    with stub.lock:
+                        items = sorted(stub.endpoints.items())
+                    resources = [{"id": endpoint_id, "name": mac}
+                                 for endpoint_id, mac in items[(page - 1) * size:page * size]]
+                    result = {"total": len(items), "resources": resources}
+                    if page * size < len(items):
+                        result["nextPage"] = {"rel": "next", "href": f"{path}?page={page + 1}"}
+                    self._reply(200, {"SearchResult": result})
+                else:
+                    self._reply(404)
+
+            def do_POST(self): # pylint: disable=invalid-name
+                """ Single endpoint creation """
+                stub.requests["create"] += 1
+                mac = json.loads(self._body())["ERSEndPoint"]["mac"].upper()
+                created, endpoint_id = stub.create(mac)
+                if not created:
+                    self._reply(400, {"ERSResponse": {"messages": [{"title": "exists"}]}})
+                    return
+                self._reply(201, headers={"Location": f"/ers/config/endpoint/{endpoint_id}"})
+
+            def do_PUT(self): # pylint: disable=invalid-name
+                """ Bulk submission """
+                body = self._body()
+                if not stub.bulk_supported or self.path != "/ers/config/endpoint/bulk/submit":
+                    self._reply(405)
+                    return
+                stub.requests["bulk"] += 1
+                bulk_id = stub.bulk_submit(body)
+                self._reply(202, headers={
+                    "Location": f"{stub.url}/ers/config/endpoint/bulk/{bulk_id}"})
+
+            def do_DELETE(self): # pylint: disable=invalid-name
+                """ Single endpoint deletion """
+                stub.requests["delete"] += 1
+                endpoint_id = self.path.rsplit("/", 1)[-1]
+                with stub.lock:
+                    found = stub.endpoints.pop(endpoint_id, None) is not None
+                self._reply(204 if found else 404)
+
+        return Handler
@@ -0,0 +1,48 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Test startup timing and lazily loaded integrations
+"""
+
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from boot import BootTimer
+
+GATEWAY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_boot_timer():
+    """ Concurrent steps are timed separately and reported together """
+    timer = BootTimer()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(timer.timed("first", time.sleep, 0.2))
+        second = pool.submit(timer.timed("second", lambda: 42))
+        assert second.result() == 42
+        first.result()
+
+    # Loaded runners oversleep, so only the lower bound is tight
+    assert 0.2 <= timer.steps["first"] < 2
+    assert timer.steps["second"] < timer.steps["first"]
+    report = timer.report()
+    assert report.startswith("Boot took ")
+    for name, seconds in timer.steps.items():
+        assert f"{name} {seconds:.2f}s" in report
+
+
+def test_optional_integrations_are_lazy():
+    """ Importing the application loads neither ISE, FDO nor radio libraries """
+    env = {key: value for key, value in os.environ.items()
+           if key not in ("WANT_ETHERNET_MAB", "WANT_FDO", "ISE_USERNAME")}
+    modules = subprocess.run(
+        [sys.executable, "-c", "import sys, app; print(' '.join(sys.modules))"],
+        cwd=GATEWAY_DIR, env=env, check=True, capture_output=True, text=True
+    ).stdout.split()
+    for module in ("ciscoisesdk", "requests", "bgapi", "serial", "OpenSSL"):
+        assert module not in modules
@@ -0,0 +1,111 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Test the cross-process change notification bus.
+"""
+
+import queue
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy import text, update
+
+from change_bus import ALL_TABLES, DELETE, INSERT, UPDATE, Change, ChangeBus, change_bus
+from database import session
+from nipc_models import SdfModel
+
+EVENT = "https://example.com/thermometer#/sdfThing/thermometer/sdfEvent/isPresent"
+OTHER_EVENT = "https://example.com/thermometer#/sdfThing/thermometer/sdfEvent/isConnected"
+
+
+def next_change(changes: queue.Queue, table: str) -> Change:
+    """ The next change to table """
+    while True:
+        change = changes.get(timeout=5)
+        if change.table == table:
+            return change
+
+
+@pytest.fixture(name="changes")
+def fixture_changes(app: Flask):
+    """ Changes received by this process, from now on """
+    received = queue.Queue()
+    change_bus().subscribe(received.put)
+    change_bus().start(app)
+    with app.app_context():
+        if session.get_bind().dialect.name == "postgresql":
+            assert change_bus().wait_listening(5)
+    yield received
+    change_bus().stop()
+    change_bus().unsubscribe(received.put)
+
+
+def test_registry_writes_are_published(client: FlaskClient, control_api_key: str,
+                                       sdf_model: SdfModel, # pylint: disable=unused-argument
+                                       data_app: dict, changes: queue.Queue):
+    """ Data app registration, update and removal each publish a change """
+    url = f"/nipc/registrations/data-apps?dataAppId={data_app['id']}"
+    headers = {"x-api-key": control_api_key}
+
+    response = client.post(url, json={"events": [{"event": EVENT}], "mqttClient": True},
+                           headers=headers)
+    assert response.status_code == 200
+    assert next_change(changes, "data_app") == Change("data_app", data_app["id"], 1, INSERT)
+
+    response = client.put(url, json={"events": [{"event": EVENT}, {"event": OTHER_EVENT}],
+                                     "mqttClient": True}, headers=headers)
+    assert response.status_code == 200
+    assert next_change(changes, "data_app") == Change("data_app", data_app["id"], 2, UPDATE)
+
+    response = client.delete(url, headers=headers)
+    assert response.status_code == 200
+    assert next_change(changes, "data_app") == Change("data_app", data_app["id"], 2, DELETE)
+
+
+def test_rollbacks_and_bulk_statements(app: Flask, changes: queue.Queue):
+    """ Rolled back writes are not published; bulk statements change the table """
+    with app.app_context():
+        session.add(SdfModel("https://example.com/rolled-back", {}))
+        session.flush()
+        session.rollback()
+
+        model = SdfModel("https://example.com/committed", {})
+        session.add(model)
+        session.commit()
+        assert next_change(changes, "sdf_model") == \
+            Change("sdf_model", str(model.id), 1, INSERT)
+
+        session.execute(update(SdfModel).values(model={"changed": True}))
+        session.commit()
+        assert next_change(changes, "sdf_model") == Change("sdf_model", op=UPDATE)
+
+
+@pytest.mark.postgres
+def test_listener_reconnects(app: Flask):
+    """ A listener that lost its connection reconnects and asks for a resync """
+    bus = ChangeBus(reconnect_delay=0.1)
+    received = queue.Queue()
+    bus.subscribe(received.put, "sdf_model")
+    bus.start(app)
+    try:
+        assert bus.wait_listening(5)
+        with app.app_context():
+            session.execute(text(
+                "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                "WHERE query = 'LISTEN tiedie_changes'"))
+            session.commit()
+
+        assert received.get(timeout=5) == Change(ALL_TABLES)
+
+        assert bus.wait_listening(5)
+        with app.app_context():
+            model = SdfModel("https://example.com/after-reconnect", {})
+            session.add(model)
+            session.commit()
+            assert received.get(timeout=5).key == str(model.id)
+    finally:
+        bus.stop()
@@ -10,13 +10,16 @@ Test Gateway controller implementation
 
 import uuid
 import base64
+import json
 import urllib.parse
 from flask.testing import FlaskClient
 import pytest
 import ap_factory
 from data_producer import DataProducer
+from event_stream import event_broker
 from mock.mock_access_point import MockAccessPoint
 from nipc_models import SdfModel
+from value_cache import value_cache
 # pylint: disable-next=unused-import
 from scim_fdo import FDOExtension
 # pylint: disable-next=unused-import
@@ -32,7 +35,8 @@ def fixture_ble_ap(data_producer: DataProducer):
     yield ble_ap
 
 
-def create_device(client: FlaskClient, api_key: str):
+def create_device(client: FlaskClient, api_key: str,
+                  mac_address: str = "AA:BB:CC:11:22:33"):
     """ Test POST Device """
     response = client.post(
         "/scim/v2/Devices",
@@ -43,7 +47,7 @@ def create_device(client: FlaskClient, api_key: str):
             "active": True,
             "urn:ietf:params:scim:schemas:extension:ble:2.0:Device": {
                 "versionSupport": ["5.3"],
-                "deviceMacAddress": "AA:BB:CC:11:22:33",
+                "deviceMacAddress": mac_address,
                 "isRandom": False,
                 "mobility": True
             }
@@ -103,6 +107,44 @@ def test_connect_device(client: FlaskClient, api_key: str, control_api_key: str)
     assert response.json.get("id") == device["id"]
 
 
+def test_connect_device_async(client: FlaskClient, api_key: str, control_api_key: str):
+    """ Test connecting a device through an asynchronous job """
+    device = create_device(client, api_key)
+
+    response = client.post(
+        f"/nipc/devices/{device['id']}/connections",
+        headers={
+            "x-api-key": control_api_key,
+            "Prefer": "respond-async"
+        },
+        json={"retries": 3, "protocolInformation": {"ble": {}}}
+    )
+
+    assert response.status_code == 202
+    assert response.json["operation"] == "connect"
+    assert response.json["deviceId"] == device["id"]
+    location = response.headers["Location"]
+    assert location.endswith(f"/nipc/jobs/{response.json['id']}")
+
+    response = client.get(f"{urllib.parse.urlparse(location).path}?wait=5",
+                          headers={"x-api-key": control_api_key})
+
+    assert response.status_code == 200
+    assert response.json["state"] == "succeeded"
+    assert response.json["result"]["id"] == device["id"]
+    assert isinstance(response.json["result"]["protocolInformation"], dict)
+
+    response = client.get(f"/nipc/jobs/{uuid.uuid4()}",
+                          headers={"x-api-key": control_api_key})
+    assert response.status_code == 404
+
+    response = client.delete(
+        f"/nipc/devices/{device['id']}/connections",
+        headers={"x-api-key": control_api_key}
+    )
+    assert response.status_code == 200
+
+
 def test_update_connection(client: FlaskClient, api_key: str, control_api_key: str):
     """ Test updating a device connection service map """
     device = create_device(client, api_key)
@@ -303,6 +345,123 @@ def test_property_read_multiple_properties(client: FlaskClient, api_key: str,
     assert humidity_property in properties
 
 
+def test_property_read_max_age(client: FlaskClient, api_key: str, control_api_key: str,
+                               sdf_model: SdfModel, ble_ap: MockAccessPoint,  # pylint: disable=unused-argument
+                               data_producer: DataProducer, monkeypatch: pytest.MonkeyPatch):
+    """ Test serving property reads from the last-value cache """
+    value_cache().clear()
+    device = create_device(client, api_key)
+    property_name = ("https://example.com/thermometer#/sdfThing/thermometer/"
+                     "sdfProperty/temperature")
+    url = (f"/nipc/devices/{device['id']}/properties?"
+           f"propertyName={urllib.parse.quote(property_name, safe='')}")
+    headers = {"x-api-key": control_api_key}
+
+    # Nothing cached yet, so the device is read and the value recorded
+    response = client.get(f"{url}&maxAge=60", headers=headers)
+    assert response.status_code == 200
+    assert response.json == [{
+        "property": property_name,
+        "value": base64.b64encode(b"test").decode(),
+        "age": 0
+    }]
+
+    # Cached reads must not touch the radio
+    def fail(*args, **kwargs):
+        raise AssertionError("unexpected BLE operation")
+    monkeypatch.setattr(ble_ap, "connect", fail)
+    monkeypatch.setattr(ble_ap, "read", fail)
+
+    response = client.get(f"{url}&maxAge=60", headers=headers)
+    assert response.status_code == 200
+    assert response.json[0]["value"] == base64.b64encode(b"test").decode()
+    assert 0 <= response.json[0]["age"] <= 60
+
+    # Notifications refresh the cache; Cache-Control works like maxAge
+    data_producer.publish_notification("AA:BB:CC:11:22:33", "180d", "2a38", b"\x01\x02")
+    response = client.get(url, headers={**headers, "Cache-Control": "max-age=60"})
+    assert response.status_code == 200
+    assert response.json[0]["value"] == base64.b64encode(b"\x01\x02").decode()
+
+    # A zero max age on an older value requires a device read
+    response = client.get(f"{url}&maxAge=0", headers=headers)
+    assert response.status_code == 500
+
+    response = client.get(f"{url}&maxAge=-1", headers=headers)
+    assert response.status_code == 400
+
+
+def test_value_cache_follows_writes(client: FlaskClient, api_key: str, control_api_key: str,
+                                    sdf_model: SdfModel, ble_ap: MockAccessPoint,  # pylint: disable=unused-argument
+                                    monkeypatch: pytest.MonkeyPatch):
+    """ Writes update cached values; disconnects and deletes forget them """
+    value_cache().clear()
+    device = create_device(client, api_key)
+    address = "AA:BB:CC:11:22:33"
+    property_name = ("https://example.com/thermometer#/sdfThing/thermometer/"
+                     "sdfProperty/temperature_control")
+    device_url = f"/nipc/devices/{device['id']}"
+    url = f"{device_url}/properties"
+    headers = {"x-api-key": control_api_key}
+    value_cache().put(address, "180d", "2a39", b"20.0")
+
+    response = client.put(url, json=[{
+        "property": property_name,
+        "value": base64.b64encode(b"25.5").decode()
+    }], headers=headers)
+    assert response.status_code == 200
+    assert response.json == [{"status": 200}]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("unexpected BLE operation")
+    monkeypatch.setattr(ble_ap, "read", fail)
+    response = client.get(f"{url}?propertyName={urllib.parse.quote(property_name, safe='')}"
+                          "&maxAge=60", headers=headers)
+    assert response.status_code == 200
+    assert response.json[0]["value"] == base64.b64encode(b"25.5").decode()
+
+    response = client.post(f"{device_url}/connections", headers=headers,
+                           json={"retries": 3, "protocolInformation": {"ble": {}}})
+    assert response.status_code == 200
+    response = client.delete(f"{device_url}/connections", headers=headers)
+    assert response.status_code == 200
+    assert value_cache().get(address, "180d", "2a39", 60) is None
+
+    value_cache().put(address, "180d", "2a39", b"20.0")
+    response = client.delete(f"/scim/v2/Devices/{device['id']}", headers={"x-api-key": api_key})
+    assert response.status_code == 204
+    assert value_cache().get(address, "180d", "2a39", 60) is None
+
+
+def test_implicit_connection_released_on_failure(client: FlaskClient, api_key: str,
+                                                 control_api_key: str, sdf_model: SdfModel,  # pylint: disable=unused-argument
+                                                 ble_ap: MockAccessPoint,
+                                                 monkeypatch: pytest.MonkeyPatch):
+    """ An implicit connection is released when discovery fails after connecting """
+    device = create_device(client, api_key)
+    headers = {"x-api-key": control_api_key}
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("discovery crashed")
+    monkeypatch.setattr(ble_ap, "discover", fail)
+
+    property_name = ("https://example.com/thermometer#/sdfThing/thermometer/"
+                     "sdfProperty/temperature")
+    response = client.get(f"/nipc/devices/{device['id']}/properties?"
+                          f"propertyName={urllib.parse.quote(property_name, safe='')}",
+                          headers=headers)
+    assert response.status_code == 500
+    assert "AA:BB:CC:11:22:33" not in ble_ap.conn_reqs
+
+    response = client.put(f"/nipc/devices/{device['id']}/properties", json=[{
+        "property": ("https://example.com/thermometer#/sdfThing/thermometer/"
+                     "sdfProperty/temperature_control"),
+        "value": base64.b64encode(b"25.5").decode()
+    }], headers=headers)
+    assert response.status_code == 500
+    assert "AA:BB:CC:11:22:33" not in ble_ap.conn_reqs
+
+
 def test_property_write_with_auto_connection(client: FlaskClient, api_key: str,
                                             control_api_key: str, sdf_model: SdfModel):  # pylint: disable=unused-argument
     """ Test property write with automatic connection management """
@@ -568,6 +727,74 @@ def test_register_data_app(
     assert f"Data app with ID {data_app_id} not found" in response.json.get("detail", "")
 
 
+def test_registry_conditional_get(
+    client: FlaskClient,
+    api_key: str,
+    control_api_key: str,
+    sdf_model: SdfModel, # pylint: disable=unused-argument
+    data_app: dict) -> None:
+    """ Test ETags and 304 responses on registry endpoints """
+    headers = {"x-api-key": control_api_key}
+
+    def assert_not_modified(url: str) -> str:
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+
+        response = client.get(url, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.data == b""
+        assert response.headers["ETag"] == etag
+        return etag
+
+    def assert_modified(url: str, etag: str):
+        response = client.get(url, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    # Models
+    models_url = "/nipc/registrations/models"
+    etag = assert_not_modified(models_url)
+    model_url = (f"{models_url}?sdfName="
+                 f"{urllib.parse.quote('https://example.com/thermometer', safe='')}")
+    model_etag = assert_not_modified(model_url)
+
+    model = client.get(model_url, headers=headers).json
+    model["info"] = {"title": "Updated thermometer"}
+    response = client.put(model_url, json=model, headers=headers)
+    assert response.status_code == 200
+    assert_modified(models_url, etag)
+    assert_modified(model_url, model_etag)
+
+    # Data apps
+    data_app_url = f"/nipc/registrations/data-apps?dataAppId={data_app['id']}"
+    body = {
+        "events": [{"event": "https://example.com/thermometer"
+                             "#/sdfThing/thermometer/sdfEvent/isPresent"}],
+        "mqttClient": True
+    }
+    response = client.post(data_app_url, json=body, headers=headers)
+    assert response.status_code == 200
+    etag = assert_not_modified(data_app_url)
+
+    body["events"].append({"event": "https://example.com/thermometer"
+                                    "#/sdfThing/thermometer/sdfEvent/isConnected"})
+    response = client.put(data_app_url, json=body, headers=headers)
+    assert response.status_code == 200
+    assert_modified(data_app_url, etag)
+
+    # Device events
+    device = create_device(client, api_key)
+    events_url = f"/nipc/devices/{device['id']}/events"
+    etag = assert_not_modified(events_url)
+
+    event_name = urllib.parse.quote(
+        "https://example.com/thermometer#/sdfThing/thermometer/sdfEvent/isPresent")
+    response = client.post(f"{events_url}?eventName={event_name}", headers=headers)
+    assert response.status_code == 201
+    assert_modified(events_url, etag)
+
+
 def test_device_events(
     client: FlaskClient,
     api_key: str,
@@ -716,3 +943,117 @@ def test_duplicate_event_enable(
 
     assert response.status_code == 400
     assert "Event already exists" in response.json.get("detail", "")
+
+
+def test_group_property_operations(client: FlaskClient, api_key: str,
+                                   control_api_key: str, sdf_model: SdfModel):  # pylint: disable=unused-argument
+    """ Test fan-out property reads and writes over a device group """
+    devices = [create_device(client, api_key, f"AA:BB:CC:11:22:{i:02}") for i in range(3)]
+    device_ids = [device["id"] for device in devices]
+
+    response = client.post(
+        "/nipc/groups",
+        json={"devices": device_ids},
+        headers={"x-api-key": control_api_key}
+    )
+
+    assert response.status_code == 201
+    group_id = response.json["id"]
+    assert sorted(response.json["devices"]) == sorted(device_ids)
+
+    property_name = ("https://example.com/thermometer#/sdfThing/thermometer/"
+                     "sdfProperty/temperature")
+    response = client.get(
+        f"/nipc/groups/{group_id}/properties?"
+        f"propertyName={urllib.parse.quote(property_name, safe='')}",
+        headers={"x-api-key": control_api_key}
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    results = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert sorted(result["id"] for result in results) == sorted(device_ids)
+    for result in results:
+        assert result["properties"] == [{
+            "property": property_name,
+            "value": base64.b64encode(b"test").decode("utf-8")
+        }]
+
+    # Ad-hoc device lists report unknown devices individually
+    missing_id = str(uuid.uuid4())
+    response = client.put(
+        f"/nipc/devices/properties?deviceId={device_ids[0]}&deviceId={missing_id}",
+        json=[{
+            "property": ("https://example.com/thermometer#/sdfThing/thermometer/"
+                         "sdfProperty/temperature_control"),
+            "value": base64.b64encode(b"25.5").decode("ascii")
+        }],
+        headers={"x-api-key": control_api_key}
+    )
+
+    assert response.status_code == 200
+    results = {result["id"]: result for result in
+               (json.loads(line) for line in response.get_data(as_text=True).splitlines())}
+    assert results[device_ids[0]]["properties"] == [{"status": 200}]
+    assert results[missing_id]["status"] == 404
+
+    # Any spelling of an ID reaches the device and is reported canonically
+    response = client.get(
+        f"/nipc/devices/properties?deviceId={device_ids[1].upper()}&deviceId=not-a-uuid&"
+        f"propertyName={urllib.parse.quote(property_name, safe='')}",
+        headers={"x-api-key": control_api_key}
+    )
+
+    assert response.status_code == 200
+    results = {result["id"]: result for result in
+               (json.loads(line) for line in response.get_data(as_text=True).splitlines())}
+    assert results[device_ids[1]]["properties"][0]["property"] == property_name
+    assert results["not-a-uuid"]["status"] == 404
+
+    response = client.delete(f"/nipc/groups/{group_id}",
+                             headers={"x-api-key": control_api_key})
+    assert response.status_code == 200
+
+    response = client.get(f"/nipc/groups/{group_id}",
+                          headers={"x-api-key": control_api_key})
+    assert response.status_code == 404
+
+
+def test_stream_events(
+    client: FlaskClient,
+    control_api_key: str,
+    sdf_model: SdfModel, # pylint: disable=unused-argument
+    data_app: dict) -> None:
+    """ Test streaming data app events over Server-Sent Events """
+    data_app_id = data_app["id"]
+    event_name = "https://example.com/thermometer#/sdfThing/thermometer/sdfEvent/isPresent"
+    response = client.post(
+        f"/nipc/registrations/data-apps?dataAppId={data_app_id}",
+        json={"events": [{"event": event_name}], "mqttClient": True},
+        headers={"x-api-key": control_api_key}
+    )
+    assert response.status_code == 200
+
+    # Only the data app itself may attach to its stream
+    response = client.get(f"/nipc/events/stream?dataAppId={data_app_id}",
+                          headers={"x-api-key": control_api_key})
+    assert response.status_code == 403
+
+    response = client.get("/nipc/events/stream?dataAppId=not-a-uuid",
+                          headers={"x-api-key": data_app["clientToken"]})
+    assert response.status_code == 400
+
+    # Any spelling of the ID reaches the events published under it
+    response = client.get(f"/nipc/events/stream?dataAppId={data_app_id.upper()}",
+                          headers={"x-api-key": data_app["clientToken"]},
+                          buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    chunks = response.iter_encoded()
+    assert next(chunks).startswith(b"retry:")
+
+    payload = b"\xa1adata"
+    event_broker().publish(data_app_id, event_name, payload)
+    encoded = base64.b64encode(payload).decode()
+    assert next(chunks).endswith(f"event: {event_name}\ndata: {encoded}\n\n".encode())
+    response.close()
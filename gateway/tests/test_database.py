@@ -0,0 +1,127 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Test read replica routing and the embedded SQLite mode.
+"""
+
+import io
+import json
+import uuid
+from collections import Counter
+
+import pytest
+from flask import Flask
+from sqlalchemy import event, select, text
+
+from app_factory import create_app
+from database import REPLICA_BIND, db, session, upgrade_database, use_replica
+from device_import import import_devices
+from models import OnboardingAppKey
+from nipc_models import BleExtension
+from scim_ble import BLE_SCHEMA
+from tests.test_control import create_device
+
+
+@pytest.fixture(name="replica_app")
+def fixture_replica_app(postgres):
+    """ Application whose replica bind is a second pool on the same database """
+    url = postgres.get_connection_url()
+    app = create_app(url, replica_url=url)
+    with app.app_context():
+        upgrade_database()
+    yield app
+
+
+@pytest.fixture(name="statements")
+def fixture_statements(replica_app: Flask):
+    """ Count the statements run on the primary and on the replica """
+    counts = Counter()
+    with replica_app.app_context():
+        for name, engine in (("primary", db.engine), ("replica", db.engines[REPLICA_BIND])):
+            event.listen(engine, "before_cursor_execute",
+                         lambda *_, name=name: counts.update([name]))
+    return counts
+
+
+@pytest.mark.postgres
+def test_read_only_views_use_replica(replica_app: Flask, statements: Counter):
+    """ Read-only views, and their authentication, read from the replica """
+    client = replica_app.test_client()
+    with replica_app.app_context():
+        api_key = str(uuid.uuid4())
+        session.add(OnboardingAppKey("onboarding-app", api_key))
+        session.commit()
+
+    device = create_device(client, api_key)
+    assert statements["replica"] == 0
+
+    statements.clear()
+    response = client.get(f"/scim/v2/Devices/{device['id']}", headers={"x-api-key": api_key})
+    assert response.status_code == 200
+    response = client.get("/scim/v2/Devices", headers={"x-api-key": api_key})
+    assert response.status_code == 200
+    assert response.json["totalResults"] == 1
+    assert [resource["id"] for resource in response.json["Resources"]] == [device["id"]]
+    assert statements["replica"] > 0
+    assert statements["primary"] == 0
+
+
+@pytest.mark.postgres
+def test_use_replica_routing_rules(replica_app: Flask, statements: Counter):
+    """ Writes, locking reads and reads after a flush stay on the primary """
+    with replica_app.app_context(), use_replica():
+        session.scalar(select(OnboardingAppKey))
+        assert statements == {"replica": 1}
+
+        session.scalar(select(OnboardingAppKey).with_for_update())
+        assert statements["primary"] == 1
+
+        session.add(OnboardingAppKey("onboarding-app", "key"))
+        session.flush()
+        assert session.scalar(select(OnboardingAppKey)).key_val == "key"
+        assert statements["replica"] == 1
+        session.rollback()
+
+        session.scalar(select(OnboardingAppKey))
+        assert statements["replica"] == 2
+
+        replica_connection = session.connection(
+            bind_arguments={"bind": db.engines[REPLICA_BIND]})
+        assert replica_connection.execute(
+            text("SHOW default_transaction_read_only")).scalar() == "on"
+
+
+def _ble_record(mac_address: str, *pairing_methods: str) -> str:
+    return json.dumps({
+        "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Device", BLE_SCHEMA],
+        "displayName": mac_address,
+        "active": True,
+        BLE_SCHEMA: {"deviceMacAddress": mac_address, "versionSupport": ["5.3"],
+                     "pairingMethods": list(pairing_methods)},
+    }) + "\n"
+
+
+def test_sqlite_storage(tmp_path):
+    """ SQLite databases are migrated, run in WAL mode and take bulk imports """
+    app = create_app(f"sqlite:///{tmp_path / 'tiedie.db'}")
+    with app.app_context():
+        upgrade_database()
+        assert session.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert session.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        session.rollback()
+
+        records = io.StringIO(_ble_record("AA:BB:CC:00:00:01", "urn:ietf:params:scim:"
+                                          "schemas:extension:pairingNull:2.0:Device") +
+                              _ble_record("AA:BB:CC:00:00:02") +
+                              _ble_record("AA:BB:CC:00:00:01"))
+        assert import_devices(records, "ndjson", io.StringIO()) == (2, 1)
+        # The staging table of the first import is gone
+        assert import_devices(io.StringIO(_ble_record("AA:BB:CC:00:00:03")), "ndjson",
+                              io.StringIO()) == (1, 0)
+
+        assert [ble.pairing_methods for ble in session.scalars(
+            select(BleExtension).order_by(BleExtension.device_mac_address))] == [
+                ["urn:ietf:params:scim:schemas:extension:pairingNull:2.0:Device"], [], []]
@@ -0,0 +1,196 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Test FDO voucher uploads against a stub owner service.
+"""
+
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+import fdo_upload
+import scim_fdo
+from database import db
+from models import Device
+from fdo_upload import FdoUploader, FdoUploadJob, UploadState, enqueue_voucher, submit_voucher
+
+FDO_SCHEMA = "urn:ietf:params:scim:schemas:extension:fido-device-onboard:2.0:Device"
+
+
+class OwnerStub:
+    """ Accepts vouchers, optionally failing or stalling first """
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.statuses: list[int] = []
+        self.vouchers: list[str] = []
+        self.clients: set = set()
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """ Owner service request handler """
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args): # pylint: disable=arguments-differ
+                pass
+
+            def do_POST(self): # pylint: disable=invalid-name
+                """ Voucher submission """
+                body = self.rfile.read(int(self.headers["Content-Length"])).decode()
+                time.sleep(stub.delay)
+                with stub.lock:
+                    stub.clients.add(self.client_address)
+                    status = stub.statuses.pop(0) if stub.statuses else 201
+                    if status == 201:
+                        stub.vouchers.append(body)
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/api/v1/owner/vouchers"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        """ Stop serving """
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture(name="owner")
+def fixture_owner():
+    """ Stub owner service """
+    stub = OwnerStub()
+    yield stub
+    stub.close()
+
+
+@pytest.fixture(name="uploader")
+def fixture_uploader(app: Flask, owner: OwnerStub):
+    """ Upload workers posting to the stub """
+    uploader = FdoUploader(submit=lambda voucher: submit_voucher(voucher, url=owner.url),
+                           workers=4, retry_base=0.05, poll_interval=0.1)
+    uploader.start(app)
+    yield uploader
+    uploader.stop()
+
+
+def create_fdo_device(client: FlaskClient, api_key: str, name: str):
+    """ POST an FDO device """
+    with open("tests/fdo-voucher.b64", encoding="utf-8") as voucher_file:
+        voucher = voucher_file.read()
+    return client.post("/scim/v2/Devices", json={
+        "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Device", FDO_SCHEMA],
+        "displayName": name,
+        "active": True,
+        FDO_SCHEMA: {"fdoOwnerVoucher": voucher}
+    }, headers={"x-api-key": api_key})
+
+
+def wait_for_jobs(app: Flask, timeout: float = 10.0) -> list[FdoUploadJob]:
+    """ Wait until no upload job is pending or running """
+    deadline = time.monotonic() + timeout
+    while True:
+        with app.app_context():
+            jobs = db.session.scalars(db.select(FdoUploadJob)).all()
+            db.session.expunge_all()
+        if all(job.state in (UploadState.SUCCEEDED, UploadState.FAILED) for job in jobs) \
+                or time.monotonic() > deadline:
+            return jobs
+        time.sleep(0.05)
+
+
+def test_upload_retry(app: Flask, client: FlaskClient, api_key: str, owner: OwnerStub,
+                      uploader: FdoUploader):
+    """ Transient failures are retried with backoff; permanent ones are not """
+    device_ids = [create_fdo_device(client, api_key, f"FDO {n}").json["id"] for n in range(2)]
+
+    owner.statuses = [503, 503]
+    with app.app_context():
+        enqueue_voucher(db.session.get(Device, device_ids[0]), "first voucher")
+        db.session.commit()
+    jobs = wait_for_jobs(app)
+    assert [(job.state, job.attempts) for job in jobs] == [(UploadState.SUCCEEDED, 3)]
+    assert owner.vouchers == ["first voucher"]
+
+    owner.statuses = [400]
+    with app.app_context():
+        enqueue_voucher(db.session.get(Device, device_ids[1]), "second voucher")
+        db.session.commit()
+    jobs = {job.device_id: job for job in wait_for_jobs(app)}
+    failed = jobs[uuid.UUID(device_ids[1])]
+    assert failed.state == UploadState.FAILED
+    assert failed.attempts == 1
+    assert failed.last_error.startswith("400")
+    assert uploader.backoff(1) == pytest.approx(0.05)
+    assert uploader.backoff(3) == pytest.approx(0.2)
+
+
+def test_scim_async_upload(app: Flask, client: FlaskClient, api_key: str, owner: OwnerStub,
+                           uploader: FdoUploader, monkeypatch):
+    """ SCIM answers at once while vouchers upload concurrently over pooled connections """
+    monkeypatch.setattr(scim_fdo, "FDO_SUPPORT", True)
+    monkeypatch.setattr(scim_fdo, "FDO_ASYNC_UPLOAD", True)
+    monkeypatch.setattr(scim_fdo, "FDO_ASYNC_STATUS", 202)
+    monkeypatch.setattr(fdo_upload, "_fdo_uploader", uploader)
+    owner.delay = 0.3
+
+    started = time.monotonic()
+    for n in range(8):
+        response = create_fdo_device(client, api_key, f"FDO {n}")
+        assert response.status_code == 202, response.json
+        assert FDO_SCHEMA in response.json
+    assert time.monotonic() - started < 8 * owner.delay
+
+    jobs = wait_for_jobs(app)
+    assert len(jobs) == 8
+    assert all(job.state == UploadState.SUCCEEDED for job in jobs)
+    assert all(voucher.startswith("-----BEGIN OWNERSHIP VOUCHER-----")
+               for voucher in owner.vouchers)
+    # Four workers share one pool instead of opening a connection per voucher
+    assert len(owner.clients) <= uploader.workers
+
+    # Deleting the device drops its upload jobs
+    device_id = client.get("/scim/v2/Devices", headers={"x-api-key": api_key}) \
+        .json["Resources"][0]["id"]
+    response = client.delete(f"/scim/v2/Devices/{device_id}", headers={"x-api-key": api_key})
+    assert response.status_code == 204
+    assert len(wait_for_jobs(app)) == 7
+
+
+def test_import_queues_uploads(app: Flask, owner: OwnerStub, uploader: FdoUploader,
+                               tmp_path, monkeypatch):
+    """ Imported FDO devices have their vouchers uploaded like SCIM ones """
+    monkeypatch.setattr(scim_fdo, "FDO_SUPPORT", True)
+    monkeypatch.setattr(fdo_upload, "_fdo_uploader", uploader)
+    with open("tests/fdo-voucher.b64", encoding="utf-8") as voucher_file:
+        voucher = voucher_file.read()
+    source = tmp_path / "devices.ndjson"
+    source.write_text(json.dumps({
+        "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Device", FDO_SCHEMA],
+        "displayName": "Imported FDO",
+        "active": True,
+        FDO_SCHEMA: {"fdoOwnerVoucher": voucher}
+    }) + "\n" + json.dumps({
+        "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Device"],
+        "displayName": "Imported plain",
+        "active": True
+    }) + "\n")
+
+    result = app.test_cli_runner().invoke(args=["import-devices", str(source)])
+    assert result.exit_code == 0, result.output
+    assert "imported 2 devices, rejected 0" in result.output
+
+    jobs = wait_for_jobs(app)
+    assert [(job.state, job.attempts) for job in jobs] == [(UploadState.SUCCEEDED, 1)]
+    assert owner.vouchers == [scim_fdo.to_pem(voucher)]
@@ -0,0 +1,141 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Test the ISE sync queue against a stub ERS server.
+"""
+
+import ciscoisesdk
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+import ise_sync
+from tests.ers_stub import ErsStub
+
+MAB_SCHEMA = "urn:ietf:params:scim:schemas:extension:ethernet-mab:2.0:Device"
+
+
+def make_sync(stub: ErsStub) -> ise_sync.IseSync:
+    """ An IseSync talking to the stub """
+    api = ciscoisesdk.IdentityServicesEngineAPI(
+        username="admin", password="admin", uses_api_gateway=False,
+        ers_base_url=stub.url, ui_base_url=stub.url, mnt_base_url=stub.url,
+        px_grid_base_url=stub.url, version="3.1.0", uses_csrf_token=False,
+        verify=False)
+    return ise_sync.IseSync(lambda: api, delay=0.05)
+
+
+@pytest.fixture(name="ers")
+def fixture_ers():
+    """ Stub ERS server """
+    with ErsStub() as stub:
+        yield stub
+
+
+def mac_address(number: int) -> str:
+    """ Build a MAC address """
+    return f"AA:BB:CC:00:{number // 256:02X}:{number % 256:02X}"
+
+
+def test_bulk_sync(ers: ErsStub):
+    """ Queued changes are coalesced into ERS bulk requests """
+    sync = make_sync(ers)
+    ers.endpoints["existing"] = mac_address(0)
+
+    for number in range(50):
+        sync.add(mac_address(number).lower())
+    assert sync.flush(timeout=10)
+    assert ers.macs() == {mac_address(number) for number in range(50)}
+    assert ers.requests["bulk"] == 1
+    # Only the endpoint that already existed is looked up
+    assert ers.requests["lookup"] == 1
+    assert ers.requests["create"] == 0
+
+    for number in range(10):
+        sync.remove(mac_address(number))
+    sync.add(mac_address(99))
+    sync.remove(mac_address(99))
+    assert sync.flush(timeout=10)
+    assert ers.macs() == {mac_address(number) for number in range(10, 50)}
+    assert ers.requests["bulk"] == 2
+    assert ers.requests["delete"] == 0
+    sync.stop()
+
+
+def test_sync_without_bulk():
+    """ Servers without ERS bulk support get single requests """
+    with ErsStub(bulk_supported=False) as ers:
+        sync = make_sync(ers)
+        for number in range(3):
+            sync.add(mac_address(number))
+        assert sync.flush(timeout=10)
+        assert not sync.use_bulk
+        assert ers.requests["create"] == 3
+
+        sync.replace(mac_address(0), mac_address(5))
+        assert sync.flush(timeout=10)
+        assert ers.macs() == {mac_address(number) for number in (1, 2, 5)}
+        sync.stop()
+
+
+def test_scim_mab_sync(app: Flask, client: FlaskClient, api_key: str, ers: ErsStub,
+                       monkeypatch):
+    """ SCIM MAB requests are synced in the background and reconciled """
+    sync = make_sync(ers)
+    monkeypatch.setattr(ise_sync, "_ise_sync", sync)
+    headers = {"x-api-key": api_key}
+
+    device_ids = []
+    for number in range(3):
+        response = client.post("/scim/v2/Devices", json={
+            "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Device", MAB_SCHEMA],
+            "displayName": f"MAB {number}",
+            "active": True,
+            MAB_SCHEMA: {"deviceMacAddress": mac_address(number)}
+        }, headers=headers)
+        assert response.status_code == 201
+        device_ids.append(response.json["id"])
+
+    assert sync.flush(timeout=10)
+    assert ers.macs() == {mac_address(number) for number in range(3)}
+
+    # Devices that fail after the MAB extension ran never reach ISE, even
+    # when a later operation of the same bulk request commits
+    rejected = {
+        "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Device", MAB_SCHEMA,
+                    "urn:example:unknown"],
+        "displayName": "MAB rejected",
+        "active": True,
+        MAB_SCHEMA: {"deviceMacAddress": mac_address(10)}
+    }
+    response = client.post("/scim/v2/Devices", json=rejected, headers=headers)
+    assert response.status_code == 501
+    response = client.post("/scim/v2/Bulk", json={
+        "schemas": ["urn:ietf:params:scim:api:messages:2.0:BulkRequest"],
+        "Operations": [
+            {"method": "POST", "path": "/Devices", "bulkId": "rejected", "data": rejected},
+            {"method": "POST", "path": "/Devices", "bulkId": "plain", "data": {
+                "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Device"],
+                "displayName": "Plain", "active": True}},
+        ]
+    }, headers=headers)
+    assert [result["status"] for result in response.json["Operations"]] == ["501", "201"]
+    assert sync.flush(timeout=10)
+    assert ers.macs() == {mac_address(number) for number in range(3)}
+
+    response = client.delete(f"/scim/v2/Devices/{device_ids[0]}", headers=headers)
+    assert response.status_code == 204
+    assert sync.flush(timeout=10)
+    assert ers.macs() == {mac_address(number) for number in (1, 2)}
+
+    # Endpoints lost on the ISE side are restored by reconciliation
+    ers.endpoints.clear()
+    ers.endpoints["unmanaged"] = "11:22:33:44:55:66"
+    changes = sync.reconcile(app)
+    assert sorted(changes) == [(mac_address(1), True), (mac_address(2), True)]
+    assert sync.flush(timeout=10)
+    assert ers.macs() == {mac_address(1), mac_address(2), "11:22:33:44:55:66"}
+    sync.stop()
@@ -0,0 +1,137 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Test the migration history and the indexes behind the hot query paths.
+"""
+
+import datetime
+import uuid
+
+import flask_migrate
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from flask import Flask
+from sqlalchemy import func, select, text
+
+from database import db, session, upgrade_database
+from fdo_upload import FdoUploadJob
+from models import Device, EndpointApp, OnboardingAppKey, devices_endpoint_apps
+from nipc_models import BleExtension, DataApp, DataAppEvent, Event, SdfModel, device_group_members
+from scim_ethermab import EtherMABExtension
+
+DEVICE_ID = str(uuid.uuid4())
+
+HOT_QUERIES = {
+    "ble device by address, any case": select(BleExtension).filter(
+        func.lower(BleExtension.device_mac_address) == func.lower("AA:BB:CC:DD:EE:FF")),
+    "ble device by address": select(BleExtension).filter_by(
+        device_mac_address="AA:BB:CC:DD:EE:FF"),
+    "mab device by address": select(EtherMABExtension).filter_by(
+        device_mac_address="AA:BB:CC:DD:EE:FF"),
+    "gatt events": select(Event).filter_by(
+        device_id=DEVICE_ID, event_type="gatt",
+        gatt_service_id="180d", gatt_characteristic_id="2a37"),
+    "events by type": select(Event).filter_by(
+        device_id=DEVICE_ID, event_type="advertisements"),
+    "event by name": select(Event).filter_by(event_name="event", device_id=DEVICE_ID),
+    "data app fan-out": select(DataAppEvent.data_app_id, Event.event_name)
+        .select_from(Event)
+        .filter_by(device_id=DEVICE_ID, event_type="advertisements")
+        .join(DataAppEvent, DataAppEvent.event_name == Event.event_name),
+    "events of a data app": select(DataAppEvent).filter_by(data_app_id=DEVICE_ID),
+    "control app by token": select(EndpointApp).filter_by(clientToken="token"),
+    "control app by subject": select(EndpointApp).filter_by(subjectName="subject"),
+    "app by name": select(EndpointApp).filter_by(applicationName="admin"),
+    "onboarding key": select(OnboardingAppKey).filter_by(key_val="key"),
+    "sdf model by name": select(SdfModel).filter_by(sdf_name="https://example.com/model"),
+    "device by display name": select(Device).filter_by(display_name="device"),
+    "apps of a device": select(devices_endpoint_apps).filter_by(device_id=DEVICE_ID),
+    "groups of a device": select(device_group_members).filter_by(device_id=DEVICE_ID),
+    "due fdo uploads": select(FdoUploadJob)
+        .where(FdoUploadJob.state.in_(["pending", "running"]),
+               FdoUploadJob.next_attempt <= datetime.datetime(2026, 1, 1))
+        .order_by(FdoUploadJob.next_attempt),
+}
+
+
+def _explain(statement) -> str:
+    compiled = statement.compile(dialect=db.engine.dialect,
+                                 compile_kwargs={"render_postcompile": True})
+    rows = session.connection().exec_driver_sql(
+        f"EXPLAIN {compiled}", compiled.params).all()
+    return "\n".join(row[0] for row in rows)
+
+
+def test_migrations_match_models(app: Flask):
+    """ The migrated schema has everything the models declare """
+    with app.app_context():
+        with db.engine.connect() as connection:
+            context = MigrationContext.configure(connection)
+            assert compare_metadata(context, db.metadata) == []
+
+
+@pytest.mark.postgres
+def test_hot_queries_use_indexes(app: Flask):
+    """ Each query on a hot path can be answered from an index """
+    unindexed = {}
+    with app.app_context():
+        # With no rows the planner would otherwise prefer sequential scans
+        session.execute(text("SET LOCAL enable_seqscan = off"))
+        for name, statement in HOT_QUERIES.items():
+            plan = _explain(statement)
+            if "Seq Scan" in plan or "Index" not in plan:
+                unindexed[name] = plan
+        session.rollback()
+
+    assert not unindexed
+
+
+def test_adopt_create_all_database(app: Flask):
+    """ A database made by db.create_all() before migrations is upgraded """
+    with app.app_context():
+        flask_migrate.downgrade(revision="0001")
+        session.execute(text("DROP TABLE alembic_version"))
+        session.commit()
+
+        upgrade_database()
+
+        with db.engine.connect() as connection:
+            context = MigrationContext.configure(connection)
+            head = ScriptDirectory(app.extensions["migrate"].directory).get_current_head()
+            assert context.get_current_revision() == head
+            assert compare_metadata(context, db.metadata) == []
+
+
+@pytest.mark.postgres
+def test_data_app_events_migration(app: Flask):
+    """ Event arrays are converted to subscription rows and back """
+    event = "https://example.com/thermometer#/sdfThing/thermometer/sdfEvent/isPresent"
+    other = "https://example.com/thermometer#/sdfThing/thermometer/sdfEvent/isConnected"
+    with app.app_context():
+        flask_migrate.downgrade(revision="0002")
+        app_id = session.execute(text(
+            "INSERT INTO endpoint_app "
+            "(id, \"applicationType\", \"applicationName\", \"createdTime\", "
+            "\"modifiedTime\", is_admin) "
+            "VALUES (gen_random_uuid(), 'telemetry', 'app', now(), now(), false) "
+            "RETURNING id")).scalar_one()
+        session.execute(text(
+            "INSERT INTO data_app (data_app_id, events) VALUES (:id, :events)"),
+            {"id": app_id, "events": [other, event, other]})
+        session.commit()
+
+        flask_migrate.upgrade()
+        data_app = session.get(DataApp, app_id)
+        assert data_app.events == [other, event]
+        session.rollback()
+
+        flask_migrate.downgrade(revision="0002")
+        assert session.execute(text("SELECT events FROM data_app")).scalar_one() == \
+            [other, event]
+        session.rollback()
+        flask_migrate.upgrade()
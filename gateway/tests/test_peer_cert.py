@@ -0,0 +1,105 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Test client certificate extraction
+"""
+
+import datetime
+import urllib.parse
+import uuid
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+from flask.testing import FlaskClient
+
+from peer_cert import PeerCertMiddleware
+
+
+class TlsSocket:
+    """ The part of an SSL socket that the middleware uses """
+
+    def __init__(self, der: bytes | None):
+        self.der = der
+
+    def getpeercert(self, binary_form: bool = False):
+        """ The peer certificate, DER encoded """
+        assert binary_form
+        return self.der
+
+
+def make_certificate(common_name: str) -> x509.Certificate:
+    """ A self-signed client certificate """
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return (x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now)
+            .not_valid_after(now + datetime.timedelta(days=1))
+            .sign(key, hashes.SHA256()))
+
+
+@pytest.fixture(name="certificate")
+def fixture_certificate() -> x509.Certificate:
+    """ Client certificate with CN sensor-ctl """
+    return make_certificate("sensor-ctl")
+
+
+def test_socket_certificate(certificate: x509.Certificate):
+    """ Without a header, the certificate comes from the TLS socket """
+    middleware = PeerCertMiddleware(None, header=None)
+    der = certificate.public_bytes(serialization.Encoding.DER)
+
+    for key in ("werkzeug.socket", "gunicorn.socket"):
+        peer_cert = middleware.peer_cert({key: TlsSocket(der)})
+        assert peer_cert.get_subject().CN == "sensor-ctl"
+
+    assert middleware.peer_cert({"werkzeug.socket": TlsSocket(None)}) is None
+    assert middleware.peer_cert({"werkzeug.socket": object()}) is None
+    # Headers are not trusted unless configured
+    pem = certificate.public_bytes(serialization.Encoding.PEM).decode()
+    assert middleware.peer_cert({"HTTP_X_SSL_CLIENT_CERT": urllib.parse.quote(pem)}) is None
+
+
+def test_header_certificate(certificate: x509.Certificate):
+    """ Behind a proxy, the certificate comes from the configured header """
+    middleware = PeerCertMiddleware(None, header="X-SSL-Client-Cert")
+    pem = certificate.public_bytes(serialization.Encoding.PEM).decode()
+    other = make_certificate("intruder").public_bytes(serialization.Encoding.DER)
+
+    peer_cert = middleware.peer_cert({"HTTP_X_SSL_CLIENT_CERT": urllib.parse.quote(pem),
+                                      "werkzeug.socket": TlsSocket(other)})
+    assert peer_cert.get_subject().CN == "sensor-ctl"
+    # The socket of the proxy connection is not the client's
+    assert middleware.peer_cert({"werkzeug.socket": TlsSocket(other)}) is None
+    assert middleware.peer_cert({"HTTP_X_SSL_CLIENT_CERT": "garbage"}) is None
+
+
+def test_certificate_authentication(client: FlaskClient, api_key: str,
+                                    certificate: x509.Certificate):
+    """ Requests are authenticated by the certificate the middleware found """
+    response = client.post("/scim/v2/EndpointApps", json={
+        "schemas": ["urn:ietf:params:scim:schemas:core:2.0:EndpointApp"],
+        "applicationType": "deviceControl",
+        "applicationName": "Certificate Control App",
+        "certificateInfo": {"rootCA": "", "subjectName": "sensor-ctl"},
+    }, headers={"x-api-key": api_key})
+    assert response.status_code == 201
+
+    url = f"/nipc/devices/{uuid.uuid4()}/connections"
+    der = certificate.public_bytes(serialization.Encoding.DER)
+    response = client.get(url, environ_base={"werkzeug.socket": TlsSocket(der)})
+    assert response.status_code == 404
+
+    der = make_certificate("intruder").public_bytes(serialization.Encoding.DER)
+    response = client.get(url, environ_base={"werkzeug.socket": TlsSocket(der)})
+    assert response.status_code == 403
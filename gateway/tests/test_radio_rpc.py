@@ -0,0 +1,132 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Test the radio daemon RPC
+"""
+
+import pytest
+
+from access_point import BleConnectOptions
+from access_point_responses import AccessPointError, BleConnectionError, BleReadError
+from data_producer import DataProducer
+from event_stream import EventBroker, event_broker
+from mock.mock_access_point import MockAccessPoint
+from radio_rpc import RadioRpcServer, RemoteAccessPoint
+from value_cache import ValueCache, value_cache
+
+ADDRESS = "AA:BB:CC:11:22:33"
+
+
+@pytest.fixture(name="socket_path")
+def fixture_socket_path(tmp_path) -> str:
+    """ Socket of the radio daemon """
+    return str(tmp_path / "radio.sock")
+
+
+@pytest.fixture(name="radio")
+def fixture_radio(data_producer: DataProducer, socket_path: str):
+    """ Mock access point, served on socket_path """
+    access_point = MockAccessPoint(data_producer)
+    access_point.start()
+    server = RadioRpcServer(access_point, socket_path)
+    server.start()
+    yield access_point
+    server.stop()
+    access_point.conn_reqs.pop(ADDRESS, None)
+
+
+@pytest.fixture(name="remote")
+def fixture_remote(radio: MockAccessPoint, # pylint: disable=unused-argument
+                   socket_path: str):
+    """
+    Worker side of the radio; it has an event broker and value cache of
+    its own, as it would in a worker process
+    """
+    remote = RemoteAccessPoint(socket_path, timeout=5, reconnect_delay=0.1,
+                               broker=EventBroker(), cache=ValueCache())
+    remote.start()
+    assert remote.ready.wait(5)
+    yield remote
+    remote.stop()
+
+
+def test_remote_calls(remote: RemoteAccessPoint):
+    """ Calls reach the access point of the daemon, errors included """
+    assert remote.connectable()
+    assert ADDRESS not in remote.conn_reqs
+
+    assert remote.connection_count() == 0
+    remote.connect(ADDRESS, BleConnectOptions())
+    assert ADDRESS in remote.conn_reqs
+    assert remote.connection_count() == 1
+    assert remote.get_connection(ADDRESS).address == ADDRESS
+    with pytest.raises(BleConnectionError, match="already connected"):
+        remote.connect(ADDRESS, BleConnectOptions())
+
+    services = remote.discover(ADDRESS, BleConnectOptions()).services
+    assert [svc.service_id for svc in services] == ["180d"]
+    characteristics = services[0].characteristics
+    assert characteristics["2a37"].properties == ["notify"]
+    assert list(characteristics["2a37"].descriptors) == ["2902"]
+
+    assert remote.read(ADDRESS, "180d", "2a38").value == b"test"
+    with pytest.raises(BleReadError):
+        remote.read(ADDRESS, "180d", "2a99")
+    assert remote.write(ADDRESS, "180d", "2a39", b"\x01").success
+
+    remote.disconnect(ADDRESS)
+    assert remote.get_connection(ADDRESS) is None
+    assert len(remote.conn_reqs) == 0
+
+
+def test_events_are_forwarded(remote: RemoteAccessPoint):
+    """ Events and values produced in the daemon reach the worker """
+    subscriber = remote.broker.subscribe("data-app")
+    event_broker().publish("data-app", "isPresent", b"\xa0")
+    event = subscriber.events.get(timeout=5)
+    assert (event.event_name, event.payload) == ("isPresent", b"\xa0")
+
+    value_cache().put(ADDRESS, "180d", "2a37", b"\x42")
+    subscriber = remote.broker.subscribe("other-app")
+    # Messages are delivered in order; once this event arrives, so has the value
+    event_broker().publish("other-app", "isConnected", b"\xa0")
+    subscriber.events.get(timeout=5)
+    assert remote.cache.get(ADDRESS, "180d", "2a37", 60)[0] == b"\x42"
+
+
+def test_cache_updates_reach_workers(remote: RemoteAccessPoint, socket_path: str):
+    """ Written values and invalidations reach every worker """
+    other = RemoteAccessPoint(socket_path, timeout=5, reconnect_delay=0.1,
+                              broker=EventBroker(), cache=ValueCache())
+    other.start()
+    try:
+        assert other.ready.wait(5)
+        subscriber = other.broker.subscribe("data-app")
+
+        def delivered():
+            # Messages are delivered in order; once this event arrives, so has the rest
+            event_broker().publish("data-app", "isPresent", b"\xa0")
+            subscriber.events.get(timeout=5)
+
+        other.cache.put(ADDRESS, "180d", "2a39", b"\x00", notify=False)
+        remote.connect(ADDRESS, BleConnectOptions())
+        assert remote.write(ADDRESS, "180d", "2a39", b"\x01").success
+        delivered()
+        assert other.cache.get(ADDRESS, "180d", "2a39", 60)[0] == b"\x01"
+
+        remote.cache.invalidate(ADDRESS)
+        delivered()
+        assert other.cache.get(ADDRESS, "180d", "2a39", 60) is None
+        assert value_cache().get(ADDRESS, "180d", "2a39", 60) is None
+    finally:
+        other.stop()
+
+
+def test_daemon_unavailable(tmp_path):
+    """ Calls fail with an access point error when the daemon is down """
+    remote = RemoteAccessPoint(str(tmp_path / "missing.sock"), timeout=1)
+    with pytest.raises(AccessPointError, match="radio daemon unavailable"):
+        remote.read(ADDRESS, "180d", "2a38")
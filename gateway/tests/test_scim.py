@@ -8,8 +8,17 @@
 Test SCIM server implementation
 """
 
+import json
+import math
+import tracemalloc
 import uuid
+from flask import Flask
 from flask.testing import FlaskClient
+from sqlalchemy import event, insert
+from config import SCIM_STREAM_BATCH_SIZE
+from database import db
+from models import Device
+from nipc_models import BleExtension
 # pylint: disable-next=unused-import
 from scim_fdo import FDOExtension
 # pylint: disable-next=unused-import
@@ -149,6 +158,62 @@ def test_get_device(client: FlaskClient, api_key):
         "Resources"][0]
 
 
+def test_get_device_conditional(client: FlaskClient, api_key):
+    """ Test ETag and If-None-Match on GET device """
+    device = {
+        "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Device",
+                    "urn:ietf:params:scim:schemas:extension:ble:2.0:Device"],
+        "displayName": "BLE Heart Monitor",
+        "active": True,
+        "urn:ietf:params:scim:schemas:extension:ble:2.0:Device": {
+            "versionSupport": ["5.3"],
+            "deviceMacAddress": "AA:BB:CC:11:22:33",
+            "isRandom": False,
+            "mobility": True
+        }
+    }
+    response = client.post("/scim/v2/Devices", json=device, headers={
+        "x-api-key": api_key
+    })
+    device_id = response.json["id"]
+
+    response = client.get(f"/scim/v2/Devices/{device_id}", headers={
+        "x-api-key": api_key
+    })
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert response.json["meta"]["version"] == etag
+
+    response = client.get(f"/scim/v2/Devices/{device_id}", headers={
+        "x-api-key": api_key,
+        "If-None-Match": etag
+    })
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+
+    ble = "urn:ietf:params:scim:schemas:extension:ble:2.0:Device"
+    device[ble].update({
+        "urn:ietf:params:scim:schemas:extension:pairingJustWorks:2.0:Device": {"key": None},
+        "urn:ietf:params:scim:schemas:extension:pairingPassKey:2.0:Device": {"key": None},
+        "urn:ietf:params:scim:schemas:extension:pairingOOB:2.0:Device": {},
+    })
+    response = client.put(f"/scim/v2/Devices/{device_id}",
+                          json={**device, "id": device_id, "displayName": "Renamed"},
+                          headers={"x-api-key": api_key})
+    print(response.json)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+    response = client.get(f"/scim/v2/Devices/{device_id}", headers={
+        "x-api-key": api_key,
+        "If-None-Match": etag
+    })
+    assert response.status_code == 200
+    assert response.json["displayName"] == "Renamed"
+    assert response.json["meta"]["version"] == response.headers["ETag"]
+
+
 def test_delete_device(client: FlaskClient, api_key):
     """ Test DELETE device """
     device_id = uuid.uuid4()
@@ -648,3 +713,351 @@ def test_create_endpoint_app_token(client: FlaskClient, api_key: str):
         "urn:ietf:params:scim:schemas:core:2.0:EndpointApp"
     ]
     assert response.json["clientToken"] is not None
+
+
+def bulk_device(mac_address: str, bulk_id: str, app_id=None) -> dict:
+    """ Build a device creation bulk operation """
+    data = {
+        "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Device",
+                    "urn:ietf:params:scim:schemas:extension:ble:2.0:Device"],
+        "displayName": f"BLE Monitor {bulk_id}",
+        "active": True,
+        "urn:ietf:params:scim:schemas:extension:ble:2.0:Device": {
+            "versionSupport": ["5.3"],
+            "deviceMacAddress": mac_address,
+            "isRandom": False
+        }
+    }
+    if app_id:
+        data["schemas"].append(
+            "urn:ietf:params:scim:schemas:extension:endpointAppsExt:2.0:Device")
+        data["urn:ietf:params:scim:schemas:extension:endpointAppsExt:2.0:Device"] = {
+            "applications": [{"value": app_id}]
+        }
+    return {"method": "POST", "path": "/Devices", "bulkId": bulk_id, "data": data}
+
+
+def test_bulk_devices(client: FlaskClient, api_key: str):
+    """ Test POST Bulk """
+    headers = {"x-api-key": api_key}
+    app_id = client.post("/scim/v2/EndpointApps", json={
+        "schemas": ["urn:ietf:params:scim:schemas:core:2.0:EndpointApp"],
+        "applicationType": "deviceControl",
+        "applicationName": "Bulk Control App",
+    }, headers=headers).json["id"]
+    existing_id = client.post("/scim/v2/Devices", json=bulk_device(
+        "AA:BB:CC:00:00:01", "existing")["data"], headers=headers).json["id"]
+
+    response = client.post("/scim/v2/Bulk", json={
+        "schemas": ["urn:ietf:params:scim:api:messages:2.0:BulkRequest"],
+        "Operations": [
+            bulk_device("AA:BB:CC:00:00:02", "d2", app_id),
+            bulk_device("AA:BB:CC:00:00:03", "d3"),
+            bulk_device("AA:BB:CC:00:00:03", "dup"),
+            bulk_device("AA:BB:CC:00:00:01", "existing"),
+            {"method": "DELETE", "path": f"/Devices/{existing_id}"},
+            {"method": "POST", "path": "/Devices", "bulkId": "bad",
+             "data": {"schemas": ["urn:ietf:params:scim:schemas:core:2.0:Device"]}},
+        ]
+    }, headers=headers)
+
+    assert response.status_code == 200
+    print(response.json)
+    assert response.json["schemas"] == ["urn:ietf:params:scim:api:messages:2.0:BulkResponse"]
+    results = response.json["Operations"]
+    assert [result["status"] for result in results] == ["201", "201", "409", "409", "204", "400"]
+    assert [result.get("bulkId") for result in results] == \
+        ["d2", "d3", "dup", "existing", None, "bad"]
+    assert results[2]["response"]["scimType"] == "uniqueness"
+
+    device_id = results[0]["location"].rsplit("/", 1)[1]
+    response = client.get(f"/scim/v2/Devices/{device_id}", headers=headers)
+    assert response.status_code == 200
+    assert response.json["meta"]["version"] == results[0]["version"]
+    assert response.json["urn:ietf:params:scim:schemas:extension:ble:2.0:Device"][
+        "deviceMacAddress"] == "AA:BB:CC:00:00:02"
+    assert response.json["urn:ietf:params:scim:schemas:extension:endpointAppsExt:2.0:Device"][
+        "applications"][0]["value"] == app_id
+
+    assert client.get(f"/scim/v2/Devices/{existing_id}", headers=headers).status_code == 404
+
+    # failOnErrors stops processing, and nothing after the failure is applied
+    response = client.post("/scim/v2/Bulk", json={
+        "schemas": ["urn:ietf:params:scim:api:messages:2.0:BulkRequest"],
+        "failOnErrors": 1,
+        "Operations": [
+            bulk_device("AA:BB:CC:00:00:02", "dup"),
+            bulk_device("AA:BB:CC:00:00:04", "d4"),
+        ]
+    }, headers=headers)
+
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json["Operations"]] == ["409"]
+    response = client.get("/scim/v2/Devices", headers=headers)
+    assert response.json["totalResults"] == 2
+
+
+def test_filter_devices(client: FlaskClient, api_key: str):
+    """ Test SCIM filter expressions on GET Devices and EndpointApps """
+    headers = {"x-api-key": api_key}
+    app_id = client.post("/scim/v2/EndpointApps", json={
+        "schemas": ["urn:ietf:params:scim:schemas:core:2.0:EndpointApp"],
+        "applicationType": "telemetry",
+        "applicationName": "Filter Telemetry App",
+    }, headers=headers).json["id"]
+    client.post("/scim/v2/EndpointApps", json={
+        "schemas": ["urn:ietf:params:scim:schemas:core:2.0:EndpointApp"],
+        "applicationType": "deviceControl",
+        "applicationName": "Filter Control App",
+    }, headers=headers)
+
+    ids = {}
+    for bulk_id, mac_address, linked_app in (("heart", "AA:BB:CC:00:00:01", app_id),
+                                             ("thermo", "AA:BB:CC:00:00:02", None),
+                                             ("scale", "DD:EE:FF:00:00:03", None)):
+        data = bulk_device(mac_address, bulk_id, linked_app)["data"]
+        ids[bulk_id] = client.post("/scim/v2/Devices", json=data, headers=headers).json["id"]
+    ids["mab"] = client.post("/scim/v2/Devices", json={
+        "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Device",
+                    "urn:ietf:params:scim:schemas:extension:ethernet-mab:2.0:Device"],
+        "displayName": "Ethernet Printer",
+        "active": False,
+        "urn:ietf:params:scim:schemas:extension:ethernet-mab:2.0:Device": {
+            "deviceMacAddress": "DD:EE:FF:00:00:04"
+        }
+    }, headers=headers).json["id"]
+
+    def matches(expression: str, resource: str = "Devices") -> set:
+        response = client.get(f"/scim/v2/{resource}",
+                              query_string={"filter": expression}, headers=headers)
+        assert response.status_code == 200, response.json
+        assert response.json["totalResults"] == len(response.json["Resources"])
+        return {resource["id"] for resource in response.json["Resources"]}
+
+    ble = "urn:ietf:params:scim:schemas:extension:ble:2.0:Device"
+    assert matches(f'{ble}:deviceMacAddress eq "AA:BB:CC:00:00:02"') == {ids["thermo"]}
+    assert matches('deviceMacAddress sw "DD:EE:FF"') == {ids["scale"], ids["mab"]}
+    assert matches('displayname co "Monitor" and not (displayName ew "scale")') == \
+        {ids["heart"], ids["thermo"]}
+    assert matches('active eq false or deviceMacAddress eq "AA:BB:CC:00:00:01"') == \
+        {ids["mab"], ids["heart"]}
+    assert matches(f"{ble}:deviceMacAddress pr") == {ids["heart"], ids["thermo"], ids["scale"]}
+    assert matches('displayName ne "Ethernet Printer"') == \
+        {ids["heart"], ids["thermo"], ids["scale"]}
+    assert matches(f'{ble}:versionSupport eq "5.3" and (deviceMacAddress gt "AA:BB:CC:00:00:01")'
+                   ) == {ids["thermo"], ids["scale"]}
+    assert matches(f'applications[value eq "{app_id}"]') == {ids["heart"]}
+    assert matches(f'id eq "{ids["mab"]}"') == {ids["mab"]}
+
+    assert matches('applicationType eq "telemetry"', "EndpointApps") == {app_id}
+    assert len(matches('applicationName sw "Filter" and applicationType ne "telemetry"',
+                       "EndpointApps")) == 1
+
+    for expression in ('displayName eq', 'nosuchAttribute eq "x"', 'displayName eq "x" and',
+                       '(active eq true', 'id eq "not-a-uuid"', 'active gt true'):
+        response = client.get("/scim/v2/Devices", query_string={"filter": expression},
+                              headers=headers)
+        assert response.status_code == 400, expression
+        assert response.json["scimType"] == "invalidFilter"
+
+
+def test_device_pagination(client: FlaskClient, api_key: str):
+    """ Test index and cursor paging on GET Devices """
+    headers = {"x-api-key": api_key}
+    client.post("/scim/v2/Bulk", json={
+        "schemas": ["urn:ietf:params:scim:api:messages:2.0:BulkRequest"],
+        "Operations": [bulk_device(f"AA:BB:CC:00:00:0{number}", str(number))
+                       for number in range(5)]
+    }, headers=headers)
+
+    response = client.get("/scim/v2/Devices", headers=headers)
+    all_ids = [resource["id"] for resource in response.json["Resources"]]
+    assert len(all_ids) == 5
+
+    response = client.get("/scim/v2/Devices?startIndex=2&count=2", headers=headers)
+    assert response.json["startIndex"] == 2
+    assert response.json["totalResults"] == 5
+    assert response.json["itemsPerPage"] == 2
+    assert [resource["id"] for resource in response.json["Resources"]] == all_ids[1:3]
+
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get("/scim/v2/Devices", query_string={"cursor": cursor, "count": 2},
+                              headers=headers)
+        assert response.status_code == 200
+        assert "startIndex" not in response.json
+        assert response.json["totalResults"] == 5
+        seen.extend(resource["id"] for resource in response.json["Resources"])
+        cursor = response.json.get("nextCursor")
+    assert seen == all_ids
+
+    response = client.get("/scim/v2/Devices?cursor=bogus", headers=headers)
+    assert response.status_code == 400
+    assert response.json["scimType"] == "invalidCursor"
+
+    response = client.get("/scim/v2/Devices?cursor=&startIndex=1", headers=headers)
+    assert response.status_code == 400
+
+    response = client.get("/scim/v2/Devices?cursor=&count=0", headers=headers)
+    assert response.status_code == 200
+    assert response.json["totalResults"] == 5
+    assert response.json["Resources"] == []
+    assert "nextCursor" not in response.json
+
+
+def test_endpoint_app_pagination(client: FlaskClient, api_key: str):
+    """ Test cursor paging on GET EndpointApps """
+    headers = {"x-api-key": api_key}
+    for number in range(5):
+        client.post("/scim/v2/EndpointApps", json={
+            "schemas": ["urn:ietf:params:scim:schemas:core:2.0:EndpointApp"],
+            "applicationType": "telemetry",
+            "applicationName": f"Paging App {number}",
+        }, headers=headers)
+
+    response = client.get("/scim/v2/EndpointApps", headers=headers)
+    all_ids = [resource["id"] for resource in response.json["Resources"]]
+    total = response.json["totalResults"]
+    assert total == len(all_ids) >= 5
+
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get("/scim/v2/EndpointApps",
+                              query_string={"cursor": cursor, "count": 2}, headers=headers)
+        assert response.status_code == 200
+        assert response.json["totalResults"] == total
+        assert response.json["itemsPerPage"] <= 2
+        seen.extend(resource["id"] for resource in response.json["Resources"])
+        cursor = response.json.get("nextCursor")
+    assert seen == all_ids
+
+    response = client.get("/scim/v2/EndpointApps?cursor=&count=0", headers=headers)
+    assert response.status_code == 200
+    assert response.json["totalResults"] == total
+    assert response.json["Resources"] == []
+    assert "nextCursor" not in response.json
+
+
+def test_import_devices(app: Flask, client: FlaskClient, api_key: str, tmp_path):
+    """ Test flask import-devices """
+    headers = {"x-api-key": api_key}
+    client.post("/scim/v2/Bulk", json={
+        "schemas": ["urn:ietf:params:scim:api:messages:2.0:BulkRequest"],
+        "Operations": [bulk_device("AA:BB:CC:11:22:33", "existing")]
+    }, headers=headers)
+
+    records = [bulk_device(f"AA:BB:CC:00:00:0{number}", str(number))["data"]
+               for number in range(3)]
+    records.append(bulk_device("AA:BB:CC:00:00:01", "duplicate")["data"])
+    records.append(bulk_device("AA:BB:CC:11:22:33", "registered")["data"])
+    records.append({"schemas": ["urn:ietf:params:scim:schemas:core:2.0:Device",
+                                "urn:example:unknown"],
+                    "displayName": "Unknown", "active": True})
+    source = tmp_path / "devices.ndjson"
+    source.write_text("\n".join(json.dumps(record) for record in records) + "\n{broken\n")
+
+    result = app.test_cli_runner().invoke(args=["import-devices", str(source)])
+    assert result.exit_code == 0, result.output
+    assert "imported 3 devices, rejected 4" in result.output
+
+    rejects = [json.loads(line) for line in
+               (tmp_path / "devices.ndjson.rejects.ndjson").read_text().splitlines()]
+    rejects.sort(key=lambda reject: reject["line"])
+    assert [reject["line"] for reject in rejects] == [4, 5, 6, 7]
+    assert rejects[0]["error"] == "Device already exists"
+    assert rejects[1]["error"] == "Device already exists"
+
+    source = tmp_path / "devices.csv"
+    source.write_text(
+        "displayName,active,deviceMacAddress,versionSupport,mabMacAddress\n"
+        "CSV BLE,true,AA:BB:CC:00:00:10,4.1;5.3,\n"
+        "CSV MAB,false,,,AA:BB:CC:00:00:11\n"
+        "CSV Bad,maybe,AA:BB:CC:00:00:12,,\n")
+    rejects = tmp_path / "csv.rejects"
+    result = app.test_cli_runner().invoke(
+        args=["import-devices", str(source), "--rejects", str(rejects)])
+    assert result.exit_code == 0, result.output
+    assert "imported 2 devices, rejected 1" in result.output
+
+    response = client.get("/scim/v2/Devices", query_string={
+        "filter": 'deviceMacAddress eq "AA:BB:CC:00:00:10"'}, headers=headers)
+    assert response.json["totalResults"] == 1
+    device = response.json["Resources"][0]
+    assert device["displayName"] == "CSV BLE"
+    assert device["urn:ietf:params:scim:schemas:extension:ble:2.0:Device"]["versionSupport"] == \
+        ["4.1", "5.3"]
+
+    response = client.get("/scim/v2/Devices", headers=headers)
+    assert response.json["totalResults"] == 6
+
+
+def seed_devices(app: Flask, start: int, stop: int):
+    """ Insert BLE devices numbered [start, stop) """
+    devices = []
+    ble_extensions = []
+    for number in range(start, stop):
+        device_id = uuid.uuid4()
+        devices.append({
+            "device_id": device_id,
+            "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Device",
+                        "urn:ietf:params:scim:schemas:extension:ble:2.0:Device"],
+            "display_name": f"BLE Monitor {number}",
+            "active": True,
+            "version": 1,
+        })
+        ble_extensions.append({
+            "device_id": device_id,
+            "device_mac_address": f"AA:{number:010X}",
+            "version_support": ["5.3"],
+            "is_random": False,
+        })
+    with app.app_context():
+        db.session.execute(insert(Device), devices)
+        db.session.execute(insert(BleExtension), ble_extensions)
+        db.session.commit()
+
+
+def measure_device_listing(app: Flask, client: FlaskClient, api_key: str):
+    """ Stream GET /Devices; return (devices, SQL statements, peak memory) """
+    statements = 0
+
+    def count_statement(*args): # pylint: disable=unused-argument
+        nonlocal statements
+        statements += 1
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", count_statement)
+    tracemalloc.start()
+    try:
+        response = client.get("/scim/v2/Devices", headers={"x-api-key": api_key},
+                              buffered=False)
+        assert response.status_code == 200
+        devices = sum(chunk.count(b'"deviceMacAddress"') for chunk in response.iter_encoded())
+        response.close()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        event.remove(engine, "before_cursor_execute", count_statement)
+    return devices, statements, peak
+
+
+def test_read_devices_at_scale(app: Flask, client: FlaskClient, api_key: str):
+    """ Device listing issues batched queries and streams in bounded memory """
+    results = {}
+    seeded = 0
+    for total in (10_000, 100_000):
+        seed_devices(app, seeded, total)
+        seeded = total
+        devices, statements, peak = measure_device_listing(app, client, api_key)
+        print(total, statements, peak)
+
+        assert devices == total
+        # API key check, count, device query, one endpoint app query per batch
+        assert statements <= 3 + math.ceil(total / SCIM_STREAM_BATCH_SIZE)
+        results[total] = peak
+
+    # Ten times the devices must not mean ten times the memory
+    assert results[100_000] < 1.5 * results[10_000]
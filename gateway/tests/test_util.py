@@ -0,0 +1,30 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Test credential hashing.
+"""
+
+from util import COST_FACTOR, HASH_FUNCTION, check_hash, hash_password, make_hash, \
+    needs_rehash
+
+
+def test_hash_parameters():
+    """ Cost parameters are recorded in the hash and honoured when checking """
+    hashed = make_hash("secret", "sha256", 1000)
+    scheme, hash_function, cost_factor, _, _ = hashed.split("$")
+    assert (scheme, hash_function, cost_factor) == ("PBKDF2", "sha256", "1000")
+    assert check_hash("secret", hashed)
+    assert not check_hash("wrong", hashed)
+    assert not check_hash("secret", "not a hash")
+    assert needs_rehash(hashed)
+
+
+def test_hash_password_offloaded():
+    """ Hashes made in the process pool use the configured parameters """
+    hashed = hash_password("token")
+    assert hashed.startswith(f"PBKDF2${HASH_FUNCTION}${COST_FACTOR}$")
+    assert check_hash("token", hashed)
+    assert not needs_rehash(hashed)
@@ -36,3 +36,8 @@ class ISEError(Exception):
     """
     Something went wrong with ISE
     """
+
+class FilterError(Exception):
+    """
+    A SCIM filter expression could not be parsed or applied.
+    """
@@ -6,18 +6,86 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from base64 import b64encode
+from concurrent.futures import ProcessPoolExecutor
 from os import urandom
+from typing import Optional
 import hashlib
+import hmac
+import multiprocessing
+import threading
+
+from config import HASH_WORKERS, PBKDF2_HASH, PBKDF2_ITERATIONS
 
 SALT_LENGTH = 16
-HASH_FUNCTION = 'sha512'
-COST_FACTOR = 100000
+HASH_FUNCTION = PBKDF2_HASH
+COST_FACTOR = PBKDF2_ITERATIONS
 
 
-def make_hash(pwd: str):
-    """ Hashes a password with PBKDF2 and returns a formatted hash. """
+def make_hash(pwd: str, hash_function: str = HASH_FUNCTION,
+              cost_factor: int = COST_FACTOR):
+    """
+    Hashes a password with PBKDF2 and returns a formatted hash. The hash
+    function and cost factor are recorded in the result.
+    """
     password = pwd.encode('utf-8')
     salt = b64encode(urandom(SALT_LENGTH))
     hash_key = b64encode(hashlib.pbkdf2_hmac(
-        HASH_FUNCTION, password, salt, COST_FACTOR))
-    return f"PBKDF2${HASH_FUNCTION}${COST_FACTOR}${str(salt, 'utf-8')}${str(hash_key, 'utf-8')}"
+        hash_function, password, salt, cost_factor))
+    return f"PBKDF2${hash_function}${cost_factor}${str(salt, 'utf-8')}${str(hash_key, 'utf-8')}"
+
+
+def _parse_hash(hashed: str) -> Optional[tuple[str, int, str, str]]:
+    parts = hashed.split("$")
+    if len(parts) != 5 or parts[0] != "PBKDF2" or not parts[2].isdigit():
+        return None
+    return parts[1], int(parts[2]), parts[3], parts[4]
+
+
+def check_hash(pwd: str, hashed: str) -> bool:
+    """ Checks a password against a hash made with any cost parameters. """
+    parsed = _parse_hash(hashed)
+    if parsed is None:
+        return False
+    hash_function, cost_factor, salt, hash_key = parsed
+    computed = b64encode(hashlib.pbkdf2_hmac(
+        hash_function, pwd.encode('utf-8'), salt.encode('utf-8'), cost_factor))
+    return hmac.compare_digest(computed, hash_key.encode('utf-8'))
+
+
+def needs_rehash(hashed: str) -> bool:
+    """ True if a hash was made with other than the current cost parameters. """
+    parsed = _parse_hash(hashed)
+    return parsed is None or parsed[:2] != (HASH_FUNCTION, COST_FACTOR)
+
+
+_hash_pool: Optional[ProcessPoolExecutor] = None
+_hash_pool_lock = threading.Lock()
+
+
+def hash_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Process pool for password hashing, created on first use. None if
+    HASH_WORKERS is 0, in which case hashing runs inline.
+    """
+    global _hash_pool # pylint: disable=global-statement
+
+    if HASH_WORKERS <= 0:
+        return None
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            # Forking a threaded server is unsafe; start clean interpreters instead
+            _hash_pool = ProcessPoolExecutor(
+                max_workers=HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"))
+        return _hash_pool
+
+
+def hash_password(pwd: str) -> str:
+    """
+    make_hash() in the hashing process pool. The calling thread waits
+    without holding the GIL, and at most HASH_WORKERS hashes run at once.
+    """
+    pool = hash_pool()
+    if pool is None:
+        return make_hash(pwd)
+    return pool.submit(make_hash, pwd).result()
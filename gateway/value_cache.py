@@ -0,0 +1,114 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+
+This module keeps the last known value of each GATT characteristic, fed by
+property reads and writes and by notifications, so that clients willing
+to accept slightly stale data can be answered without radio traffic.
+The values of a device are forgotten when it is disconnected or deleted.
+
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from config import VALUE_CACHE_SIZE
+
+
+class ValueCache:
+    """ Bounded LRU cache of (device, service, characteristic) values """
+
+    def __init__(self, max_entries: int = VALUE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._values: OrderedDict[tuple[str, str, str], tuple[bytes, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[str, str, str, bytes], None]] = []
+        self._invalidation_listeners: list[Callable[[str], None]] = []
+
+    @staticmethod
+    def _key(address: str, service_uuid: str, char_uuid: str) -> tuple[str, str, str]:
+        return address.lower(), service_uuid.lower(), char_uuid.lower()
+
+    def add_listener(self, listener: Callable[[str, str, str, bytes], None]):
+        """ Also hand every recorded value to listener, e.g. to forward it """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, str, str, bytes], None]):
+        """ Remove a listener; safe to call more than once """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def add_invalidation_listener(self, listener: Callable[[str], None]):
+        """ Also hand the address of every invalidated device to listener """
+        self._invalidation_listeners.append(listener)
+
+    def remove_invalidation_listener(self, listener: Callable[[str], None]):
+        """ Remove an invalidation listener; safe to call more than once """
+        if listener in self._invalidation_listeners:
+            self._invalidation_listeners.remove(listener)
+
+    def put(self,
+            address: str,
+            service_uuid: str,
+            char_uuid: str,
+            value: bytes,
+            notify: bool = True):
+        """
+        Record the latest value of a characteristic. notify is False for
+        values that listeners already know of, e.g. forwarded ones.
+        """
+        if notify:
+            for listener in list(self._listeners):
+                listener(address, service_uuid, char_uuid, value)
+        key = self._key(address, service_uuid, char_uuid)
+        with self._lock:
+            self._values[key] = (value, time.monotonic())
+            self._values.move_to_end(key)
+            while len(self._values) > self.max_entries:
+                self._values.popitem(last=False)
+
+    def get(self,
+            address: str,
+            service_uuid: str,
+            char_uuid: str,
+            max_age: float) -> Optional[tuple[bytes, float]]:
+        """ Return (value, age in seconds) if a value no older than max_age exists """
+        key = self._key(address, service_uuid, char_uuid)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return None
+            value, updated = entry
+            age = time.monotonic() - updated
+            if age > max_age:
+                return None
+            self._values.move_to_end(key)
+            return value, age
+
+    def invalidate(self, address: str, notify: bool = True):
+        """ Forget all values of a device; notify is as for put """
+        if notify:
+            for listener in list(self._invalidation_listeners):
+                listener(address)
+        address = address.lower()
+        with self._lock:
+            for key in [key for key in self._values if key[0] == address]:
+                del self._values[key]
+
+    def clear(self):
+        """ Forget all values """
+        with self._lock:
+            self._values.clear()
+
+
+_value_cache = ValueCache()
+
+
+def value_cache() -> ValueCache:
+    """ Global value cache getter """
+    return _value_cache
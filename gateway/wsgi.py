@@ -0,0 +1,29 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+
+WSGI entry point for serving the HTTP APIs from several worker
+processes, with the radio in radio_daemon.py, e.g.
+
+    gunicorn --workers 4 --bind 0.0.0.0:8081 \\
+        --certfile certs/server.crt --keyfile certs/server.key \\
+        --ca-certs ca_certificates/ca.pem --cert-reqs 1 wsgi:app
+
+Each worker talks to the daemon on RADIO_SOCKET and listens for registry
+changes. Do not use --preload: the threads started here must be started
+in every worker.
+
+"""
+
+from ap_factory import set_ble_ap
+from app import app
+from change_bus import change_bus
+from radio_rpc import RemoteAccessPoint
+
+radio = RemoteAccessPoint()
+set_ble_ap(radio)
+radio.start()
+change_bus().start(app)
@@ -0,0 +1,158 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+
+Measure the per-call cost of mapping large HTTP responses to TieDie
+responses: a BLE discovery (NIPC) and a device list (SCIM).
+
+For each response, the benchmark compares:
+
+- text: the body decoded to text, logged eagerly and validated from
+  the text, as the client did before;
+- bytes: the client's mapping, which validates the body bytes and only
+  decodes them for debug logging;
+- unvalidated: json.loads and model_construct of every nested model,
+  what skipping validation for trusted responses would cost.
+
+Run from the python-sdk directory:
+
+    python -m benchmarks.response_decoding --services 200 --devices 5000
+
+"""
+
+import argparse
+import json
+import logging
+import timeit
+import types
+import typing
+from typing import Any, Callable, Optional
+
+import requests
+from pydantic import BaseModel
+
+from tiedie.api.http_client import ResponseMapper
+from tiedie.models import BleDiscoverResponse, Device, ListResponse
+
+logger = logging.getLogger('tiedie')
+
+
+def discover_body(services: int) -> bytes:
+    """ A BLE discovery with 10 characteristics per service """
+    return json.dumps({"protocolInformation": {"ble": {"services": [{
+        "serviceID": f"{service:04x}",
+        "characteristics": [{
+            "characteristicID": f"{characteristic:04x}",
+            "flags": ["read", "write", "notify"],
+            "descriptors": [{"descriptorID": "2902"}]
+        } for characteristic in range(10)]
+    } for service in range(services)]}}}).encode()
+
+
+def list_body(devices: int) -> bytes:
+    """ A SCIM ListResponse of BLE devices """
+    return json.dumps({
+        "schemas": ["urn:ietf:params:scim:api:messages:2.0:ListResponse"],
+        "totalResults": devices,
+        "Resources": [{
+            "id": f"{index:08x}-0000-4000-8000-000000000000",
+            "displayName": f"BLE Monitor {index}",
+            "active": True,
+            "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Device",
+                        "urn:ietf:params:scim:schemas:extension:ble:2.0:Device"],
+            "urn:ietf:params:scim:schemas:extension:ble:2.0:Device": {
+                "versionSupport": ["5.0"],
+                "deviceMacAddress": f"AA:BB:CC:{index >> 16 & 255:02X}:"
+                                    f"{index >> 8 & 255:02X}:{index & 255:02X}",
+                "isRandom": False,
+                "pairingMethods": []
+            }
+        } for index in range(devices)]
+    }).encode()
+
+
+def make_response(content: bytes, content_type: str) -> requests.Response:
+    """ A received requests response """
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = "OK"
+    response.headers["Content-Type"] = content_type
+    response._content = content  # pylint: disable=protected-access
+    return response
+
+
+def map_text(response: requests.Response, model: type[BaseModel]) -> BaseModel:
+    """ The text path the client used to take """
+    logger.debug("Response headers: %s", response.headers)
+    logger.debug("Response: %s", response.text)
+    return model.model_validate_json(response.text)
+
+
+def _converter(annotation) -> Optional[Callable[[Any], Any]]:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return lambda value: construct(annotation, value)
+    args = [arg for arg in typing.get_args(annotation) if arg is not types.NoneType]
+    if typing.get_origin(annotation) in (list, typing.List):
+        item = _converter(args[0])
+        return None if item is None else lambda value: [item(entry) for entry in value]
+    if typing.get_origin(annotation) is typing.Union and len(args) == 1:
+        inner = _converter(args[0])
+        return None if inner is None else \
+            lambda value: None if value is None else inner(value)
+    return None
+
+
+def construct(model: type[BaseModel], data: dict) -> BaseModel:
+    """ Build model and its nested models from JSON data, without validation """
+    fields = {field.alias or name: (name, _converter(field.annotation))
+              for name, field in model.model_fields.items()}
+    values = {}
+    for key, value in data.items():
+        if key in fields:
+            name, convert = fields[key]
+            values[name] = value if convert is None else convert(value)
+    return model.model_construct(**values)
+
+
+def per_call_ms(func: Callable[[], Any], number: int) -> float:
+    """ Best mean time of func over 5 runs """
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1000
+
+
+def main():
+    """ Print a comparison table """
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--services", type=int, default=200)
+    parser.add_argument("--devices", type=int, default=5000)
+    parser.add_argument("--number", type=int, default=10)
+    args = parser.parse_args()
+
+    mapper = ResponseMapper()
+    discover = make_response(discover_body(args.services), "application/nipc+json")
+    devices = make_response(list_body(args.devices), "application/scim+json")
+    cases = [
+        ("discover", discover, BleDiscoverResponse,
+         # pylint: disable-next=protected-access
+         lambda: mapper._map_nipc_response(discover, BleDiscoverResponse)),
+        ("list", devices, ListResponse[Device],
+         # pylint: disable-next=protected-access
+         lambda: mapper._map_response(devices, ListResponse[Device])),
+    ]
+
+    print(f"{'response':9} {'KiB':>7} {'text ms':>9} {'bytes ms':>9} {'unvalidated ms':>15}")
+    for name, response, model, mapped in cases:
+        text = per_call_ms(lambda r=response, m=model: map_text(r, m), args.number)
+        fast = per_call_ms(mapped, args.number)
+        unvalidated = per_call_ms(
+            lambda r=response, m=model: construct(m, json.loads(r.content)),
+            max(args.number // 5, 1))
+        print(f"{name:9} {len(response.content) / 1024:7.0f} {text:9.2f} {fast:9.2f} "
+              f"{unvalidated:15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@
 
 from .control_client import *
 from .data_receiver_client import *
+from .dispatch import *
 from .onboarding_client import *
 from .http_client import *
 from .auth import *
@@ -7,6 +7,7 @@
 """ TieDie Client authenticators """
 
 from typing import Optional
+import httpx
 import OpenSSL.crypto
 import paho.mqtt.client as mqtt
 import requests
@@ -34,6 +35,17 @@ class Authenticator:
         """
         raise NotImplementedError()
 
+    def set_async_auth_options(self, options: dict) -> dict:
+        """ Set auth options to the keyword arguments of an httpx.AsyncClient.
+
+        Args:
+            options (dict): The client options, with an ssl.SSLContext as "verify".
+
+        Returns:
+            dict: Updated client options.
+        """
+        raise NotImplementedError()
+
     def set_auth_options_mqtt(self,
                               mqtt_client: mqtt.Client,
                               disable_tls: bool = False,
@@ -66,6 +78,10 @@ class ApiKeyAuthenticator(Authenticator):
         session.verify = self.ca_file_path
         return session
 
+    def set_async_auth_options(self, options: dict) -> dict:
+        options.setdefault("headers", {})[self.API_KEY_HEADER] = self.api_key
+        return options
+
     def set_auth_options_mqtt(self,
                               mqtt_client: mqtt.Client,
                               disable_tls: bool = False,
@@ -103,6 +119,10 @@ class CertificateAuthenticator(Authenticator):
         session.cert = (self.cert_path, self.key_path)
         return session
 
+    def set_async_auth_options(self, options: dict) -> dict:
+        options["verify"].load_cert_chain(self.cert_path, self.key_path)
+        return options
+
     def set_auth_options_mqtt(self,
                               mqtt_client: mqtt.Client,
                               disable_tls: bool = False,
@@ -113,6 +133,26 @@ class CertificateAuthenticator(Authenticator):
             mqtt_client.tls_insecure_set(insecure_tls)
         return mqtt_client
 
+class _RequestsAuthAdapter(httpx.Auth):
+    """
+    Applies the session auth of an OAuth2Authenticator, a requests auth
+    that refreshes its token as needed, to httpx requests.
+    """
+
+    def __init__(self, authenticator: "OAuth2Authenticator") -> None:
+        self.authenticator = authenticator
+
+    def auth_flow(self, request: httpx.Request):
+        # session_auth is set after the client is created
+        session_auth = self.authenticator.session_auth
+        if session_auth is not None:
+            prepared = requests.Request(request.method, str(request.url)).prepare()
+            prepared = session_auth(prepared)
+            if "Authorization" in prepared.headers:
+                request.headers["Authorization"] = prepared.headers["Authorization"]
+        yield request
+
+
 class OAuth2Authenticator(Authenticator):
     """
     Authenticator implementation for OAuth2 based authentication.
@@ -131,6 +171,10 @@ class OAuth2Authenticator(Authenticator):
         session.auth = self.session_auth
         return session
 
+    def set_async_auth_options(self, options: dict) -> dict:
+        options["auth"] = _RequestsAuthAdapter(self)
+        return options
+
     def set_auth_options_mqtt(self,
                               mqtt_client: mqtt.Client,
                               disable_tls: bool = False,
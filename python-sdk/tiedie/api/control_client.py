@@ -49,7 +49,127 @@ from tiedie.models.scim import Device
 from tiedie.models.zigbee import ZigbeeDiscoverResponse
 
 from .auth import Authenticator
-from .http_client import AbstractHttpClient
+from .http_client import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_MAX_CONNECTIONS,
+    AbstractHttpClient,
+    AsyncAbstractHttpClient,
+    map_bounded,
+)
+
+SDF_MEDIA_TYPE = "application/sdf+json"
+
+
+def _require_device_id(device: Device):
+    if device.device_id is None:
+        raise ValueError("Device ID is required for connection")
+
+
+def _connect_request(device: Device, request: BleConnectRequest, retries) \
+        -> TiedieConnectRequest:
+    _require_device_id(device)
+    if device.ble_extension is None:
+        raise ValueError("BLE device is required for connection")
+    return TiedieConnectRequest(
+        protocol_information=BleProtocolInformation(ble=request),
+        retries=retries
+    )
+
+
+def _connection_response_type(device: Device):
+    _require_device_id(device)
+    if device.zigbee_extension is not None:
+        return ZigbeeDiscoverResponse
+    return BleDiscoverResponse
+
+
+def _discover_request(device: Device, request: BleConnectRequest, retries):
+    _require_device_id(device)
+    if device.zigbee_extension is not None:
+        return TiedieZigbeeDiscoverRequest(
+            protocol_information=ZigbeeProtocolInformation(zigbee={})
+        ), ZigbeeDiscoverResponse
+    return TiedieConnectRequest(
+        protocol_information=BleProtocolInformation(ble=request),
+        retries=retries
+    ), BleDiscoverResponse
+
+
+def _parameter_list_response(device: Device, discover_response: NipcResponse) \
+        -> NipcResponse[Optional[Sequence[DataParameter]]]:
+    """ Map a discovery response to the list of DataParameter it describes """
+    if (discover_response.is_success and
+            isinstance(discover_response.body,
+                       (BleDiscoverResponse, ZigbeeDiscoverResponse))):
+        parameter_list = discover_response.body.to_parameter_list(device.device_id)
+        # A Zigbee device may have no parameters
+        if parameter_list or isinstance(discover_response.body,
+                                        ZigbeeDiscoverResponse):
+            return NipcResponse[Optional[Sequence[DataParameter]]](
+                http=discover_response.http,
+                body=parameter_list
+            )
+
+    # Handle error case or empty response
+    return NipcResponse[Optional[Sequence[DataParameter]]](
+        http=discover_response.http,
+        error=discover_response.error,
+        body=None
+    )
+
+
+def _read_request(service_id: str, characteristic_id: str) -> TiedieReadRequest:
+    return TiedieReadRequest(sdf_protocol_map=PropertyProtocolMap(
+        ble=BlePropertyProtocolMap(
+            service_id=service_id,
+            characteristic_id=characteristic_id)))
+
+
+def _write_request(service_id: str, characteristic_id: str, value: str) -> TiedieWriteRequest:
+    return TiedieWriteRequest(sdf_protocol_map=PropertyProtocolMap(
+        ble=BlePropertyProtocolMap(
+            service_id=service_id,
+            characteristic_id=characteristic_id)),
+                              value=value)
+
+
+def _property_path(device: str, sdf_name: str) -> str:
+    encoded_sdf_name = url_parse.quote(sdf_name, safe="")
+    return f"/devices/{device}/properties?propertyName={encoded_sdf_name}"
+
+
+def _model_path(sdf_name: str) -> str:
+    return f"/registrations/models?sdfName={url_parse.quote(sdf_name)}"
+
+
+def _data_app_path(data_app_id: str) -> str:
+    return f"/registrations/data-apps?dataAppId={data_app_id}"
+
+
+def _event_path(device_id: str, event: str) -> str:
+    return f"/devices/{device_id}/events?eventName={url_parse.quote(event, safe='')}"
+
+
+def _event_instance_response(resp: NipcResponse) -> NipcResponse[Optional[str]]:
+    """ Set the instance ID of an enabled event, from its Location header, as body """
+    if resp.is_success and resp.http is not None and resp.http.headers is not None:
+        location = next(
+            (value for key, value in resp.http.headers.items()
+             if key.lower() == "location"),
+            None
+        )
+        if location is not None:
+            instance_ids = url_parse.parse_qs(
+                url_parse.urlparse(location).query
+            ).get("instanceId")
+            if instance_ids:
+                resp.body = instance_ids[0]
+    return resp
+
+
+PropertyReadResponse = RootModel[List[Union[PropertyResponse, ProblemDetails]]]
+PropertyWriteResponses = RootModel[List[Union[PropertyWriteResponse, ProblemDetails]]]
+EventResponses = RootModel[List[Union[TiedieEventResponse, ProblemDetails]]]
 
 
 class ControlClient(AbstractHttpClient):
@@ -83,35 +203,10 @@ class ControlClient(AbstractHttpClient):
             A list of DataParameter objects is present if the service discovery was successful.
 
         """
-        if device.device_id is None:
-            raise ValueError("Device ID is required for connection")
-        if device.ble_extension is None:
-            raise ValueError("BLE device is required for connection")
-
-        tiedie_request = TiedieConnectRequest(
-            protocol_information=BleProtocolInformation(ble=request),
-            retries=retries
-        )
-
+        tiedie_request = _connect_request(device, request, retries)
         ble_discover_response = self.post_with_nipc_response(
             f'/devices/{device.device_id}/connections', tiedie_request, BleDiscoverResponse)
-
-        # Handle success case: extract parameter list from BLE discovery response
-        if (ble_discover_response.is_success and
-                isinstance(ble_discover_response.body, BleDiscoverResponse)):
-            parameter_list = ble_discover_response.body.to_parameter_list(device.device_id)
-            if parameter_list:
-                return NipcResponse[Optional[Sequence[DataParameter]]](
-                    http=ble_discover_response.http,
-                    body=parameter_list
-                )
-
-        # Handle error case or empty response
-        return NipcResponse[Optional[Sequence[DataParameter]]](
-            http=ble_discover_response.http,
-            error=ble_discover_response.error,
-            body=None
-        )
+        return _parameter_list_response(device, ble_discover_response)
 
     def disconnect(self, device: Device) -> NipcResponse[Optional[TiedieDeviceResponse]]:
         """ Disconnects from a connected IoT device. """
@@ -131,35 +226,12 @@ class ControlClient(AbstractHttpClient):
             the state of the request.
             A list of DataParameter objects is present if the service discovery was successful.
         """
-        if device.device_id is None:
-            raise ValueError("Device ID is required for connection")
-
-        response_type = BleDiscoverResponse
-        if device.zigbee_extension is not None:
-            response_type = ZigbeeDiscoverResponse
-
+        response_type = _connection_response_type(device)
         discover_response = self.get_with_nipc_response(
             f'/devices/{device.device_id}/connections',
             None, response_type
         )
-
-        if (discover_response.is_success and
-                isinstance(discover_response.body,
-                           (BleDiscoverResponse, ZigbeeDiscoverResponse))):
-            parameter_list = discover_response.body.to_parameter_list(device.device_id)
-            if parameter_list or isinstance(discover_response.body,
-                                            ZigbeeDiscoverResponse):
-                return NipcResponse[Optional[Sequence[DataParameter]]](
-                    http=discover_response.http,
-                    body=parameter_list
-                )
-
-        # Handle error case or empty response
-        return NipcResponse[Optional[Sequence[DataParameter]]](
-            http=discover_response.http,
-            error=discover_response.error,
-            body=None
-        )
+        return _parameter_list_response(device, discover_response)
 
     def discover(self, device: Device,
                  request: BleConnectRequest = BleConnectRequest(),
@@ -181,41 +253,10 @@ class ControlClient(AbstractHttpClient):
             the state of the request.
             A list of DataParameter objects is present if the service discovery was successful.
         """
-        if device.device_id is None:
-            raise ValueError("Device ID is required for connection")
-
-        response_type = BleDiscoverResponse
-        if device.zigbee_extension is not None:
-            tiedie_request = TiedieZigbeeDiscoverRequest(
-                protocol_information=ZigbeeProtocolInformation(zigbee={})
-            )
-            response_type = ZigbeeDiscoverResponse
-        else:
-            tiedie_request = TiedieConnectRequest(
-                protocol_information=BleProtocolInformation(ble=request),
-                retries=retries
-            )
-
+        tiedie_request, response_type = _discover_request(device, request, retries)
         discover_response = self.put_with_nipc_response(
             f'/devices/{device.device_id}/connections', tiedie_request, response_type)
-
-        if (discover_response.is_success and
-                isinstance(discover_response.body,
-                           (BleDiscoverResponse, ZigbeeDiscoverResponse))):
-            parameter_list = discover_response.body.to_parameter_list(device.device_id)
-            if parameter_list or isinstance(discover_response.body,
-                                            ZigbeeDiscoverResponse):
-                return NipcResponse[Optional[Sequence[DataParameter]]](
-                    http=discover_response.http,
-                    body=parameter_list
-                )
-
-        # Handle error case or empty response
-        return NipcResponse[Optional[Sequence[DataParameter]]](
-            http=discover_response.http,
-            error=discover_response.error,
-            body=None
-        )
+        return _parameter_list_response(device, discover_response)
 
     def read(self, device: Device, service_id: str, characteristic_id: str) \
             -> NipcResponse[Optional[ValueResponse]]:
@@ -230,11 +271,7 @@ class ControlClient(AbstractHttpClient):
         Returns:
             NipcResponse[Optional[ValueResponse]]: The NIPC response object containing the value.
         """
-        tiedie_request = \
-            TiedieReadRequest(sdf_protocol_map=PropertyProtocolMap(
-                ble=BlePropertyProtocolMap(
-                    service_id=service_id,
-                    characteristic_id=characteristic_id)))
+        tiedie_request = _read_request(service_id, characteristic_id)
         return self.post_with_nipc_response(f"/extensions/{device.device_id}/properties/read",
                                            tiedie_request, ValueResponse)
 
@@ -254,11 +291,7 @@ class ControlClient(AbstractHttpClient):
         Returns:
             NipcResponse[Optional[ValueResponse]]: The NIPC response object containing the value.
         """
-        tiedie_request = TiedieWriteRequest(sdf_protocol_map=PropertyProtocolMap(
-                ble=BlePropertyProtocolMap(
-                    service_id=service_id,
-                    characteristic_id=characteristic_id)),
-                                            value=value)
+        tiedie_request = _write_request(service_id, characteristic_id, value)
         endpoint = f"/extensions/{device.device_id}/properties/write"
         return self.post_with_nipc_response(endpoint, tiedie_request, ValueResponse)
 
@@ -277,10 +310,8 @@ class ControlClient(AbstractHttpClient):
             NipcResponse[Optional[Union[PropertyResponse, ProblemDetails]]]:
                 The NIPC response object containing the value of the property.
         """
-        encoded_sdf_name = url_parse.quote(sdf_name, safe="")
-        endpoint = f"/devices/{device}/properties?propertyName={encoded_sdf_name}"
-        response_type = RootModel[List[Union[PropertyResponse, ProblemDetails]]]
-        return self.get_with_nipc_response(endpoint, None, response_type)
+        return self.get_with_nipc_response(_property_path(device, sdf_name), None,
+                                           PropertyReadResponse)
 
     def write_property(self,
                         device: str,
@@ -302,7 +333,7 @@ class ControlClient(AbstractHttpClient):
         return self.put_with_nipc_response(
             f"/devices/{device}/properties",
             [PropertyWriteRequest(property=sdf_name, value=value)],
-            RootModel[List[Union[PropertyWriteResponse, ProblemDetails]]]
+            PropertyWriteResponses
         )
 
 
@@ -319,7 +350,7 @@ class ControlClient(AbstractHttpClient):
         """
         return self.post_with_nipc_response("/registrations/models",
                                               model, RootModel[List[ModelRegistrationResponse]],
-                                              "application/sdf+json")
+                                              SDF_MEDIA_TYPE)
 
     def update_sdf_model(self, sdf_name: str, model: SdfModel):
         """ Updates a SDF model for an IoT device.
@@ -332,10 +363,9 @@ class ControlClient(AbstractHttpClient):
             HttpResponse[ModelRegistrationResponse]: The response object containing
                 the status of the request.
         """
-        encoded_sdf_name = url_parse.quote(sdf_name)
-        return self.put_with_nipc_response(f"/registrations/models?sdfName={encoded_sdf_name}",
+        return self.put_with_nipc_response(_model_path(sdf_name),
                                               model, ModelRegistrationResponse,
-                                              "application/sdf+json")
+                                              SDF_MEDIA_TYPE)
 
 
     def get_sdf_models(self):
@@ -348,7 +378,7 @@ class ControlClient(AbstractHttpClient):
             HttpResponse[ModelRegistrationResponse]: The response object containing
                 the status of the request.
         """
-        self.headers['Accept'] = "application/sdf+json"
+        self.headers['Accept'] = SDF_MEDIA_TYPE
         return self.get("/registrations/models",
                             RootModel[List[ModelRegistrationResponse]])
 
@@ -363,9 +393,8 @@ class ControlClient(AbstractHttpClient):
             HttpResponse[ModelRegistrationResponse]: The response object containing
                 the status of the request.
         """
-        encoded_sdf_name = url_parse.quote(sdf_name)
-        self.headers['Accept'] = "application/sdf+json"
-        return self.get(f"/registrations/models?sdfName={encoded_sdf_name}", SdfModel)
+        self.headers['Accept'] = SDF_MEDIA_TYPE
+        return self.get(_model_path(sdf_name), SdfModel)
 
     def unregister_sdf_model(self, sdf_name: str):
         """ Unregisters a SDF model for an IoT device.
@@ -378,8 +407,7 @@ class ControlClient(AbstractHttpClient):
             HttpResponse[ModelRegistrationResponse]: The response object containing
                 the status of the request.
         """
-        encoded_sdf_name = url_parse.quote(sdf_name)
-        return self.delete_with_nipc_response(f"/registrations/models?sdfName={encoded_sdf_name}",
+        return self.delete_with_nipc_response(_model_path(sdf_name),
                                                 None, ModelRegistrationResponse)
 
     def get_data_app(self, data_app_id: str):
@@ -393,7 +421,7 @@ class ControlClient(AbstractHttpClient):
                 the status of the request.
         """
         return self.get_with_nipc_response(
-            f"/registrations/data-apps?dataAppId={data_app_id}",
+            _data_app_path(data_app_id),
             None,
             DataAppRegistration
         )
@@ -408,7 +436,7 @@ class ControlClient(AbstractHttpClient):
             HttpResponse[ModelRegistrationResponse]: The response object containing
                 the status of the request.
         """
-        return self.post_with_nipc_response(f"/registrations/data-apps?dataAppId={data_app_id}",
+        return self.post_with_nipc_response(_data_app_path(data_app_id),
                                               data_app, DataAppRegistration)
 
     def update_data_app(self, data_app_id: str, data_app: DataAppRegistration):
@@ -421,7 +449,7 @@ class ControlClient(AbstractHttpClient):
             HttpResponse[ModelRegistrationResponse]: The response object containing
                 the status of the request.
         """
-        return self.put_with_nipc_response(f"/registrations/data-apps?dataAppId={data_app_id}",
+        return self.put_with_nipc_response(_data_app_path(data_app_id),
                                               data_app, DataAppRegistration)
 
     def delete_data_app(self, data_app_id: str):
@@ -434,7 +462,7 @@ class ControlClient(AbstractHttpClient):
             HttpResponse[ModelRegistrationResponse]: The response object containing
                 the status of the request.
         """
-        return self.delete_with_nipc_response(f"/registrations/data-apps?dataAppId={data_app_id}",
+        return self.delete_with_nipc_response(_data_app_path(data_app_id),
                                                 None, DataAppRegistration)
 
     def enable_event(self,
@@ -449,25 +477,8 @@ class ControlClient(AbstractHttpClient):
         Returns:
             NipcResponse[Optional[str]]: NIPC response object.
         """
-        encoded_sdf_name = url_parse.quote(event, safe="")
-        resp = self.post_with_nipc_response(
-            f"/devices/{device_id}/events?eventName={encoded_sdf_name}",
-            None,
-            None
-        )
-        if resp.is_success and resp.http is not None and resp.http.headers is not None:
-            location = next(
-                (value for key, value in resp.http.headers.items()
-                 if key.lower() == "location"),
-                None
-            )
-            if location is not None:
-                instance_ids = url_parse.parse_qs(
-                    url_parse.urlparse(location).query
-                ).get("instanceId")
-                if instance_ids:
-                    resp.body = instance_ids[0]
-        return resp
+        resp = self.post_with_nipc_response(_event_path(device_id, event), None, None)
+        return _event_instance_response(resp)
 
     def disable_event(self,
                       device_id: str,
@@ -504,7 +515,7 @@ class ControlClient(AbstractHttpClient):
         return self.get_with_nipc_response(
             f"/devices/{device_id}/events?instanceId={instance_id}",
             None,
-            RootModel[List[Union[TiedieEventResponse, ProblemDetails]]]
+            EventResponses
         )
 
     def get_all_events(
@@ -521,6 +532,194 @@ class ControlClient(AbstractHttpClient):
             NipcResponse[Optional[List[Union[TiedieEventResponse, ProblemDetails]]]]:
                 NIPC response object.
         """
-        endpoint = f"/devices/{device_id}/events"
-        response_type = RootModel[List[Union[TiedieEventResponse, ProblemDetails]]]
-        return self.get_with_nipc_response(endpoint, None, response_type)
+        return self.get_with_nipc_response(f"/devices/{device_id}/events", None,
+                                           EventResponses)
+
+
+class AsyncControlClient(AsyncAbstractHttpClient):
+    """ asyncio counterpart of ControlClient.
+
+    Requests share a pool of keep-alive connections. Close the client
+    with aclose(), or use it as an async context manager.
+    """
+
+    def __init__(self, base_url: str, authenticator: Authenticator,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS, **kwargs):
+        super().__init__(base_url, "application/nipc+json", authenticator,
+                         max_connections=max_connections, **kwargs)
+        self.authenticator = authenticator
+
+    async def connect(self, device: Device,
+                      request: BleConnectRequest = BleConnectRequest(),
+                      retries=3) \
+            -> NipcResponse[Optional[Sequence[DataParameter]]]:
+        """ See ControlClient.connect """
+        tiedie_request = _connect_request(device, request, retries)
+        ble_discover_response = await self.post_with_nipc_response(
+            f'/devices/{device.device_id}/connections', tiedie_request, BleDiscoverResponse)
+        return _parameter_list_response(device, ble_discover_response)
+
+    async def disconnect(self, device: Device) -> NipcResponse[Optional[TiedieDeviceResponse]]:
+        """ See ControlClient.disconnect """
+        if device.ble_extension is None:
+            raise ValueError("BLE device is required for connection")
+        return await self.delete_with_nipc_response(f'/devices/{device.device_id}/connections',
+                                                   None, TiedieDeviceResponse)
+
+    async def get_connection(self, device: Device) \
+            -> NipcResponse[Optional[Sequence[DataParameter]]]:
+        """ See ControlClient.get_connection """
+        response_type = _connection_response_type(device)
+        discover_response = await self.get_with_nipc_response(
+            f'/devices/{device.device_id}/connections', None, response_type)
+        return _parameter_list_response(device, discover_response)
+
+    async def discover(self, device: Device,
+                       request: BleConnectRequest = BleConnectRequest(),
+                       retries=3) \
+            -> NipcResponse[Optional[Sequence[DataParameter]]]:
+        """ See ControlClient.discover """
+        tiedie_request, response_type = _discover_request(device, request, retries)
+        discover_response = await self.put_with_nipc_response(
+            f'/devices/{device.device_id}/connections', tiedie_request, response_type)
+        return _parameter_list_response(device, discover_response)
+
+    async def read(self, device: Device, service_id: str, characteristic_id: str) \
+            -> NipcResponse[Optional[ValueResponse]]:
+        """ See ControlClient.read """
+        return await self.post_with_nipc_response(
+            f"/extensions/{device.device_id}/properties/read",
+            _read_request(service_id, characteristic_id), ValueResponse)
+
+    async def write(self, device: Device,
+                    service_id: str,
+                    characteristic_id: str,
+                    value: str) -> NipcResponse[Optional[ValueResponse]]:
+        """ See ControlClient.write """
+        return await self.post_with_nipc_response(
+            f"/extensions/{device.device_id}/properties/write",
+            _write_request(service_id, characteristic_id, value), ValueResponse)
+
+    async def read_property(self,
+                            device: str,
+                            sdf_name: str) -> NipcResponse[
+                                Optional[Union[PropertyResponse, ProblemDetails]]
+                            ]:
+        """ See ControlClient.read_property """
+        return await self.get_with_nipc_response(_property_path(device, sdf_name), None,
+                                                 PropertyReadResponse)
+
+    async def read_properties(self,
+                              devices: Sequence[str],
+                              sdf_name: str,
+                              concurrency: int = DEFAULT_CONCURRENCY) -> List[NipcResponse[
+                                  Optional[Union[PropertyResponse, ProblemDetails]]
+                              ]]:
+        """ Reads a property from many devices, concurrency at a time.
+
+        Args:
+            devices (Sequence[str]): The devices to read from.
+            sdf_name (str): The SDF reference of an SDF property to read.
+            concurrency (int, optional): Maximum number of requests in flight.
+
+        Returns:
+            List[NipcResponse]: The responses, in the order of devices.
+        """
+        return await map_bounded(lambda device: self.read_property(device, sdf_name),
+                                 devices, concurrency)
+
+    async def write_property(self,
+                             device: str,
+                             sdf_name: str,
+                             value: str) -> NipcResponse[
+                                 Optional[List[Union[PropertyWriteResponse, ProblemDetails]]]
+                             ]:
+        """ See ControlClient.write_property """
+        return await self.put_with_nipc_response(
+            f"/devices/{device}/properties",
+            [PropertyWriteRequest(property=sdf_name, value=value)],
+            PropertyWriteResponses
+        )
+
+    async def register_sdf_model(self, model: SdfModel):
+        """ See ControlClient.register_sdf_model """
+        return await self.post_with_nipc_response("/registrations/models",
+                                                  model, RootModel[List[ModelRegistrationResponse]],
+                                                  SDF_MEDIA_TYPE)
+
+    async def update_sdf_model(self, sdf_name: str, model: SdfModel):
+        """ See ControlClient.update_sdf_model """
+        return await self.put_with_nipc_response(_model_path(sdf_name),
+                                                 model, ModelRegistrationResponse,
+                                                 SDF_MEDIA_TYPE)
+
+    async def get_sdf_models(self):
+        """ See ControlClient.get_sdf_models """
+        return await self.get("/registrations/models",
+                              RootModel[List[ModelRegistrationResponse]], SDF_MEDIA_TYPE)
+
+    async def get_sdf_model(self, sdf_name: str):
+        """ See ControlClient.get_sdf_model """
+        return await self.get(_model_path(sdf_name), SdfModel, SDF_MEDIA_TYPE)
+
+    async def unregister_sdf_model(self, sdf_name: str):
+        """ See ControlClient.unregister_sdf_model """
+        return await self.delete_with_nipc_response(_model_path(sdf_name),
+                                                    None, ModelRegistrationResponse)
+
+    async def get_data_app(self, data_app_id: str):
+        """ See ControlClient.get_data_app """
+        return await self.get_with_nipc_response(_data_app_path(data_app_id),
+                                                 None, DataAppRegistration)
+
+    async def create_data_app(self, data_app_id: str, data_app: DataAppRegistration):
+        """ See ControlClient.create_data_app """
+        return await self.post_with_nipc_response(_data_app_path(data_app_id),
+                                                  data_app, DataAppRegistration)
+
+    async def update_data_app(self, data_app_id: str, data_app: DataAppRegistration):
+        """ See ControlClient.update_data_app """
+        return await self.put_with_nipc_response(_data_app_path(data_app_id),
+                                                 data_app, DataAppRegistration)
+
+    async def delete_data_app(self, data_app_id: str):
+        """ See ControlClient.delete_data_app """
+        return await self.delete_with_nipc_response(_data_app_path(data_app_id),
+                                                    None, DataAppRegistration)
+
+    async def enable_event(self,
+                           device_id: str,
+                           event: str) -> NipcResponse[Optional[str]]:
+        """ See ControlClient.enable_event """
+        resp = await self.post_with_nipc_response(_event_path(device_id, event), None, None)
+        return _event_instance_response(resp)
+
+    async def disable_event(self,
+                            device_id: str,
+                            instance_id: str) -> NipcResponse[None]:
+        """ See ControlClient.disable_event """
+        return await self.delete_with_nipc_response(
+            f"/devices/{device_id}/events?instanceId={instance_id}",
+            None,
+            None)
+
+    async def get_event(self,
+                        device_id: str,
+                        instance_id: str) -> NipcResponse[
+                            Optional[List[Union[TiedieEventResponse, ProblemDetails]]]
+                        ]:
+        """ See ControlClient.get_event """
+        return await self.get_with_nipc_response(
+            f"/devices/{device_id}/events?instanceId={instance_id}",
+            None,
+            EventResponses
+        )
+
+    async def get_all_events(
+            self, device_id: str
+    ) -> NipcResponse[
+        Optional[List[Union[TiedieEventResponse, ProblemDetails]]]
+    ]:
+        """ See ControlClient.get_all_events """
+        return await self.get_with_nipc_response(f"/devices/{device_id}/events", None,
+                                                 EventResponses)
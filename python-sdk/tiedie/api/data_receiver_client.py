@@ -8,14 +8,16 @@
 
 The mmodule defines a Python client using Paho MQTT for receiving and 
 handling data from an MQTT broker, particularly for IoT applications.
+Messages are handed to the application by a dispatcher (see dispatch).
 
 """
 
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 import logging
 import paho.mqtt.client as mqtt
 import cbor2
 from .auth import Authenticator
+from .dispatch import Dispatcher, InlineDispatcher, ReceivedMessage
 
 logger = logging.getLogger('tiedie')
 
@@ -27,7 +29,8 @@ class DataReceiverClient:
                  authenticator: Authenticator,
                  port: int = 8883,
                  disable_tls: bool = False,
-                 insecure_tls: bool = False):
+                 insecure_tls: bool = False,
+                 dispatcher: Optional[Dispatcher] = None):
         self.host = host
         self.port = port
         self.authenticator = authenticator
@@ -38,6 +41,8 @@ class DataReceiverClient:
         self.mqtt_client.on_disconnect = self.__on_disconnect
         self.mqtt_client.on_message = self.__on_message
         self.connected = False
+        # Callbacks run on the network loop thread unless told otherwise
+        self.dispatcher = dispatcher or InlineDispatcher()
 
     def connect(self):
         """ Connect to the MQTT broker """
@@ -50,18 +55,23 @@ class DataReceiverClient:
         self.mqtt_client.loop_stop()
 
     def subscribe(self, topic: str,
-                  callback: Callable[[Any], None]):
+                  callback: Optional[Callable[[Any], None]] = None):
         """ Subscribe to a topic and register a callback function.
 
         Args:
             topic (str): The topic to subscribe to.
             callback (Callable[[Any], None]): 
-                A callback function to be called when a message is received.
+                A callback function to be called when a message is received,
+                by the dispatcher of the client. Not used, and optional,
+                with an AsyncQueueDispatcher.
         """
+        if callback is None and self.dispatcher.needs_callback:
+            raise ValueError("A callback is required with this dispatcher")
+
         def on_message(_client, _userdata, msg):
             payload = msg.payload
             data = cbor2.loads(payload)
-            callback(data)
+            self.dispatcher.submit(ReceivedMessage(msg.topic, data), callback)
 
         self.mqtt_client.subscribe(topic, qos=0)
         self.mqtt_client.message_callback_add(topic, on_message)
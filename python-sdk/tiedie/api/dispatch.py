@@ -0,0 +1,311 @@
+#!python
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+
+Dispatchers hand the messages received by a DataReceiverClient to the
+application, off or on the MQTT network loop thread:
+
+- InlineDispatcher calls the callback on the network loop thread, as a
+  slow callback delays every topic.
+- ThreadPoolDispatcher calls callbacks on a pool of worker threads.
+  Messages of one topic are delivered in order, one at a time.
+- AsyncQueueDispatcher queues messages for an asyncio application,
+  which reads them with "async for".
+
+The queueing dispatchers hold at most max_pending messages; the
+overflow policy decides what happens to the next one. Each dispatcher
+counts received, delivered, dropped and failed messages, and the lag
+between the arrival of a message and its delivery.
+
+"""
+
+import asyncio
+import dataclasses
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+import logging
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger('tiedie')
+
+DEFAULT_MAX_PENDING = 1000
+DEFAULT_WORKERS = 4
+
+MessageCallback = Callable[[Any], None]
+
+
+class OverflowPolicy(str, Enum):
+    """ What a full dispatcher does with a new message """
+    # Wait for room, holding up the network loop
+    BLOCK = "block"
+    # Discard the new message
+    DROP_NEWEST = "drop_newest"
+    # Discard the oldest queued message, preferably of the same topic
+    DROP_OLDEST = "drop_oldest"
+
+
+@dataclass
+class ReceivedMessage:
+    """ A decoded message, with its topic and arrival time (time.monotonic) """
+    topic: str
+    data: Any
+    received: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class DispatchStats:
+    """ Counters of a dispatcher; lags are in seconds """
+    received: int = 0
+    delivered: int = 0
+    dropped: int = 0
+    failed: int = 0
+    pending: int = 0
+    max_lag: float = 0.0
+    total_lag: float = 0.0
+
+    @property
+    def mean_lag(self) -> float:
+        """ Mean time between the arrival and the delivery of a message """
+        return self.total_lag / self.delivered if self.delivered else 0.0
+
+
+class Dispatcher:
+    """ Interface of the message dispatchers of DataReceiverClient """
+
+    # False if messages are read from the dispatcher rather than passed
+    # to a callback
+    needs_callback = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = DispatchStats()
+
+    @property
+    def stats(self) -> DispatchStats:
+        """ A snapshot of the counters """
+        with self._lock:
+            return dataclasses.replace(self._stats)
+
+    def submit(self, message: ReceivedMessage, callback: Optional[MessageCallback]):
+        """ Deliver message, on the network loop thread """
+        raise NotImplementedError()
+
+    def close(self, timeout: Optional[float] = None):
+        """ Deliver the pending messages and stop """
+
+    def _record_delivery(self, message: ReceivedMessage):
+        lag = time.monotonic() - message.received
+        with self._lock:
+            self._stats.delivered += 1
+            self._stats.total_lag += lag
+            self._stats.max_lag = max(self._stats.max_lag, lag)
+
+    def _record_failure(self):
+        with self._lock:
+            self._stats.failed += 1
+
+
+class InlineDispatcher(Dispatcher):
+    """
+    Calls callbacks on the network loop thread. Nothing is queued, so
+    no message is dropped, and exceptions reach the MQTT client.
+    """
+
+    def submit(self, message: ReceivedMessage, callback: Optional[MessageCallback]):
+        with self._lock:
+            self._stats.received += 1
+        self._record_delivery(message)
+        try:
+            callback(message.data)  # type: ignore
+        except Exception:
+            self._record_failure()
+            raise
+
+
+class _QueueingDispatcher(Dispatcher):
+    """ A dispatcher that holds up to max_pending messages """
+
+    def __init__(self, max_pending: int, overflow: OverflowPolicy):
+        super().__init__()
+        self.max_pending = max(max_pending, 1)
+        self.overflow = OverflowPolicy(overflow)
+        self._closing = False
+        self._space = threading.Condition(self._lock)
+
+    def _admit(self, topic: str) -> bool:
+        """ Make room for a message of topic, holding the lock """
+        self._stats.received += 1
+        while self._stats.pending >= self.max_pending and not self._closing:
+            if self.overflow == OverflowPolicy.BLOCK:
+                self._space.wait()
+            elif self.overflow == OverflowPolicy.DROP_NEWEST:
+                self._stats.dropped += 1
+                return False
+            else:
+                self._drop_oldest(topic)
+                self._stats.pending -= 1
+                self._stats.dropped += 1
+        if self._closing:
+            self._stats.dropped += 1
+            return False
+        return True
+
+    def _drop_oldest(self, topic: str):
+        raise NotImplementedError()
+
+    def _taken(self):
+        """ A queued message was taken, holding the lock """
+        self._stats.pending -= 1
+        self._space.notify()
+
+
+class ThreadPoolDispatcher(_QueueingDispatcher):
+    """
+    Calls callbacks on up to workers threads. Messages of a topic are
+    delivered in order and never concurrently; topics take turns.
+    Callback exceptions are logged and counted as failed.
+    """
+
+    def __init__(self,
+                 workers: int = DEFAULT_WORKERS,
+                 max_pending: int = DEFAULT_MAX_PENDING,
+                 overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST):
+        super().__init__(max_pending, overflow)
+        self.workers = max(workers, 1)
+        self._work = threading.Condition(self._lock)
+        # Queued messages per topic
+        self._queues: Dict[str, Deque[Tuple[ReceivedMessage, MessageCallback]]] = {}
+        # Topics waiting for a worker, each with queued messages
+        self._ready: Deque[str] = deque()
+        # Topics waiting for or being delivered by a worker
+        self._active: Set[str] = set()
+        self._threads: List[threading.Thread] = []
+
+    def submit(self, message: ReceivedMessage, callback: Optional[MessageCallback]):
+        with self._lock:
+            if not self._threads and not self._closing:
+                self._threads = [threading.Thread(target=self._run, daemon=True,
+                                                  name=f"tiedie-dispatch-{index}")
+                                 for index in range(self.workers)]
+                for thread in self._threads:
+                    thread.start()
+            if not self._admit(message.topic):
+                return
+            self._queues.setdefault(message.topic, deque()).append((message, callback))  # type: ignore
+            self._stats.pending += 1
+            if message.topic not in self._active:
+                self._active.add(message.topic)
+                self._ready.append(message.topic)
+                self._work.notify()
+
+    def close(self, timeout: Optional[float] = None):
+        with self._lock:
+            self._closing = True
+            self._work.notify_all()
+            self._space.notify_all()
+            threads = self._threads
+        for thread in threads:
+            thread.join(timeout)
+
+    def _drop_oldest(self, topic: str):
+        queue = self._queues.get(topic)
+        if not queue:
+            topic, queue = next((topic, queue) for topic, queue in self._queues.items() if queue)
+        queue.popleft()
+        if not queue and topic in self._ready:
+            self._ready.remove(topic)
+            self._active.discard(topic)
+            del self._queues[topic]
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._ready and not self._closing:
+                    self._work.wait()
+                if not self._ready:
+                    return
+                topic = self._ready.popleft()
+                message, callback = self._queues[topic].popleft()
+                self._taken()
+
+            self._record_delivery(message)
+            try:
+                callback(message.data)
+            except Exception: # pylint: disable=broad-except
+                self._record_failure()
+                logger.exception("Callback failed on a message of %s", topic)
+
+            with self._lock:
+                if self._queues[topic]:
+                    # Back of the line, so that a busy topic does not starve the others
+                    self._ready.append(topic)
+                    self._work.notify()
+                else:
+                    self._active.discard(topic)
+                    del self._queues[topic]
+
+
+class AsyncQueueDispatcher(_QueueingDispatcher):
+    """
+    Queues messages for an asyncio application, which reads them with
+    "async for message in dispatcher", as ReceivedMessage objects.
+    Subscriptions need no callback. Create it in the event loop that
+    reads it, or pass that loop.
+    """
+
+    needs_callback = False
+
+    def __init__(self,
+                 loop: Optional[asyncio.AbstractEventLoop] = None,
+                 max_pending: int = DEFAULT_MAX_PENDING,
+                 overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST):
+        super().__init__(max_pending, overflow)
+        self.loop = loop or asyncio.get_running_loop()
+        self._queue: Deque[ReceivedMessage] = deque()
+        self._wakeup = asyncio.Event()
+
+    def submit(self, message: ReceivedMessage, callback: Optional[MessageCallback]):
+        with self._lock:
+            if not self._admit(message.topic):
+                return
+            self._queue.append(message)
+            self._stats.pending += 1
+        self.loop.call_soon_threadsafe(self._wakeup.set)
+
+    def close(self, timeout: Optional[float] = None):
+        """ End the iteration once the pending messages are read """
+        with self._lock:
+            self._closing = True
+            self._space.notify_all()
+        self.loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _drop_oldest(self, topic: str):
+        for index, message in enumerate(self._queue):
+            if message.topic == topic:
+                del self._queue[index]
+                return
+        self._queue.popleft()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> ReceivedMessage:
+        while True:
+            with self._lock:
+                if self._queue:
+                    message = self._queue.popleft()
+                    self._taken()
+                    break
+                if self._closing:
+                    raise StopAsyncIteration
+                self._wakeup.clear()
+            await self._wakeup.wait()
+        self._record_delivery(message)
+        return message
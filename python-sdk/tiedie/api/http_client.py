@@ -9,12 +9,24 @@
 This moddules defines a client for making HTTP requests, handling responses,
 and mapping them to specific classes, particularly for IoT applications.
 
+AsyncAbstractHttpClient is the asyncio counterpart, for applications
+that talk to many devices at once: its requests share a pool of
+keep-alive connections, and map_bounded fans calls out with bounded
+concurrency.
+
+Response bodies are validated straight from their bytes, and are only
+decoded to text for error details and debug logs.
+
 """
 
+import asyncio
 from enum import Enum
 import json
 import logging
-from typing import Optional, Type, TypeVar, Union, List
+import ssl
+from typing import (Awaitable, Callable, Iterable, List, Mapping, Optional, Protocol, Type,
+                    TypeVar, Union)
+import httpx
 from pydantic import BaseModel, ValidationError
 import requests
 from tiedie.api.auth import Authenticator
@@ -28,20 +40,40 @@ from tiedie.models.responses import (
 
 ReturnClass = TypeVar('ReturnClass', bound=BaseModel)
 NipcReturnClass = TypeVar('NipcReturnClass', bound=BaseModel)
+Item = TypeVar('Item')
+Result = TypeVar('Result')
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_CONCURRENCY = 16
+DEFAULT_TIMEOUT = 30.0
 
 logger = logging.getLogger('tiedie')
 
-class AbstractHttpClient:
-    """ class AbstractHttpClient """
+class HttpResponseLike(Protocol):
+    """ The parts of an HTTP response that are mapped to TieDie responses """
+    status_code: int
+    reason: str
+    headers: Mapping[str, str]
+    content: bytes
+    text: str
 
-    def __init__(self, base_url, media_type, authenticator: Authenticator):
-        self.base_url = base_url
-        self.media_type = media_type
-        self.headers = {"Content-Type": self.media_type}
-        self.http_client = authenticator.set_auth_options(requests.Session())
+
+def _log_response(response: HttpResponseLike):
+    # Decoding and formatting a large body costs more than parsing it
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Response HTTP status %d", response.status_code)
+        logger.debug("Response headers: %s", response.headers)
+        logger.debug("Response: %s", response.text)
+
+
+class ResponseMapper:
+    """ Maps HTTP responses to TieDie responses, for sync and async clients """
+
+    base_url: str
+    media_type: str
 
     def _map_response(self,
-                      response: requests.Response,
+                      response: HttpResponseLike,
                       return_class: Optional[Type[ReturnClass]] = None) \
             -> HttpResponse[ReturnClass | None]:
         """ Map response to object """
@@ -52,13 +84,10 @@ class AbstractHttpClient:
                 None
             )
 
-        logger.debug("Response HTTP status %d", response.status_code)
-        logger.debug("Response headers: %s", response.headers)
-        logger.debug("Response: %s", response.text)
+        _log_response(response)
 
         try:
-            body = return_class.model_validate_json(
-                response.text)
+            body = return_class.model_validate_json(response.content)
         except (ValueError, ValidationError):
             body = None
 
@@ -68,81 +97,8 @@ class AbstractHttpClient:
             body
         )
 
-    def post(self,
-             path: str,
-             body: BaseModel,
-             return_class: Type[ReturnClass]) -> HttpResponse[ReturnClass | None]:
-        """ API POST """
-        data = body.model_dump_json(by_alias=True, exclude_none=True)
-
-        logger.debug("POST %s", self.base_url + path)
-        logger.debug("Headers: %s", self.headers)
-        logger.debug("Body: %s", data)
-
-        response = self.http_client.post(
-            self.base_url + path,
-            data=data,
-            headers=self.headers,
-            verify=False,
-        )
-
-        return self._map_response(response, return_class)
-
-    def put(self,
-             path: str,
-             body: BaseModel,
-             return_class: Type[ReturnClass]) -> HttpResponse[ReturnClass | None]:
-        """ API PUT """
-        data = body.model_dump_json(by_alias=True, exclude_none=True)
-
-        logger.debug("PUT %s", self.base_url + path)
-        logger.debug("Headers: %s", self.headers)
-        logger.debug("Body: %s", data)
-
-        response = self.http_client.put(
-            self.base_url + path,
-            data=data,
-            headers=self.headers,
-            verify=False,
-        )
-
-        return self._map_response(response, return_class)
-
-    def get(self,
-            path: str,
-            return_class: Type[ReturnClass]) -> HttpResponse[ReturnClass | None]:
-        """ API GET """
-
-        logger.debug("GET %s", self.base_url + path)
-        logger.debug("Headers: %s", self.headers)
-
-        response = self.http_client.get(
-            self.base_url + path,
-            headers=self.headers,
-            verify=False,
-
-        )
-        return self._map_response(response, return_class)
-
-    def delete(self,
-               path: str,
-               return_class: Optional[Type[ReturnClass]] = None) \
-            -> HttpResponse[ReturnClass | None]:
-        """ API DELETE """
-
-        logger.debug("DELETE %s", self.base_url + path)
-        logger.debug("Headers: %s", self.headers)
-
-        response = self.http_client.delete(
-            self.base_url + path,
-            headers=self.headers,
-            verify=False,
-        )
-
-        return self._map_response(response, return_class)
-
     def _map_nipc_response(self,
-                          response: requests.Response,
+                          response: HttpResponseLike,
                           return_class: Optional[Type[NipcReturnClass]]) \
             -> NipcResponse[Optional[NipcReturnClass]]:
         """Map HTTP response to NIPC response format.
@@ -156,8 +112,7 @@ class AbstractHttpClient:
             headers=dict(response.headers)
         )
 
-        logger.debug("Response headers: %s", response.headers)
-        logger.debug("Response: %s", response.text)
+        _log_response(response)
 
         # Check for error status codes (4xx, 5xx)
         if response.status_code >= 400:
@@ -167,7 +122,7 @@ class AbstractHttpClient:
         return self._handle_success_response(response, http, return_class)
 
     def _handle_error_response(self,
-                              response: requests.Response,
+                              response: HttpResponseLike,
                               http: TiedieHTTP) -> NipcResponse[None]:
         """Handle error responses with Problem Details format."""
         content_type = response.headers.get('content-type', '').lower()
@@ -175,7 +130,7 @@ class AbstractHttpClient:
         try:
             if 'application/problem+json' in content_type:
                 # Parse RFC 9457 Problem Details format
-                problem_details = ProblemDetails.model_validate_json(response.text)
+                problem_details = ProblemDetails.model_validate_json(response.content)
                 return NipcResponse[None](http=http, error=problem_details)
             # Fallback: try to parse as JSON and extract error info
             error_data = json.loads(response.text) if response.text else {}
@@ -198,7 +153,7 @@ class AbstractHttpClient:
             return NipcResponse[None](http=http, error=problem_details)
 
     def _handle_success_response(self,
-                                response: requests.Response,
+                                response: HttpResponseLike,
                                 http: TiedieHTTP,
                                 return_class: Optional[Type[NipcReturnClass]]) \
         -> NipcResponse[Optional[NipcReturnClass]]:
@@ -206,7 +161,7 @@ class AbstractHttpClient:
         if return_class is None:
             return NipcResponse[None](http=http, body=None)
         try:
-            body = return_class.model_validate_json(response.text)
+            body = return_class.model_validate_json(response.content)
             return NipcResponse[Optional[NipcReturnClass]](http=http, body=body)
         except (ValueError, ValidationError) as e:
             logger.debug("Error parsing success response: %s", e)
@@ -270,6 +225,89 @@ class AbstractHttpClient:
                 ']'
         return body.model_dump_json(by_alias=True, exclude_none=True)
 
+
+class AbstractHttpClient(ResponseMapper):
+    """ class AbstractHttpClient """
+
+    def __init__(self, base_url, media_type, authenticator: Authenticator):
+        self.base_url = base_url
+        self.media_type = media_type
+        self.headers = {"Content-Type": self.media_type}
+        self.http_client = authenticator.set_auth_options(requests.Session())
+
+    def post(self,
+             path: str,
+             body: BaseModel,
+             return_class: Type[ReturnClass]) -> HttpResponse[ReturnClass | None]:
+        """ API POST """
+        data = body.model_dump_json(by_alias=True, exclude_none=True)
+
+        logger.debug("POST %s", self.base_url + path)
+        logger.debug("Headers: %s", self.headers)
+        logger.debug("Body: %s", data)
+
+        response = self.http_client.post(
+            self.base_url + path,
+            data=data,
+            headers=self.headers,
+            verify=False,
+        )
+
+        return self._map_response(response, return_class)
+
+    def put(self,
+             path: str,
+             body: BaseModel,
+             return_class: Type[ReturnClass]) -> HttpResponse[ReturnClass | None]:
+        """ API PUT """
+        data = body.model_dump_json(by_alias=True, exclude_none=True)
+
+        logger.debug("PUT %s", self.base_url + path)
+        logger.debug("Headers: %s", self.headers)
+        logger.debug("Body: %s", data)
+
+        response = self.http_client.put(
+            self.base_url + path,
+            data=data,
+            headers=self.headers,
+            verify=False,
+        )
+
+        return self._map_response(response, return_class)
+
+    def get(self,
+            path: str,
+            return_class: Type[ReturnClass]) -> HttpResponse[ReturnClass | None]:
+        """ API GET """
+
+        logger.debug("GET %s", self.base_url + path)
+        logger.debug("Headers: %s", self.headers)
+
+        response = self.http_client.get(
+            self.base_url + path,
+            headers=self.headers,
+            verify=False,
+
+        )
+        return self._map_response(response, return_class)
+
+    def delete(self,
+               path: str,
+               return_class: Optional[Type[ReturnClass]] = None) \
+            -> HttpResponse[ReturnClass | None]:
+        """ API DELETE """
+
+        logger.debug("DELETE %s", self.base_url + path)
+        logger.debug("Headers: %s", self.headers)
+
+        response = self.http_client.delete(
+            self.base_url + path,
+            headers=self.headers,
+            verify=False,
+        )
+
+        return self._map_response(response, return_class)
+
     def post_with_nipc_response(self,
                            path: str,
                            body: Optional[Union[BaseModel, List[BaseModel]]],
@@ -374,3 +412,189 @@ class AbstractHttpClient:
         )
 
         return self._map_nipc_response(response, return_class)
+
+
+async def map_bounded(func: Callable[[Item], Awaitable[Result]],
+                      items: Iterable[Item],
+                      concurrency: int = DEFAULT_CONCURRENCY) -> List[Result]:
+    """ Await func(item) for every item, at most concurrency at a time.
+
+    Args:
+        func: Coroutine function to call, e.g. a method of an async client.
+        items: Arguments to call func with.
+        concurrency (int, optional): Maximum number of calls in flight.
+
+    Returns:
+        List: The results, in the order of items. The first exception
+            raised by a call propagates.
+    """
+    pending = list(items)
+    results: List[Result] = [None] * len(pending)  # type: ignore
+    queue = iter(enumerate(pending))
+
+    async def worker():
+        for index, item in queue:
+            results[index] = await func(item)
+
+    await asyncio.gather(*(worker() for _ in range(min(max(concurrency, 1), len(pending)))))
+    return results
+
+
+class _HttpxResponse:
+    """ An httpx response, with the attribute names of a requests response """
+
+    def __init__(self, response: httpx.Response):
+        self.status_code = response.status_code
+        self.reason = response.reason_phrase
+        self.headers = response.headers
+        self.content = response.content
+        self._response = response
+
+    @property
+    def text(self) -> str:
+        """ The decoded body """
+        return self._response.text
+
+
+class AsyncAbstractHttpClient(ResponseMapper):
+    """ asyncio HTTP client with a shared pool of keep-alive connections.
+
+    Close it with aclose(), or use it as an async context manager, to
+    release the connections.
+    """
+
+    def __init__(self,
+                 base_url,
+                 media_type,
+                 authenticator: Authenticator,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.base_url = base_url
+        self.media_type = media_type
+        self.headers = {"Content-Type": self.media_type}
+
+        # Like AbstractHttpClient, which sends every request with verify=False
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        options = authenticator.set_async_auth_options({"verify": context})
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+            timeout=timeout,
+            transport=transport,
+            **options
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """ Close the pooled connections """
+        await self.http_client.aclose()
+
+    async def _request(self,
+                       method: str,
+                       path: str,
+                       headers: dict,
+                       data: Optional[str] = None,
+                       params=None) -> _HttpxResponse:
+        logger.debug("%s %s", method, self.base_url + path)
+        logger.debug("Headers: %s", headers)
+        logger.debug("Body: %s", data)
+        logger.debug("Params: %s", params)
+
+        response = await self.http_client.request(
+            method,
+            self.base_url + path,
+            content=data,
+            # Empty params would replace the query string of path
+            params=params or None,
+            headers=headers,
+        )
+        return _HttpxResponse(response)
+
+    async def post(self,
+                   path: str,
+                   body: BaseModel,
+                   return_class: Type[ReturnClass]) -> HttpResponse[ReturnClass | None]:
+        """ API POST """
+        data = body.model_dump_json(by_alias=True, exclude_none=True)
+        response = await self._request("POST", path, dict(self.headers), data)
+        return self._map_response(response, return_class)
+
+    async def put(self,
+                  path: str,
+                  body: BaseModel,
+                  return_class: Type[ReturnClass]) -> HttpResponse[ReturnClass | None]:
+        """ API PUT """
+        data = body.model_dump_json(by_alias=True, exclude_none=True)
+        response = await self._request("PUT", path, dict(self.headers), data)
+        return self._map_response(response, return_class)
+
+    async def get(self,
+                  path: str,
+                  return_class: Type[ReturnClass],
+                  accept: Optional[str] = None) -> HttpResponse[ReturnClass | None]:
+        """ API GET """
+        headers = dict(self.headers)
+        if accept is not None:
+            headers['Accept'] = accept
+        response = await self._request("GET", path, headers)
+        return self._map_response(response, return_class)
+
+    async def delete(self,
+                     path: str,
+                     return_class: Optional[Type[ReturnClass]] = None) \
+            -> HttpResponse[ReturnClass | None]:
+        """ API DELETE """
+        response = await self._request("DELETE", path, dict(self.headers))
+        return self._map_response(response, return_class)
+
+    async def post_with_nipc_response(self,
+                                      path: str,
+                                      body: Optional[Union[BaseModel, List[BaseModel]]],
+                                      return_class: Optional[Type[NipcReturnClass]],
+                                      content_type: Optional[str] = "application/nipc+json") \
+            -> NipcResponse[Optional[NipcReturnClass]]:
+        """ API POST with NIPC response format """
+        headers = {**self.headers, 'Content-Type': content_type, 'Accept': self.media_type}
+        response = await self._request("POST", path, headers, self._serialize_body(body))
+        return self._map_nipc_response(response, return_class)
+
+    async def put_with_nipc_response(self,
+                                     path: str,
+                                     body: Union[BaseModel, List[BaseModel]],
+                                     return_class: Optional[Type[NipcReturnClass]],
+                                     content_type: Optional[str] = "application/nipc+json") \
+            -> NipcResponse[Optional[NipcReturnClass]]:
+        """ API PUT with NIPC response format """
+        headers = {**self.headers, 'Content-Type': content_type, 'Accept': self.media_type}
+        response = await self._request("PUT", path, headers, self._serialize_body(body))
+        return self._map_nipc_response(response, return_class)
+
+    async def get_with_nipc_response(self,
+                                     path: str,
+                                     body: Optional[BaseModel],
+                                     return_class: Optional[Type[NipcReturnClass]]) \
+            -> NipcResponse[Optional[NipcReturnClass]]:
+        """ API GET with NIPC response format """
+        headers = {**self.headers, 'Content-Type': self.media_type, 'Accept': self.media_type}
+        response = await self._request("GET", path, headers,
+                                       params=self._get_query_parameters(body))
+        return self._map_nipc_response(response, return_class)
+
+    async def delete_with_nipc_response(self,
+                                        path: str,
+                                        body: Optional[BaseModel],
+                                        return_class: Optional[Type[NipcReturnClass]]) \
+            -> NipcResponse[Optional[NipcReturnClass]]:
+        """ API DELETE with NIPC response format """
+        headers = {**self.headers, 'Accept': self.media_type}
+        response = await self._request("DELETE", path, headers,
+                                       params=self._get_query_parameters(body))
+        return self._map_nipc_response(response, return_class)
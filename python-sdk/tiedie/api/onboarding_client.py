@@ -6,11 +6,156 @@
 
 """ this module defines onboarding a client """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterator, List, Optional, Sequence, Tuple, Type, TypeVar
+import urllib.parse as url_parse
 
 from tiedie.api.auth import Authenticator
-from tiedie.models import Device, EndpointApp, ListResponse
+from tiedie.models import (
+    BulkOperation,
+    BulkRequest,
+    BulkResponse,
+    BulkResult,
+    Device,
+    EndpointApp,
+    ListResponse,
+)
 
-from .http_client import AbstractHttpClient, HttpResponse
+from .http_client import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_MAX_CONNECTIONS,
+    AbstractHttpClient,
+    AsyncAbstractHttpClient,
+    HttpResponse,
+    map_bounded,
+)
+
+# Operations per SCIM BulkRequest; the gateway writes device creations
+# in batches of up to 1000 (BULK_CHUNK_SIZE)
+DEFAULT_BULK_CHUNK_SIZE = 1000
+# BulkRequests in flight at once
+DEFAULT_BULK_CONCURRENCY = 4
+
+# Resources per page of the list iterators
+DEFAULT_PAGE_SIZE = 100
+
+Item = TypeVar("Item")
+BulkChunk = List[Tuple[Item, BulkOperation]]
+Resource = TypeVar("Resource", Device, EndpointApp)
+
+
+class ListPageError(RuntimeError):
+    """Raised by the list iterators when a page cannot be fetched."""
+
+    def __init__(self, response: HttpResponse):
+        super().__init__(f"List request failed: {response.status_code} {response.message}")
+        self.response = response
+
+
+def _page_path(path: str, params: dict) -> str:
+    return f"{path}?{url_parse.urlencode(params)}"
+
+
+def _first_page_params(page_size: int, scim_filter: Optional[str]) -> dict:
+    # Cursor paging when the server supports it, as every page then
+    # costs the same; a server that does not ignores the cursor or
+    # rejects it, and is paged by index instead
+    params = {"count": max(page_size, 1), "cursor": ""}
+    if scim_filter:
+        params["filter"] = scim_filter
+    return params
+
+
+def _index_params(params: dict, start_index: int = 1) -> dict:
+    params = {key: value for key, value in params.items() if key != "cursor"}
+    params["startIndex"] = start_index
+    return params
+
+
+def _next_page_params(params: dict, page: ListResponse) -> Optional[dict]:
+    """ The query of the page after page, or None if it was the last one """
+    if page.next_cursor:
+        return {**params, "cursor": page.next_cursor}
+    if page.start_index is None:
+        # Last page of cursor paging
+        return None
+    received = len(page.resources or [])
+    next_index = page.start_index + received
+    if received == 0 or next_index > page.total_results:
+        return None
+    return _index_params(params, next_index)
+
+
+def _checked_page(response: HttpResponse) -> ListResponse:
+    if response.status_code >= 400 or response.body is None:
+        raise ListPageError(response)
+    return response.body
+
+
+def _device_data(device: Device) -> dict:
+    return device.model_dump(mode="json", by_alias=True, exclude_none=True)
+
+
+def _create_operations(devices: Sequence[Device]) -> List[Tuple[Device, BulkOperation]]:
+    return [(device, BulkOperation(method="POST", path="/Devices", bulk_id=str(index),
+                                   data=_device_data(device)))
+            for index, device in enumerate(devices)]
+
+
+def _update_operations(devices: Sequence[Device]) -> List[Tuple[Device, BulkOperation]]:
+    operations = []
+    for index, device in enumerate(devices):
+        if device.device_id is None:
+            raise ValueError("Device ID is required for update")
+        operations.append((device, BulkOperation(method="PUT",
+                                                 path=f"/Devices/{device.device_id}",
+                                                 bulk_id=str(index),
+                                                 data=_device_data(device))))
+    return operations
+
+
+def _delete_operations(device_ids: Sequence[str]) -> List[Tuple[str, BulkOperation]]:
+    return [(device_id, BulkOperation(method="DELETE", path=f"/Devices/{device_id}",
+                                      bulk_id=str(index)))
+            for index, device_id in enumerate(device_ids)]
+
+
+def _chunks(operations: List[Tuple[Item, BulkOperation]], chunk_size: int) \
+        -> List[BulkChunk]:
+    chunk_size = max(chunk_size, 1)
+    return [operations[start:start + chunk_size]
+            for start in range(0, len(operations), chunk_size)]
+
+
+def _bulk_request(chunk: BulkChunk) -> BulkRequest:
+    return BulkRequest(operations=[operation for _, operation in chunk])
+
+
+def _bulk_results(chunk: BulkChunk,
+                  response: HttpResponse[BulkResponse | None]) -> List[BulkResult]:
+    """ Match the results of a BulkResponse to the items of chunk by bulkId """
+    if response.body is None or response.status_code >= 400:
+        # The whole request failed: no item was processed
+        status_code = response.status_code if response.status_code >= 400 else None
+        error = {"status": str(response.status_code), "detail": response.message}
+        return [BulkResult(item, status_code, error=error) for item, _ in chunk]
+
+    by_bulk_id = {result.bulk_id: result for result in response.body.operations
+                  if result.bulk_id is not None}
+    results = []
+    for item, operation in chunk:
+        result = by_bulk_id.get(operation.bulk_id)
+        if result is None:
+            results.append(BulkResult(item, None, error={
+                "detail": "The bulk response has no result for this operation"}))
+            continue
+        status_code = int(result.status)
+        results.append(BulkResult(
+            item, status_code, result.location, result.version,
+            result.response if status_code >= 400 and isinstance(result.response, dict)
+            else None))
+    return results
 
 
 class OnboardingClient(AbstractHttpClient):
@@ -61,6 +206,28 @@ class OnboardingClient(AbstractHttpClient):
         """
         return self.get("/Devices", ListResponse[Device])
 
+    def iter_devices(self, page_size: int = DEFAULT_PAGE_SIZE,
+                     scim_filter: Optional[str] = None,
+                     prefetch: bool = True) -> Iterator[Device]:
+        """Iterate over the devices, one page at a time.
+
+        Unlike get_devices, at most two pages are held in memory: the
+        current one and, with prefetch, the next one, fetched in the
+        background while the current one is consumed.
+
+        Args:
+            page_size (int, optional): Devices per request.
+            scim_filter (str, optional): SCIM filter expression, e.g. 'displayName sw "BLE"'.
+            prefetch (bool, optional): Fetch the next page in the background.
+
+        Raises:
+            ListPageError: Raised if a page cannot be fetched.
+
+        Returns:
+            Iterator[Device]: The devices.
+        """
+        return self._iter_pages("/Devices", Device, page_size, scim_filter, prefetch)
+
     def delete_device(self, device_id: str) -> HttpResponse[None]:
         """Delete a device.
 
@@ -81,6 +248,18 @@ class OnboardingClient(AbstractHttpClient):
         """
         return self.get("/EndpointApps", ListResponse[EndpointApp])
 
+    def iter_endpoint_apps(self, page_size: int = DEFAULT_PAGE_SIZE,
+                           scim_filter: Optional[str] = None,
+                           prefetch: bool = True) -> Iterator[EndpointApp]:
+        """Iterate over the EndpointApp objects, one page at a time.
+
+        See iter_devices.
+
+        Returns:
+            Iterator[EndpointApp]: The EndpointApp objects.
+        """
+        return self._iter_pages("/EndpointApps", EndpointApp, page_size, scim_filter, prefetch)
+
     def get_endpoint_app(self, app_id: str) -> HttpResponse[EndpointApp | None]:
         """Get the EndpointApp object using its unique ID.
 
@@ -102,3 +281,229 @@ class OnboardingClient(AbstractHttpClient):
             HttpResponse[EndpointApp | None]: Response object containing the EndpointApp object.
         """
         return self.post("/EndpointApps", endpoint_app, EndpointApp)
+
+    def create_devices(self, devices: Sequence[Device],
+                       chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+                       concurrency: int = DEFAULT_BULK_CONCURRENCY) \
+            -> List[BulkResult[Device]]:
+        """Onboard many devices with SCIM bulk requests.
+
+        Args:
+            devices (Sequence[Device]): Device objects to be onboarded.
+            chunk_size (int, optional): Devices per bulk request.
+            concurrency (int, optional): Bulk requests in flight at once.
+
+        Returns:
+            List[BulkResult[Device]]: One result per device, in the order of devices.
+                The ID of a created device is its resource_id.
+        """
+        return self._run_bulk(_create_operations(devices), chunk_size, concurrency)
+
+    def update_devices(self, devices: Sequence[Device],
+                       chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+                       concurrency: int = DEFAULT_BULK_CONCURRENCY) \
+            -> List[BulkResult[Device]]:
+        """Update many existing devices with SCIM bulk requests.
+
+        Args:
+            devices (Sequence[Device]): Device objects to be updated.
+            chunk_size (int, optional): Devices per bulk request.
+            concurrency (int, optional): Bulk requests in flight at once.
+
+        Raises:
+            ValueError: Raised if a device has no ID.
+
+        Returns:
+            List[BulkResult[Device]]: One result per device, in the order of devices.
+        """
+        return self._run_bulk(_update_operations(devices), chunk_size, concurrency)
+
+    def delete_devices(self, device_ids: Sequence[str],
+                       chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+                       concurrency: int = DEFAULT_BULK_CONCURRENCY) \
+            -> List[BulkResult[str]]:
+        """Delete many devices with SCIM bulk requests.
+
+        Args:
+            device_ids (Sequence[str]): Unique IDs of the devices.
+            chunk_size (int, optional): Devices per bulk request.
+            concurrency (int, optional): Bulk requests in flight at once.
+
+        Returns:
+            List[BulkResult[str]]: One result per device ID, in the order of device_ids.
+        """
+        return self._run_bulk(_delete_operations(device_ids), chunk_size, concurrency)
+
+    def _get_page(self, path: str, resource_class: Type[Resource], params: dict) \
+            -> Tuple[ListResponse[Resource], dict]:
+        response = self.get(_page_path(path, params), ListResponse[resource_class])
+        if response.status_code == 400 and "cursor" in params:
+            params = _index_params(params)
+            response = self.get(_page_path(path, params), ListResponse[resource_class])
+        return _checked_page(response), params
+
+    def _iter_pages(self, path: str, resource_class: Type[Resource], page_size: int,
+                    scim_filter: Optional[str], prefetch: bool) -> Iterator[Resource]:
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page, params = self._get_page(path, resource_class,
+                                          _first_page_params(page_size, scim_filter))
+            while True:
+                next_params = _next_page_params(params, page)
+                upcoming = None
+                if next_params is not None and executor is not None:
+                    upcoming = executor.submit(self._get_page, path, resource_class, next_params)
+                yield from page.resources or []
+                if next_params is None:
+                    return
+                page, params = upcoming.result() if upcoming is not None else \
+                    self._get_page(path, resource_class, next_params)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _post_bulk(self, chunk: BulkChunk) -> List[BulkResult]:
+        return _bulk_results(chunk, self.post("/Bulk", _bulk_request(chunk), BulkResponse))
+
+    def _run_bulk(self, operations: List[Tuple[Item, BulkOperation]],
+                  chunk_size: int, concurrency: int) -> List[BulkResult]:
+        chunks = _chunks(operations, chunk_size)
+        if not chunks:
+            return []
+        with ThreadPoolExecutor(max_workers=max(min(concurrency, len(chunks)), 1)) as executor:
+            return [result for results in executor.map(self._post_bulk, chunks)
+                    for result in results]
+
+
+class AsyncOnboardingClient(AsyncAbstractHttpClient):
+    """asyncio counterpart of OnboardingClient.
+
+    Requests share a pool of keep-alive connections. Close the client
+    with aclose(), or use it as an async context manager.
+    """
+
+    def __init__(self, base_url: str, authenticator: Authenticator,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS, **kwargs):
+        super().__init__(base_url, "application/scim+json", authenticator,
+                         max_connections=max_connections, **kwargs)
+
+    async def create_device(self, device: Device) -> HttpResponse[Device | None]:
+        """See OnboardingClient.create_device"""
+        return await self.post("/Devices", device, Device)
+
+    async def update_device(self, device: Device) -> HttpResponse[Device | None]:
+        """See OnboardingClient.update_device"""
+        return await self.put(f"/Devices/{device.device_id}", device, Device)
+
+    async def get_device(self, device_id: str) -> HttpResponse[Device | None]:
+        """See OnboardingClient.get_device"""
+        return await self.get(f"/Devices/{device_id}", Device)
+
+    async def get_device_list(self, device_ids: Sequence[str],
+                              concurrency: int = DEFAULT_CONCURRENCY) \
+            -> List[HttpResponse[Device | None]]:
+        """Get many Device objects, concurrency requests at a time.
+
+        Args:
+            device_ids (Sequence[str]): Unique IDs of the devices.
+            concurrency (int, optional): Maximum number of requests in flight.
+
+        Returns:
+            List[HttpResponse[Device | None]]: Responses, in the order of device_ids.
+        """
+        return await map_bounded(self.get_device, device_ids, concurrency)
+
+    async def get_devices(self) -> HttpResponse[ListResponse[Device] | None]:
+        """See OnboardingClient.get_devices"""
+        return await self.get("/Devices", ListResponse[Device])
+
+    def iter_devices(self, page_size: int = DEFAULT_PAGE_SIZE,
+                     scim_filter: Optional[str] = None,
+                     prefetch: bool = True) -> AsyncIterator[Device]:
+        """See OnboardingClient.iter_devices"""
+        return self._iter_pages("/Devices", Device, page_size, scim_filter, prefetch)
+
+    async def delete_device(self, device_id: str) -> HttpResponse[None]:
+        """See OnboardingClient.delete_device"""
+        return await self.delete(f"/Devices/{device_id}", None)
+
+    async def get_endpoint_apps(self) -> HttpResponse[ListResponse[EndpointApp] | None]:
+        """See OnboardingClient.get_endpoint_apps"""
+        return await self.get("/EndpointApps", ListResponse[EndpointApp])
+
+    def iter_endpoint_apps(self, page_size: int = DEFAULT_PAGE_SIZE,
+                           scim_filter: Optional[str] = None,
+                           prefetch: bool = True) -> AsyncIterator[EndpointApp]:
+        """See OnboardingClient.iter_endpoint_apps"""
+        return self._iter_pages("/EndpointApps", EndpointApp, page_size, scim_filter, prefetch)
+
+    async def get_endpoint_app(self, app_id: str) -> HttpResponse[EndpointApp | None]:
+        """See OnboardingClient.get_endpoint_app"""
+        return await self.get(f"/EndpointApps/{app_id}", EndpointApp)
+
+    async def create_endpoint_app(self, endpoint_app: EndpointApp) \
+            -> HttpResponse[EndpointApp | None]:
+        """See OnboardingClient.create_endpoint_app"""
+        return await self.post("/EndpointApps", endpoint_app, EndpointApp)
+
+    async def create_devices(self, devices: Sequence[Device],
+                             chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+                             concurrency: int = DEFAULT_BULK_CONCURRENCY) \
+            -> List[BulkResult[Device]]:
+        """See OnboardingClient.create_devices"""
+        return await self._run_bulk(_create_operations(devices), chunk_size, concurrency)
+
+    async def update_devices(self, devices: Sequence[Device],
+                             chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+                             concurrency: int = DEFAULT_BULK_CONCURRENCY) \
+            -> List[BulkResult[Device]]:
+        """See OnboardingClient.update_devices"""
+        return await self._run_bulk(_update_operations(devices), chunk_size, concurrency)
+
+    async def delete_devices(self, device_ids: Sequence[str],
+                             chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+                             concurrency: int = DEFAULT_BULK_CONCURRENCY) \
+            -> List[BulkResult[str]]:
+        """See OnboardingClient.delete_devices"""
+        return await self._run_bulk(_delete_operations(device_ids), chunk_size, concurrency)
+
+    async def _get_page(self, path: str, resource_class: Type[Resource], params: dict) \
+            -> Tuple[ListResponse[Resource], dict]:
+        response = await self.get(_page_path(path, params), ListResponse[resource_class])
+        if response.status_code == 400 and "cursor" in params:
+            params = _index_params(params)
+            response = await self.get(_page_path(path, params), ListResponse[resource_class])
+        return _checked_page(response), params
+
+    async def _iter_pages(self, path: str, resource_class: Type[Resource], page_size: int,
+                          scim_filter: Optional[str], prefetch: bool) -> AsyncIterator[Resource]:
+        page, params = await self._get_page(path, resource_class,
+                                            _first_page_params(page_size, scim_filter))
+        while True:
+            next_params = _next_page_params(params, page)
+            upcoming = None
+            if next_params is not None and prefetch:
+                upcoming = asyncio.ensure_future(
+                    self._get_page(path, resource_class, next_params))
+            try:
+                for resource in page.resources or []:
+                    yield resource
+            except BaseException:
+                # The caller stopped iterating
+                if upcoming is not None:
+                    upcoming.cancel()
+                raise
+            if next_params is None:
+                return
+            page, params = await upcoming if upcoming is not None else \
+                await self._get_page(path, resource_class, next_params)
+
+    async def _post_bulk(self, chunk: BulkChunk) -> List[BulkResult]:
+        return _bulk_results(chunk, await self.post("/Bulk", _bulk_request(chunk),
+                                                    BulkResponse))
+
+    async def _run_bulk(self, operations: List[Tuple[Item, BulkOperation]],
+                        chunk_size: int, concurrency: int) -> List[BulkResult]:
+        chunks = _chunks(operations, chunk_size)
+        return [result for results in await map_bounded(self._post_bulk, chunks, concurrency)
+                for result in results]
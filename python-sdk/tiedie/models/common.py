@@ -5,12 +5,13 @@
 
 """
 
-Classes for IoT parameters, list responses, and subscription options used in IoT applications.
+Classes for IoT parameters, list and bulk messages, and subscription options used in IoT
+applications.
 
 """
 
 from enum import IntEnum
-from typing import Generic, List, Optional, TypeVar
+from typing import Any, Generic, List, Optional, TypeVar
 
 from pydantic import BaseModel, ConfigDict, Field
 from pydantic.alias_generators import to_camel
@@ -63,17 +64,63 @@ Resource = TypeVar("Resource", bound=BaseModel)
 class ListResponse(BaseModel, Generic[Resource]):
     """
     A class representing a list response with attributes for totalResults,
-    startIndex, itemsPerPage, and resources.
+    startIndex, itemsPerPage, nextCursor and resources.
     """
     model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
 
     total_results: int
     start_index: Optional[int] = None
     items_per_page: Optional[int] = None
+    # Cursor of the next page, with cursor paging (draft-ietf-scim-cursor-pagination)
+    next_cursor: Optional[str] = None
 
     resources: Optional[List[Resource]] = Field(alias=str("Resources"), default=[])
 
 
+BULK_REQUEST_SCHEMA = "urn:ietf:params:scim:api:messages:2.0:BulkRequest"
+BULK_RESPONSE_SCHEMA = "urn:ietf:params:scim:api:messages:2.0:BulkResponse"
+
+
+class BulkOperation(BaseModel):
+    """ One operation of a SCIM BulkRequest (RFC 7644 section 3.7). """
+    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+
+    method: str
+    path: str
+    bulk_id: Optional[str] = None
+    version: Optional[str] = None
+    data: Optional[Any] = None
+
+
+class BulkRequest(BaseModel):
+    """ A SCIM BulkRequest message. """
+    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+
+    schemas: List[str] = [BULK_REQUEST_SCHEMA]
+    fail_on_errors: Optional[int] = None
+    operations: List[BulkOperation] = Field(alias=str("Operations"))
+
+
+class BulkOperationResponse(BaseModel):
+    """ The result of one operation, in a SCIM BulkResponse. """
+    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+
+    method: Optional[str] = None
+    bulk_id: Optional[str] = None
+    version: Optional[str] = None
+    location: Optional[str] = None
+    status: str
+    response: Optional[Any] = None
+
+
+class BulkResponse(BaseModel):
+    """ A SCIM BulkResponse message. """
+    model_config = ConfigDict(populate_by_name=True, alias_generator=to_camel)
+
+    schemas: List[str] = [BULK_RESPONSE_SCHEMA]
+    operations: List[BulkOperationResponse] = Field(alias=str("Operations"), default=[])
+
+
 class RegistrationOptions(BaseModel):
     """
     A class representing registration options for IoT devices.
@@ -141,6 +141,33 @@ class HttpResponse(Generic[T_co]):
     body: T_co
 
 
+@dataclass
+class BulkResult(Generic[T_co]):
+    """ The outcome of one item of a bulk call, e.g. OnboardingClient.create_devices.
+
+    status_code is None when the server returned no result for the item,
+    e.g. because the whole bulk request failed before reaching it.
+    """
+
+    item: T_co
+    status_code: Optional[int]
+    location: Optional[str] = None
+    version: Optional[str] = None
+    error: Optional[dict] = None
+
+    @property
+    def is_success(self) -> bool:
+        """Returns True if the operation on the item succeeded."""
+        return self.status_code is not None and self.status_code < 400
+
+    @property
+    def resource_id(self) -> Optional[str]:
+        """The ID of the created or updated resource, from its location."""
+        if self.location is None:
+            return None
+        return self.location.rstrip("/").rsplit("/", 1)[-1]
+
+
 class ValueResponse(SuccessResponse):
     """ Class for data response with value and status. """
 
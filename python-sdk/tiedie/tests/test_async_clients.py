@@ -0,0 +1,276 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+""" Test the asyncio clients """
+
+import asyncio
+import json
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from tiedie.api.auth import ApiKeyAuthenticator
+from tiedie.api.control_client import AsyncControlClient
+from tiedie.api.http_client import map_bounded
+from tiedie.api.onboarding_client import AsyncOnboardingClient
+from tiedie.models.ble import BleDataParameter
+from tiedie.models.responses import PropertyResponse
+from tiedie.models.scim import BleExtension, Device
+
+SDF_NAME = "https://example.com/heartrate#/sdfObject/healthsensor/sdfProperty/heartrate"
+
+
+@pytest.fixture(name="authenticator")
+def api_key_authenticator():
+    """API Key Authenticator fixture"""
+    return ApiKeyAuthenticator(
+        app_id="control_app",
+        ca_file_path="client_ca_path",
+        api_key=str(uuid4())
+    )
+
+
+def ble_device(device_id: str) -> Device:
+    """A BLE device"""
+    return Device(
+        display_name="BLE Monitor",
+        active=True,
+        device_id=device_id,
+        ble_extension=BleExtension(
+            device_mac_address="AA:BB:CC:11:22:33",
+            is_random=False,
+            version_support=["5.0"],
+        )
+    )
+
+
+def test_map_bounded():
+    """ Results keep the input order, with at most concurrency calls in flight """
+    in_flight = 0
+    peak = 0
+
+    async def double(value: int) -> int:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001 * (10 - value))
+        in_flight -= 1
+        return value * 2
+
+    assert asyncio.run(map_bounded(double, range(10), 3)) == [value * 2 for value in range(10)]
+    assert peak == 3
+    assert asyncio.run(map_bounded(double, [], 3)) == []
+
+
+def test_connect(authenticator: ApiKeyAuthenticator):
+    """ Connect maps the NIPC response to data parameters """
+    device_id = str(uuid4())
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={
+            "id": device_id,
+            "protocolInformation": {"ble": {"services": [{
+                "serviceID": "1800",
+                "characteristics": [{"characteristicID": "2a00", "flags": ["read"]}]
+            }]}}
+        }, headers={"Content-Type": "application/nipc+json"})
+
+    async def connect():
+        async with AsyncControlClient("https://control.example.com/nipc", authenticator,
+                                      transport=httpx.MockTransport(handler)) as client:
+            return await client.connect(ble_device(device_id))
+
+    response = asyncio.run(connect())
+
+    assert response.http and response.http.status_code == 200
+    assert response.body == [BleDataParameter(device_id=device_id, service_id="1800",
+                                              characteristic_id="2a00", flags=["read"])]
+    request = requests[0]
+    assert request.url == f"https://control.example.com/nipc/devices/{device_id}/connections"
+    assert request.headers["x-api-key"] == authenticator.api_key
+    assert request.headers["content-type"] == "application/nipc+json"
+    assert json.loads(request.content) == {"protocolInformation": {"ble": {}}, "retries": 3}
+
+
+def test_read_properties(authenticator: ApiKeyAuthenticator):
+    """ Property reads fan out over one connection pool and keep their order """
+    device_ids = [str(uuid4()) for _ in range(20)]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        device_id = request.url.path.split("/")[-2]
+        assert request.url.params["propertyName"] == SDF_NAME
+        if device_id == device_ids[3]:
+            return httpx.Response(404, json={"title": "Device not found", "status": 404},
+                                  headers={"Content-Type": "application/problem+json"})
+        return httpx.Response(200, json=[{"property": SDF_NAME, "value": device_id}],
+                              headers={"Content-Type": "application/nipc+json"})
+
+    async def read():
+        async with AsyncControlClient("https://control.example.com/nipc", authenticator,
+                                      transport=httpx.MockTransport(handler)) as client:
+            return await client.read_properties(device_ids, SDF_NAME, concurrency=4)
+
+    responses = asyncio.run(read())
+
+    assert len(responses) == len(device_ids)
+    for device_id, response in zip(device_ids, responses):
+        if device_id == device_ids[3]:
+            assert not response.is_success
+            assert response.error and response.error.status == 404
+            continue
+        assert response.is_success
+        assert response.body and response.body.root == [
+            PropertyResponse(property=SDF_NAME, value=device_id)]
+
+
+def test_sdf_accept_header_is_per_request(authenticator: ApiKeyAuthenticator):
+    """ Fetching SDF models does not change the headers of other requests """
+    accepts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        accepts.append(request.headers.get("accept"))
+        return httpx.Response(200, json=[], headers={"Content-Type": "application/sdf+json"})
+
+    async def fetch():
+        async with AsyncControlClient("https://control.example.com/nipc", authenticator,
+                                      transport=httpx.MockTransport(handler)) as client:
+            await client.get_sdf_models()
+            await client.get_all_events(str(uuid4()))
+
+    asyncio.run(fetch())
+
+    assert accepts == ["application/sdf+json", "application/nipc+json"]
+
+
+def test_enable_event(authenticator: ApiKeyAuthenticator):
+    """ The instance ID of an enabled event is read from its location """
+    device_id = str(uuid4())
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.method == "POST"
+        return httpx.Response(201, headers={
+            "Location": f"/nipc/devices/{device_id}/events?instanceId=instance-1"})
+
+    async def enable():
+        async with AsyncControlClient("https://control.example.com/nipc", authenticator,
+                                      transport=httpx.MockTransport(handler)) as client:
+            return await client.enable_event(device_id, SDF_NAME)
+
+    response = asyncio.run(enable())
+
+    assert response.is_success
+    assert response.body == "instance-1"
+
+
+def test_onboarding_client(authenticator: ApiKeyAuthenticator):
+    """ Onboarding calls map SCIM responses and errors """
+    device_id = str(uuid4())
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers["content-type"] == "application/scim+json"
+        if request.method == "POST":
+            body = json.loads(request.content)
+            body["id"] = device_id
+            return httpx.Response(201, json=body,
+                                  headers={"Content-Type": "application/scim+json"})
+        if request.url.path.endswith(device_id):
+            return httpx.Response(204)
+        return httpx.Response(404, json={
+            "schemas": ["urn:ietf:params:scim:api:messages:2.0:Error"],
+            "status": "404",
+            "detail": "Device not found"
+        }, headers={"Content-Type": "application/scim+json"})
+
+    async def onboard():
+        async with AsyncOnboardingClient("https://onboarding.example.com/scim/v2",
+                                         authenticator,
+                                         transport=httpx.MockTransport(handler)) as client:
+            created = await client.create_device(ble_device(device_id))
+            deleted = await client.delete_device(device_id)
+            missing = await client.get_device_list([str(uuid4())])
+            return created, deleted, missing
+
+    created, deleted, missing = asyncio.run(onboard())
+
+    assert created.status_code == 201
+    assert created.body and created.body.device_id == device_id
+    assert deleted.status_code == 204
+    assert missing[0].status_code == 404
+    assert missing[0].body is None
+    assert missing[0].message
+
+
+def test_bulk_create_devices(authenticator: ApiKeyAuthenticator):
+    """ Bulk creation pipelines chunks and matches results by bulkId """
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        operations = json.loads(request.content)["Operations"]
+        return httpx.Response(200, json={
+            "schemas": ["urn:ietf:params:scim:api:messages:2.0:BulkResponse"],
+            "Operations": [{"method": "POST", "bulkId": operation["bulkId"], "status": "201",
+                            "location": f"/scim/v2/Devices/device-{operation['bulkId']}"}
+                           for operation in operations]
+        }, headers={"Content-Type": "application/scim+json"})
+
+    devices = [ble_device(str(index)) for index in range(10)]
+    for device in devices:
+        device.device_id = None
+
+    async def create():
+        async with AsyncOnboardingClient("https://onboarding.example.com/scim/v2",
+                                         authenticator,
+                                         transport=httpx.MockTransport(handler)) as client:
+            return await client.create_devices(devices, chunk_size=2, concurrency=3)
+
+    results = asyncio.run(create())
+
+    assert peak == 3
+    assert [result.resource_id for result in results] == \
+        [f"device-{index}" for index in range(10)]
+    assert all(result.is_success for result in results)
+
+
+def test_iter_endpoint_apps(authenticator: ApiKeyAuthenticator):
+    """ The next page is fetched while the current one is consumed """
+    app_ids = [str(uuid4()) for _ in range(5)]
+    requested = []
+    second_page = asyncio.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        start = int(request.url.params["cursor"] or 0)
+        requested.append(start)
+        if start == 2:
+            second_page.set()
+        body = {"totalResults": len(app_ids), "Resources": [
+            {"id": app_id, "applicationName": "app",
+             "applicationType": "deviceControl"} for app_id in app_ids[start:start + 2]]}
+        if start + 2 < len(app_ids):
+            body["nextCursor"] = str(start + 2)
+        return httpx.Response(200, json=body, headers={"Content-Type": "application/scim+json"})
+
+    async def iterate():
+        received = []
+        async with AsyncOnboardingClient("https://onboarding.example.com/scim/v2",
+                                         authenticator,
+                                         transport=httpx.MockTransport(handler)) as client:
+            async for app in client.iter_endpoint_apps(page_size=2):
+                received.append(app.application_id)
+                if len(received) == 1:
+                    # Fetched before the first page is consumed
+                    await asyncio.wait_for(second_page.wait(), 5)
+        return received
+
+    assert asyncio.run(iterate()) == app_ids
+    assert requested == [0, 2, 4]
@@ -18,7 +18,8 @@ from tiedie.api.control_client import ControlClient
 from tiedie.models.ble import BleDataParameter
 from tiedie.models.requests import (PropertyProtocolMap, SdfModel,
                                     ZigbeePropertyProtocolMap)
-from tiedie.models.responses import DataAppRegistration, Event, ProblemDetails
+from tiedie.models.responses import (DataAppRegistration, Event, ProblemDetails,
+                                     ValueResponse)
 from tiedie.models.scim import (BleExtension, Device, PairingJustWorks,
                                 PairingPassKey, ZigbeeExtension)
 from tiedie.models.zigbee import ZigbeeDataParameter
@@ -945,3 +946,25 @@ def test_get_events(mock_server: responses.RequestsMock,
     assert all_events_response.body.root[0].instance_id == instance_id
     assert isinstance(all_events_response.body.root[1], ProblemDetails)
     assert all_events_response.body.root[1].status == 404
+
+
+class BytesOnlyResponse:
+    """ A response whose body must not be decoded to text """
+    status_code = 200
+    reason = "OK"
+    headers = {"Content-Type": "application/nipc+json"}
+    content = b'{"id": "device", "value": "AQI="}'
+
+    @property
+    def text(self):
+        """ Decoding is only needed for debug logs """
+        raise AssertionError("The body was decoded")
+
+
+def test_response_mapping_uses_bytes(control_client: ControlClient):
+    """ Bodies are validated from bytes when debug logging is off """
+    # pylint: disable-next=protected-access
+    response = control_client._map_nipc_response(BytesOnlyResponse(), ValueResponse)
+
+    assert response.is_success
+    assert response.body and response.body.value == "AQI="
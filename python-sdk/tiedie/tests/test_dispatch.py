@@ -0,0 +1,138 @@
+# Copyright (c) 2026, Cisco Systems, Inc. and/or its affiliates.
+# All rights reserved.
+# See LICENSE file in this distribution.
+# SPDX-License-Identifier: Apache-2.0
+
+""" Test the data receiver dispatchers """
+
+import asyncio
+import threading
+from uuid import uuid4
+
+import pytest
+
+from tiedie.api.auth import ApiKeyAuthenticator
+from tiedie.api.data_receiver_client import DataReceiverClient
+from tiedie.api.dispatch import (AsyncQueueDispatcher, InlineDispatcher, OverflowPolicy,
+                                 ReceivedMessage, ThreadPoolDispatcher)
+
+
+def test_inline_dispatcher():
+    """ Callbacks run on the calling thread and their exceptions propagate """
+    dispatcher = InlineDispatcher()
+    received = []
+
+    dispatcher.submit(ReceivedMessage("a", 1), received.append)
+    with pytest.raises(ZeroDivisionError):
+        dispatcher.submit(ReceivedMessage("a", 0), lambda value: 1 / value)
+
+    assert received == [1]
+    stats = dispatcher.stats
+    assert (stats.received, stats.delivered, stats.failed, stats.dropped) == (2, 2, 1, 0)
+
+
+def test_thread_pool_topic_order():
+    """ A slow topic keeps its order and does not hold up the others """
+    dispatcher = ThreadPoolDispatcher(workers=2)
+    release = threading.Event()
+    slow, fast = [], []
+    fast_done = threading.Event()
+
+    def on_slow(value):
+        release.wait(5)
+        slow.append(value)
+
+    def on_fast(value):
+        fast.append(value)
+        if len(fast) == 10:
+            fast_done.set()
+
+    for value in range(10):
+        dispatcher.submit(ReceivedMessage("slow", value), on_slow)
+        dispatcher.submit(ReceivedMessage("fast", value), on_fast)
+
+    assert fast_done.wait(5)
+    assert not slow
+    release.set()
+    dispatcher.close(5)
+
+    assert slow == list(range(10))
+    assert fast == list(range(10))
+    stats = dispatcher.stats
+    assert (stats.received, stats.delivered, stats.pending) == (20, 20, 0)
+    assert stats.max_lag >= stats.mean_lag > 0
+
+
+@pytest.mark.parametrize("overflow,expected", [
+    (OverflowPolicy.DROP_NEWEST, [0, 1, 2]),
+    (OverflowPolicy.DROP_OLDEST, [0, 2, 3]),
+])
+def test_thread_pool_overflow(overflow: OverflowPolicy, expected: list):
+    """ A full pool drops messages according to its policy """
+    dispatcher = ThreadPoolDispatcher(workers=1, max_pending=2, overflow=overflow)
+    started = threading.Event()
+    release = threading.Event()
+    received = []
+
+    def callback(value):
+        started.set()
+        release.wait(5)
+        received.append(value)
+
+    dispatcher.submit(ReceivedMessage("a", 0), callback)
+    assert started.wait(5)
+    for value in range(1, 4):
+        dispatcher.submit(ReceivedMessage("a", value), callback)
+    release.set()
+    dispatcher.close(5)
+
+    assert received == expected
+    assert dispatcher.stats.dropped == 1
+
+
+def test_async_queue():
+    """ Messages from the network thread are read with async for """
+
+    async def consume():
+        dispatcher = AsyncQueueDispatcher(max_pending=100)
+
+        def produce():
+            for value in range(50):
+                dispatcher.submit(ReceivedMessage(f"topic/{value % 2}", value), None)
+            dispatcher.close()
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        received = [(message.topic, message.data) async for message in dispatcher]
+        producer.join()
+        return received, dispatcher.stats
+
+    received, stats = asyncio.run(consume())
+
+    assert received == [(f"topic/{value % 2}", value) for value in range(50)]
+    assert (stats.received, stats.delivered, stats.pending, stats.dropped) == (50, 50, 0, 0)
+
+
+def test_async_queue_drop_oldest():
+    """ A full queue drops the oldest message of the same topic """
+
+    async def consume():
+        dispatcher = AsyncQueueDispatcher(max_pending=3)
+        for topic, value in [("a", 0), ("b", 1), ("a", 2), ("b", 3)]:
+            dispatcher.submit(ReceivedMessage(topic, value), None)
+        dispatcher.close()
+        return [message.data async for message in dispatcher], dispatcher.stats
+
+    received, stats = asyncio.run(consume())
+
+    assert received == [0, 2, 3]
+    assert stats.dropped == 1
+
+
+def test_subscribe_requires_callback():
+    """ Only an async queue dispatcher takes subscriptions without callbacks """
+    client = DataReceiverClient("localhost", ApiKeyAuthenticator("app", None, str(uuid4())),
+                                disable_tls=True)
+
+    with pytest.raises(ValueError):
+        client.subscribe("data-app/#")
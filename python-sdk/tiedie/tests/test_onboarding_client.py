@@ -6,10 +6,11 @@
 """Test the Onboarding Client"""
 
 import json
+import urllib.parse as url_parse
 from uuid import uuid4
 import pytest
 import responses
-from tiedie.api.onboarding_client import OnboardingClient
+from tiedie.api.onboarding_client import ListPageError, OnboardingClient
 from tiedie.api.auth import ApiKeyAuthenticator, CertificateAuthenticator
 from tiedie.models.scim import (
     AppCertificateInfo, BleExtension, Device, EndpointApp, EndpointAppType, PairingPassKey
@@ -476,3 +477,173 @@ def test_no_endpoint_app(mock_server: responses.RequestsMock,
     assert response.status_code == 200
     assert response.body is not None
     assert response.body.total_results == 0
+
+
+def ble_device(index: int) -> Device:
+    """ A BLE device with a unique MAC address """
+    return Device(
+        display_name=f"BLE Monitor {index}",
+        active=True,
+        ble_extension=BleExtension(
+            device_mac_address=f"AA:BB:CC:11:22:{index:02X}",
+            version_support=["5.0"]
+        )
+    )
+
+
+def test_create_devices(mock_server: responses.RequestsMock,
+                        onboarding_client: OnboardingClient):
+    """ Devices are created in chunks and results are matched by bulkId """
+    bulk_requests = []
+
+    def bulk(request):
+        body = json.loads(request.body)
+        bulk_requests.append(body)
+        results = []
+        for operation in body["Operations"]:
+            assert operation["method"] == "POST" and operation["path"] == "/Devices"
+            mac = operation["data"]["urn:ietf:params:scim:schemas:extension:ble:2.0:Device"][
+                "deviceMacAddress"]
+            if mac.endswith(":02"):
+                results.append({"method": "POST", "bulkId": operation["bulkId"],
+                                "status": "409",
+                                "response": {"status": "409", "scimType": "uniqueness",
+                                             "detail": "Device already exists"}})
+            elif not mac.endswith(":04"):
+                results.append({"method": "POST", "bulkId": operation["bulkId"],
+                                "status": "201",
+                                "location": "https://onboarding.example.com/scim/v2/Devices/"
+                                            + operation["bulkId"],
+                                "version": 'W/"1"'})
+        # Results may come in any order
+        return 200, {}, json.dumps({
+            "schemas": ["urn:ietf:params:scim:api:messages:2.0:BulkResponse"],
+            "Operations": results[::-1]
+        })
+
+    mock_server.add_callback(responses.POST, "https://onboarding.example.com/scim/v2/Bulk",
+                             callback=bulk, content_type="application/scim+json")
+
+    devices = [ble_device(index) for index in range(5)]
+    results = onboarding_client.create_devices(devices, chunk_size=2, concurrency=2)
+
+    assert len(bulk_requests) == 3
+    assert all(body["schemas"] == ["urn:ietf:params:scim:api:messages:2.0:BulkRequest"]
+               for body in bulk_requests)
+    assert sorted(len(body["Operations"]) for body in bulk_requests) == [1, 2, 2]
+
+    assert [result.item for result in results] == devices
+    assert [result.status_code for result in results] == [201, 201, 409, 201, None]
+    assert [result.resource_id for result in results[:2]] == ["0", "1"]
+    assert results[1].version == 'W/"1"'
+    assert not results[2].is_success
+    assert results[2].error and results[2].error["scimType"] == "uniqueness"
+    assert not results[4].is_success
+
+
+def test_delete_devices(mock_server: responses.RequestsMock,
+                        onboarding_client: OnboardingClient):
+    """ A failed bulk request fails every device of its chunk """
+    device_ids = [str(uuid4()) for _ in range(3)]
+    calls = []
+
+    def bulk(request):
+        body = json.loads(request.body)
+        calls.append(body)
+        if len(body["Operations"]) == 1:
+            return 413, {}, json.dumps({"status": "413", "detail": "Payload too large"})
+        return 200, {}, json.dumps({
+            "schemas": ["urn:ietf:params:scim:api:messages:2.0:BulkResponse"],
+            "Operations": [{"method": "DELETE", "bulkId": operation["bulkId"], "status": "204"}
+                           for operation in body["Operations"]]
+        })
+
+    mock_server.add_callback(responses.POST, "https://onboarding.example.com/scim/v2/Bulk",
+                             callback=bulk, content_type="application/scim+json")
+
+    results = onboarding_client.delete_devices(device_ids, chunk_size=2)
+
+    # Chunks are sent concurrently, in any order
+    assert sorted(operation["path"] for body in calls for operation in body["Operations"]) == \
+        sorted(f"/Devices/{device_id}" for device_id in device_ids)
+    assert [result.item for result in results] == device_ids
+    assert [result.status_code for result in results] == [204, 204, 413]
+    assert onboarding_client.delete_devices([]) == []
+
+
+def list_server(device_ids, cursors=True):
+    """ A /Devices callback paging device_ids like the gateway """
+    queries = []
+
+    def read_devices(request):
+        query = dict(url_parse.parse_qsl(url_parse.urlparse(request.url).query,
+                                         keep_blank_values=True))
+        queries.append(query)
+        count = int(query["count"])
+        body = {"schemas": ["urn:ietf:params:scim:api:messages:2.0:ListResponse"],
+                "totalResults": len(device_ids)}
+        if "cursor" in query and cursors:
+            start = int(query["cursor"] or 0)
+            if start + count < len(device_ids):
+                body["nextCursor"] = str(start + count)
+        else:
+            start = int(query.get("startIndex", 1)) - 1
+            body["startIndex"] = start + 1
+        body["Resources"] = [{"id": device_id, "displayName": device_id, "active": True,
+                              "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Device"]}
+                             for device_id in device_ids[start:start + count]]
+        body["itemsPerPage"] = len(body["Resources"])
+        return 200, {}, json.dumps(body)
+
+    return read_devices, queries
+
+
+@pytest.mark.parametrize("cursors", [True, False])
+def test_iter_devices(mock_server: responses.RequestsMock,
+                      onboarding_client: OnboardingClient, cursors: bool):
+    """ Devices are paged with cursors, or by index if the server has no cursors """
+    device_ids = [str(uuid4()) for _ in range(5)]
+    read_devices, queries = list_server(device_ids, cursors)
+    mock_server.add_callback(responses.GET, "https://onboarding.example.com/scim/v2/Devices",
+                             callback=read_devices, content_type="application/scim+json")
+
+    devices = onboarding_client.iter_devices(page_size=2, scim_filter='displayName pr')
+
+    assert [device.device_id for device in devices] == device_ids
+    assert all(query["filter"] == "displayName pr" and query["count"] == "2"
+               for query in queries)
+    if cursors:
+        assert [query["cursor"] for query in queries] == ["", "2", "4"]
+    else:
+        assert [query.get("startIndex") for query in queries] == [None, "3", "5"]
+
+
+def test_iter_devices_stops_early(mock_server: responses.RequestsMock,
+                                  onboarding_client: OnboardingClient):
+    """ Pages are fetched as they are consumed, at most one ahead """
+    device_ids = [str(uuid4()) for _ in range(10)]
+    read_devices, queries = list_server(device_ids)
+    mock_server.add_callback(responses.GET, "https://onboarding.example.com/scim/v2/Devices",
+                             callback=read_devices, content_type="application/scim+json")
+
+    devices = onboarding_client.iter_devices(page_size=2, prefetch=False)
+    assert next(devices).device_id == device_ids[0]
+    assert next(devices).device_id == device_ids[1]
+    devices.close()
+
+    assert len(queries) == 1
+
+
+def test_iter_devices_error(mock_server: responses.RequestsMock,
+                            onboarding_client: OnboardingClient):
+    """ A page that cannot be fetched raises ListPageError """
+    mock_server.get(
+        "https://onboarding.example.com/scim/v2/Devices",
+        status=403,
+        content_type="application/scim+json",
+        body=json.dumps({"status": "403", "detail": "Forbidden"}),
+    )
+
+    with pytest.raises(ListPageError) as error:
+        list(onboarding_client.iter_devices())
+    assert error.value.response.status_code == 403